@@ -0,0 +1,171 @@
+"""Binary columnar storage for the cache files of :func:`hisim.utils.get_cache_file`.
+
+Components that cache precomputed time series (weather, PV, solar thermal, cars, ...) store
+their columns as one structured NumPy ``.npy`` file next to the ``.cache`` path. The file keeps
+the column types, is written atomically and is read memory-mapped, so large weather caches are
+not parsed again for every simulation. Caches that were written as CSV by older versions are
+converted to the binary format the first time they are read.
+
+The caches are uncompressed on purpose: a memory-mapped ``.npy`` column is used without decoding and
+its pages are shared by all simulations on a node. Parquet, which the results are exported to, is
+compressed and encoded, so every reader would decode its own copy of the columns.
+
+On HPC nodes with many parallel simulations, the environment variable ``HISIM_SHARED_CACHE_DIR``
+can point to a node-local shared memory directory such as ``/dev/shm/hisim_cache``. The first
+process on a node then copies each cache file there, keyed by its ``get_cache_file`` hash, and all
+simulations on the node memory-map that copy. The operating system keeps only one copy of the
+pages in memory and the shared file system is read once per node instead of once per simulation.
+"""
+
+# clean
+import os
+import shutil
+import tempfile
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+import portalocker
+
+from hisim import log
+
+#: File extension of the binary cache files.
+COLUMNAR_CACHE_EXTENSION: str = ".npy"
+
+#: Environment variable with the node-local directory for the shared cache copies.
+SHARED_CACHE_DIRECTORY_ENVIRONMENT_VARIABLE: str = "HISIM_SHARED_CACHE_DIR"
+
+
+def get_columnar_cache_path(cache_filepath: str) -> str:
+    """Gets the path of the binary cache file that belongs to a path from ``get_cache_file``."""
+    return os.path.splitext(cache_filepath)[0] + COLUMNAR_CACHE_EXTENSION
+
+
+def columnar_cache_exists(cache_filepath: str) -> bool:
+    """Checks if the binary cache file or a legacy CSV cache file exists for the given cache path."""
+    return os.path.isfile(get_columnar_cache_path(cache_filepath)) or os.path.isfile(cache_filepath)
+
+
+def get_shared_cache_directory() -> Optional[str]:
+    """Gets the node-local shared cache directory, or None if the shared cache is not enabled."""
+    return os.environ.get(SHARED_CACHE_DIRECTORY_ENVIRONMENT_VARIABLE) or None
+
+
+def get_node_local_cache_path(cache_filepath: str) -> str:
+    """Gets the path of the node-local copy of a cache file and creates the copy if needed.
+
+    Returns ``cache_filepath`` itself if the shared cache is not enabled. The copy is created
+    under a file lock, so only one process per node reads the file from the shared file system.
+    """
+    shared_cache_directory = get_shared_cache_directory()
+    if shared_cache_directory is None:
+        return cache_filepath
+    shared_cache_path = os.path.join(shared_cache_directory, os.path.basename(cache_filepath))
+    if os.path.isfile(shared_cache_path):
+        return shared_cache_path
+    os.makedirs(shared_cache_directory, exist_ok=True)
+    try:
+        with portalocker.Lock(shared_cache_path + ".lock", timeout=600):
+            if not os.path.isfile(shared_cache_path):
+                file_descriptor, temporary_path = tempfile.mkstemp(dir=shared_cache_directory, suffix=".tmp")
+                os.close(file_descriptor)
+                try:
+                    shutil.copyfile(cache_filepath, temporary_path)
+                    os.replace(temporary_path, shared_cache_path)
+                finally:
+                    if os.path.exists(temporary_path):
+                        os.remove(temporary_path)
+                log.information("Copied cache file " + cache_filepath + " to the shared cache " + shared_cache_path)
+    except (OSError, portalocker.exceptions.LockException) as error:
+        log.warning(f"Could not use the shared cache for {cache_filepath}, reading it directly: {error}")
+        return cache_filepath
+    return shared_cache_path
+
+
+def get_column_values(columns: Dict[str, np.ndarray], column_name: str) -> np.ndarray:
+    """Gets one cached column for use in a component.
+
+    The column is always a read-only array, memory-mapped from the cache file or, with the shared cache,
+    from its node-local copy, so the simulations on a node share its memory. Components that change
+    the values have to copy them first.
+    """
+    values = columns[column_name].view()
+    values.flags.writeable = False
+    return values
+
+
+def get_column_dtype(values: np.ndarray) -> np.dtype:
+    """Gets the dtype that is used to store a column. Columns that are not numeric are stored as strings."""
+    if values.dtype.kind in "biufcM":
+        return np.dtype(values.dtype)
+    return np.dtype(np.array([str(value) for value in values]).dtype)
+
+
+def save_columnar_cache(cache_filepath: str, data: Union[pd.DataFrame, Dict[str, Any]]) -> str:
+    """Saves the columns of a DataFrame or a dictionary of equally long sequences as binary cache.
+
+    The file is first written to a temporary file and then moved into place, so parallel
+    simulations never read a half-written cache.
+    """
+    if isinstance(data, pd.DataFrame):
+        columns = {str(column_name): data[column_name].to_numpy() for column_name in data.columns}
+    else:
+        columns = {str(column_name): np.asarray(values) for column_name, values in data.items()}
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"All columns of a cache file need to have the same length, got the lengths {sorted(lengths)}.")
+    number_of_rows = lengths.pop() if lengths else 0
+
+    dtype = np.dtype([(column_name, get_column_dtype(values)) for column_name, values in columns.items()])
+    records = np.empty(number_of_rows, dtype=dtype)
+    for column_name, values in columns.items():
+        records[column_name] = values
+
+    columnar_cache_path = get_columnar_cache_path(cache_filepath)
+    cache_directory = os.path.dirname(columnar_cache_path) or "."
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=cache_directory, suffix=COLUMNAR_CACHE_EXTENSION + ".tmp")
+    try:
+        with os.fdopen(file_descriptor, "wb") as file:
+            np.save(file, records, allow_pickle=False)
+        os.replace(temporary_path, columnar_cache_path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+    return columnar_cache_path
+
+
+def load_columnar_cache(cache_filepath: str, **read_csv_kwargs: Any) -> Dict[str, np.ndarray]:
+    """Loads the columns of a cache file as read-only, memory-mapped arrays.
+
+    If only a legacy CSV cache exists at ``cache_filepath``, it is read with ``read_csv_kwargs``,
+    converted to the binary format and removed. Index columns that pandas wrote into the CSV
+    (``Unnamed: 0``) are dropped during the conversion.
+    """
+    columnar_cache_path = get_columnar_cache_path(cache_filepath)
+    if not os.path.isfile(columnar_cache_path):
+        if not os.path.isfile(cache_filepath):
+            raise FileNotFoundError(f"Neither {columnar_cache_path} nor {cache_filepath} exists.")
+        log.information("Converting CSV cache file " + cache_filepath + " to binary format.")
+        data_frame = pd.read_csv(cache_filepath, **read_csv_kwargs)
+        save_columnar_cache(
+            cache_filepath,
+            {
+                str(column_name): data_frame[column_name].to_numpy()
+                for column_name in data_frame.columns
+                if not str(column_name).startswith("Unnamed:")
+            },
+        )
+        try:
+            os.remove(cache_filepath)
+        except OSError as error:
+            log.warning(f"Could not remove the converted CSV cache file {cache_filepath}: {error}")
+    records = np.load(get_node_local_cache_path(columnar_cache_path), mmap_mode="r", allow_pickle=False)
+    if records.dtype.names is None:
+        raise ValueError(f"The cache file {columnar_cache_path} does not contain named columns.")
+    return {column_name: records[column_name] for column_name in records.dtype.names}
+
+
+def load_columnar_cache_as_data_frame(cache_filepath: str, **read_csv_kwargs: Any) -> pd.DataFrame:
+    """Loads a cache file as DataFrame. See :func:`load_columnar_cache`."""
+    return pd.DataFrame(load_columnar_cache(cache_filepath, **read_csv_kwargs))
@@ -6,12 +6,11 @@ The component class is the base class for all other components.
 # clean
 
 from __future__ import annotations
-import os
 import dataclasses as dc
 import typing
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
-import json
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 from dataclass_wizard import JSONWizard
 
@@ -20,6 +19,7 @@ from hisim import log
 from hisim.sim_repository import SimRepository
 from hisim.simulationparameters import SimulationParameters
 from hisim.postprocessing.kpi_computation.kpi_structure import KpiEntry, KpiTagEnumClass
+from hisim.postprocessing.kpi_computation.kpi_accumulators import KpiAccumulators
 
 # Package
 
@@ -126,54 +126,107 @@ class ComponentInput:  # noqa: too-few-public-methods
 
 
 class SingleTimeStepValues:
-    """Contains the values for a single time step."""
+    """Contains the values for a single time step.
 
-    def __init__(self, number_of_values: int):
-        """Initializes a new single time step values class."""
-        self.values = [0.0] * number_of_values
+    The values are kept in a preallocated float64 numpy array, so copying between the current and the
+    previous iteration happens in place and the convergence check is vectorized over all outputs.
+    """
 
-    def copy_values_from_other(self, other):
+    def __init__(
+        self,
+        number_of_values: int,
+        absolute_tolerance: float = 0.0001,
+        relative_tolerance: float = 0.0,
+    ):
+        """Initializes a new single time step values class."""
+        self._values: np.ndarray = np.zeros(number_of_values, dtype=np.float64)
+        self._difference_buffer: np.ndarray = np.empty(number_of_values, dtype=np.float64)
+        self.absolute_tolerance: float = absolute_tolerance
+        self.relative_tolerance: float = relative_tolerance
+
+    @property
+    def values(self) -> np.ndarray:
+        """Gets the value array."""
+        return self._values
+
+    @values.setter
+    def values(self, new_values: Any) -> None:
+        """Sets the value array. Lists are converted to a float64 array."""
+        self._values = np.asarray(new_values, dtype=np.float64)
+        if self._difference_buffer.shape != self._values.shape:
+            self._difference_buffer = np.empty(self._values.shape, dtype=np.float64)
+
+    def copy_values_from_other(self, other: "SingleTimeStepValues") -> None:
         """Copy all values from a single time step values."""
-        self.values = other.values[:]
+        if self._values.shape == other.values.shape:
+            np.copyto(self._values, other.values)
+        else:
+            self.values = other.values.copy()
 
-    def clone(self):
+    def clone(self) -> "SingleTimeStepValues":
         """Makes a copy of the current object."""
-        newstsv = SingleTimeStepValues(len(self.values))
-        newstsv.values = self.values[:]
+        newstsv = SingleTimeStepValues(len(self._values), self.absolute_tolerance, self.relative_tolerance)
+        np.copyto(newstsv.values, self._values)
         return newstsv
 
     def get_input_value(self, component_input: ComponentInput) -> float:
         """Gets a value for an input from the single time step values."""
         if component_input.source_output is None:
             return 0
-        return self.values[component_input.source_output.global_index]
+        return float(self._values.item(component_input.source_output.global_index))
 
     def set_output_value(self, output: ComponentOutput, value: float) -> None:
         """Sets a single output value in the single time step values array."""
-        self.values[output.global_index] = value
-
-    def is_close_enough_to_previous(self, previous_values: "SingleTimeStepValues") -> bool:
-        """Checks if the values are sufficiently similar to another array."""
-        count = len(self.values)
-        for i in range(count):
-            if abs(previous_values.values[i] - self.values[i]) > 0.0001:
-                return False
-        return True
-
-    def get_differences_for_error_msg(self, previous_values: Any, outputs: List[ComponentOutput]) -> str:
+        self._values[output.global_index] = value
+
+    def get_changed_value_mask(
+        self, previous_values: "SingleTimeStepValues", indices: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Gets a boolean mask of all values that differ from another array by more than the tolerance.
+
+        If indices are given, only these values are compared and the mask refers to the indices.
+        Differences involving NaN are not counted as changes, like in the previous scalar comparison.
+        """
+        if indices is None:
+            current = self._values
+            previous = np.asarray(previous_values.values)
+            difference = self._difference_buffer
+            np.subtract(previous, current, out=difference)
+        else:
+            current = self._values[indices]
+            previous = np.asarray(previous_values.values)[indices]
+            difference = previous - current
+        np.abs(difference, out=difference)
+        changed_value_mask: np.ndarray
+        if self.relative_tolerance > 0:
+            changed_value_mask = difference > self.absolute_tolerance + self.relative_tolerance * np.abs(previous)
+        else:
+            changed_value_mask = difference > self.absolute_tolerance
+        return changed_value_mask
+
+    def is_close_enough_to_previous(
+        self, previous_values: "SingleTimeStepValues", indices: Optional[np.ndarray] = None
+    ) -> bool:
+        """Checks if the values (or only the values at the given indices) are sufficiently similar to another array."""
+        return not self.get_changed_value_mask(previous_values, indices).any()
+
+    def get_differences_for_error_msg(
+        self, previous_values: Any, outputs: List[ComponentOutput], indices: Optional[np.ndarray] = None
+    ) -> str:
         """Gets a pretty error message for the differences between two time steps."""
-        count = len(self.values)
+        changed_positions = np.flatnonzero(self.get_changed_value_mask(previous_values, indices))
+        if indices is not None:
+            changed_positions = indices[changed_positions]
         error_msg = ""
-        for i in range(count):
-            if abs(previous_values.values[i] - self.values[i]) > 0.0001:
-                error_msg += (
-                    outputs[i].get_pretty_name()
-                    + " previously: "
-                    + f"{previous_values.values[i]:4.2f}"
-                    + " currently: "
-                    + f"{self.values[i]:4.2f}"
-                    + " | "
-                )
+        for i in changed_positions:
+            error_msg += (
+                outputs[i].get_pretty_name()
+                + " previously: "
+                + f"{previous_values.values[i]:4.2f}"
+                + " currently: "
+                + f"{self._values[i]:4.2f}"
+                + " | "
+            )
         return error_msg
 
 
@@ -231,7 +284,12 @@ class Component:
             )
         self.my_display_config: DisplayConfig = my_display_config
         self.log_connections: List[Any] = []
+        self.connection_records: List[Dict[str, Dict[str, str]]] = []
         self.enable_logging = my_simulation_parameters.log_connections
+        # precomputed outputs as declared, they are only converted to arrays when they are used
+        self.precomputed_output_values: Dict[ComponentOutput, Any] = {}
+        # components and outputs with precomputed values that were prepared before this one, keyed by (component, field)
+        self.precomputed_values_of_prepared_components: Dict[Tuple[str, str], Tuple["Component", ComponentOutput]] = {}
 
     def get_component_name(
         self,
@@ -257,7 +315,10 @@ class Component:
                 raise ValueError("Trying to add connections to different components in one go.")
         self.default_connections[component_name] = connections
         log.trace(
-            "added default connections for connections from : " + component_name + "\n" + str(self.default_connections)
+            lambda: "added default connections for connections from : "
+            + component_name
+            + "\n"
+            + str(self.default_connections)
         )
 
     def i_prepare_simulation(self) -> None:
@@ -266,6 +327,46 @@ class Component:
             "Simulation preparation is missing for " + self.component_name + " (" + self.get_full_classname() + ")"
         )
 
+    def i_finish_simulation(self) -> None:
+        """Gets called after the last timestep. Components can override it to save caches for later simulations."""
+
+    def set_precomputed_output_values(self, output: ComponentOutput, values: Any) -> None:
+        """Declares the values of an output for all timesteps.
+
+        Components that declare all of their outputs this way in i_prepare_simulation are time series sources:
+        the simulator writes their output columns directly and does not call i_simulate for them anymore.
+        The values are kept as given and only converted to an array if the component is used as time series
+        source or a later component reads them. Values that have to be derived first, e.g. by a unit conversion,
+        can be given as a function without arguments, which is then only called when the values are used.
+        """
+        self.precomputed_output_values[output] = values
+
+    def get_precomputed_output_values(self, output: ComponentOutput) -> np.ndarray:
+        """Gets the declared values of an output for all timesteps as array."""
+        values = self.precomputed_output_values[output]
+        if isinstance(values, np.ndarray) and values.dtype == np.float64:
+            return values
+        if callable(values):
+            values = values()
+        array_values: np.ndarray = np.asarray(values, dtype=np.float64)
+        self.precomputed_output_values[output] = array_values
+        return array_values
+
+    def get_precomputed_input_values(self, component_input: ComponentInput) -> Optional[np.ndarray]:
+        """Gets the values for all timesteps of the output that an input is connected to.
+
+        Returns None if the source component did not declare precomputed values or was prepared after this component.
+        """
+        if component_input.src_object_name is None or component_input.src_field_name is None:
+            return None
+        source = self.precomputed_values_of_prepared_components.get(
+            (component_input.src_object_name, component_input.src_field_name)
+        )
+        if source is None:
+            return None
+        source_component, source_output = source
+        return source_component.get_precomputed_output_values(source_output)
+
     def set_sim_repo(self, simulation_repository: SimRepository) -> None:
         """Sets the SimRepository."""
         if simulation_repository is None:
@@ -341,32 +442,13 @@ class Component:
         input_to_set.src_field_name = src_field_name
 
         if self.enable_logging:
-            # write input and output connection to json file
-            file_name = os.path.join(self.my_simulation_parameters.result_directory, "component_connections.json")
-
-            dict_with_connection_information = {
-                "From": {"Component": input_to_set.src_object_name, "Field": input_to_set.src_field_name},
-                "To": {"Component": input_to_set.component_name, "Field": input_to_set.field_name},
-            }
-
-            try:
-                # Validate that result_directory exists, create if it doesn't
-                if not os.path.exists(self.my_simulation_parameters.result_directory):
-                    os.makedirs(self.my_simulation_parameters.result_directory, exist_ok=True)
-
-                if os.path.exists(file_name):
-                    with open(file_name, mode="r+", encoding="utf-8") as file:
-                        file.seek(os.stat(file_name).st_size - 1)
-                        file.write(f",{json.dumps(dict_with_connection_information)}]")
-                else:
-                    with open(file_name, "a", encoding="utf-8") as file:
-                        json.dump([dict_with_connection_information], file)
-            except (OSError, IOError) as e:
-                # Log warning instead of crashing
-                log.warning(
-                    f"Failed to write component connections to {file_name}: {e}. "
-                    "Component connections will not be logged to file."
-                )
+            # collected for component_connections.json, which the simulator writes after connecting all components
+            self.connection_records.append(
+                {
+                    "From": {"Component": input_to_set.src_object_name, "Field": input_to_set.src_field_name},
+                    "To": {"Component": input_to_set.component_name, "Field": input_to_set.field_name},
+                }
+            )
 
     def connect_dynamic_input(self, input_fieldname: str, src_object: ComponentOutput) -> None:
         """For connecting an input to a dynamic output."""
@@ -447,6 +529,13 @@ class Component:
         # if the method is not implemented in the component return an empty list
         raise NotImplementedError(f"{self.component_name} has no kpis implemented.")
 
+    def register_kpi_accumulators(self, kpi_accumulators: KpiAccumulators) -> None:
+        """Registers running KPI values of outputs that the simulator updates after every converged timestep.
+
+        Components can override it and use the values of the accumulators in get_component_kpi_entries
+        instead of going through the results of all timesteps.
+        """
+
     def calc_maintenance_cost(self) -> float:
         """Calc maintenance_cost per simulated period as share of capex of component."""
 
@@ -468,6 +557,31 @@ class Component:
         """Performs the actual calculation."""
         raise NotImplementedError()
 
+    def i_prepare_next_period(self) -> None:
+        """Gets called before every further period of a multi-period simulation.
+
+        The simulation parameters already cover the next period. Components whose prepared inputs depend on the
+        simulated year reload them here. By default, the prepared inputs and the states of the component are kept.
+        """
+
+    def i_get_checkpoint_state(self) -> Dict[str, Any]:
+        """Returns the attributes that are needed to continue the simulation from a checkpoint.
+
+        The checkpoint is taken right after i_save_state. By default, these are all attributes of the component
+        except the inputs, outputs and connections, the configuration and the references to other components.
+        Components with attributes that cannot be pickled, or that save their state in other objects,
+        override this and i_restore_checkpoint_state.
+        """
+        return {
+            name: value
+            for name, value in vars(self).items()
+            if name not in COMPONENT_STRUCTURE_ATTRIBUTES and not isinstance(value, NON_CHECKPOINT_TYPES)
+        }
+
+    def i_restore_checkpoint_state(self, checkpoint_state: Dict[str, Any]) -> None:
+        """Sets the attributes of a checkpoint. The simulator calls i_restore_state afterwards."""
+        vars(self).update(checkpoint_state)
+
     def write_to_report(self) -> Any:
         """Abstract function for writing the report entry for this component."""
         raise NotImplementedError("In " + self.component_name)
@@ -477,6 +591,35 @@ class Component:
         pass  # noqa
 
 
+#: Attributes of every component that are set up before the simulation and are not part of a checkpoint.
+COMPONENT_STRUCTURE_ATTRIBUTES = frozenset(
+    [
+        "component_name",
+        "inputs",
+        "outputs",
+        "outputs_initialized",
+        "inputs_initialized",
+        "default_connections",
+        "log_connections",
+        "connection_records",
+        "enable_logging",
+        "precomputed_output_values",
+        "precomputed_values_of_prepared_components",
+    ]
+)
+
+#: Types of attributes that refer to the simulation setup or to other components and are not part of a checkpoint.
+NON_CHECKPOINT_TYPES = (
+    Component,
+    ComponentInput,
+    ComponentOutput,
+    ConfigBase,
+    DisplayConfig,
+    SimulationParameters,
+    SimRepository,
+)
+
+
 @dataclass
 class OpexCostDataClass:
     """Return element of type OpexCostDataClass in function get_opex_cost from Component."""
@@ -0,0 +1,136 @@
+"""Per-component profiling of the simulation loop.
+
+If ``profile_components`` is set in the simulation parameters, every component wrapper measures the
+wall time and the number of calls of ``i_simulate``, ``i_save_state``, ``i_restore_state`` and
+``i_doublecheck`` of its component. The simulator counts per timestep how many iterations were needed
+until convergence and how often each component was simulated. The profile is written as
+``component_profile.json`` into the result directory and summarized in the PDF report.
+Without profiling, the wrappers only check that no profile is set.
+"""
+
+# clean
+import json
+import os
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List
+
+#: File name of the profile inside the result directory.
+COMPONENT_PROFILE_FILENAME: str = "component_profile.json"
+
+#: Profiled methods of the components.
+I_SIMULATE: str = "i_simulate"
+I_SAVE_STATE: str = "i_save_state"
+I_RESTORE_STATE: str = "i_restore_state"
+I_DOUBLECHECK: str = "i_doublecheck"
+PROFILED_METHODS: List[str] = [I_SIMULATE, I_SAVE_STATE, I_RESTORE_STATE, I_DOUBLECHECK]
+
+
+class ComponentProfile:
+
+    """Wall times and calls of the profiled methods of one component."""
+
+    def __init__(self, component_name: str) -> None:
+        """Initializes an empty profile."""
+        self.component_name: str = component_name
+        self.wall_time_in_seconds: Dict[str, float] = {method: 0.0 for method in PROFILED_METHODS}
+        self.calls: Dict[str, int] = {method: 0 for method in PROFILED_METHODS}
+        # number of timesteps by the number of i_simulate calls in the timestep
+        self.simulate_calls_per_timestep: Counter = Counter()
+        self.simulate_calls_before_timestep: int = 0
+
+    def call(self, method: str, function: Callable[..., None], *args: Any) -> None:
+        """Calls the method of the component and adds its wall time."""
+        start = time.perf_counter()
+        try:
+            function(*args)
+        finally:
+            self.wall_time_in_seconds[method] += time.perf_counter() - start
+            self.calls[method] += 1
+
+    def finish_timestep(self) -> None:
+        """Counts the i_simulate calls of the finished timestep."""
+        simulate_calls = self.calls[I_SIMULATE]
+        self.simulate_calls_per_timestep[simulate_calls - self.simulate_calls_before_timestep] += 1
+        self.simulate_calls_before_timestep = simulate_calls
+
+    def get_total_wall_time_in_seconds(self) -> float:
+        """Returns the wall time of all profiled methods."""
+        return sum(self.wall_time_in_seconds.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the profile as json compatible dict."""
+        return {
+            "total_wall_time_in_seconds": self.get_total_wall_time_in_seconds(),
+            "wall_time_in_seconds": dict(self.wall_time_in_seconds),
+            "calls": dict(self.calls),
+            "simulate_calls_per_timestep": {
+                str(number_of_calls): number_of_timesteps
+                for number_of_calls, number_of_timesteps in sorted(self.simulate_calls_per_timestep.items())
+            },
+        }
+
+
+class SimulationProfile:
+
+    """Profiles of all components and the iterations until convergence of all timesteps."""
+
+    def __init__(self, component_profiles: List[ComponentProfile]) -> None:
+        """Initializes the profile of a simulation with the profiles of its components."""
+        self.component_profiles: List[ComponentProfile] = component_profiles
+        # number of timesteps by the number of iterations until convergence
+        self.iterations_per_timestep: Counter = Counter()
+        self.start_time: float = time.perf_counter()
+        self.simulation_wall_time_in_seconds: float = 0.0
+
+    def finish_timestep(self, iteration_tries: int) -> None:
+        """Counts the iterations of the finished timestep and the i_simulate calls of all components."""
+        self.iterations_per_timestep[iteration_tries] += 1
+        for component_profile in self.component_profiles:
+            component_profile.finish_timestep()
+
+    def finish(self) -> None:
+        """Stops the wall time of the simulation loop."""
+        self.simulation_wall_time_in_seconds = time.perf_counter() - self.start_time
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the profile as json compatible dict, with the slowest components first."""
+        sorted_profiles = sorted(
+            self.component_profiles, key=lambda profile: profile.get_total_wall_time_in_seconds(), reverse=True
+        )
+        return {
+            "simulation_wall_time_in_seconds": self.simulation_wall_time_in_seconds,
+            "iterations_per_timestep": {
+                str(iterations): number_of_timesteps
+                for iterations, number_of_timesteps in sorted(self.iterations_per_timestep.items())
+            },
+            "components": {profile.component_name: profile.to_dict() for profile in sorted_profiles},
+        }
+
+    def write(self, result_directory: str) -> str:
+        """Writes the profile into the result directory and returns the file path."""
+        file_path = os.path.join(result_directory, COMPONENT_PROFILE_FILENAME)
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, indent=4)
+        return file_path
+
+
+def get_profile_summary_lines(profile: Dict[str, Any], number_of_components: int = 10) -> List[str]:
+    """Returns text lines that summarize a profile dict for the report, with the slowest components."""
+    simulation_wall_time = profile["simulation_wall_time_in_seconds"]
+    lines = [f"The simulation loop took {simulation_wall_time:.2f} s."]
+    iterations = ", ".join(
+        f"{number_of_timesteps} timesteps with {iterations_text} iterations"
+        for iterations_text, number_of_timesteps in profile["iterations_per_timestep"].items()
+    )
+    lines.append(f"Iterations until convergence: {iterations}.")
+    for component_name, component_profile in list(profile["components"].items())[:number_of_components]:
+        total_wall_time = component_profile["total_wall_time_in_seconds"]
+        share = total_wall_time / simulation_wall_time * 100 if simulation_wall_time > 0 else 0.0
+        method_times = ", ".join(
+            f"{method} {component_profile['wall_time_in_seconds'][method]:.2f} s "
+            f"({component_profile['calls'][method]} calls)"
+            for method in PROFILED_METHODS
+        )
+        lines.append(f"{component_name}: {total_wall_time:.2f} s ({share:.1f} %): {method_times}.")
+    return lines
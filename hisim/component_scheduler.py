@@ -0,0 +1,166 @@
+"""Builds the evaluation order of the components from their input/output connections.
+
+The components and the connections between them (``ComponentInput.source_output``) form a
+directed graph. Its strongly connected components are the blocks in which components depend on
+each other in a circle (for example building, heat pump, storage and controllers). These blocks
+have to be iterated until convergence. All other components only depend on components that
+are evaluated before them and therefore have to be simulated exactly once per timestep.
+"""
+
+# clean
+import heapq
+from dataclasses import dataclass, field
+from typing import Dict, List, Set
+
+import numpy as np
+
+from hisim.component_wrapper import ComponentWrapper
+
+
+@dataclass
+class EvaluationBlock:
+
+    """A group of components that is evaluated together in one timestep.
+
+    Acyclic blocks contain exactly one component that does not depend on itself.
+    Cyclic blocks contain the components of one strongly connected component in insertion order.
+    """
+
+    wrapped_components: List[ComponentWrapper]
+    is_cyclic: bool
+    output_indices: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.intp))
+
+    def get_component_names(self) -> List[str]:
+        """Gets the names of all components in the block."""
+        return [wrapped_component.my_component.component_name for wrapped_component in self.wrapped_components]
+
+
+def get_component_dependencies(wrapped_components: List[ComponentWrapper]) -> List[Set[int]]:
+    """Gets, for every wrapped component, the indices of the wrapped components it reads inputs from."""
+    owner_by_output_id: Dict[int, int] = {}
+    for component_index, wrapped_component in enumerate(wrapped_components):
+        for output in wrapped_component.component_outputs:
+            owner_by_output_id[id(output)] = component_index
+
+    dependencies: List[Set[int]] = []
+    for wrapped_component in wrapped_components:
+        sources: Set[int] = set()
+        for component_input in wrapped_component.my_component.inputs:
+            if component_input.source_output is None:
+                continue
+            source_index = owner_by_output_id.get(id(component_input.source_output))
+            if source_index is not None:
+                sources.add(source_index)
+        dependencies.append(sources)
+    return dependencies
+
+
+def get_strongly_connected_components(successors: List[List[int]]) -> List[List[int]]:
+    """Finds the strongly connected components of a graph with Tarjan's algorithm.
+
+    The implementation is iterative, so large district setups do not hit the recursion limit.
+    """
+    number_of_nodes = len(successors)
+    index_counter = 0
+    node_index = [-1] * number_of_nodes
+    low_link = [0] * number_of_nodes
+    on_stack = [False] * number_of_nodes
+    stack: List[int] = []
+    strongly_connected_components: List[List[int]] = []
+
+    for root in range(number_of_nodes):
+        if node_index[root] != -1:
+            continue
+        work_stack = [(root, 0)]
+        while work_stack:
+            node, next_successor = work_stack[-1]
+            if next_successor == 0:
+                node_index[node] = index_counter
+                low_link[node] = index_counter
+                index_counter += 1
+                stack.append(node)
+                on_stack[node] = True
+            recurse = False
+            for position in range(next_successor, len(successors[node])):
+                successor = successors[node][position]
+                if node_index[successor] == -1:
+                    work_stack[-1] = (node, position + 1)
+                    work_stack.append((successor, 0))
+                    recurse = True
+                    break
+                if on_stack[successor]:
+                    low_link[node] = min(low_link[node], node_index[successor])
+            if recurse:
+                continue
+            work_stack.pop()
+            if work_stack:
+                parent = work_stack[-1][0]
+                low_link[parent] = min(low_link[parent], low_link[node])
+            if low_link[node] == node_index[node]:
+                component: List[int] = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component.append(member)
+                    if member == node:
+                        break
+                strongly_connected_components.append(sorted(component))
+    return strongly_connected_components
+
+
+def build_evaluation_blocks(wrapped_components: List[ComponentWrapper]) -> List[EvaluationBlock]:
+    """Sorts the wrapped components into evaluation blocks in topological order.
+
+    Ties are broken by the order in which the components were added to the simulator,
+    so the schedule is deterministic and stays close to the setup order.
+    """
+    dependencies = get_component_dependencies(wrapped_components)
+    successors: List[List[int]] = [[] for _ in wrapped_components]
+    for target_index, sources in enumerate(dependencies):
+        for source_index in sorted(sources):
+            successors[source_index].append(target_index)
+
+    strongly_connected_components = get_strongly_connected_components(successors)
+    block_of_component: Dict[int, int] = {}
+    for block_index, members in enumerate(strongly_connected_components):
+        for member in members:
+            block_of_component[member] = block_index
+
+    # Kahn's algorithm on the condensed graph, prioritized by the first component of each block
+    block_successors: List[Set[int]] = [set() for _ in strongly_connected_components]
+    number_of_block_predecessors = [0] * len(strongly_connected_components)
+    for source_index, targets in enumerate(successors):
+        for target_index in targets:
+            source_block = block_of_component[source_index]
+            target_block = block_of_component[target_index]
+            if source_block != target_block and target_block not in block_successors[source_block]:
+                block_successors[source_block].add(target_block)
+                number_of_block_predecessors[target_block] += 1
+    ready = [
+        (members[0], block_index)
+        for block_index, members in enumerate(strongly_connected_components)
+        if number_of_block_predecessors[block_index] == 0
+    ]
+    heapq.heapify(ready)
+
+    evaluation_blocks: List[EvaluationBlock] = []
+    while ready:
+        _, block_index = heapq.heappop(ready)
+        members = strongly_connected_components[block_index]
+        is_cyclic = len(members) > 1 or members[0] in dependencies[members[0]]
+        block_components = [wrapped_components[member] for member in members]
+        output_indices = np.array(
+            [output.global_index for wrapped_component in block_components for output in wrapped_component.component_outputs],
+            dtype=np.intp,
+        )
+        evaluation_blocks.append(
+            EvaluationBlock(wrapped_components=block_components, is_cyclic=is_cyclic, output_indices=output_indices)
+        )
+        for successor_block in block_successors[block_index]:
+            number_of_block_predecessors[successor_block] -= 1
+            if number_of_block_predecessors[successor_block] == 0:
+                heapq.heappush(ready, (strongly_connected_components[successor_block][0], successor_block))
+
+    if len(evaluation_blocks) != len(strongly_connected_components):
+        raise ValueError("The component graph could not be ordered. This is a bug in the component scheduler.")
+    return evaluation_blocks
@@ -1,11 +1,15 @@
 """Wraps components for use in the simulator."""
 
 # clean
-from typing import List
+from typing import List, Optional
+
+import numpy as np
 
 import hisim.component as cp
 import hisim.loadtypes as lt
 from hisim import log
+from hisim.component_profiling import ComponentProfile, I_DOUBLECHECK, I_RESTORE_STATE, I_SAVE_STATE, I_SIMULATE
+from hisim.output_registry import OutputRegistry
 
 
 class ComponentWrapper:
@@ -22,6 +26,15 @@ class ComponentWrapper:
         # self.cachedict: = {}
         self.is_cachable: bool = is_cachable
         self.connect_automatically: bool = connect_automatically
+        # global indices of the outputs that the inputs of this component are connected to
+        self.source_output_indices: np.ndarray = np.zeros(0, dtype=np.intp)
+        # set by the simulator if all outputs of the component are precomputed for the whole simulation
+        self.is_time_series_source: bool = False
+        # run statistics
+        self.simulate_calls: int = 0
+        self.skipped_simulations: int = 0
+        # set by the simulator if the component methods are profiled
+        self.profile: Optional[ComponentProfile] = None
 
     def clear(self) -> None:
         """Clears properties to help with saving memory."""
@@ -30,9 +43,9 @@ class ComponentWrapper:
         del self.component_outputs
 
     def register_component_outputs(
-        self, all_outputs: List[cp.ComponentOutput], wrapped_components_so_far: List["ComponentWrapper"]
+        self, output_registry: OutputRegistry, wrapped_components_so_far: List["ComponentWrapper"]
     ) -> None:
-        """Registers component outputs in the global list of components."""
+        """Registers component outputs in the global registry of outputs."""
 
         log.debug("Registering component outputs on " + self.my_component.component_name)
 
@@ -73,15 +86,8 @@ class ComponentWrapper:
                     "Therefore, this output will be skipped."
                 )
                 continue  # skip this output, because the source component is not wrapped yet
-            if any(output.full_name == out.full_name for out in all_outputs):
-                raise ValueError(
-                    f"Trying to register the same key twice: {output.full_name}. "
-                    "Check if more than one building is being modeled."
-                )
-            # set the global index of the output column
-            output.global_index = len(all_outputs)  # noqa
-            # add the output column to the global list of outputs
-            all_outputs.append(output)
+            # add the output column to the global registry of outputs, which sets its global index
+            output_registry.register(output)
             self.component_outputs.append(output)
             log.debug("Registered output " + output.full_name)
             if not self.component_outputs:
@@ -103,6 +109,9 @@ class ComponentWrapper:
         This gets called at the beginning of a timestep and wraps the i_save_state
         i_save_state should always cache the current state at the beginning of a time step.
         """
+        if self.profile is not None:
+            self.profile.call(I_SAVE_STATE, self.my_component.i_save_state)
+            return
         self.my_component.i_save_state()
 
     def doublecheck(self, timestep: int, stsv: cp.SingleTimeStepValues) -> None:
@@ -111,6 +120,9 @@ class ComponentWrapper:
         Doublecheck is completely optional call that can be used while debugging to
         double check the component results after the iteration finished for a timestep.
         """
+        if self.profile is not None:
+            self.profile.call(I_DOUBLECHECK, self.my_component.i_doublecheck, timestep, stsv)
+            return
         self.my_component.i_doublecheck(timestep, stsv)
 
     def restore_state(self) -> None:
@@ -118,10 +130,17 @@ class ComponentWrapper:
 
         Gets called at the beginning of every iteration to return to the state at the beginning of the iteration.
         """
+        if self.profile is not None:
+            self.profile.call(I_RESTORE_STATE, self.my_component.i_restore_state)
+            return
         self.my_component.i_restore_state()
 
     def calculate_component(self, timestep: int, stsv: cp.SingleTimeStepValues, force_convergence: bool) -> None:
         """Wrapper for the core simulation function in each component."""
+        self.simulate_calls += 1
+        if self.profile is not None:
+            self.profile.call(I_SIMULATE, self.my_component.i_simulate, timestep, stsv, force_convergence)
+            return
         self.my_component.i_simulate(timestep, stsv, force_convergence)
 
     def prepare_calculation(self) -> None:
@@ -129,51 +148,57 @@ class ComponentWrapper:
         log.information("Preparing " + self.my_component.component_name + " for simulation.")
         self.my_component.i_prepare_simulation()
 
-    def connect_inputs(self, all_outputs: List[cp.ComponentOutput]) -> None:
+    def prepare_next_period(self) -> None:
+        """Wrapper for i_prepare_next_period, also resets the run statistics."""
+        log.debug("Preparing " + self.my_component.component_name + " for the next period.")
+        self.simulate_calls = 0
+        self.skipped_simulations = 0
+        self.my_component.i_prepare_next_period()
+
+    def connect_inputs(self, output_registry: OutputRegistry) -> None:
         """Connects cp.ComponentOutputs to ComponentInputs of WrapperComponent."""
 
         # Returns a List of ComponentInputs
         self.my_component.get_input_definitions()
+        source_output_indices: List[int] = []
 
         # Loop through lists of inputs of self component
         for cinput in self.my_component.inputs:
             # Adds to the ComponentInput List of ComponentWrapper
             self.component_inputs.append(cinput)
 
-            # Creates a ComponentOutput variable
-            global_output: cp.ComponentOutput
-
-            # Loop through all the existent component outputs in the current simulation
-            for global_output in all_outputs:
-                # Check if ComponentOutput and ComponentInput match
-                if (
-                    global_output.component_name == cinput.src_object_name
-                    and global_output.field_name == cinput.src_field_name
-                ):
-                    # Check if ComponentOutput and ComponentInput have the same units
-                    if cinput.unit != global_output.unit:
-                        # Check the use of "Units.Any"
-                        if (cinput.unit == lt.Units.ANY and global_output.unit != lt.Units.ANY) or (
-                            cinput.unit != lt.Units.ANY and global_output.unit == lt.Units.ANY
-                        ):
-                            log.warning(
-                                f"The input {cinput.field_name} (cp: {cinput.component_name}, unit: {cinput.unit}) "
-                                f"and output {global_output.field_name}(cp: {global_output.component_name}, unit: {global_output.unit}) "
-                                f"might not have compatible units."
-                            )  #
-                            # Connect, i.e, save ComponentOutput in ComponentInput
-                            cinput.source_output = global_output
-                            log.debug("Connected input '" + cinput.fullname + "' to '" + global_output.full_name + "'")
-                        else:
-                            raise ValueError(
-                                f"The input {cinput.field_name} (cp: {cinput.component_name}, unit: {cinput.unit}) and "
-                                f"output {global_output.field_name}(cp: {global_output.component_name}, unit: {global_output.unit}) "
-                                f"do not have the same unit!"
-                            )  #
-                    else:
+            # Look up the ComponentOutput that matches the ComponentInput, unconnected inputs have no source
+            global_output: Optional[cp.ComponentOutput] = None
+            if cinput.src_object_name is not None and cinput.src_field_name is not None:
+                global_output = output_registry.get_output(cinput.src_object_name, cinput.src_field_name)
+            if global_output is not None:
+                # Check if ComponentOutput and ComponentInput have the same units
+                if cinput.unit != global_output.unit:
+                    # Check the use of "Units.Any"
+                    if (cinput.unit == lt.Units.ANY and global_output.unit != lt.Units.ANY) or (
+                        cinput.unit != lt.Units.ANY and global_output.unit == lt.Units.ANY
+                    ):
+                        log.warning(
+                            f"The input {cinput.field_name} (cp: {cinput.component_name}, unit: {cinput.unit}) "
+                            f"and output {global_output.field_name}(cp: {global_output.component_name}, unit: {global_output.unit}) "
+                            f"might not have compatible units."
+                        )  #
                         # Connect, i.e, save ComponentOutput in ComponentInput
                         cinput.source_output = global_output
-                        log.debug(f"connected input {cinput.fullname} to {global_output.full_name}")
+                        log.debug("Connected input '" + cinput.fullname + "' to '" + global_output.full_name + "'")
+                    else:
+                        raise ValueError(
+                            f"The input {cinput.field_name} (cp: {cinput.component_name}, unit: {cinput.unit}) and "
+                            f"output {global_output.field_name}(cp: {global_output.component_name}, unit: {global_output.unit}) "
+                            f"do not have the same unit!"
+                        )  #
+                else:
+                    # Connect, i.e, save ComponentOutput in ComponentInput
+                    cinput.source_output = global_output
+                    log.debug(f"connected input {cinput.fullname} to {global_output.full_name}")
+
+            if cinput.source_output is not None:
+                source_output_indices.append(cinput.source_output.global_index)
 
             # Check if there are inputs that have been not connected
             if cinput.is_mandatory and cinput.source_output is None:
@@ -187,6 +212,7 @@ class ComponentWrapper:
                         f"The ComponentInput {cinput.field_name} (cp: {cinput.component_name}, "
                         f"unit: {cinput.unit}) is not connected to any ComponentOutput. "
                         "You could run debug mode (logging_level=4) to check all inputs, outputs and connections. "
-                        f"Likely, no match was found between {cinput.src_object_name} and {[a.component_name for a in all_outputs]} & "
-                        f"and between {cinput.src_field_name} and {[a.field_name for a in all_outputs]}."
+                        f"Likely, no match was found between {cinput.src_object_name} and {[a.component_name for a in output_registry.outputs]} & "
+                        f"and between {cinput.src_field_name} and {[a.field_name for a in output_registry.outputs]}."
                     )  #
+        self.source_output_indices = np.array(sorted(set(source_output_indices)), dtype=np.intp)
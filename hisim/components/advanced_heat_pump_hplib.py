@@ -3,15 +3,14 @@
 See library on https://github.com/FZJ-IEK3-VSA/hplib/tree/main/hplib
 """
 
-import hashlib
 
 # clean
 import importlib
 from dataclasses import dataclass
-from typing import Any, List, Optional, Dict
+from typing import Any, List, Optional
 
+import numpy as np
 import pandas as pd
-from dataclass_wizard import JSONWizard
 from dataclasses_json import dataclass_json
 from hplib import hplib as hpl
 
@@ -27,7 +26,7 @@ from hisim.component import (
     CapexCostDataClass,
     DisplayConfig,
 )
-from hisim.components import weather, simple_water_storage, heat_distribution_system
+from hisim.components import weather, simple_water_storage, heat_distribution_system, hplib_result_cache
 from hisim.components.heat_distribution_system import HeatDistributionSystemType
 from hisim.loadtypes import LoadTypes, Units, InandOutputType, OutputPostprocessingRules, ComponentType
 from hisim.units import (
@@ -44,6 +43,7 @@ from hisim.postprocessing.cost_and_emission_computation.capex_computation import
 from hisim.components.configuration import EmissionFactorsAndCostsForFuelsConfig
 from hisim.simulationparameters import SimulationParameters
 from hisim.postprocessing.kpi_computation.kpi_structure import KpiEntry, KpiHelperClass, KpiTagEnumClass
+from hisim.postprocessing.kpi_computation.kpi_accumulators import KpiAccumulator, KpiAccumulatorKind, KpiAccumulators
 
 __authors__ = "Tjarko Tjaden, Hauke Hoops, Kai Rösken"
 __copyright__ = "Copyright 2021, the House Infrastructure Project"
@@ -210,9 +210,6 @@ class HeatPumpHplib(Component):
             my_config=config,
             my_display_config=my_display_config,
         )
-        # caching for hplib simulation
-        self.calculation_cache: Dict = {}
-
         self.model = config.model
 
         self.group_id = config.group_id
@@ -244,6 +241,10 @@ class HeatPumpHplib(Component):
         # Load parameters from heat pump database
         self.parameters = hpl.get_parameters(self.model, self.group_id, self.t_in, self.t_out_val, self.p_th_set)
 
+        # caching for hplib simulation, shared by all heat pumps with the same parameters
+        self.parameter_key = hplib_result_cache.get_parameter_key(self.parameters)
+        self.calculation_cache = hplib_result_cache.get_shared_hplib_result_cache(self.parameter_key)
+
         # Define component inputs
         self.on_off_switch: ComponentInput = self.add_input(
             object_name=self.component_name,
@@ -399,6 +400,7 @@ class HeatPumpHplib(Component):
             unit=Units.SECONDS,
             output_description="Time turned off",
         )
+        self.heat_pump_cycles_accumulator: Optional[KpiAccumulator] = None
 
         self.add_default_connections(self.get_default_connections_from_heat_pump_controller())
         self.add_default_connections(self.get_default_connections_from_weather())
@@ -469,7 +471,19 @@ class HeatPumpHplib(Component):
 
     def i_prepare_simulation(self) -> None:
         """Prepare simulation."""
-        pass
+        if self.my_simulation_parameters.persist_hplib_results:
+            self.calculation_cache.load(self.get_hplib_result_cache_filepath())
+
+    def i_finish_simulation(self) -> None:
+        """Save the hplib results of this run for later simulations."""
+        if self.my_simulation_parameters.persist_hplib_results:
+            self.calculation_cache.save(self.get_hplib_result_cache_filepath())
+
+    def get_hplib_result_cache_filepath(self) -> str:
+        """Get the file that the hplib results of this heat pump model are saved to."""
+        return hplib_result_cache.get_hplib_result_cache_filepath(
+            self.my_simulation_parameters.cache_dir_path, self.parameter_key
+        )
 
     def i_simulate(self, timestep: int, stsv: SingleTimeStepValues, force_convergence: bool) -> None:
         """Simulate the component."""
@@ -672,19 +686,15 @@ class HeatPumpHplib(Component):
         t_in_secondary = round(t_in_secondary, 1)
         t_amb = round(t_amb, 1)
 
-        my_data_class = CalculationRequest(
-            t_in_primary=t_in_primary, t_in_secondary=t_in_secondary, t_amb=t_amb, mode=mode,
+        calculation_cache = self.calculation_cache
+        if parameters is not self.parameters:
+            calculation_cache = hplib_result_cache.get_shared_hplib_result_cache(
+                hplib_result_cache.get_parameter_key(parameters)
+            )
+        results = calculation_cache.get_or_calculate(
+            (t_in_primary, t_in_secondary, t_amb, mode),
+            lambda: hpl.simulate(t_in_primary, t_in_secondary, parameters, t_amb, mode=mode),
         )
-        my_json_key = my_data_class.get_key()
-        my_hash_key = hashlib.sha256(my_json_key.encode("utf-8")).hexdigest()
-
-        if my_hash_key in self.calculation_cache:
-            results = self.calculation_cache[my_hash_key]
-
-        else:
-            results = hpl.simulate(t_in_primary, t_in_secondary, parameters, t_amb, mode=mode)
-
-            self.calculation_cache[my_hash_key] = results
 
         return results
 
@@ -862,18 +872,22 @@ class HeatPumpHplib(Component):
 
         return list_of_kpi_entries
 
+    def register_kpi_accumulators(self, kpi_accumulators: KpiAccumulators) -> None:
+        """Count the heat pump cycles while the simulation runs."""
+        self.heat_pump_cycles_accumulator = kpi_accumulators.add(KpiAccumulatorKind.CYCLES, self.time_off)
+
     # make kpi entries and append to list
     def get_heatpump_cycles(self, output: Any, index: int, postprocessing_results: pd.DataFrame) -> float:
-        """Get the number of cycles of the heat pump for the simulated period."""
+        """Get the number of cycles of the heat pump for the simulated period.
+
+        A cycle ends when the off time is reset to zero after the heat pump was off.
+        """
         number_of_cycles = 0
         if output.field_name == self.TimeOff:
-            for time_index, off_time in enumerate(postprocessing_results.iloc[:, index].values):
-                try:
-                    if off_time != 0 and postprocessing_results.iloc[:, index].values[time_index + 1] == 0:
-                        number_of_cycles = number_of_cycles + 1
-
-                except Exception:
-                    pass
+            if self.heat_pump_cycles_accumulator is not None and self.heat_pump_cycles_accumulator.value is not None:
+                return int(self.heat_pump_cycles_accumulator.value)
+            off_times = postprocessing_results.iloc[:, index].values
+            number_of_cycles = int(np.count_nonzero((off_times[:-1] != 0) & (off_times[1:] == 0)))
 
         return number_of_cycles
 
@@ -1326,18 +1340,3 @@ class HeatPumpHplibController(Component):
     ) -> List[KpiEntry]:
         """Calculates KPIs for the respective component and return all KPI entries as list."""
         return []
-
-
-@dataclass
-class CalculationRequest(JSONWizard):
-    """Class for caching hplib parameters so that hplib.simulate does not need to run so often."""
-
-    t_in_primary: float
-    t_in_secondary: float
-    t_amb: float
-    mode: int
-
-    def get_key(self):
-        """Get key of class with important parameters."""
-
-        return str(self.t_in_primary) + " " + str(self.t_in_secondary) + " " + str(self.t_amb) + " " + str(self.mode)
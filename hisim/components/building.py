@@ -45,7 +45,7 @@ import importlib
 import math
 from dataclasses import dataclass
 from functools import lru_cache
-from typing import Any, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
 import pvlib
@@ -53,13 +53,14 @@ from dataclasses_json import dataclass_json
 
 from hisim import component as cp
 from hisim import loadtypes as lt
-from hisim import log, utils
+from hisim import columnar_cache, log, utils
 from hisim.components.loadprofilegenerator_utsp_connector import UtspLpgConnector
 from hisim.components.weather import Weather
 from hisim.loadtypes import OutputPostprocessingRules
 from hisim.sim_repository_singleton import SingletonDictKeyEnum, SingletonSimRepository
 from hisim.simulationparameters import SimulationParameters
 from hisim.postprocessing.kpi_computation.kpi_structure import KpiEntry, KpiTagEnumClass, KpiHelperClass
+from hisim.postprocessing.kpi_computation.kpi_accumulators import KpiAccumulator, KpiAccumulatorKind, KpiAccumulators
 
 __authors__ = "Vitor Hugo Bellotto Zago"
 __copyright__ = "Copyright 2021, the House Infrastructure Project"
@@ -292,6 +293,8 @@ class Building(cp.Component):
         self.set_heating_temperature_in_celsius = self.buildingconfig.set_heating_temperature_in_celsius
         self.set_cooling_temperature_in_celsius = self.buildingconfig.set_cooling_temperature_in_celsius
         self.window_open: int = 0
+        # running indoor air temperature KPIs, set in register_kpi_accumulators
+        self.indoor_air_temperature_accumulators: Dict[KpiAccumulatorKind, KpiAccumulator] = {}
 
         (
             self.is_in_cache,
@@ -892,12 +895,7 @@ class Building(cp.Component):
                     self.cache,
                     columns=["solar_gain_through_windows"],
                 )
-                database.to_csv(
-                    self.cache_file_path,
-                    sep=",",
-                    decimal=".",
-                    index=False,
-                )
+                columnar_cache.save_columnar_cache(self.cache_file_path, database)
 
     # =================================================================================================================================
 
@@ -981,6 +979,22 @@ class Building(cp.Component):
                 entry=phi_ia_forecast,
             )
 
+    def i_prepare_next_period(
+        self,
+    ) -> None:
+        """Read the solar gains of the next period and keep the thermal state of the building."""
+        (
+            self.is_in_cache,
+            self.cache_file_path,
+        ) = utils.get_cache_file(
+            self.config.name,
+            self.buildingconfig,
+            self.my_simulation_parameters,
+        )
+        self.timesteps = self.my_simulation_parameters.timesteps
+        self.load_solar_heat_gain_cache()
+        self.i_prepare_simulation()
+
     def i_restore_state(
         self,
     ) -> None:
@@ -1113,18 +1127,24 @@ class Building(cp.Component):
             )
 
             total_windows_area += self.my_building_information.scaled_window_areas_in_m2[index]
+        self.load_solar_heat_gain_cache()
+
+        return windows, total_windows_area
+
+    def load_solar_heat_gain_cache(
+        self,
+    ) -> None:
+        """Read the cached solar gains through the windows of the simulated period or prepare the cache."""
         # if nothing exists, initialize the empty arrays for caching, else read stuff
         if not self.is_in_cache:  # cache_filepath is None or  (not os.path.isfile(cache_filepath)):
             self.cache = [0] * self.my_simulation_parameters.timesteps
         else:
-            self.solar_heat_gain_through_windows = pd.read_csv(
+            self.solar_heat_gain_through_windows = columnar_cache.load_columnar_cache(
                 self.cache_file_path,
                 sep=",",
                 decimal=".",
             )["solar_gain_through_windows"].tolist()
 
-        return windows, total_windows_area
-
     def __str__(
         self,
     ):
@@ -1340,6 +1360,23 @@ class Building(cp.Component):
         list_of_kpi_entries.append(specific_heating_demand_ref_in_watt_per_m2_entry)
         return list_of_kpi_entries
 
+    def register_kpi_accumulators(self, kpi_accumulators: KpiAccumulators) -> None:
+        """Accumulate the deviations from the set temperatures and the min and max indoor air temperature."""
+        self.indoor_air_temperature_accumulators = {
+            KpiAccumulatorKind.DEVIATION_BELOW: kpi_accumulators.add(
+                KpiAccumulatorKind.DEVIATION_BELOW,
+                self.indoor_air_temperature_channel,
+                threshold=self.set_heating_temperature_in_celsius,
+            ),
+            KpiAccumulatorKind.DEVIATION_ABOVE: kpi_accumulators.add(
+                KpiAccumulatorKind.DEVIATION_ABOVE,
+                self.indoor_air_temperature_channel,
+                threshold=self.set_cooling_temperature_in_celsius,
+            ),
+            KpiAccumulatorKind.MINIMUM: kpi_accumulators.add(KpiAccumulatorKind.MINIMUM, self.indoor_air_temperature_channel),
+            KpiAccumulatorKind.MAXIMUM: kpi_accumulators.add(KpiAccumulatorKind.MAXIMUM, self.indoor_air_temperature_channel),
+        }
+
     def get_building_temperature_deviation_from_set_temperatures(
         self, output: Any, index: int, postprocessing_results: pd.DataFrame, list_of_kpi_entries: List[KpiEntry]
     ) -> List[KpiEntry]:
@@ -1348,30 +1385,49 @@ class Building(cp.Component):
         Check for all timesteps and count the
         time when the temperature is outside of the building set temperatures
         in order to verify if energy system provides enough heating and cooling.
+        The values of the KPI accumulators are used if they were updated during the simulation.
         """
 
-        temperature_difference_of_building_being_below_heating_set_temperature = 0
-        temperature_difference_of_building_being_below_cooling_set_temperature = 0
+        temperature_difference_of_building_being_below_heating_set_temperature: float = 0.0
+        temperature_difference_of_building_being_below_cooling_set_temperature: float = 0.0
         temperature_hours_of_building_being_below_heating_set_temperature = None
         temperature_hours_of_building_being_above_cooling_set_temperature = None
         min_temperature_reached_in_celsius = None
         max_temperature_reached_in_celsius = None
         if output.field_name == self.TemperatureIndoorAir:
-            indoor_temperatures_in_celsius = postprocessing_results.iloc[:, index]
-            for temperature in indoor_temperatures_in_celsius:
-                if temperature < self.set_heating_temperature_in_celsius:
-                    temperature_difference_heating = self.set_heating_temperature_in_celsius - temperature
-
-                    temperature_difference_of_building_being_below_heating_set_temperature = (
-                        temperature_difference_of_building_being_below_heating_set_temperature
-                        + temperature_difference_heating
-                    )
-                elif temperature > self.set_cooling_temperature_in_celsius:
-                    temperature_difference_cooling = temperature - self.set_cooling_temperature_in_celsius
-                    temperature_difference_of_building_being_below_cooling_set_temperature = (
-                        temperature_difference_of_building_being_below_cooling_set_temperature
-                        + temperature_difference_cooling
-                    )
+            accumulators = self.indoor_air_temperature_accumulators
+            accumulated_values = {
+                kind: accumulator.value for kind, accumulator in accumulators.items() if accumulator.value is not None
+            }
+            if accumulators and len(accumulated_values) == len(accumulators):
+                temperature_difference_of_building_being_below_heating_set_temperature = accumulated_values[
+                    KpiAccumulatorKind.DEVIATION_BELOW
+                ]
+                temperature_difference_of_building_being_below_cooling_set_temperature = accumulated_values[
+                    KpiAccumulatorKind.DEVIATION_ABOVE
+                ]
+                min_temperature_reached_in_celsius = accumulated_values[KpiAccumulatorKind.MINIMUM]
+                max_temperature_reached_in_celsius = accumulated_values[KpiAccumulatorKind.MAXIMUM]
+            else:
+                indoor_temperatures_in_celsius = postprocessing_results.iloc[:, index]
+                for temperature in indoor_temperatures_in_celsius:
+                    if temperature < self.set_heating_temperature_in_celsius:
+                        temperature_difference_heating = self.set_heating_temperature_in_celsius - temperature
+
+                        temperature_difference_of_building_being_below_heating_set_temperature = (
+                            temperature_difference_of_building_being_below_heating_set_temperature
+                            + temperature_difference_heating
+                        )
+                    elif temperature > self.set_cooling_temperature_in_celsius:
+                        temperature_difference_cooling = temperature - self.set_cooling_temperature_in_celsius
+                        temperature_difference_of_building_being_below_cooling_set_temperature = (
+                            temperature_difference_of_building_being_below_cooling_set_temperature
+                            + temperature_difference_cooling
+                        )
+
+                # get also max and min indoor air temperature
+                min_temperature_reached_in_celsius = float(min(indoor_temperatures_in_celsius.values))
+                max_temperature_reached_in_celsius = float(max(indoor_temperatures_in_celsius.values))
 
             temperature_hours_of_building_being_below_heating_set_temperature = (
                 temperature_difference_of_building_being_below_heating_set_temperature
@@ -1385,10 +1441,6 @@ class Building(cp.Component):
                 / 3600
             )
 
-            # get also max and min indoor air temperature
-            min_temperature_reached_in_celsius = float(min(indoor_temperatures_in_celsius.values))
-            max_temperature_reached_in_celsius = float(max(indoor_temperatures_in_celsius.values))
-
             # make kpi entries and append to list
             temperature_hours_of_building_below_heating_set_temperature_entry = KpiEntry(
                 name=f"Temperature deviation of building indoor air temperature being below set temperature {self.set_heating_temperature_in_celsius} Celsius",
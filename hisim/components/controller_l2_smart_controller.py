@@ -172,6 +172,17 @@ class SmartController(Component):
         for index, _ in enumerate(self.wrapped_controllers):
             self.wrapped_controllers[index].i_restore_state()
 
+    def i_get_checkpoint_state(self) -> Dict[str, Any]:
+        """Return the saved states of the wrapped controllers."""
+        return {
+            controller.component_name: controller.i_get_checkpoint_state() for controller in self.wrapped_controllers
+        }
+
+    def i_restore_checkpoint_state(self, checkpoint_state: Dict[str, Any]) -> None:
+        """Set the saved states of the wrapped controllers."""
+        for controller in self.wrapped_controllers:
+            controller.i_restore_checkpoint_state(checkpoint_state.get(controller.component_name, {}))
+
     def i_doublecheck(self, timestep: int, stsv: SingleTimeStepValues) -> None:
         """Doublecheck."""
         pass
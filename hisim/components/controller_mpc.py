@@ -2,11 +2,12 @@
 
 # clean
 
+import copy
 import datetime
-from typing import List, Optional, Any
+from typing import Any, Dict, List, Optional
 
 # from typing import Any
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 # from statistics import mean
 import numpy as np
@@ -111,6 +112,10 @@ class MpcControllerConfig(ConfigBase):
     eer_coef: List
     predictive: bool
     prediction_horizon: Optional[int]
+    # solving the optimization problem
+    warm_start: bool = True
+    use_solver_function: bool = False
+    jit_compilation: bool = False
 
     @classmethod
     def get_default_config(
@@ -174,9 +179,32 @@ class MpcControllerConfig(ConfigBase):
             eer_coef=[0] * 2,
             predictive=True,
             prediction_horizon=0,
+            warm_start=True,
+            use_solver_function=False,
+            jit_compilation=False,
         )
 
 
+@dataclass
+class MpcOptimizationProblem:
+    """Parametric optimization problem of the MPC, built once and solved for every optimization."""
+
+    opti: Any
+    scaled_horizon: int
+    sampling_rate: int
+    variables: Dict[str, Any]
+    parameters: Dict[str, Any]
+    # casadi function that solves the problem, if the solver function is used instead of the Opti stack
+    solver_function: Optional[Any] = None
+    # solution of the previous optimization for warm starts
+    previous_solution: Dict[str, Any] = field(default_factory=dict)
+    previous_variable_assignments: Any = None
+    previous_multipliers: Any = None
+    # options of the solver, ipopt is switched to warm start once there is a previous solution
+    solver_options: Dict[str, Any] = field(default_factory=dict)
+    solver_is_warm_started: bool = False
+
+
 class MPCcontrollerState:
     """Controller state."""
 
@@ -400,6 +428,7 @@ class MpcController(cp.Component):
         self.maximum_discharging_power = self.mpcconfig.maximum_discharging_power
         self.battery_efficiency = self.mpcconfig.battery_efficiency
         self.inverter_efficiency = self.mpcconfig.inverter_efficiency
+        self.optimization_problem: Optional[MpcOptimizationProblem] = None
 
         self.temperature_forecast_24h_1min = self.mpcconfig.temperature_forecast_24h_1min
         self.phi_m_forecast_24h_1min = self.mpcconfig.phi_m_forecast_24h_1min
@@ -473,6 +502,11 @@ class MpcController(cp.Component):
             self.inverter_efficiency = SingletonSimRepository().get_entry(key=SingletonDictKeyEnum.INVERTEREFFICIENCY)
             log.information(f"self.inverter_efficiency {format(self.inverter_efficiency)}")
 
+            """ building the optimization problem once, it is solved with new forecasts in every optimization"""
+            self.optimization_problem = self.build_optimization_problem(
+                scaled_horizon=int(self.prediction_horizon / self.get_optimizer_sampling_rate())
+            )
+
     def build(self):
         """Build function: The function sets important constants and parameters for the calculations."""
         if self.mpcconfig.predictive:
@@ -664,21 +698,19 @@ class MpcController(cp.Component):
             pv_forecast_24h,
         )
 
-    @utils.measure_execution_time
-    def optimize(  # noqa: C901
-        self,
-        temperature_forecast_24h,
-        phi_ia_forecast_24h,
-        phi_st_forecast_24h,
-        phi_m_forecast_24h,
-        price_purchase_forecast_24h,
-        price_injection_forecast_24h,
-        pv_forecast_24h,
-        scaled_horizon,
-    ):
-        """MPC implementation."""
+    def get_optimizer_sampling_rate(self) -> int:
+        """Returns the number of HiSim timesteps per optimization step."""
+        if self.my_simulation_parameters.seconds_per_timestep >= 15 * 60:
+            return 1
+        return self.sampling_rate
+
+    def build_optimization_problem(self, scaled_horizon: int) -> MpcOptimizationProblem:  # noqa: C901
+        """Builds the parametric optimal control problem once for all optimizations of the simulation.
+
+        The forecasts of the disturbances, the efficiencies, the prices, the PV production and the initial states
+        are parameters, which are set before every solve. The state space model is discretized here only once.
+        """
         sampling_rate = int(self.prediction_horizon / scaled_horizon)
-        # scaled_horizon = scaled_horizon  # scaled prediction horizon
 
         # Discretization of the state space model:
         identity_matrix = np.identity(self.state_space_system_matrix_a.shape[0])  # this is an identity matrix
@@ -689,39 +721,6 @@ class MpcController(cp.Component):
             * self.state_space_system_matrix_b
         )
 
-        # numerical values of the disturbances
-        disturbance_values = ca.horzcat(
-            temperature_forecast_24h,
-            temperature_forecast_24h,
-            phi_ia_forecast_24h,
-            phi_st_forecast_24h,
-            phi_m_forecast_24h,
-        ).T
-
-        # Numerical values of cop and eer sampled (casadi fromat)
-
-        cop_timestep = []
-        eer_timestep = []
-        for k in range(int(self.prediction_horizon)):
-            cop_timestep.append(self.cop_coef[0] * self.temperature_forecast_24h_1min[k] + self.cop_coef[1])  # cop
-            eer_timestep.append(self.eer_coef[0] * self.temperature_forecast_24h_1min[k] + self.eer_coef[1])  # eer
-
-        cop_sampled = cop_timestep[0::sampling_rate]
-        eer_sampled = eer_timestep[0::sampling_rate]
-
-        cop_sampled_array: np.ndarray = np.reshape(np.array(cop_sampled), (1, len(cop_sampled)))
-        eer_sampled_array: np.ndarray = np.reshape(np.array(eer_sampled), (1, len(eer_sampled)))
-
-        # Numerical values of pv forecast (casadi fromat)
-        pv_forecast_24h = np.reshape(np.array(pv_forecast_24h), (1, len(pv_forecast_24h)))
-
-        electricity_price: np.ndarray = np.reshape(np.array(price_purchase_forecast_24h), (1, len(price_purchase_forecast_24h)))
-
-        feed_in_tariff: np.ndarray = np.reshape(
-            np.array(price_injection_forecast_24h),
-            (1, len(price_injection_forecast_24h)),
-        )
-
         # symbolic defenition of system variables:
 
         # 1. manipulated variable
@@ -774,11 +773,24 @@ class MpcController(cp.Component):
         # 4. heat flux to the node s (internal surfaces)
         # 5. heat flux to thermal mass node
         optvar_power_bought_from_grid = opti.variable(1, scaled_horizon)
+        variables = {
+            "temperature": optvar_temperature,
+            "power_thermal_delivered": optvar_power_thermal_delivered,
+            "disturbances": optvar_disturbances,
+            "power_bought_from_grid": optvar_power_bought_from_grid,
+        }
 
         if self.flexibility_element in {"PV_only", "PV_and_Battery"}:
             optvar_power_pv = opti.variable(1, scaled_horizon)
             optvar_power_sold_to_grid = opti.variable(1, scaled_horizon)
             optvar_power_pv_generation_forecasted = opti.variable(1, scaled_horizon)
+            variables.update(
+                {
+                    "power_pv": optvar_power_pv,
+                    "power_sold_to_grid": optvar_power_sold_to_grid,
+                    "power_pv_generation_forecasted": optvar_power_pv_generation_forecasted,
+                }
+            )
 
         if self.flexibility_element == "PV_and_Battery":
             optvar_battery_soc = opti.variable(1, scaled_horizon + 1)
@@ -786,6 +798,14 @@ class MpcController(cp.Component):
             optvar_battery_power_discharging = opti.variable(1, scaled_horizon)
             optvar_battery_power_flow = opti.variable(1, scaled_horizon)
             # flow=opti.variable(1,N)
+            variables.update(
+                {
+                    "battery_soc": optvar_battery_soc,
+                    "battery_power_charging": optvar_battery_power_charging,
+                    "battery_power_discharging": optvar_battery_power_discharging,
+                    "battery_power_flow": optvar_battery_power_flow,
+                }
+            )
 
         initial_temperature_state = opti.parameter(1, 1)
         # u_init=opti.parameter(1,1)
@@ -794,12 +814,24 @@ class MpcController(cp.Component):
             1, scaled_horizon
         )  # coefiiecient of performance: heating air conditioner efficiency
         eer_values = opti.parameter(1, scaled_horizon)  # energy efficiency ratio: cooling air conditioner efficiency
+        electricity_price = opti.parameter(1, scaled_horizon)
+        feed_in_tariff = opti.parameter(1, scaled_horizon)
+        parameters = {
+            "initial_temperature_state": initial_temperature_state,
+            "disturbance_forecast": disturbance_forecast,
+            "cop_values": cop_values,
+            "eer_values": eer_values,
+            "electricity_price": electricity_price,
+            "feed_in_tariff": feed_in_tariff,
+        }
 
         if self.flexibility_element in {"PV_only", "PV_and_Battery"}:
             pv_production = opti.parameter(1, scaled_horizon)
+            parameters["pv_production"] = pv_production
 
         if self.flexibility_element == "PV_and_Battery":
             soc_init = opti.parameter(1, 1)
+            parameters["soc_init"] = soc_init
 
         # Cost Function
 
@@ -969,7 +1001,9 @@ class MpcController(cp.Component):
 
         This's  reduced to 0.5 sec with { HiSim time_step = 60 sec and sampling rate = 15 }
         or { HiSim time_step = 60*20 sec and sampling rate = 1 } and 'ma27' solver and even less with sampling
-        rate of 20 min.
+        rate of 20 min. Since the problem is built only once and every solve starts from the previous solution
+        ('warm_start'), the solver needs fewer iterations in the following optimizations. With 'use_solver_function'
+        the problem is wrapped into a casadi function, which 'jit_compilation' compiles to machine code once.
 
         Also it is not guarnteed that a one year simulation will work for all systems with the default solver.
 
@@ -977,7 +1011,7 @@ class MpcController(cp.Component):
         ONLY.
         """
 
-        sol_opts = {
+        sol_opts: Dict[str, Any] = {
             "ipopt": {
                 "max_iter": 500,
                 # "max_iter": 2000,
@@ -993,29 +1027,134 @@ class MpcController(cp.Component):
             },
             "print_time": False,
         }
+        if self.mpcconfig.jit_compilation:
+            # compile the expressions and derivatives of the problem with the C compiler of the system
+            sol_opts.update({"jit": True, "compiler": "shell", "jit_options": {"flags": ["-O2"]}})
         opti.solver("ipopt", sol_opts)
 
-        # numerical values of the parameter
+        solver_function = None
+        if self.mpcconfig.use_solver_function:
+            # the variables are inputs as initial guesses and outputs as solution, which allows warm starts
+            solver_function = opti.to_function(
+                "mpc_solver",
+                list(parameters.values()) + list(variables.values()),
+                list(variables.values()),
+                list(parameters.keys()) + [name + "_initial" for name in variables],
+                list(variables.keys()),
+            )
+        log.information(
+            f"Built the MPC optimization problem with {scaled_horizon} optimization steps "
+            f"and a sampling rate of {sampling_rate}."
+        )
+        return MpcOptimizationProblem(
+            opti=opti,
+            scaled_horizon=scaled_horizon,
+            sampling_rate=sampling_rate,
+            variables=variables,
+            parameters=parameters,
+            solver_function=solver_function,
+            solver_options=sol_opts,
+        )
+
+    def solve_optimization_problem(
+        self, problem: MpcOptimizationProblem, parameter_values: Dict[str, Any]
+    ) -> Dict[str, np.ndarray]:
+        """Solves the optimization problem for the parameter values and returns the values of all variables.
+
+        With warm starts, the solution of the previous optimization is the initial guess. Once there is a previous
+        solution, ipopt also starts from its multipliers ('warm_start_init_point'), which the first solve must not do.
+        """
+        warm_start = self.mpcconfig.warm_start and bool(problem.previous_solution)
+        if problem.solver_function is not None:
+            initial_guesses = [problem.previous_solution[name] if warm_start else 0 for name in problem.variables]
+            solution = problem.solver_function(*[parameter_values[name] for name in problem.parameters], *initial_guesses)
+            problem.previous_solution = dict(zip(problem.variables, solution))
+        else:
+            opti = problem.opti
+            for name, parameter in problem.parameters.items():
+                opti.set_value(parameter, parameter_values[name])
+            if warm_start:
+                if not problem.solver_is_warm_started:
+                    warm_start_options = copy.deepcopy(problem.solver_options)
+                    warm_start_options["ipopt"]["warm_start_init_point"] = "yes"
+                    opti.solver("ipopt", warm_start_options)
+                    problem.solver_is_warm_started = True
+                opti.set_initial(problem.previous_variable_assignments)
+                opti.set_initial(opti.lam_g, problem.previous_multipliers)
+            sol = opti.solve()
+            # opti.debug.value
+            problem.previous_solution = {name: sol.value(variable) for name, variable in problem.variables.items()}
+            problem.previous_variable_assignments = sol.value_variables()
+            problem.previous_multipliers = sol.value(opti.lam_g)
+        return {name: np.array(value).flatten() for name, value in problem.previous_solution.items()}
+
+    @utils.measure_execution_time
+    def optimize(  # noqa: C901
+        self,
+        temperature_forecast_24h,
+        phi_ia_forecast_24h,
+        phi_st_forecast_24h,
+        phi_m_forecast_24h,
+        price_purchase_forecast_24h,
+        price_injection_forecast_24h,
+        pv_forecast_24h,
+        scaled_horizon,
+    ):
+        """MPC implementation."""
+        problem = self.optimization_problem
+        if problem is None or problem.scaled_horizon != scaled_horizon:
+            problem = self.build_optimization_problem(scaled_horizon)
+            self.optimization_problem = problem
+        sampling_rate = problem.sampling_rate
+        identity_matrix = np.identity(self.state_space_system_matrix_a.shape[0])  # this is an identity matrix
 
-        opti.set_value(initial_temperature_state, self.state.temperature_mean)
-        opti.set_value(disturbance_forecast, disturbance_values)
-        opti.set_value(cop_values, cop_sampled_array)
-        opti.set_value(eer_values, eer_sampled_array)
+        # numerical values of the disturbances
+        disturbance_values = ca.horzcat(
+            temperature_forecast_24h,
+            temperature_forecast_24h,
+            phi_ia_forecast_24h,
+            phi_st_forecast_24h,
+            phi_m_forecast_24h,
+        ).T
+
+        # Numerical values of cop and eer sampled (casadi fromat)
+
+        cop_timestep = []
+        eer_timestep = []
+        for k in range(int(self.prediction_horizon)):
+            cop_timestep.append(self.cop_coef[0] * self.temperature_forecast_24h_1min[k] + self.cop_coef[1])  # cop
+            eer_timestep.append(self.eer_coef[0] * self.temperature_forecast_24h_1min[k] + self.eer_coef[1])  # eer
+
+        cop_sampled = cop_timestep[0::sampling_rate]
+        eer_sampled = eer_timestep[0::sampling_rate]
+
+        cop_sampled_array: np.ndarray = np.reshape(np.array(cop_sampled), (1, len(cop_sampled)))
+        eer_sampled_array: np.ndarray = np.reshape(np.array(eer_sampled), (1, len(eer_sampled)))
+
+        # numerical values of the parameter
+        parameter_values: Dict[str, Any] = {
+            "initial_temperature_state": self.state.temperature_mean,
+            "disturbance_forecast": disturbance_values,
+            "cop_values": cop_sampled_array,
+            "eer_values": eer_sampled_array,
+            "electricity_price": np.reshape(np.array(price_purchase_forecast_24h), (1, len(price_purchase_forecast_24h))),
+            "feed_in_tariff": np.reshape(np.array(price_injection_forecast_24h), (1, len(price_injection_forecast_24h))),
+        }
 
         if self.flexibility_element in {"PV_only", "PV_and_Battery"}:
-            opti.set_value(pv_production, pv_forecast_24h)
+            # Numerical values of pv forecast (casadi fromat)
+            parameter_values["pv_production"] = np.reshape(np.array(pv_forecast_24h), (1, len(pv_forecast_24h)))
 
         if self.flexibility_element == "PV_and_Battery":
-            opti.set_value(soc_init, self.state.soc)
+            parameter_values["soc_init"] = self.state.soc
 
         print("Starting solve", datetime.datetime.now())
-        sol = opti.solve()
-        # opti.debug.value
+        solution = self.solve_optimization_problem(problem, parameter_values)
 
         # solution optimize resolution
         # t_m_opt=sol.value(x)
-        p_th_opt = sol.value(optvar_power_thermal_delivered)
-        grid_import = sol.value(optvar_power_bought_from_grid)
+        p_th_opt = solution["power_thermal_delivered"]
+        grid_import = solution["power_bought_from_grid"]
 
         # solution for actual HiSim timestep
         p_th_opt_timstep = np.repeat(p_th_opt, sampling_rate).tolist()
@@ -1042,8 +1181,8 @@ class MpcController(cp.Component):
 
         if self.flexibility_element in {"PV_only", "PV_and_Battery"}:
             # solution optimize resolution
-            pv_consumption = sol.value(optvar_power_pv)
-            grid_export = sol.value(optvar_power_sold_to_grid)
+            pv_consumption = solution["power_pv"]
+            grid_export = solution["power_sold_to_grid"]
 
             # solution for actual HiSim timestep
             pv_consumption_timestep = np.repeat(pv_consumption, sampling_rate).tolist()
@@ -1059,11 +1198,11 @@ class MpcController(cp.Component):
 
         if self.flexibility_element == "PV_and_Battery":
             # solution optimize resolution
-            battery_to_load = sol.value(optvar_battery_power_discharging)
-            pv_to_battery = sol.value(optvar_battery_power_charging)
-            optvar_battery_power_flow = sol.value(optvar_battery_power_flow)
-            batt_soc_actual = sol.value(optvar_battery_soc)
-            batt_soc_normalized = sol.value(optvar_battery_soc) / self.maximum_storage_capacity
+            battery_to_load = solution["battery_power_discharging"]
+            pv_to_battery = solution["battery_power_charging"]
+            battery_power_flow = solution["battery_power_flow"]
+            batt_soc_actual = solution["battery_soc"]
+            batt_soc_normalized = solution["battery_soc"] / self.maximum_storage_capacity
             if self.mpc_scheme == "optimization_once_aday_only":
                 self.state.soc = batt_soc_actual[-1]
                 if self.state.soc < 0.2 * self.maximum_storage_capacity:
@@ -1076,7 +1215,7 @@ class MpcController(cp.Component):
             pv_to_battery_timestep = np.repeat(pv_to_battery, sampling_rate).tolist()
             batt_soc_actual_timestep = np.repeat(batt_soc_actual, sampling_rate).tolist()
             batt_soc_normalized_timestep = np.repeat(batt_soc_normalized, sampling_rate).tolist()
-            battery_power_flow_timestep = np.repeat(optvar_battery_power_flow, sampling_rate).tolist()
+            battery_power_flow_timestep = np.repeat(battery_power_flow, sampling_rate).tolist()
 
             # optimizer solution might lead to values like 1.5e-9 ---> these are replaces with zeros
             for i in range(self.prediction_horizon):
@@ -1176,10 +1315,7 @@ class MpcController(cp.Component):
                 self.mpc_scheme == "moving_horizon_control"
                 and timestep <= self.my_simulation_parameters.timesteps - self.prediction_horizon
             ):
-                if self.my_simulation_parameters.seconds_per_timestep >= 15 * 60:
-                    sampling_rate = 1
-                else:
-                    sampling_rate = self.sampling_rate
+                sampling_rate = self.get_optimizer_sampling_rate()
                 scaled_horizon = int(
                     self.prediction_horizon / sampling_rate
                 )  # number of points are reduced from 1440 to this value
@@ -285,7 +285,7 @@ class CSVLoader(cp.Component):
 
     def i_prepare_simulation(self) -> None:
         """Prepare the simulation."""
-        pass
+        self.set_precomputed_output_values(self.output1_channel, lambda: self.column_values * self.multiplier)
 
     def i_save_state(self) -> None:
         """Saves the state."""
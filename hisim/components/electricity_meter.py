@@ -2,7 +2,7 @@
 
 # clean
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 from dataclasses_json import dataclass_json
@@ -20,6 +20,7 @@ from hisim.dynamic_component import (
 )
 from hisim.simulationparameters import SimulationParameters
 from hisim.postprocessing.kpi_computation.kpi_structure import KpiEntry, KpiTagEnumClass, KpiHelperClass
+from hisim.postprocessing.kpi_computation.kpi_accumulators import KpiAccumulator, KpiAccumulatorKind, KpiAccumulators
 from hisim.postprocessing.cost_and_emission_computation.capex_computation import CapexComputationHelperFunctions
 
 
@@ -117,6 +118,8 @@ class ElectricityMeter(DynamicComponent):
         # Component has states
         self.state = ElectricityMeterState(cumulative_production_in_watt_hour=0, cumulative_consumption_in_watt_hour=0)
         self.previous_state = self.state.self_copy()
+        # running grid KPIs by field name and kind, set in register_kpi_accumulators
+        self.grid_kpi_accumulators: Dict[Tuple[str, KpiAccumulatorKind], KpiAccumulator] = {}
 
         # Outputs
         self.electricity_to_grid_in_watt_channel: cp.ComponentOutput = self.add_output(
@@ -707,6 +710,40 @@ class ElectricityMeter(DynamicComponent):
 
         return capex_cost_data_class
 
+    def register_kpi_accumulators(self, kpi_accumulators: KpiAccumulators) -> None:
+        """Accumulate the grid energy and the mean, max and min grid power while the simulation runs."""
+        self.grid_kpi_accumulators = {}
+        for output in (self.electricity_from_grid_channel, self.electricity_to_grid_channel):
+            self.grid_kpi_accumulators[(output.field_name, KpiAccumulatorKind.SUM)] = kpi_accumulators.add(
+                KpiAccumulatorKind.SUM, output
+            )
+        for output in (self.electricity_from_grid_in_watt_channel, self.electricity_to_grid_in_watt_channel):
+            for kind in (KpiAccumulatorKind.SUM, KpiAccumulatorKind.MAXIMUM, KpiAccumulatorKind.MINIMUM):
+                self.grid_kpi_accumulators[(output.field_name, kind)] = kpi_accumulators.add(kind, output)
+
+    def get_grid_kpis_from_accumulators(self) -> Optional[Tuple[float, float, Tuple, Tuple]]:
+        """Returns the grid energies in kWh and the mean, max and min grid powers in kW of the accumulators.
+
+        Returns None if the accumulators were not updated during the simulation.
+        """
+        if not self.grid_kpi_accumulators or any(
+            accumulator.value is None for accumulator in self.grid_kpi_accumulators.values()
+        ):
+            return None
+
+        def get_mean_max_min(field_name: str) -> Tuple[float, float, float]:
+            mean_value = self.grid_kpi_accumulators[(field_name, KpiAccumulatorKind.SUM)].get_mean()
+            max_value = self.grid_kpi_accumulators[(field_name, KpiAccumulatorKind.MAXIMUM)].value
+            min_value = self.grid_kpi_accumulators[(field_name, KpiAccumulatorKind.MINIMUM)].value
+            return (mean_value * 1e-3, max_value * 1e-3, min_value * 1e-3)  # type: ignore[operator]
+
+        return (
+            self.grid_kpi_accumulators[(self.ElectricityFromGrid, KpiAccumulatorKind.SUM)].value * 1e-3,  # type: ignore[operator]
+            self.grid_kpi_accumulators[(self.ElectricityToGrid, KpiAccumulatorKind.SUM)].value * 1e-3,  # type: ignore[operator]
+            get_mean_max_min(self.ElectricityFromGridInWatt),
+            get_mean_max_min(self.ElectricityToGridInWatt),
+        )
+
     def get_component_kpi_entries(
         self,
         all_outputs: List,
@@ -719,26 +756,35 @@ class ElectricityMeter(DynamicComponent):
         total_power_to_grid_in_watt: float
 
         list_of_kpi_entries: List[KpiEntry] = []
-        for index, output in enumerate(all_outputs):
-            if output.component_name == self.component_name and output.load_type == lt.LoadTypes.ELECTRICITY:
-                if output.field_name == self.ElectricityFromGrid:
-                    total_energy_from_grid_in_kwh = postprocessing_results.iloc[:, index].sum() * 1e-3
-                elif output.field_name == self.ElectricityToGrid:
-                    total_energy_to_grid_in_kwh = postprocessing_results.iloc[:, index].sum() * 1e-3
-                elif output.field_name == self.ElectricityFromGridInWatt:
-                    total_power_from_grid_in_watt = postprocessing_results.iloc[:, index] * 1e-3
-                elif output.field_name == self.ElectricityToGridInWatt:
-                    total_power_to_grid_in_watt = postprocessing_results.iloc[:, index] * 1e-3
-
-        (mean_total_power_from_grid_in_watt,
-        max_total_power_from_grid_in_watt,
-        min_total_power_from_grid_in_watt,
-         ) = KpiHelperClass.calc_mean_max_min_value(list_or_pandas_series=total_power_from_grid_in_watt)
-
-        (mean_total_power_to_grid_in_watt,
-        max_total_power_to_grid_in_watt,
-        min_total_power_to_grid_in_watt,
-         ) = KpiHelperClass.calc_mean_max_min_value(list_or_pandas_series=total_power_to_grid_in_watt)
+        grid_kpis = self.get_grid_kpis_from_accumulators()
+        if grid_kpis is not None:
+            (
+                total_energy_from_grid_in_kwh,
+                total_energy_to_grid_in_kwh,
+                (mean_total_power_from_grid_in_watt, max_total_power_from_grid_in_watt, min_total_power_from_grid_in_watt),
+                (mean_total_power_to_grid_in_watt, max_total_power_to_grid_in_watt, min_total_power_to_grid_in_watt),
+            ) = grid_kpis
+        else:
+            for index, output in enumerate(all_outputs):
+                if output.component_name == self.component_name and output.load_type == lt.LoadTypes.ELECTRICITY:
+                    if output.field_name == self.ElectricityFromGrid:
+                        total_energy_from_grid_in_kwh = postprocessing_results.iloc[:, index].sum() * 1e-3
+                    elif output.field_name == self.ElectricityToGrid:
+                        total_energy_to_grid_in_kwh = postprocessing_results.iloc[:, index].sum() * 1e-3
+                    elif output.field_name == self.ElectricityFromGridInWatt:
+                        total_power_from_grid_in_watt = postprocessing_results.iloc[:, index] * 1e-3
+                    elif output.field_name == self.ElectricityToGridInWatt:
+                        total_power_to_grid_in_watt = postprocessing_results.iloc[:, index] * 1e-3
+
+            (mean_total_power_from_grid_in_watt,
+            max_total_power_from_grid_in_watt,
+            min_total_power_from_grid_in_watt,
+             ) = KpiHelperClass.calc_mean_max_min_value(list_or_pandas_series=total_power_from_grid_in_watt)
+
+            (mean_total_power_to_grid_in_watt,
+            max_total_power_to_grid_in_watt,
+            min_total_power_to_grid_in_watt,
+             ) = KpiHelperClass.calc_mean_max_min_value(list_or_pandas_series=total_power_to_grid_in_watt)
 
         total_energy_from_grid_in_kwh_entry = KpiEntry(
             name="Total energy from grid",
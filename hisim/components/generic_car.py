@@ -16,7 +16,7 @@ from dataclasses_json import dataclass_json
 
 from hisim import component as cp
 from hisim import loadtypes as lt
-from hisim import utils, log
+from hisim import columnar_cache, utils, log
 from hisim.component import OpexCostDataClass, CapexCostDataClass
 from hisim.components.configuration import EmissionFactorsAndCostsForFuelsConfig
 from hisim.loadtypes import Units, ComponentType
@@ -513,7 +513,7 @@ class Car(cp.Component):
         if file_exists:
             # load from cache
             log.information("Generic car data is taken from cache.")
-            dataframe = pd.read_csv(cache_filepath, sep=",", decimal=".", encoding="cp1252")
+            dataframe = columnar_cache.load_columnar_cache(cache_filepath, sep=",", decimal=".", encoding="cp1252")
             self.car_location = dataframe["car_location"].tolist()
             self.meters_driven = dataframe["meters_driven"].tolist()
 
@@ -571,7 +571,7 @@ class Car(cp.Component):
 
             # save data in cache
             database = pd.DataFrame({"car_location": self.car_location, "meters_driven": self.meters_driven})
-            database.to_csv(cache_filepath)
+            columnar_cache.save_columnar_cache(cache_filepath, database)
             del database
 
     def resample_meters_driven(self, meters_driven: List, seconds_per_timestep: int) -> Any:
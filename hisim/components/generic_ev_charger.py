@@ -18,7 +18,7 @@ import pandas as pd
 from hisim.simulationparameters import SimulationParameters
 from hisim import component as cp
 from hisim import loadtypes as lt
-from hisim import utils
+from hisim import columnar_cache, utils
 
 
 __authors__ = "Vitor Hugo Bellotto Zago"
@@ -269,10 +269,9 @@ class VehiclePure(cp.Component):
             self.config.name, self.evconfig, self.my_simulation_parameters
         )
         if cache_file_exists:
-            self.car_in_charging_station = pd.read_csv(cache_filepath, sep=",", decimal=".")[
-                "CarInChargingStation"
-            ].tolist()
-            self.discharge = pd.read_csv(cache_filepath, sep=",", decimal=".")["Discharge"].tolist()
+            cached_columns = columnar_cache.load_columnar_cache(cache_filepath, sep=",", decimal=".")
+            self.car_in_charging_station = cached_columns["CarInChargingStation"].tolist()
+            self.discharge = cached_columns["Discharge"].tolist()
         else:
 
             def open_sql(path, table_name):
@@ -350,7 +349,7 @@ class VehiclePure(cp.Component):
 
             self.car_in_charging_station = car_in_charging_station
             self.discharge = discharge_stats
-            database.to_csv(cache_filepath)
+            columnar_cache.save_columnar_cache(cache_filepath, database)
             # utils.save_cache("Vehicle", [self.evconfig.profile_name], database)
 
     def i_save_state(self) -> None:
@@ -18,7 +18,7 @@ import enum
 import math
 import os
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -28,6 +28,7 @@ from dataclasses_json import dataclass_json
 # Owned
 from hisim import component as cp
 from hisim import loadtypes as lt
+from hisim import columnar_cache
 from hisim import log
 from hisim import utils
 from hisim.component import ConfigBase, OpexCostDataClass, CapexCostDataClass
@@ -321,8 +322,8 @@ class PVSystem(cp.Component):
         """Initialize the class."""
         self.my_simulation_parameters = my_simulation_parameters
         self.pvconfig = config
-        self.ac_power_ratios_for_all_timesteps_data: List = []
-        self.ac_power_ratios_for_all_timesteps_output: List = []
+        self.ac_power_ratios_for_all_timesteps_data: np.ndarray = np.zeros(0)
+        self.ac_power_ratios_for_all_timesteps_output: Union[List, np.ndarray] = []
         self.cache_filepath: str
         self.modules: Any
         self.inverter: Any
@@ -661,33 +662,14 @@ class PVSystem(cp.Component):
             self.ac_power_ratios_for_all_timesteps_data[timestep] = ac_power_ratio
 
             if timestep + 1 == self.data_length:
-                dict_with_results = {
-                    "output_power": self.ac_power_ratios_for_all_timesteps_data,  # noqa: E501
-                }
-
-                database = pd.DataFrame(
-                    dict_with_results,
-                    columns=[
-                        "output_power",
-                    ],
+                columnar_cache.save_columnar_cache(
+                    self.cache_filepath, {"output_power": self.ac_power_ratios_for_all_timesteps_data}
                 )
 
-                database.to_csv(self.cache_filepath, sep=",", decimal=".", index=False)
-
         if self.pvconfig.predictive_control and self.pvconfig.prediction_horizon is not None:
-            last_forecast_timestep = int(
-                timestep + self.pvconfig.prediction_horizon / self.my_simulation_parameters.seconds_per_timestep
-            )
-            if last_forecast_timestep > len(self.ac_power_ratios_for_all_timesteps_output):
-                last_forecast_timestep = len(self.ac_power_ratios_for_all_timesteps_output)
-            pvforecast = [
-                self.ac_power_ratios_for_all_timesteps_output[t] * self.pvconfig.power_in_watt
-                for t in range(timestep, last_forecast_timestep)
-            ]
-            self.simulation_repository.set_dynamic_entry(
-                component_type=lt.ComponentType.PV,
-                source_weight=self.pvconfig.source_weight,
-                entry=pvforecast,
+            # move the PV forecast, the window is only created when it is read
+            self.simulation_repository.set_forecast_start(
+                (lt.ComponentType.PV, self.pvconfig.source_weight), timestep
             )
 
             if timestep == 1:
@@ -735,6 +717,24 @@ class PVSystem(cp.Component):
         """Doublechecks."""
         pass
 
+    def i_prepare_next_period(self) -> None:
+        """Computes the PV output of the next period from the weather of that period."""
+        self.i_prepare_simulation()
+
+    def set_precomputed_ac_power_output_values(self) -> None:
+        """Declares the electricity outputs for all timesteps from the AC power ratios."""
+        self.set_precomputed_output_values(
+            self.electricity_output_channel,
+            lambda: np.asarray(self.ac_power_ratios_for_all_timesteps_output) * self.pvconfig.power_in_watt,
+        )
+        self.set_precomputed_output_values(
+            self.electricity_energy_output_channel,
+            lambda: np.asarray(self.ac_power_ratios_for_all_timesteps_output)
+            * self.pvconfig.power_in_watt
+            * self.my_simulation_parameters.seconds_per_timestep
+            / 3600,
+        )
+
     def i_prepare_simulation(self) -> None:
         """Prepares the component for the simulation."""
         file_exists, self.cache_filepath = utils.get_cache_file(
@@ -743,9 +743,9 @@ class PVSystem(cp.Component):
 
         if file_exists:
             log.information("Get PV results from cache.")
-            self.ac_power_ratios_for_all_timesteps_output = pd.read_csv(self.cache_filepath, sep=",", decimal=".")[
-                "output_power"
-            ].tolist()
+            self.ac_power_ratios_for_all_timesteps_output = columnar_cache.get_column_values(
+                columnar_cache.load_columnar_cache(self.cache_filepath, sep=",", decimal="."), "output_power"
+            )
 
             if len(self.ac_power_ratios_for_all_timesteps_output) != self.my_simulation_parameters.timesteps:
                 raise ValueError(
@@ -753,6 +753,9 @@ class PVSystem(cp.Component):
                     f"Expected {self.my_simulation_parameters.timesteps} values, "
                     f"but got {len(self.ac_power_ratios_for_all_timesteps_output)}"
                 )
+            if not self.pvconfig.predictive_control:
+                # cached results without forecasts can be written by the simulator as time series
+                self.set_precomputed_ac_power_output_values()
         else:
             if SingletonSimRepository().entry_exists(key=SingletonDictKeyEnum.LOCATION):
                 SingletonSimRepository().get_entry(key=SingletonDictKeyEnum.LOCATION)
@@ -805,50 +808,60 @@ class PVSystem(cp.Component):
                 )
                 wind_speed = SingletonSimRepository().get_entry(key=SingletonDictKeyEnum.WEATHERWINDSPEEDYEARLYFORECAST)
 
-                x_simplephotovoltaic = []
-                for i in range(self.my_simulation_parameters.timesteps):
-                    # calculate outputs
-                    if self.pvconfig.module_database == PVLibModuleAndInverterEnum.CEC_MODULE_DATABASE:
-                        simulate_fct = self.simulate_cec
-                    elif self.pvconfig.module_database == PVLibModuleAndInverterEnum.SANDIA_MODULE_DATABASE:
-                        simulate_fct = self.simulate_sandia
-                    ac_power_ratio = simulate_fct(
-                        dni_extra=dni_extra[i],
-                        dni=dni[i],
-                        dhi=dhi[i],
-                        ghi=ghi[i],
-                        azimuth=azimuth[i],
-                        apparent_zenith=apparent_zenith[i],
-                        temperature=temperature[i],
-                        wind_speed=wind_speed[i],
-                        surface_azimuth=self.pvconfig.azimuth,
-                        surface_tilt=self.pvconfig.tilt,
-                    )
-
-                    # append lists
-                    x_simplephotovoltaic.append(ac_power_ratio)
-
-                self.ac_power_ratios_for_all_timesteps_output = x_simplephotovoltaic
+                timesteps = self.my_simulation_parameters.timesteps
+                self.ac_power_ratios_for_all_timesteps_output = self.calculate_ac_power_ratios_for_all_timesteps(
+                    dni_extra=dni_extra[:timesteps],
+                    dni=dni[:timesteps],
+                    dhi=dhi[:timesteps],
+                    ghi=ghi[:timesteps],
+                    azimuth=azimuth[:timesteps],
+                    apparent_zenith=apparent_zenith[:timesteps],
+                    temperature=temperature[:timesteps],
+                    wind_speed=wind_speed[:timesteps],
+                ).tolist()
 
                 # cache predictive control results
-                dict_with_results = {
-                    "output_power": self.ac_power_ratios_for_all_timesteps_output,  # noqa: E501
-                }
-
-                database = pd.DataFrame(
-                    dict_with_results,
-                    columns=[
-                        "output_power",
-                    ],
+                columnar_cache.save_columnar_cache(
+                    self.cache_filepath, {"output_power": self.ac_power_ratios_for_all_timesteps_output}
                 )
 
-                database.to_csv(self.cache_filepath, sep=",", decimal=".", index=False)
-
             else:
-                # create empty result lists as a preparation for caching
-                # in i_simulate
+                weather_inputs = {
+                    "dni_extra": self.get_precomputed_input_values(self.dni_extra_channel),
+                    "dni": self.get_precomputed_input_values(self.dni_channel),
+                    "dhi": self.get_precomputed_input_values(self.dhi_channel),
+                    "ghi": self.get_precomputed_input_values(self.ghi_channel),
+                    "azimuth": self.get_precomputed_input_values(self.azimuth_channel),
+                    "apparent_zenith": self.get_precomputed_input_values(self.apparent_zenith_channel),
+                    "temperature": self.get_precomputed_input_values(self.t_out_channel),
+                    "wind_speed": self.get_precomputed_input_values(self.wind_speed_channel),
+                }
+                if all(values is not None for values in weather_inputs.values()):
+                    # the weather is known for the whole simulation, so all timesteps are calculated at once
+                    log.information("Calculating PV results for all timesteps.")
+                    timesteps = self.my_simulation_parameters.timesteps
+                    self.ac_power_ratios_for_all_timesteps_output = self.calculate_ac_power_ratios_for_all_timesteps(
+                        **{name: values[:timesteps] for name, values in weather_inputs.items()}  # type: ignore
+                    ).tolist()
+                    columnar_cache.save_columnar_cache(
+                        self.cache_filepath, {"output_power": self.ac_power_ratios_for_all_timesteps_output}
+                    )
+                    self.set_precomputed_ac_power_output_values()
+                else:
+                    # create empty result lists as a preparation for caching
+                    # in i_simulate
+
+                    self.ac_power_ratios_for_all_timesteps_data = np.zeros(self.my_simulation_parameters.timesteps)
 
-                self.ac_power_ratios_for_all_timesteps_data = [0] * self.my_simulation_parameters.timesteps
+        if self.pvconfig.predictive_control and self.pvconfig.prediction_horizon is not None:
+            # the PV power of all timesteps, of which the forecast windows are read as dynamic entry
+            self.simulation_repository.set_forecast_source(
+                (lt.ComponentType.PV, self.pvconfig.source_weight),
+                np.asarray(self.ac_power_ratios_for_all_timesteps_output) * self.pvconfig.power_in_watt,
+                horizon_in_timesteps=int(
+                    self.pvconfig.prediction_horizon / self.my_simulation_parameters.seconds_per_timestep
+                ),
+            )
 
         if self.pvconfig.predictive:
             pv_forecast_yearly = [
@@ -1250,6 +1263,146 @@ class PVSystem(cp.Component):
 
         return ac_power_ratio
 
+    def calculate_ac_power_ratios_for_all_timesteps(
+        self,
+        dni_extra: Any,
+        dni: Any,
+        dhi: Any,
+        ghi: Any,
+        azimuth: Any,
+        apparent_zenith: Any,
+        temperature: Any,
+        wind_speed: Any,
+        albedo: float = 0.2,
+    ) -> np.ndarray:
+        """Calculates the AC power ratio for whole weather time series at once.
+
+        This is the vectorized counterpart of simulate_cec and simulate_sandia: the same pvlib models are
+        evaluated on arrays, and timesteps without a defined result give 0 like in the single timestep methods.
+        """
+        dni_extra = np.asarray(dni_extra, dtype=np.float64)
+        dni = np.asarray(dni, dtype=np.float64)
+        dhi = np.asarray(dhi, dtype=np.float64)
+        ghi = np.asarray(ghi, dtype=np.float64)
+        azimuth = np.asarray(azimuth, dtype=np.float64)
+        apparent_zenith = np.asarray(apparent_zenith, dtype=np.float64)
+        temperature = np.asarray(temperature, dtype=np.float64)
+        wind_speed = np.asarray(wind_speed, dtype=np.float64)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            poa_irrad, airmass, aoi = self._calculate_irradiance(
+                dni_extra,
+                dni,
+                dhi,
+                ghi,
+                azimuth,
+                apparent_zenith,
+                self.pvconfig.tilt,
+                self.pvconfig.azimuth,
+                albedo,
+            )
+            if self.pvconfig.module_database == PVLibModuleAndInverterEnum.CEC_MODULE_DATABASE:
+                ac_power_ratios = self._calculate_cec_ac_power_ratios(poa_irrad, temperature, wind_speed)
+            elif self.pvconfig.module_database == PVLibModuleAndInverterEnum.SANDIA_MODULE_DATABASE:
+                ac_power_ratios = self._calculate_sandia_ac_power_ratios(
+                    poa_irrad, airmass, aoi, temperature, wind_speed
+                )
+            else:
+                raise KeyError(
+                    f"""The module database '{self.pvconfig.module_database}'
+                    is not available."""
+                )
+        return np.nan_to_num(np.asarray(ac_power_ratios, dtype=np.float64), nan=0.0)
+
+    def _calculate_cec_ac_power_ratios(
+        self, poa_irrad: Dict[str, Any], temperature: np.ndarray, wind_speed: np.ndarray
+    ) -> np.ndarray:
+        """Vectorized single-diode model, see simulate_cec."""
+        poa_global = np.asarray(poa_irrad["poa_global"], dtype=np.float64)
+        ac_power_ratios = np.zeros(len(poa_global), dtype=np.float64)
+        # If global irradiation is undefined (e.g. when dhi was 0), no power output from PV
+        is_defined = ~np.isnan(poa_global)
+        if not is_defined.any():
+            return ac_power_ratios
+
+        pvtemps = pvlib.temperature.pvsyst_cell(
+            poa_global[is_defined],
+            temperature[is_defined],
+            wind_speed[is_defined],
+            **self.temperature_model_parameters,
+        )
+        d = {k: self.module[k] for k in ["alpha_sc", "a_ref", "I_L_ref", "I_o_ref", "R_sh_ref", "R_s", "Adjust"]}
+        (
+            photocurrent,
+            saturation_current,
+            resistance_series,
+            resistance_shunt,
+            n_ns_v_th,
+        ) = pvlib.pvsystem.calcparams_cec(
+            effective_irradiance=poa_global[is_defined],
+            temp_cell=pvtemps,
+            **d,
+        )
+        mp = pvlib.pvsystem.max_power_point(
+            photocurrent,
+            saturation_current,
+            resistance_series,
+            resistance_shunt,
+            n_ns_v_th,
+            d2mutau=0,
+            NsVbi=np.inf,
+            method="brentq",
+        )
+        module_peak_load_in_watt = self.module["I_mp_ref"] * self.module["V_mp_ref"]
+        if self.pvconfig.integrate_inverter:
+            inverter_load_in_watt = np.nan_to_num(
+                np.asarray(pvlib.inverter.sandia(inverter=self.inverter, v_dc=mp["v_mp"], p_dc=mp["p_mp"])), nan=0.0
+            )
+            ac_power_ratios[is_defined] = inverter_load_in_watt / module_peak_load_in_watt
+        else:
+            ac_power_ratios[is_defined] = np.asarray(mp["p_mp"]) / module_peak_load_in_watt
+        return ac_power_ratios
+
+    def _calculate_sandia_ac_power_ratios(
+        self,
+        poa_irrad: Dict[str, Any],
+        airmass: Any,
+        aoi: Any,
+        temperature: np.ndarray,
+        wind_speed: np.ndarray,
+    ) -> np.ndarray:
+        """Vectorized Sandia PV Array Performance Model, see simulate_sandia."""
+        pvtemps = pvlib.temperature.sapm_cell(
+            poa_irrad["poa_global"],
+            temperature,
+            wind_speed,
+            **self.temperature_model_parameters,
+        )
+        sapm_irr = pvlib.pvsystem.sapm_effective_irradiance(
+            module=self.module,
+            poa_direct=poa_irrad["poa_direct"],
+            poa_diffuse=poa_irrad["poa_diffuse"],
+            airmass_absolute=airmass,
+            aoi=aoi,
+        )
+        sapm_out = pvlib.pvsystem.sapm(
+            sapm_irr,
+            module=self.module,
+            temp_cell=pvtemps,
+        )
+        module_peak_load_in_watt = self.module["Impo"] * self.module["Vmpo"]
+        if self.pvconfig.integrate_inverter:
+            inverter_load_in_watt = np.nan_to_num(
+                np.asarray(
+                    pvlib.inverter.sandia(inverter=self.inverter, v_dc=sapm_out["v_mp"], p_dc=sapm_out["p_mp"])
+                ),
+                nan=0.0,
+            )
+            ac_power_ratios: np.ndarray = inverter_load_in_watt / module_peak_load_in_watt
+        else:
+            ac_power_ratios = np.asarray(sapm_out["p_mp"]) / module_peak_load_in_watt
+        return ac_power_ratios
+
     def _calculate_irradiance(
         self,
         dni_extra: Optional[float] = None,
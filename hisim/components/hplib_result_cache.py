@@ -0,0 +1,113 @@
+"""Bounded memo for the results of hplib heat pump calculations.
+
+The hplib heat pump models are evaluated with temperatures rounded to 0.1 °C, so the same
+operating points occur again and again during a simulation. The memo stores the results in
+an LRU dictionary keyed directly on the rounded operating point. Memos for a pure hplib
+calculation can be shared by all heat pumps with the same model parameters in one process
+(and, through forking, by warm child processes), and can be saved to and loaded from the
+cache directory, so that a simulation starts with the operating points of earlier runs.
+"""
+
+# clean
+import hashlib
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import pandas as pd
+
+from hisim import log
+
+#: Default maximum number of operating points that a memo keeps.
+DEFAULT_MAXIMUM_NUMBER_OF_ENTRIES: int = 100_000
+
+_shared_result_caches: Dict[str, "HplibResultCache"] = {}
+
+
+class HplibResultCache:
+
+    """LRU memo of hplib results keyed by the rounded operating point."""
+
+    def __init__(self, maximum_number_of_entries: Optional[int] = DEFAULT_MAXIMUM_NUMBER_OF_ENTRIES) -> None:
+        """Initializes an empty memo. With ``maximum_number_of_entries=None`` the memo is not bounded."""
+        self.maximum_number_of_entries = maximum_number_of_entries
+        self.results: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.number_of_unsaved_entries: int = 0
+
+    def __len__(self) -> int:
+        """Gets the number of stored operating points."""
+        return len(self.results)
+
+    def get_or_calculate(self, key: Hashable, calculate: Callable[[], Any]) -> Any:
+        """Gets the stored results for an operating point or calculates and stores them."""
+        if key in self.results:
+            self.hits += 1
+            self.results.move_to_end(key)
+            return self.results[key]
+        self.misses += 1
+        results = calculate()
+        self.results[key] = results
+        self.number_of_unsaved_entries += 1
+        self.evict_least_recently_used_entries()
+        return results
+
+    def evict_least_recently_used_entries(self) -> None:
+        """Removes the least recently used operating points above the maximum number of entries."""
+        if self.maximum_number_of_entries is None:
+            return
+        while len(self.results) > self.maximum_number_of_entries:
+            self.results.popitem(last=False)
+
+    def load(self, filepath: str) -> None:
+        """Adds the operating points of a saved memo. Entries that are already stored are kept."""
+        if not os.path.isfile(filepath):
+            return
+        try:
+            with open(filepath, "rb") as file:
+                saved_results: Dict[Hashable, Any] = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError) as error:
+            log.warning(f"Could not read the hplib result cache {filepath}: {error}")
+            return
+        for key, results in saved_results.items():
+            if key not in self.results:
+                self.results[key] = results
+                self.results.move_to_end(key, last=False)
+        self.evict_least_recently_used_entries()
+        log.information(f"Loaded {len(saved_results)} hplib operating points from {filepath}")
+
+    def save(self, filepath: str) -> None:
+        """Saves the memo if it got new operating points. The file is replaced atomically."""
+        if self.number_of_unsaved_entries == 0 and os.path.isfile(filepath):
+            return
+        cache_directory = os.path.dirname(filepath) or "."
+        os.makedirs(cache_directory, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=cache_directory, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                pickle.dump(dict(self.results), file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, filepath)
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+        self.number_of_unsaved_entries = 0
+
+
+def get_parameter_key(parameters: pd.DataFrame) -> str:
+    """Gets a key for the model parameters of a heat pump from ``hplib.get_parameters``."""
+    return hashlib.sha256(parameters.to_json().encode("utf-8")).hexdigest()
+
+
+def get_shared_hplib_result_cache(parameter_key: str) -> HplibResultCache:
+    """Gets the memo that all heat pumps with the same model parameters share in this process."""
+    if parameter_key not in _shared_result_caches:
+        _shared_result_caches[parameter_key] = HplibResultCache()
+    return _shared_result_caches[parameter_key]
+
+
+def get_hplib_result_cache_filepath(cache_dir_path: str, parameter_key: str) -> str:
+    """Gets the file in the cache directory that the memo of one heat pump model is saved to."""
+    return os.path.join(cache_dir_path, "HplibResults_" + parameter_key + ".pkl")
@@ -4,18 +4,22 @@
 
 import datetime
 import errno
+import hashlib
 import io
 import json
+import multiprocessing
 import os
 import shutil
 import contextlib
 from ast import literal_eval
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union, Set
 import copy
 import enum
 import portalocker
+import numpy as np
 import pandas as pd
 from dataclasses_json import dataclass_json
 
@@ -42,7 +46,7 @@ from hisim.components.configuration import EmissionFactorsAndCostsForFuelsConfig
 # Owned
 from hisim import component as cp
 from hisim import loadtypes as lt
-from hisim import log, utils
+from hisim import columnar_cache, log, utils
 from hisim.components.configuration import HouseholdWarmWaterDemandConfig, PhysicsConfig
 from hisim.simulationparameters import SimulationParameters
 from hisim.component import OpexCostDataClass
@@ -52,6 +56,31 @@ from hisim.sim_repository_singleton import SingletonSimRepository, SingletonDict
 DEFAULT_WW_TEMPERATURE_INPUT = 40.45  # °C - default warm water temperature fallback
 DEFAULT_WW_MASS_INPUT = 9.3  # kg/s - default warm water mass input fallback
 
+#: Number of households that are calculated with the local LPG or loaded at the same time.
+LOCAL_LPG_WORKER_COUNT = min(4, os.cpu_count() or 1)
+
+# connector that calculates the households in the forked worker processes of the local LPG pool
+_local_lpg_connector: Optional["UtspLpgConnector"] = None
+
+
+def run_local_lpg_job(local_lpg_job: Tuple[int, JsonReference, int]) -> str:
+    """Calculates one household with the local LPG in a worker process and returns the result folder."""
+    calculation_index, household, random_seed = local_lpg_job
+    assert _local_lpg_connector is not None, "The local LPG pool was started without a connector."
+    return _local_lpg_connector.execute_local_lpg_single_household(
+        calculation_index=calculation_index, household=household, random_seed=random_seed
+    )
+
+
+def get_local_lpg_random_seed(household: JsonReference, variant: str) -> int:
+    """Returns the random seed of the household, which only depends on the household and its variant.
+
+    Duplicated households in one request get different variants and therefore different profiles. The seed does
+    not depend on the order in which the households are calculated.
+    """
+    seed_key = f"{household.Name}_{household.Guid}_{variant}".encode("utf-8")
+    return int(hashlib.sha256(seed_key).hexdigest(), 16) % (2**31 - 1)
+
 
 class LpgDataAcquisitionMode(enum.Enum):
     """Set LPG Data Acquisition Mode."""
@@ -177,6 +206,8 @@ class UtspLpgConnector(cp.Component):
             # runs in parallel (e.g. batch scenario-JSON regeneration) use distinct
             # pylpg working directories (C<index>) instead of colliding on C1.
             self.calculation_index_for_local_lpg = int(os.environ.get("HISIM_LOCAL_LPG_CALC_INDEX", "1"))
+        # result folders of the households that were calculated at once with the local LPG, by household index
+        self.local_lpg_result_folders: Dict[int, str] = {}
 
         self.build()
         # dummy value as long as there is no way to consider multiple households in one house
@@ -253,9 +284,32 @@ class UtspLpgConnector(cp.Component):
         """Empty method as component has no state."""
         pass
 
+    def i_prepare_next_period(self) -> None:
+        """Retrieves the load profiles of the next period."""
+        self.build()
+        self.i_prepare_simulation()
+
     def i_prepare_simulation(self) -> None:
         """Prepares the simulation."""
-        pass
+        if self.config.predictive_control:
+            self.simulation_repository.set_forecast_source(
+                self.Electricity_Demand_Forecast_24h,
+                self.electricity_consumption,
+                horizon_in_timesteps=24 * 3600 // self.my_simulation_parameters.seconds_per_timestep,
+            )
+            return
+        # without forecasts the profiles are only replayed, so the simulator can write them as time series
+        self.set_precomputed_output_values(self.number_of_residents_channel, self.number_of_residents)
+        self.set_precomputed_output_values(self.heating_by_residents_channel, self.heating_by_residents)
+        self.set_precomputed_output_values(self.heating_by_devices_channel, self.heating_by_devices)
+        self.set_precomputed_output_values(self.electricity_output_channel, self.electricity_consumption)
+        self.set_precomputed_output_values(
+            self.electricity_energy_output_channel,
+            lambda: np.asarray(self.electricity_consumption, dtype=np.float64)
+            * self.my_simulation_parameters.seconds_per_timestep
+            / 3600,
+        )
+        self.set_precomputed_output_values(self.water_consumption_channel, self.water_consumption)
 
     def i_doublecheck(self, timestep: int, stsv: cp.SingleTimeStepValues) -> None:
         """Gets called after the iterations are finished at each time step for potential debugging purposes."""
@@ -320,11 +374,8 @@ class UtspLpgConnector(cp.Component):
         stsv.set_output_value(self.water_consumption_channel, self.water_consumption[timestep])
 
         if self.config.predictive_control:
-            last_forecast_timestep = int(timestep + 24 * 3600 / self.my_simulation_parameters.seconds_per_timestep)
-            if last_forecast_timestep > len(self.electricity_consumption):
-                last_forecast_timestep = len(self.electricity_consumption)
-            demandforecast = self.electricity_consumption[timestep:last_forecast_timestep]
-            self.simulation_repository.set_entry(self.Electricity_Demand_Forecast_24h, demandforecast)
+            # move the demand forecast, the window is only created when it is read
+            self.simulation_repository.set_forecast_start(self.Electricity_Demand_Forecast_24h, timestep)
 
     def get_resolution(self) -> str:
         """Gets the temporal resolution of the simulation as a string in the format hh:mm:ss.
@@ -425,7 +476,8 @@ class UtspLpgConnector(cp.Component):
 
     def get_profiles_from_local_lpg(
         self,
-        lpg_households: Union[JsonReference, List[JsonReference]]
+        lpg_households: Union[JsonReference, List[JsonReference]],
+        result_folder: Optional[str] = None,
     ) -> Tuple[
         Union[str, List],
         Union[str, List],
@@ -440,12 +492,13 @@ class UtspLpgConnector(cp.Component):
     ]:
         """Requests the required load profiles from local lpg. Returns raw, unparsed result file contents.
 
+        :param result_folder: result folder of the household, if it was already calculated
         :return: a tuple of all result file contents (electricity, warm water, high bodily activity and low bodily activity),
                  and a list of filenames of all additionally saved files
         """
         if isinstance(lpg_households, JsonReference):
             (
-                result_folder,
+                lpg_result_folder,
                 electricity_file,
                 warm_water_file,
                 inner_device_heat_gains_file,
@@ -457,11 +510,12 @@ class UtspLpgConnector(cp.Component):
                 driving_distances_file,
             ) = self.calculate_one_lpg_request(
                 household=lpg_households,
+                result_folder=result_folder,
             )
 
         elif isinstance(lpg_households, List):
             (
-                result_folder,
+                lpg_result_folder,
                 electricity_file,
                 warm_water_file,
                 inner_device_heat_gains_file,
@@ -481,7 +535,7 @@ class UtspLpgConnector(cp.Component):
             )
 
         return (
-            result_folder,
+            lpg_result_folder,
             electricity_file,
             warm_water_file,
             inner_device_heat_gains_file,
@@ -620,6 +674,8 @@ class UtspLpgConnector(cp.Component):
             "driving_distances": [],
         }
         self.flexibility_data_dict: Dict = {"flexibility": []}
+        # calculate all households without cache at once, cached households are not calculated again
+        self.prepare_local_lpg_results_of_missing_households(list_of_unique_household_configs)
         # iterate over all unique utsp configs and either take cache results or calculate for each household and sum up later
         for list_index, list_item in enumerate(self.list_of_file_exists_and_cache_files):
             file_exists = list_item[0]
@@ -628,7 +684,7 @@ class UtspLpgConnector(cp.Component):
 
             # a cache file exists
             if file_exists:
-                with open(cache_filepath, "r", encoding="utf-8") as file:
+                with open(columnar_cache.get_node_local_cache_path(cache_filepath), "r", encoding="utf-8") as file:
                     cache_content: Dict = json.load(file)
                     cache_complete = True
 
@@ -764,7 +820,10 @@ class UtspLpgConnector(cp.Component):
                                     car_states_file,
                                     car_locations_file,
                                     driving_distances_file,
-                                ) = self.get_profiles_from_local_lpg(lpg_households=new_unique_config.household)
+                                ) = self.get_profiles_from_local_lpg(
+                                    lpg_households=new_unique_config.household,
+                                    result_folder=self.local_lpg_result_folders.pop(list_index, None),
+                                )
 
                             # only one result obtained
                             if isinstance(electricity_file, str):
@@ -827,34 +886,32 @@ class UtspLpgConnector(cp.Component):
                             elif isinstance(electricity_file, List):
                                 log.information(f"Multiple results obtained from {self.utsp_config.data_acquisition_mode}.")
 
-                                for index, electricity in enumerate(electricity_file):
-                                    warm_water = warm_water_file[index]
-                                    inner_device_heat_gains = inner_device_heat_gains_file[index]
-                                    high_activity = high_activity_file[index]
-                                    low_activity = low_activity_file[index]
-                                    flexibility = flexibility_file[index]
-                                    car_states = car_states_file[index]
-                                    car_locations = car_locations_file[index]
-                                    driving_distances = driving_distances_file[index]
+                                # the result files of the households are loaded at the same time, in the order of the households
+                                with ThreadPoolExecutor(max_workers=LOCAL_LPG_WORKER_COUNT) as executor:
+                                    household_results = list(
+                                        executor.map(
+                                            self.load_household_result_files,
+                                            electricity_file,
+                                            warm_water_file,
+                                            inner_device_heat_gains_file,
+                                            high_activity_file,
+                                            low_activity_file,
+                                            flexibility_file,
+                                            car_states_file,
+                                            car_locations_file,
+                                            driving_distances_file,
+                                        )
+                                    )
 
+                                for household_result in household_results:
                                     (
                                         electricity_consumption,
                                         heating_by_devices,
                                         water_consumption,
                                         heating_by_residents,
                                         number_of_residents,
-                                    ) = self.load_result_files_and_transform_to_lists(
-                                        electricity=electricity,
-                                        warm_water=warm_water,
-                                        inner_device_heat_gains=inner_device_heat_gains,
-                                        high_activity=high_activity,
-                                        low_activity=low_activity,
-                                        data_acquisition_mode=self.utsp_config.data_acquisition_mode,
-                                    )
-                                    list_of_flexibility_and_car_data = self.load_results_and_transform_string_to_data(
-                                        list_of_result_files=[flexibility, car_states, car_locations, driving_distances]
-                                    )
-
+                                        list_of_flexibility_and_car_data,
+                                    ) = household_result
                                     # write lists to dict
                                     value_dict["electricity_consumption"].append(electricity_consumption)
                                     value_dict["heating_by_devices"].append(heating_by_devices)
@@ -921,24 +978,10 @@ class UtspLpgConnector(cp.Component):
 
                         finally:
                             if result_folder is not None:
-                                folders_to_process: List[str] = []
                                 if isinstance(result_folder, list):
-                                    folders_to_process = result_folder
+                                    self.remove_local_lpg_result_folders(result_folder)
                                 elif isinstance(result_folder, str):
-                                    folders_to_process = [result_folder]
-
-                                for folder in folders_to_process:
-                                    folder_to_delete = os.path.dirname(folder)
-                                    try:
-                                        if folder_to_delete and os.path.exists(folder_to_delete):
-                                            shutil.rmtree(folder_to_delete)
-                                            log.information(
-                                                f"Folder with local lpg result '{os.path.basename(folder_to_delete)}' deleted.")
-                                        else:
-                                            log.warning(
-                                                f"Error: Folder '{folder_to_delete}' does not exist and cannot be deleted.")
-                                    except (OSError, TypeError) as e:
-                                        log.warning(f"Error during folder cleanup: {e}")
+                                    self.remove_local_lpg_result_folders([result_folder])
                             else:
                                 log.warning("LPG result folder was None; cleanup skipped.")
 
@@ -981,6 +1024,10 @@ class UtspLpgConnector(cp.Component):
                             entry=self.heating_by_residents,
                         )
 
+        # results of households that were calculated at once but not used, e.g. after a fallback
+        self.remove_local_lpg_result_folders(list(self.local_lpg_result_folders.values()))
+        self.local_lpg_result_folders = {}
+
     def get_result_lists_by_summing_over_value_dict(
         self, value_dict: Dict[Any, Any]
     ) -> Tuple[List, List, List, List, List]:
@@ -1190,9 +1237,85 @@ class UtspLpgConnector(cp.Component):
 
         return str(path_to_result_folder)
 
-    def calculate_one_lpg_request(self, household: JsonReference) -> Tuple[str, str, str, str, str, str, str, str,
-    str, str]:
-        """Calculate one lpg request."""
+    def execute_local_lpg_households(self, households: List[JsonReference], random_seeds: List[int]) -> List[str]:
+        """Calculates the households with the local LPG and returns their result folders in the order of the households.
+
+        Up to ``LOCAL_LPG_WORKER_COUNT`` households are calculated at the same time in a pool of forked processes,
+        each in its own LPG calculation directory. Without fork support, the households are calculated one after
+        the other.
+        """
+        local_lpg_jobs = [
+            (calculation_index, household, random_seed)
+            for calculation_index, (household, random_seed) in enumerate(
+                zip(households, random_seeds), start=self.calculation_index_for_local_lpg or 1
+            )
+        ]
+        worker_count = min(LOCAL_LPG_WORKER_COUNT, len(local_lpg_jobs))
+        global _local_lpg_connector  # pylint: disable=global-statement
+        _local_lpg_connector = self
+        try:
+            if worker_count <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+                return [run_local_lpg_job(local_lpg_job) for local_lpg_job in local_lpg_jobs]
+            log.information(f"Calculating {len(local_lpg_jobs)} households with {worker_count} local LPG processes.")
+            log.flush()
+            with multiprocessing.get_context("fork").Pool(processes=worker_count) as pool:
+                return pool.map(run_local_lpg_job, local_lpg_jobs, chunksize=1)
+        finally:
+            _local_lpg_connector = None
+
+    def prepare_local_lpg_results_of_missing_households(self, list_of_unique_household_configs: List) -> None:
+        """Calculates all households without cache file at once before they are processed one by one in build.
+
+        Only households whose cache file does not exist are scheduled, so cached households cost no LPG run.
+        """
+        self.local_lpg_result_folders = {}
+        # only a list of households without guid is cached household by household
+        if (
+            self.utsp_config.data_acquisition_mode != LpgDataAcquisitionMode.USE_LOCAL_LPG
+            or not isinstance(self.utsp_config.household, List)
+            or self.utsp_config.guid != ""
+        ):
+            return
+        missing_household_indices = [
+            list_index
+            for list_index, (file_exists, _) in enumerate(self.list_of_file_exists_and_cache_files)
+            if not file_exists
+        ]
+        if not missing_household_indices:
+            return
+        households = [list_of_unique_household_configs[list_index].household for list_index in missing_household_indices]
+        random_seeds = [
+            get_local_lpg_random_seed(household, list_of_unique_household_configs[list_index].guid)
+            for household, list_index in zip(households, missing_household_indices)
+        ]
+        try:
+            result_folders = self.execute_local_lpg_households(households=households, random_seeds=random_seeds)
+        except Exception as e:
+            # the households are calculated one by one in build then
+            log.warning(f"Error while calculating the households with the local LPG at once: {e}")
+            return
+        self.local_lpg_result_folders = dict(zip(missing_household_indices, result_folders))
+
+    def remove_local_lpg_result_folders(self, result_folders: List[str]) -> None:
+        """Removes the calculation directories of the local LPG results after they were loaded."""
+        for folder in result_folders:
+            folder_to_delete = os.path.dirname(folder)
+            try:
+                if folder_to_delete and os.path.exists(folder_to_delete):
+                    shutil.rmtree(folder_to_delete)
+                    log.information(f"Folder with local lpg result '{os.path.basename(folder_to_delete)}' deleted.")
+                else:
+                    log.warning(f"Error: Folder '{folder_to_delete}' does not exist and cannot be deleted.")
+            except (OSError, TypeError) as e:
+                log.warning(f"Error during folder cleanup: {e}")
+
+    def calculate_one_lpg_request(
+        self, household: JsonReference, result_folder: Optional[str] = None
+    ) -> Tuple[str, str, str, str, str, str, str, str, str, str]:
+        """Calculate one lpg request.
+
+        If the household was already calculated, the files are taken from its result folder.
+        """
 
         # define required results files
         (
@@ -1208,11 +1331,11 @@ class UtspLpgConnector(cp.Component):
             driving_distances,
         ) = self.define_required_result_files()
 
-        log.information("Requesting LPG profiles from local lpg for one household.")
-
-        result_folder = self.execute_local_lpg_single_household(calculation_index=self.calculation_index_for_local_lpg,
-                                                                household=household,
-                                                                random_seed=None)
+        if result_folder is None:
+            log.information("Requesting LPG profiles from local lpg for one household.")
+            result_folder = self.execute_local_lpg_single_household(
+                calculation_index=self.calculation_index_for_local_lpg, household=household, random_seed=None
+            )
 
         # decode required result files
         electricity_file = os.path.join(result_folder, electricity)
@@ -1276,14 +1399,12 @@ class UtspLpgConnector(cp.Component):
         ) = self.define_required_result_files()
 
         log.information("Requesting LPG profiles from local lpg for multiple household.")
-        result_folder_list = []
-        calculation_index = 1
-        for household in households:
-            result_folder = self.execute_local_lpg_single_household(calculation_index=calculation_index,
-                                                                    household=household,
-                                                                    random_seed=None)
-            calculation_index = calculation_index + 1
-            result_folder_list.append(result_folder)
+        # duplicated households get different variants, so that each of them gets its own profile
+        random_seeds = [
+            get_local_lpg_random_seed(household, str(households[:index].count(household)))
+            for index, household in enumerate(households)
+        ]
+        result_folder_list = self.execute_local_lpg_households(households=households, random_seeds=random_seeds)
 
         # append all results in lists
         electricity_file: List = []
@@ -1851,6 +1972,45 @@ class UtspLpgConnector(cp.Component):
             if os.path.exists(lock_filepath):
                 os.remove(lock_filepath)
 
+    def load_household_result_files(
+        self,
+        electricity: Any,
+        warm_water: Any,
+        inner_device_heat_gains: Any,
+        high_activity: Any,
+        low_activity: Any,
+        flexibility: str,
+        car_states: str,
+        car_locations: str,
+        driving_distances: str,
+    ) -> Tuple[List, List, List, List, List, List[Any]]:
+        """Loads the result files of one household of a request with multiple households."""
+        (
+            electricity_consumption,
+            heating_by_devices,
+            water_consumption,
+            heating_by_residents,
+            number_of_residents,
+        ) = self.load_result_files_and_transform_to_lists(
+            electricity=electricity,
+            warm_water=warm_water,
+            inner_device_heat_gains=inner_device_heat_gains,
+            high_activity=high_activity,
+            low_activity=low_activity,
+            data_acquisition_mode=self.utsp_config.data_acquisition_mode,
+        )
+        list_of_flexibility_and_car_data = self.load_results_and_transform_string_to_data(
+            list_of_result_files=[flexibility, car_states, car_locations, driving_distances]
+        )
+        return (
+            electricity_consumption,
+            heating_by_devices,
+            water_consumption,
+            heating_by_residents,
+            number_of_residents,
+            list_of_flexibility_and_car_data,
+        )
+
     def load_results_and_transform_string_to_data(self, list_of_result_files: List[str]) -> List[Any]:
         """Transform a string of data into a data."""
         list_of_data = []
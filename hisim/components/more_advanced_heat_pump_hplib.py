@@ -10,17 +10,15 @@ preparation on district heating for water/water heatpumps
 
 """
 
-import hashlib
 
 # clean
 import importlib
 from enum import IntEnum
 from dataclasses import dataclass
-from typing import Any, List, Optional, Dict, Union
+from typing import Any, List, Optional, Union
 
 import pandas as pd
 import numpy as np
-from dataclass_wizard import JSONWizard
 from dataclasses_json import dataclass_json
 from hplib import hplib as hpl
 
@@ -36,7 +34,7 @@ from hisim.component import (
     DisplayConfig,
     CapexCostDataClass,
 )
-from hisim.components import weather, simple_water_storage, heat_distribution_system
+from hisim.components import weather, simple_water_storage, heat_distribution_system, hplib_result_cache
 from hisim.components.heat_distribution_system import HeatDistributionSystemType
 from hisim.loadtypes import LoadTypes, Units, InandOutputType, OutputPostprocessingRules, ComponentType
 from hisim.components.configuration import (
@@ -46,6 +44,7 @@ from hisim.components.configuration import (
 
 from hisim.simulationparameters import SimulationParameters
 from hisim.postprocessing.kpi_computation.kpi_structure import KpiEntry, KpiHelperClass, KpiTagEnumClass
+from hisim.postprocessing.kpi_computation.kpi_accumulators import KpiAccumulator, KpiAccumulatorKind, KpiAccumulators
 from hisim.postprocessing.cost_and_emission_computation.capex_computation import CapexComputationHelperFunctions
 
 __authors__ = "Jonas Hoppe"
@@ -279,9 +278,6 @@ class MoreAdvancedHeatPumpHPLib(Component):
             my_config=config,
             my_display_config=my_display_config,
         )
-        # caching for HPLib simulation
-        self.calculation_cache: Dict = {}
-
         self.model = config.model
 
         self.group_id = config.group_id
@@ -365,6 +361,9 @@ class MoreAdvancedHeatPumpHPLib(Component):
         self.parameters = hpl.get_parameters(self.model, self.group_id, self.t_in, self.t_out_val, self.p_th_set)
         self.heatpump = hpl.HeatPump(self.parameters)
         self.heatpump.delta_t = 5
+        # caching for HPLib simulation, shared by all heat pumps with the same parameters
+        self.parameter_key = hplib_result_cache.get_parameter_key(self.parameters)
+        self.calculation_cache = hplib_result_cache.get_shared_hplib_result_cache(self.parameter_key)
 
         self.specific_heat_capacity_of_water_in_joule_per_kilogram_per_celsius = (
             PhysicsConfig.get_properties_for_energy_carrier(
@@ -582,6 +581,7 @@ class MoreAdvancedHeatPumpHPLib(Component):
             unit=Units.SECONDS,
             output_description="Time turned off",
         )
+        self.heat_pump_cycles_accumulator: Optional[KpiAccumulator] = None
 
         self.thermal_power_from_environment: ComponentOutput = self.add_output(
             object_name=self.component_name,
@@ -939,7 +939,19 @@ class MoreAdvancedHeatPumpHPLib(Component):
 
     def i_prepare_simulation(self) -> None:
         """Prepare simulation."""
-        pass
+        if self.my_simulation_parameters.persist_hplib_results:
+            self.calculation_cache.load(self.get_hplib_result_cache_filepath())
+
+    def i_finish_simulation(self) -> None:
+        """Save the HPLib results of this run for later simulations."""
+        if self.my_simulation_parameters.persist_hplib_results:
+            self.calculation_cache.save(self.get_hplib_result_cache_filepath())
+
+    def get_hplib_result_cache_filepath(self) -> str:
+        """Get the file that the HPLib results of this heat pump model are saved to."""
+        return hplib_result_cache.get_hplib_result_cache_filepath(
+            self.my_simulation_parameters.cache_dir_path, self.parameter_key
+        )
 
     def i_simulate(self, timestep: int, stsv: SingleTimeStepValues, force_convergence: bool) -> None:
         """Simulate the component."""
@@ -1508,24 +1520,13 @@ class MoreAdvancedHeatPumpHPLib(Component):
         t_in_secondary = round(t_in_secondary, 1)
         t_amb = round(t_amb, 1)
 
-        my_data_class = CalculationRequest(
-            t_in_primary=t_in_primary,
-            t_in_secondary=t_in_secondary,
-            t_amb=t_amb,
-            mode=mode,
-            operation_mode=operation_mode,
-        )
-        my_json_key = my_data_class.get_key()
-        my_hash_key = hashlib.sha256(my_json_key.encode("utf-8")).hexdigest()
-
-        if my_hash_key in self.calculation_cache:
-            results = self.calculation_cache[my_hash_key]
-        else:
-            results = self.heatpump.simulate(
+        # the results also depend on the temperature difference of the secondary side and the minimum thermal power
+        results = self.calculation_cache.get_or_calculate(
+            (t_in_primary, t_in_secondary, t_amb, mode, operation_mode, self.heatpump.delta_t, p_th_min),
+            lambda: self.heatpump.simulate(
                 t_in_primary=t_in_primary, t_in_secondary=t_in_secondary, t_amb=t_amb, mode=mode, p_th_min=p_th_min
-            )
-
-            self.calculation_cache[my_hash_key] = results
+            ),
+        )
 
         return results
 
@@ -1763,18 +1764,22 @@ class MoreAdvancedHeatPumpHPLib(Component):
 
         return list_of_kpi_entries
 
+    def register_kpi_accumulators(self, kpi_accumulators: KpiAccumulators) -> None:
+        """Count the heat pump cycles while the simulation runs."""
+        self.heat_pump_cycles_accumulator = kpi_accumulators.add(KpiAccumulatorKind.CYCLES, self.time_off)
+
     # make kpi entries and append to list
     def get_heatpump_cycles(self, output: Any, index: int, postprocessing_results: pd.DataFrame) -> float:
-        """Get the number of cycles of the heat pump for the simulated period."""
+        """Get the number of cycles of the heat pump for the simulated period.
+
+        A cycle ends when the off time is reset to zero after the heat pump was off.
+        """
         number_of_cycles = 0
         if output.field_name == self.TimeOff:
-            for time_index, off_time in enumerate(postprocessing_results.iloc[:, index].values):
-                try:
-                    if off_time != 0 and postprocessing_results.iloc[:, index].values[time_index + 1] == 0:
-                        number_of_cycles = number_of_cycles + 1
-
-                except Exception:
-                    pass
+            if self.heat_pump_cycles_accumulator is not None and self.heat_pump_cycles_accumulator.value is not None:
+                return int(self.heat_pump_cycles_accumulator.value)
+            off_times = postprocessing_results.iloc[:, index].values
+            number_of_cycles = int(np.count_nonzero((off_times[:-1] != 0) & (off_times[1:] == 0)))
 
         return number_of_cycles
 
@@ -1935,32 +1940,6 @@ class MoreAdvancedHeatPumpHPLibState:
         )
 
 
-@dataclass
-class CalculationRequest(JSONWizard):
-    """Class for caching HPLib parameters so that HPLib.simulate does not need to run so often."""
-
-    t_in_primary: float
-    t_in_secondary: float
-    t_amb: float
-    mode: int
-    operation_mode: str
-
-    def get_key(self):
-        """Get key of class with important parameters."""
-
-        return (
-            str(self.t_in_primary)
-            + " "
-            + str(self.t_in_secondary)
-            + " "
-            + str(self.t_amb)
-            + " "
-            + str(self.mode)
-            + " "
-            + str(self.operation_mode)
-        )
-
-
 @dataclass_json
 @dataclass
 class MoreAdvancedHeatPumpHPLibControllerSpaceHeatingConfig(ConfigBase):
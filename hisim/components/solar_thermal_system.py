@@ -18,7 +18,7 @@ from hisim.component import (
     SingleTimeStepValues,
     DisplayConfig,
 )
-from hisim import loadtypes, log, utils
+from hisim import columnar_cache, loadtypes, log, utils
 from hisim.components.configuration import EmissionFactorsAndCostsForFuelsConfig, PhysicsConfig
 from hisim.components.simple_water_storage import SimpleDHWStorage
 from hisim.components.weather import Weather
@@ -606,7 +606,7 @@ class SolarThermalSystem(Component):
 
         if file_exists:
             log.information("Get solar thermal results from cache.")
-            df = pd.read_csv(self.cache_filepath, sep=",", decimal=".")
+            df = columnar_cache.load_columnar_cache_as_data_frame(self.cache_filepath, sep=",", decimal=".")
             # Reconstruct list of DataFrames per timestep (if needed)
             self.precalc_data_for_all_timesteps_output = [
                 group_df.drop(columns="timestep") for _, group_df in df.groupby("timestep", sort=True)
@@ -719,7 +719,7 @@ class SolarThermalSystem(Component):
         # cache results at the end of the simulation
         self.precalc_data_for_all_timesteps_data[timestep] = precalc_data
 
-        if timestep + 1 == self.my_simulation_parameters.timesteps:
+        if timestep + 1 == self.my_simulation_parameters.timesteps and self.cache_filepath is not None:
             for i, df in enumerate(self.precalc_data_for_all_timesteps_data):
                 assert df is not None
                 df["timestep"] = i  # Add timestep column to each
@@ -727,8 +727,8 @@ class SolarThermalSystem(Component):
             # Combine all into one large DataFrame
             full_df = pd.concat(self.precalc_data_for_all_timesteps_data, ignore_index=True)
 
-            # Save directly as flat CSV
-            full_df.to_csv(self.cache_filepath, sep=",", decimal=".", index=False)
+            # Save as flat binary columns
+            columnar_cache.save_columnar_cache(self.cache_filepath, full_df)
 
 
 @dataclass
@@ -7,14 +7,14 @@ import math
 import os
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
 import pvlib
 
 from hisim import loadtypes as lt
-from hisim import log, utils
+from hisim import columnar_cache, log, utils
 from hisim.component import Component, ComponentOutput, ConfigBase, SingleTimeStepValues, DisplayConfig, OpexCostDataClass, CapexCostDataClass
 from hisim.simulationparameters import SimulationParameters
 from hisim.sim_repository_singleton import SingletonSimRepository, SingletonDictKeyEnum
@@ -592,18 +592,19 @@ class Weather(Component):
             output_description=f"here a description for {self.DailyAverageOutsideTemperatures} will follow.",
         )
 
-        self.temperature_list: List[float]
-        self.dni_list: List[float]
-        self.dniextra_list: List[float]
-        self.altitude_list: List[float]
-        self.azimuth_list: List[float]
-        self.wind_speed_list: List[float]
-        self.pressure_list: List[float]
-        self.ghi_list: List[float]
-        self.apparent_zenith_list: List[float]
-        self.dhi_list: List[float]
-        self.dry_bulb_list: List[float]
-        self.daily_average_outside_temperature_list_in_celsius: List[float]
+        # lists when calculated, read-only arrays when read from the cache
+        self.temperature_list: Union[List[float], np.ndarray]
+        self.dni_list: Union[List[float], np.ndarray]
+        self.dniextra_list: Union[List[float], np.ndarray]
+        self.altitude_list: Union[List[float], np.ndarray]
+        self.azimuth_list: Union[List[float], np.ndarray]
+        self.wind_speed_list: Union[List[float], np.ndarray]
+        self.pressure_list: Union[List[float], np.ndarray]
+        self.ghi_list: Union[List[float], np.ndarray]
+        self.apparent_zenith_list: Union[List[float], np.ndarray]
+        self.dhi_list: Union[List[float], np.ndarray]
+        self.dry_bulb_list: Union[List[float], np.ndarray]
+        self.daily_average_outside_temperature_list_in_celsius: Union[List[float], np.ndarray]
 
     def write_to_report(self):
         """Write configuration to the report."""
@@ -645,16 +646,15 @@ class Weather(Component):
             self.daily_average_outside_temperature_list_in_celsius[timestep],
         )
 
-        # set the temperature forecast
+        # move the temperature forecast, the window is only created when it is read
         if self.weather_config.predictive_control:
-            timesteps_24h = 24 * 3600 / self.my_simulation_parameters.seconds_per_timestep
-            last_forecast_timestep = int(timestep + timesteps_24h)
-            last_forecast_timestep = min(last_forecast_timestep, len(self.temperature_list))
-            # log.information( type(self.temperature))
-            temperatureforecast = self.temperature_list[timestep:last_forecast_timestep]
-            self.simulation_repository.set_entry(self.Weather_Temperature_Forecast_24h, temperatureforecast)
+            self.simulation_repository.set_forecast_start(self.Weather_Temperature_Forecast_24h, timestep)
         self.last_timestep_with_update = timestep
 
+    def i_prepare_next_period(self) -> None:
+        """Generates the weather lists of the next period."""
+        self.i_prepare_simulation()
+
     def i_prepare_simulation(self) -> None:
         """Generates the lists to be used later."""
         seconds_per_timestep = self.my_simulation_parameters.seconds_per_timestep
@@ -667,136 +667,53 @@ class Weather(Component):
         cachefound, cache_filepath = utils.get_cache_file(self.config.name, self.weather_config, self.my_simulation_parameters)
         if cachefound:
             # read cached files
-            my_weather = pd.read_csv(cache_filepath, sep=",", decimal=".", encoding="cp1252")
-            self.temperature_list = my_weather["t_out"].tolist()
-            self.daily_average_outside_temperature_list_in_celsius = my_weather["t_out_daily_average"].tolist()
+            my_weather = columnar_cache.load_columnar_cache(cache_filepath, sep=",", decimal=".", encoding="cp1252")
+            self.temperature_list = columnar_cache.get_column_values(my_weather, "t_out")
+            self.daily_average_outside_temperature_list_in_celsius = columnar_cache.get_column_values(my_weather, "t_out_daily_average")
             self.dry_bulb_list = self.temperature_list
-            self.dhi_list = my_weather["DHI"].tolist()
-            self.dni_list = my_weather["DNI"].tolist()  # self np.float64( maybe not needed? - Noah
-            self.dniextra_list = my_weather["DNIextra"].tolist()
-            self.ghi_list = my_weather["GHI"].tolist()
-            self.altitude_list = my_weather["altitude"].tolist()
-            self.azimuth_list = my_weather["azimuth"].tolist()
-            self.apparent_zenith_list = my_weather["apparent_zenith"].tolist()
-            self.wind_speed_list = my_weather["Wspd"].tolist()
+            self.dhi_list = columnar_cache.get_column_values(my_weather, "DHI")
+            self.dni_list = columnar_cache.get_column_values(my_weather, "DNI")  # self np.float64( maybe not needed? - Noah
+            self.dniextra_list = columnar_cache.get_column_values(my_weather, "DNIextra")
+            self.ghi_list = columnar_cache.get_column_values(my_weather, "GHI")
+            self.altitude_list = columnar_cache.get_column_values(my_weather, "altitude")
+            self.azimuth_list = columnar_cache.get_column_values(my_weather, "azimuth")
+            self.apparent_zenith_list = columnar_cache.get_column_values(my_weather, "apparent_zenith")
+            self.wind_speed_list = columnar_cache.get_column_values(my_weather, "Wspd")
             try:
-                self.pressure_list = my_weather["Pressure"].tolist()
+                self.pressure_list = columnar_cache.get_column_values(my_weather, "Pressure")
             except KeyError:
                 log.warning("Weather key 'Pressure' not found in cache; falling back to zeros.")
                 self.pressure_list = [0] * len(self.wind_speed_list)
         else:
-            tmy_data = read_test_reference_year_data(
-                weatherconfig=self.weather_config,
-                simulation_parameters=self.my_simulation_parameters,
-            )
-    # todo: check if this should indeed be daily resample or if another time frequency would be needed.
-            if self.weather_config.data_source == WeatherDataSourceEnum.NSRDB_15MIN:
-                dni = tmy_data["DNI"].resample("1min").asfreq().interpolate(method="linear")
-                temperature = tmy_data["T"].resample("1min").asfreq().interpolate(method="linear")
-                dhi = tmy_data["DHI"].resample("1min").asfreq().interpolate(method="linear")
-                ghi = tmy_data["GHI"].resample("1min").asfreq().interpolate(method="linear")
-                wind_speed = tmy_data["Wspd"].resample("1min").asfreq().interpolate(method="linear")
-                pressure = tmy_data["Pressure"].resample("1min").asfreq().interpolate(method="linear")
-            elif self.weather_config.data_source in (WeatherDataSourceEnum.DWD_10MIN, WeatherDataSourceEnum.DWD_15MIN):
-                dni = tmy_data["DNI"].resample("1min").asfreq().interpolate(method="linear")
-                temperature = tmy_data["T"].resample("1min").asfreq().interpolate(method="linear")
-                dhi = tmy_data["DHI"].resample("1min").asfreq().interpolate(method="linear")
-                ghi = tmy_data["GHI"].resample("1min").asfreq().interpolate(method="linear")
-                wind_speed = tmy_data["Wspd"].resample("1min").asfreq().interpolate(method="linear")
-                pressure = tmy_data["Pressure"].resample("1min").asfreq().interpolate(method="linear")
-            elif self.weather_config.data_source == WeatherDataSourceEnum.ERA5:
-                dni = tmy_data["DNI"].resample("1min").asfreq().interpolate(method="linear")
-                temperature = tmy_data["T"].resample("1min").asfreq().interpolate(method="linear")
-                dhi = tmy_data["DHI"].resample("1min").asfreq().interpolate(method="linear")
-                ghi = tmy_data["GHI"].resample("1min").asfreq().interpolate(method="linear")
-                wind_speed = tmy_data["Wspd"].resample("1min").asfreq().interpolate(method="linear")
-                pressure = tmy_data["Pressure"].resample("1min").asfreq().interpolate(method="linear")
-            else:
-                dni = self.interpolate(tmy_data["DNI"], self.my_simulation_parameters.year)
-                temperature = self.interpolate(tmy_data["T"], self.my_simulation_parameters.year)
-                dhi = self.interpolate(tmy_data["DHI"], self.my_simulation_parameters.year)
-                ghi = self.interpolate(tmy_data["GHI"], self.my_simulation_parameters.year)
-                wind_speed = self.interpolate(tmy_data["Wspd"], self.my_simulation_parameters.year)
-                pressure = self.interpolate(tmy_data["Pressure"], self.my_simulation_parameters.year)
-            # calculate extra terrestrial radiation- n eeded for perez array diffuse irradiance models
-            dni_extra = pd.Series(pvlib.irradiance.get_extra_radiation(dni.index), index=dni.index)  # type: ignore
-
-            solpos = pvlib.solarposition.get_solarposition(dni.index, location_dict["latitude"], location_dict["longitude"])  # type: ignore
-            altitude = solpos["elevation"]
-            azimuth = solpos["azimuth"]
-            apparent_zenith = solpos["apparent_zenith"]
-
-            if seconds_per_timestep != 60:
-                self.temperature_list = temperature.resample(str(seconds_per_timestep) + "s").mean().tolist()
-                self.dry_bulb_list = temperature.resample(str(seconds_per_timestep) + "s").mean().to_list()
-                self.calculate_daily_average_outside_temperature(
-                    temperaturelist=self.temperature_list,
-                    seconds_per_timestep=seconds_per_timestep,
-                )
-
-                self.dhi_list = dhi.resample(str(seconds_per_timestep) + "s").mean().tolist()
-                # np.float64( ## not sure what this is fore. python float and npfloat 64 are the same.
-                self.dni_list = dni.resample(str(seconds_per_timestep) + "s").mean().tolist()  # )  # type: ignore
-                self.dniextra_list = dni_extra.resample(str(seconds_per_timestep) + "s").mean().tolist()
-                self.ghi_list = ghi.resample(str(seconds_per_timestep) + "s").mean().tolist()
-                self.altitude_list = altitude.resample(str(seconds_per_timestep) + "s").mean().tolist()
-                self.azimuth_list = azimuth.resample(str(seconds_per_timestep) + "s").mean().tolist()
-                self.apparent_zenith_list = apparent_zenith.resample(str(seconds_per_timestep) + "s").mean().tolist()
-                self.wind_speed_list = wind_speed.resample(str(seconds_per_timestep) + "s").mean().tolist()
-                self.pressure_list = pressure.resample(str(seconds_per_timestep) + "s").mean().tolist()
-            else:
-                self.temperature_list = temperature.tolist()
-                self.dry_bulb_list = temperature.to_list()
-                self.calculate_daily_average_outside_temperature(
-                    temperaturelist=self.temperature_list,
-                    seconds_per_timestep=seconds_per_timestep,
-                )
-                self.dhi_list = dhi.tolist()
-                self.dni_list = dni.tolist()
-                self.dniextra_list = dni_extra.tolist()
-                self.ghi_list = ghi.tolist()
-                self.altitude_list = altitude.tolist()
-                self.azimuth_list = azimuth.tolist()
-                self.apparent_zenith_list = apparent_zenith.tolist()
-                self.wind_speed_list = wind_speed.resample(str(seconds_per_timestep) + "s").mean().tolist()
-                self.pressure_list = pressure.tolist()
-
-            solardata = [
-                self.dni_list,
-                self.dhi_list,
-                self.ghi_list,
-                self.temperature_list,
-                self.altitude_list,
-                self.azimuth_list,
-                self.apparent_zenith_list,
-                self.dry_bulb_list,
-                self.wind_speed_list,
-                self.pressure_list,
-                self.dniextra_list,
-                self.daily_average_outside_temperature_list_in_celsius,
-            ]
-
-            database = pd.DataFrame(
-                np.transpose(solardata),
-                columns=[
-                    "DNI",
-                    "DHI",
-                    "GHI",
-                    "t_out",
-                    "altitude",
-                    "azimuth",
-                    "apparent_zenith",
-                    "DryBulb",
-                    "Wspd",
-                    "Pressure",
-                    "DNIextra",
-                    "t_out_daily_average",
-                ],
+            one_minute_weather = self.get_one_minute_weather(location_dict)
+            self.set_weather_lists_from_one_minute_weather(one_minute_weather, seconds_per_timestep)
+
+            solardata = {
+                "DNI": self.dni_list,
+                "DHI": self.dhi_list,
+                "GHI": self.ghi_list,
+                "t_out": self.temperature_list,
+                "altitude": self.altitude_list,
+                "azimuth": self.azimuth_list,
+                "apparent_zenith": self.apparent_zenith_list,
+                "DryBulb": self.dry_bulb_list,
+                "Wspd": self.wind_speed_list,
+                "Pressure": self.pressure_list,
+                "DNIextra": self.dniextra_list,
+                "t_out_daily_average": self.daily_average_outside_temperature_list_in_celsius,
+            }
+            columnar_cache.save_columnar_cache(
+                cache_filepath,
+                {column_name: np.asarray(values, dtype=np.float64) for column_name, values in solardata.items()},
             )
-            database.to_csv(cache_filepath)
 
         # write one year forecast to simulation repository for PV processing -> if PV forecasts are needed
         if self.weather_config.predictive_control:
+            self.simulation_repository.set_forecast_source(
+                self.Weather_Temperature_Forecast_24h,
+                self.temperature_list,
+                horizon_in_timesteps=24 * 3600 // self.my_simulation_parameters.seconds_per_timestep,
+            )
             SingletonSimRepository().set_entry(
                 key=SingletonDictKeyEnum.WEATHERTEMPERATUREOUTSIDEYEARLYFORECAST,
                 entry=self.temperature_list,
@@ -837,6 +754,99 @@ class Weather(Component):
                 key=SingletonDictKeyEnum.WEATHERALTITUDEYEARLYFORECAST,
                 entry=self.altitude_list,
             )
+        else:
+            # without forecasts the weather only replays its lists and can be used as time series source
+            self.set_precomputed_output_values(self.air_temperature_output, self.temperature_list)
+            self.set_precomputed_output_values(self.dni_output, self.dni_list)
+            self.set_precomputed_output_values(self.dni_extra_output, self.dniextra_list)
+            self.set_precomputed_output_values(self.dhi_output, self.dhi_list)
+            self.set_precomputed_output_values(self.ghi_output, self.ghi_list)
+            self.set_precomputed_output_values(self.altitude_output, self.altitude_list)
+            self.set_precomputed_output_values(self.azimuth_output, self.azimuth_list)
+            self.set_precomputed_output_values(self.wind_speed_output, self.wind_speed_list)
+            self.set_precomputed_output_values(self.apparent_zenith_output, self.apparent_zenith_list)
+            self.set_precomputed_output_values(
+                self.pressure_output, lambda: np.asarray(self.pressure_list, dtype=np.float64) * 100
+            )
+            self.set_precomputed_output_values(
+                self.daily_average_outside_temperature_output,
+                self.daily_average_outside_temperature_list_in_celsius,
+            )
+
+    def get_one_minute_weather(self, location_dict: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        """Gets the weather data and the solar position of the simulated year in 1-minute resolution.
+
+        The 1-minute data does not depend on the resolution of the simulation, so it is cached once
+        per weather configuration and year. Simulations with other resolutions derive their lists
+        from this cache instead of reading the weather file and calculating the solar position again.
+        """
+        cachefound, cache_filepath = get_one_minute_weather_cache_file(self.weather_config, self.my_simulation_parameters)
+        if cachefound:
+            log.information("Deriving weather data from the 1-minute weather cache " + cache_filepath)
+            return columnar_cache.load_columnar_cache(cache_filepath)
+
+        tmy_data = read_test_reference_year_data(
+            weatherconfig=self.weather_config,
+            simulation_parameters=self.my_simulation_parameters,
+        )
+        # todo: check if this should indeed be daily resample or if another time frequency would be needed.
+        one_minute_weather: Dict[str, pd.Series] = {}
+        for column_name in ["DNI", "T", "DHI", "GHI", "Wspd", "Pressure"]:
+            if self.weather_config.data_source in (
+                WeatherDataSourceEnum.NSRDB_15MIN,
+                WeatherDataSourceEnum.DWD_10MIN,
+                WeatherDataSourceEnum.DWD_15MIN,
+                WeatherDataSourceEnum.ERA5,
+            ):
+                one_minute_weather[column_name] = tmy_data[column_name].resample("1min").asfreq().interpolate(method="linear")
+            else:
+                one_minute_weather[column_name] = self.interpolate(tmy_data[column_name], self.my_simulation_parameters.year)
+        index = one_minute_weather["DNI"].index
+        # calculate extra terrestrial radiation- n eeded for perez array diffuse irradiance models
+        one_minute_weather["DNIextra"] = pd.Series(pvlib.irradiance.get_extra_radiation(index), index=index)  # type: ignore
+
+        solpos = pvlib.solarposition.get_solarposition(index, location_dict["latitude"], location_dict["longitude"])  # type: ignore
+        one_minute_weather["altitude"] = solpos["elevation"]
+        one_minute_weather["azimuth"] = solpos["azimuth"]
+        one_minute_weather["apparent_zenith"] = solpos["apparent_zenith"]
+
+        columnar_cache.save_columnar_cache(cache_filepath, {name: series.to_numpy() for name, series in one_minute_weather.items()})
+        return {name: series.to_numpy() for name, series in one_minute_weather.items()}
+
+    def set_weather_lists_from_one_minute_weather(
+        self, one_minute_weather: Dict[str, np.ndarray], seconds_per_timestep: int
+    ) -> None:
+        """Sets the weather lists of the simulation resolution from the 1-minute weather data.
+
+        The 1-minute data starts at midnight of the first day, so averaging it over a regular
+        index gives the same timesteps as resampling the original time zone aware series.
+        """
+
+        def to_timesteps(column_name: str) -> List[float]:
+            values = pd.Series(
+                one_minute_weather[column_name],
+                index=pd.date_range("2000-01-01", periods=len(one_minute_weather[column_name]), freq="1min"),
+            )
+            if seconds_per_timestep != 60:
+                values = values.resample(str(seconds_per_timestep) + "s").mean()
+            timestep_values: List[float] = values.tolist()
+            return timestep_values
+
+        self.temperature_list = to_timesteps("T")
+        self.dry_bulb_list = list(self.temperature_list)
+        self.calculate_daily_average_outside_temperature(
+            temperaturelist=self.temperature_list,
+            seconds_per_timestep=seconds_per_timestep,
+        )
+        self.dhi_list = to_timesteps("DHI")
+        self.dni_list = to_timesteps("DNI")
+        self.dniextra_list = to_timesteps("DNIextra")
+        self.ghi_list = to_timesteps("GHI")
+        self.altitude_list = to_timesteps("altitude")
+        self.azimuth_list = to_timesteps("azimuth")
+        self.apparent_zenith_list = to_timesteps("apparent_zenith")
+        self.wind_speed_list = to_timesteps("Wspd")
+        self.pressure_list = to_timesteps("Pressure")
 
     def interpolate(self, pd_database: Any, year: int) -> Any:
         """Interpolates a time series."""
@@ -1008,6 +1018,23 @@ def get_coordinates(filepath: str, source_enum: WeatherDataSourceEnum) -> Any:
     # self.index = pd.date_range(f"{year}-01-01 00:00:00", periods=60 * 24 * 365, freq="T", tz="Europe/Berlin")
 
 
+def get_one_minute_weather_cache_file(
+    weather_config: WeatherConfig, simulation_parameters: SimulationParameters
+) -> Tuple[bool, str]:
+    """Gets the path of the 1-minute weather cache, which is shared by all resolutions of a location and year.
+
+    Unlike the other caches of :func:`hisim.utils.get_cache_file`, only the parts of the simulation parameters that
+    change the weather data are part of the key: the year and, for DWD 15-minute data that is read
+    for the simulated days only, the duration.
+    """
+    simulation_parameter_key = "###" + str(simulation_parameters.year)
+    if weather_config.data_source == WeatherDataSourceEnum.DWD_15MIN:
+        simulation_parameter_key = simulation_parameter_key + "###" + str(simulation_parameters.duration.days)
+    return utils.get_cache_file(
+        "WeatherOneMinute", weather_config, simulation_parameters, simulation_parameter_key=simulation_parameter_key
+    )
+
+
 def read_test_reference_year_data(weatherconfig: WeatherConfig, simulation_parameters: SimulationParameters) -> Any:
     """Reads a test reference year file and gets the GHI, DHI and DNI from it.
 
@@ -202,6 +202,26 @@ UNITS_USING_MEAN_AGGREGATION: frozenset[Units] = frozenset(
     }
 )
 
+#: Load types of the outputs that the KPI, OPEX and CAPEX computation reads besides the outputs
+#: with a post processing flag. Lean runs only keep the results of these outputs.
+LOAD_TYPES_FOR_KPI_COMPUTATION: frozenset[LoadTypes] = frozenset(
+    {
+        LoadTypes.ELECTRICITY,
+        LoadTypes.HEATING,
+        LoadTypes.COOLING,
+        LoadTypes.GAS,
+        LoadTypes.OIL,
+        LoadTypes.DIESEL,
+        LoadTypes.PELLETS,
+        LoadTypes.WOOD_CHIPS,
+        LoadTypes.DISTRICTHEATING,
+        LoadTypes.GREEN_HYDROGEN,
+        LoadTypes.WATER,
+        LoadTypes.WARM_WATER,
+        LoadTypes.TIME,
+    }
+)
+
 
 @enum.unique
 class OutputPostprocessingRules(str, enum.Enum):
@@ -6,11 +6,28 @@
 from __future__ import annotations
 
 # clean
+import atexit
+import os
+import threading
+import time
 from enum import IntEnum
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, TextIO, Tuple, Union
 
 LOGGING_DEFAULT_LEVEL: int = 3
 LOGGING_DEFAULT_PATH: str = r"../logs/"
+LOGGING_DEFAULT_FLUSH_INTERVAL_IN_SECONDS: float = 5.0
+LOGGING_DEFAULT_BUFFER_SIZE: int = 1000
+LOGGING_BUFFERED_ENVIRONMENT_VARIABLE: str = "HISIM_LOG_BUFFERED"
+LOGGING_QUIET_ENVIRONMENT_VARIABLE: str = "HISIM_LOG_QUIET"
+
+# A log message, or a function that creates it. Functions are only called if the message is logged.
+Message = Union[str, Callable[[], str]]
+
+
+def get_environment_flag(variable_name: str) -> bool:
+    """Check if an environment variable is set to a true value such as 1, true or yes."""
+    return os.environ.get(variable_name, "").strip().lower() in ("1", "true", "yes", "on")
 
 
 class LogPrio(IntEnum):
@@ -45,6 +62,13 @@ class Logger:
     in a kernel. Every time a simulation is started, the logger has to be set up for that
     simulation using the setup() function. Every time a simulation ends, it should be reset with
     the reset() function.
+
+    By default every message is printed and appended to the log file right away. In buffered mode
+    (configure(buffered=True) or HISIM_LOG_BUFFERED=1) the messages are collected in memory and
+    written in batches through one open file handle per log file: when the buffer is full, when the
+    flush interval has passed, when the logger is reset and at exit. An optional background writer
+    thread flushes the buffer periodically. In quiet mode (configure(quiet=True) or
+    HISIM_LOG_QUIET=1) nothing is printed to the console, which is meant for batch workers.
     """
 
     # --------------------------------------------------------------------------------------------
@@ -56,17 +80,87 @@ class Logger:
     before_result_dir_created: bool = True
     log_buffer: str = ""
     profile_buffer: str = ""
+    buffered: bool = False
+    quiet: bool = False
+    flush_interval_in_seconds: float = LOGGING_DEFAULT_FLUSH_INTERVAL_IN_SECONDS
+    buffer_size: int = LOGGING_DEFAULT_BUFFER_SIZE
+
+    def __init__(self) -> None:
+        """Initialize the buffered sink. Buffered and quiet mode can be switched on by environment variables."""
+        self.buffered = get_environment_flag(LOGGING_BUFFERED_ENVIRONMENT_VARIABLE)
+        self.quiet = get_environment_flag(LOGGING_QUIET_ENVIRONMENT_VARIABLE)
+        self.pending_messages: List[Tuple[str, str]] = []
+        self.open_files: Dict[str, TextIO] = {}
+        self.last_flush_time: float = time.monotonic()
+        self.lock = threading.RLock()
+        self.writer_thread: Optional[threading.Thread] = None
+        self.writer_stop_event = threading.Event()
 
     # --------------------------------------------------------------------------------------------
     # ----- setup functions ----------------------------------------------------------------------
     # --------------------------------------------------------------------------------------------
 
+    def configure(self, buffered: Optional[bool] = None, quiet: Optional[bool] = None,
+                  use_background_writer: Optional[bool] = None,
+                  flush_interval_in_seconds: Optional[float] = None,
+                  buffer_size: Optional[int] = None) -> None:
+        """Configure the log sink. Arguments that are None keep their current value.
+
+        Args:
+            buffered: Collect messages in memory and write them in batches.
+            quiet: Do not print messages to the console.
+            use_background_writer: Flush the buffer from a background thread every flush interval.
+                Only used in buffered mode.
+            flush_interval_in_seconds: Maximum time that a message stays in the buffer.
+            buffer_size: Number of messages after which the buffer is written.
+        """
+        if flush_interval_in_seconds is not None:
+            self.flush_interval_in_seconds = flush_interval_in_seconds
+        if buffer_size is not None:
+            self.buffer_size = buffer_size
+        if quiet is not None:
+            self.quiet = quiet
+        if buffered is not None:
+            if not buffered:
+                self.stop_background_writer()
+                self.close()
+            self.buffered = buffered
+        if use_background_writer is not None:
+            if use_background_writer and self.buffered:
+                self.start_background_writer()
+            else:
+                self.stop_background_writer()
+
+    def start_background_writer(self) -> None:
+        """Start the thread that flushes the buffer every flush interval."""
+        if self.writer_thread is not None and self.writer_thread.is_alive():
+            return
+        self.writer_stop_event = threading.Event()
+        self.writer_thread = threading.Thread(
+            target=self.run_background_writer, name="hisim-log-writer", daemon=True
+        )
+        self.writer_thread.start()
+
+    def stop_background_writer(self) -> None:
+        """Stop the background writer thread and write the remaining messages."""
+        if self.writer_thread is not None:
+            self.writer_stop_event.set()
+            self.writer_thread.join()
+            self.writer_thread = None
+        self.flush()
+
+    def run_background_writer(self) -> None:
+        """Flush the buffer every flush interval until the writer is stopped."""
+        while not self.writer_stop_event.wait(self.flush_interval_in_seconds):
+            self.flush()
+
     def setup(self, logging_path: str) -> None:
         """Create actual logging path and files and move the buffered logs there.
 
         Args:
             logging_path: The output directory. Get from simulation parameters.
         """
+        self.flush()
         # safety checks
         if not self.before_result_dir_created:
             print("WARNING! Logging seems to be already initialized.")
@@ -100,14 +194,75 @@ class Logger:
         """Resets the logger at the end of a simulation to prepare it for the next one.
 
         This is necessary because the logger gets initialized only once per kernel, when
-        log.py is first imported.
+        log.py is first imported. Buffered messages are written and the log files are closed.
         """
+        self.close()
         self.logging_path: str = LOGGING_DEFAULT_PATH
         self.logging_level: int = LOGGING_DEFAULT_LEVEL
         self.before_result_dir_created: bool = True
         self.log_buffer: str = ""
         self.profile_buffer: str = ""
 
+    def flush(self) -> None:
+        """Write all buffered messages, grouped by log file."""
+        with self.lock:
+            pending_messages, self.pending_messages = self.pending_messages, []
+            self.last_flush_time = time.monotonic()
+            lines_per_file: Dict[str, List[str]] = {}
+            for file_path, message in pending_messages:
+                lines_per_file.setdefault(file_path, []).append(message + "\n")
+            for file_path, lines in lines_per_file.items():
+                try:
+                    filestream = self.get_open_file(file_path)
+                    filestream.write("".join(lines))
+                    filestream.flush()
+                except Exception:
+                    print(f"{file_path} could not be appended. "
+                        "This might happen when too many simultaneous simulations are running.")
+
+    def close(self) -> None:
+        """Write all buffered messages and close the open log files."""
+        with self.lock:
+            self.flush()
+            for filestream in self.open_files.values():
+                try:
+                    filestream.close()
+                except Exception:
+                    pass
+            self.open_files = {}
+
+    def get_open_file(self, file_path: str) -> TextIO:
+        """Get the open handle of a log file. The directory and the file are created on first use."""
+        filestream = self.open_files.get(file_path)
+        if filestream is None:
+            Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+            filestream = open(file_path, "a", encoding="utf-8")
+            self.open_files[file_path] = filestream
+        return filestream
+
+    def after_fork_in_child(self) -> None:
+        """Reset the sink in a forked child.
+
+        The parent writes its own buffered messages, the lock may have been held by another
+        thread during the fork, and the background writer thread does not exist in the child.
+        """
+        use_background_writer = self.writer_thread is not None
+        self.lock = threading.RLock()
+        self.pending_messages = []
+        for filestream in self.open_files.values():
+            try:
+                filestream.close()
+            except Exception:
+                pass
+        self.open_files = {}
+        self.writer_thread = None
+        if use_background_writer and self.buffered:
+            self.start_background_writer()
+
+    def is_enabled(self, prio: int) -> bool:
+        """Check if messages of a priority are logged with the current logging level."""
+        return prio <= self.logging_level
+
     def file_thanos(self, filename: str) -> None:
         """Checks the size of a default logfile and halves it if it is too large."""
         file_path = str(Path(LOGGING_DEFAULT_PATH) / (filename + ".log"))
@@ -125,35 +280,52 @@ class Logger:
     # ----- logger class actual logging function -------------------------------------------------
     # --------------------------------------------------------------------------------------------
 
-    def log(self, prio: int, message: str, logging_message_path: str|None = None,
+    def log(self, prio: int, message: Message, logging_message_path: str|None = None,
             use_profile_file: bool = False) -> None:
         """Write and print a log message.
 
         If the parameter logging_message_path is not provided, the instance attribute
-        self.logging_path, which is set during the Logger setup, is used.
+        self.logging_path, which is set during the Logger setup, is used. The message can be given
+        as a function, which is only called if the priority passes the logging level.
         """
-        if logging_message_path is None:
-            logging_message_path = self.logging_path
         if prio > self.logging_level:
             return
-        if not use_profile_file:
+        if callable(message):
+            message = message()
+        if logging_message_path is None:
+            logging_message_path = self.logging_path
+        if not use_profile_file and not self.quiet:
             print(str(LogPrio.get_prio_string(prio)) + ":" + message)
-        # if logging path doesn't exist: create directory
-        if not Path(logging_message_path).exists():
-            Path(logging_message_path).mkdir(parents=True, exist_ok=True)
-        # log to file if possible
         filename = "profiling_timeuse.log" if use_profile_file else "hisim_simulation.log"
         file_path = str(Path(logging_message_path) / filename)
-        try:
-            with open(file_path, "a", encoding="utf-8") as filestream:
-                filestream.write(message + "\n")
-        except Exception:
-            print(f"{filename} could not be appended. "
-                "This might happen when too many simultaneous simulations are running.")
+        if self.buffered:
+            self.buffer_message(file_path, message)
+        else:
+            # if logging path doesn't exist: create directory
+            if not Path(logging_message_path).exists():
+                Path(logging_message_path).mkdir(parents=True, exist_ok=True)
+            # log to file if possible
+            try:
+                with open(file_path, "a", encoding="utf-8") as filestream:
+                    filestream.write(message + "\n")
+            except Exception:
+                print(f"{filename} could not be appended. "
+                    "This might happen when too many simultaneous simulations are running.")
         # if result directory and therefore actual log file not yet created: buffer logs
         if self.before_result_dir_created:
             self.log_buffer += message + "\n"
 
+    def buffer_message(self, file_path: str, message: str) -> None:
+        """Add a message to the buffer and write the buffer if it is full or the flush interval passed."""
+        with self.lock:
+            self.pending_messages.append((file_path, message))
+            flush_is_due = len(self.pending_messages) >= self.buffer_size or (
+                self.writer_thread is None
+                and time.monotonic() - self.last_flush_time >= self.flush_interval_in_seconds
+            )
+        if flush_is_due:
+            self.flush()
+
 
 # --------------------------------------------------------------------------------------------
 # ----- create the logger object and define the module-level functions -----------------------
@@ -162,44 +334,65 @@ class Logger:
 
 # this gets executed once per kernel when the module is first imported
 logger: Logger = Logger()
+atexit.register(logger.close)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=lambda: logger.after_fork_in_child())
+
+
+def configure(buffered: Optional[bool] = None, quiet: Optional[bool] = None,
+              use_background_writer: Optional[bool] = None,
+              flush_interval_in_seconds: Optional[float] = None,
+              buffer_size: Optional[int] = None) -> None:
+    """Configure buffering and console output of the logger. See Logger.configure."""
+    logger.configure(buffered, quiet, use_background_writer, flush_interval_in_seconds, buffer_size)
+
+
+def flush() -> None:
+    """Write all buffered log messages."""
+    logger.flush()
+
+
+def is_enabled(prio: int) -> bool:
+    """Check if messages of a priority are logged. Use it to skip building expensive messages."""
+    return logger.is_enabled(prio)
 
 
-def error(message: str, logging_message_path: str|None = None) -> None:
+def error(message: Message, logging_message_path: str|None = None) -> None:
     """Log an error message."""
     logger.log(LogPrio.ERROR, message, logging_message_path, False)
 
 
-def warning(message: str, logging_message_path: str|None = None) -> None:
+def warning(message: Message, logging_message_path: str|None = None) -> None:
     """Log a warning message."""
     logger.log(LogPrio.WARNING, message, logging_message_path, False)
 
 
-def information(message: str, logging_message_path: str|None = None) -> None:
+def information(message: Message, logging_message_path: str|None = None) -> None:
     """Log a information message."""
     logger.log(LogPrio.INFORMATION, message, logging_message_path, False)
 
 
-def trace(message: str, logging_message_path: str|None = None) -> None:
+def trace(message: Message, logging_message_path: str|None = None) -> None:
     """Log a trace message."""
     logger.log(LogPrio.TRACE, message, logging_message_path, False)
 
 
-def debug(message: str, logging_message_path: str|None = None) -> None:
+def debug(message: Message, logging_message_path: str|None = None) -> None:
     """Log a debug message."""
     logger.log(LogPrio.DEBUG, message, logging_message_path, False)
 
 
-def profile(message: str, logging_message_path: str|None = None) -> None:
+def profile(message: Message, logging_message_path: str|None = None) -> None:
     """Log a profile message."""
     logger.log(LogPrio.PROFILE, message, logging_message_path, False)
     logger.log(LogPrio.PROFILE, message, logging_message_path, True)
 
 
-def log(prio: int, message: str, logging_message_path: str|None = None) -> None:
+def log(prio: int, message: Message, logging_message_path: str|None = None) -> None:
     """Write and print a log message."""
     logger.log(prio, message, logging_message_path)
 
 
-def log_profile_file(message: str, logging_message_path: str|None = None) -> None:
+def log_profile_file(message: Message, logging_message_path: str|None = None) -> None:
     """Write log message to logfile."""
     logger.log(LogPrio.PROFILE, message, logging_message_path, True)
@@ -0,0 +1,42 @@
+"""Registry of all component outputs of a simulation.
+
+The simulator registers every output once, when its component is added. The registry keeps the outputs
+in the order of their global index and indexes them by component and field name. Connecting the inputs then looks up every source output directly
+instead of comparing names with all outputs, so wiring large districts grows with the number of connections.
+"""
+
+# clean
+from typing import Dict, List, Optional, Tuple
+
+from hisim.component import ComponentOutput
+
+
+class OutputRegistry:
+
+    """All registered component outputs, indexed for the lookups when connecting components."""
+
+    def __init__(self) -> None:
+        """Initializes an empty registry."""
+        # all outputs, the position in the list is the global index of the output
+        self.outputs: List[ComponentOutput] = []
+        self.outputs_by_name: Dict[Tuple[str, str], ComponentOutput] = {}
+
+    def __len__(self) -> int:
+        """Returns the number of registered outputs."""
+        return len(self.outputs)
+
+    def register(self, output: ComponentOutput) -> None:
+        """Registers the output and sets its global index."""
+        key = (output.component_name, output.field_name)
+        if key in self.outputs_by_name:
+            raise ValueError(
+                f"Trying to register the same key twice: {output.full_name}. "
+                "Check if more than one building is being modeled."
+            )
+        output.global_index = len(self.outputs)
+        self.outputs.append(output)
+        self.outputs_by_name[key] = output
+
+    def get_output(self, component_name: str, field_name: str) -> Optional[ComponentOutput]:
+        """Returns the output of the component with the field name, or None if it is not registered."""
+        return self.outputs_by_name.get((component_name, field_name))
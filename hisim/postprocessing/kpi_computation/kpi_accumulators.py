@@ -0,0 +1,148 @@
+"""Running KPI values that the simulator updates after every converged timestep.
+
+Components register accumulators for their outputs in ``register_kpi_accumulators``, for example
+the sum of a power output or the number of on/off cycles. The simulator updates all accumulators
+with the converged values of each timestep at once, so the KPIs are available after the simulation
+with memory per accumulator instead of per timestep, even if the time series are not kept.
+"""
+
+# clean
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from hisim.component import ComponentOutput
+
+
+class KpiAccumulatorKind(Enum):
+
+    """Determine how an accumulator combines the values of all timesteps."""
+
+    SUM = "sum"
+    POSITIVE_SUM = "positive sum"
+    NEGATIVE_SUM = "negative sum"
+    MAXIMUM = "maximum"
+    MINIMUM = "minimum"
+    # sum of the differences to the threshold while the value is below or above it
+    DEVIATION_BELOW = "deviation below"
+    DEVIATION_ABOVE = "deviation above"
+    # number of timesteps where the value becomes zero after a non-zero value
+    CYCLES = "cycles"
+
+
+#: Start values of the running values before the first timestep.
+_START_VALUES: Dict[KpiAccumulatorKind, float] = {
+    KpiAccumulatorKind.MAXIMUM: -np.inf,
+    KpiAccumulatorKind.MINIMUM: np.inf,
+}
+
+
+@dataclass
+class KpiAccumulator:
+
+    """Running KPI value of one output. The value is set after the last timestep."""
+
+    kind: KpiAccumulatorKind
+    output: ComponentOutput
+    threshold: float = 0.0
+    value: Optional[float] = None
+    number_of_timesteps: int = 0
+
+    def get_mean(self) -> Optional[float]:
+        """Returns the mean value per timestep of a sum accumulator."""
+        if self.value is None or self.number_of_timesteps == 0:
+            return None
+        return self.value / self.number_of_timesteps
+
+
+class KpiAccumulators:
+
+    """All KPI accumulators of a simulation, updated together with one vectorized step per kind."""
+
+    def __init__(self) -> None:
+        """Initializes an empty set of accumulators."""
+        self.accumulators: List[KpiAccumulator] = []
+        self.number_of_timesteps: int = 0
+        self.output_indices: np.ndarray = np.zeros(0, dtype=np.intp)
+        self.thresholds: np.ndarray = np.zeros(0)
+        self.running_values: np.ndarray = np.zeros(0)
+        self.previous_values: np.ndarray = np.zeros(0)
+        self.positions_by_kind: Dict[KpiAccumulatorKind, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        """Returns the number of registered accumulators."""
+        return len(self.accumulators)
+
+    def add(self, kind: KpiAccumulatorKind, output: ComponentOutput, threshold: float = 0.0) -> KpiAccumulator:
+        """Registers an accumulator for an output and returns it, so the component can read its value later."""
+        accumulator = KpiAccumulator(kind=kind, output=output, threshold=threshold)
+        self.accumulators.append(accumulator)
+        return accumulator
+
+    def prepare(self) -> None:
+        """Collects the outputs and start values of all accumulators before the first timestep."""
+        for accumulator in self.accumulators:
+            if accumulator.output.global_index < 0:
+                raise ValueError(f"The output {accumulator.output.full_name} of a KPI accumulator is not registered.")
+        self.output_indices = np.array([accumulator.output.global_index for accumulator in self.accumulators], dtype=np.intp)
+        self.thresholds = np.array([accumulator.threshold for accumulator in self.accumulators], dtype=np.float64)
+        self.running_values = np.array(
+            [_START_VALUES.get(accumulator.kind, 0.0) for accumulator in self.accumulators], dtype=np.float64
+        )
+        self.previous_values = np.zeros(len(self.accumulators), dtype=np.float64)
+        kinds = np.array([accumulator.kind for accumulator in self.accumulators], dtype=object)
+        self.positions_by_kind = {
+            kind: np.flatnonzero(kinds == kind) for kind in KpiAccumulatorKind if np.any(kinds == kind)
+        }
+        self.number_of_timesteps = 0
+
+    def update(self, values: np.ndarray) -> None:
+        """Adds the converged values of all outputs of one timestep to the accumulators."""
+        current_values = values[self.output_indices]
+        for kind, positions in self.positions_by_kind.items():
+            current = current_values[positions]
+            if kind == KpiAccumulatorKind.SUM:
+                self.running_values[positions] += current
+            elif kind == KpiAccumulatorKind.POSITIVE_SUM:
+                self.running_values[positions] += np.maximum(current, 0.0)
+            elif kind == KpiAccumulatorKind.NEGATIVE_SUM:
+                self.running_values[positions] += np.minimum(current, 0.0)
+            elif kind == KpiAccumulatorKind.MAXIMUM:
+                self.running_values[positions] = np.maximum(self.running_values[positions], current)
+            elif kind == KpiAccumulatorKind.MINIMUM:
+                self.running_values[positions] = np.minimum(self.running_values[positions], current)
+            elif kind == KpiAccumulatorKind.DEVIATION_BELOW:
+                self.running_values[positions] += np.maximum(self.thresholds[positions] - current, 0.0)
+            elif kind == KpiAccumulatorKind.DEVIATION_ABOVE:
+                self.running_values[positions] += np.maximum(current - self.thresholds[positions], 0.0)
+            elif kind == KpiAccumulatorKind.CYCLES:
+                self.running_values[positions] += (self.previous_values[positions] != 0.0) & (current == 0.0)
+                self.previous_values[positions] = current
+        self.number_of_timesteps += 1
+
+    def get_checkpoint_state(self) -> Dict[str, Any]:
+        """Returns the running values for a checkpoint of the simulation."""
+        return {
+            "running_values": self.running_values.copy(),
+            "previous_values": self.previous_values.copy(),
+            "number_of_timesteps": self.number_of_timesteps,
+        }
+
+    def set_checkpoint_state(self, checkpoint_state: Dict[str, Any]) -> None:
+        """Continues with the running values of a checkpoint."""
+        if len(checkpoint_state["running_values"]) != len(self.accumulators):
+            raise ValueError("The checkpoint was taken with other KPI accumulators.")
+        self.running_values = np.array(checkpoint_state["running_values"], dtype=np.float64)
+        self.previous_values = np.array(checkpoint_state["previous_values"], dtype=np.float64)
+        self.number_of_timesteps = checkpoint_state["number_of_timesteps"]
+
+    def finish(self) -> None:
+        """Sets the values of all accumulators after the last timestep."""
+        for accumulator, running_value in zip(self.accumulators, self.running_values):
+            accumulator.number_of_timesteps = self.number_of_timesteps
+            accumulator.value = float(running_value) if np.isfinite(running_value) else None
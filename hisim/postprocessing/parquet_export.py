@@ -0,0 +1,158 @@
+"""Export of all simulation results into compressed columnar Parquet files.
+
+Instead of one CSV or pickle file per output, all time series are written into one Parquet file
+with one typed column per output. The component, field, load type, unit, post processing flags
+and description of each output are stored as metadata of its column in the file schema.
+
+The hourly, daily, monthly and cumulative results are written into a sibling file with one row
+group per resolution. A ``resolution`` column allows to read only one resolution with a filter,
+and the outputs to read can be selected by their columns, so readers only load what they need.
+"""
+
+# clean
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from hisim.component import ComponentOutput
+from hisim.loadtypes import UNITS_USING_MEAN_AGGREGATION
+
+#: File name of the time series of all outputs inside the result directory.
+RESULTS_PARQUET_FILENAME: str = "all_results.parquet"
+#: File name of the aggregated results of all outputs inside the result directory.
+AGGREGATED_RESULTS_PARQUET_FILENAME: str = "all_results_aggregated.parquet"
+#: Name of the time stamp column.
+TIME_COLUMN: str = "time"
+#: Name of the column with the resolution of the aggregated results.
+RESOLUTION_COLUMN: str = "resolution"
+#: Key of the schema metadata with the number of outputs and the value type.
+SCHEMA_METADATA_KEY: bytes = b"hisim"
+#: Compression codec of the Parquet files.
+PARQUET_COMPRESSION: str = "zstd"
+
+
+def get_output_metadata(output: ComponentOutput) -> Dict[str, str]:
+    """Returns the metadata of an output that is stored with its column."""
+    return {
+        "component_name": output.component_name,
+        "field_name": output.field_name,
+        "load_type": str(output.load_type.value),
+        "unit": str(output.unit.value),
+        "aggregation": "mean" if output.unit in UNITS_USING_MEAN_AGGREGATION else "sum",
+        "postprocessing_flag": json.dumps(output.postprocessing_flag or [], default=str),
+        "output_description": output.output_description or "",
+    }
+
+
+def make_schema(
+    all_outputs: List[ComponentOutput], value_type: pa.DataType, with_resolution: bool = False
+) -> pa.Schema:
+    """Makes the schema with the time stamp column, optionally the resolution column, and one column per output."""
+    fields = []
+    if with_resolution:
+        fields.append(pa.field(RESOLUTION_COLUMN, pa.string(), nullable=False))
+    fields.append(pa.field(TIME_COLUMN, pa.timestamp("ns")))
+    for output in all_outputs:
+        metadata = {key.encode(): value.encode() for key, value in get_output_metadata(output).items()}
+        fields.append(pa.field(output.get_pretty_name(), value_type, metadata=metadata))
+    schema_metadata = {"number_of_outputs": len(all_outputs), "value_type": str(value_type)}
+    return pa.schema(fields, metadata={SCHEMA_METADATA_KEY: json.dumps(schema_metadata).encode()})
+
+
+def get_value_type(use_float32: bool) -> pa.DataType:
+    """Returns the type of the output columns."""
+    return pa.float32() if use_float32 else pa.float64()
+
+
+def make_table(
+    schema: pa.Schema, data_frame: pd.DataFrame, time_stamps: Optional[pd.Index], resolution: Optional[str] = None
+) -> pa.Table:
+    """Converts the columns of a results frame into a table with the given schema.
+
+    The output columns are taken from the results frame by their names in the schema, so the order
+    of the columns in the frame does not matter.
+    """
+    number_of_rows = len(data_frame)
+    arrays: List[Any] = []
+    if resolution is not None:
+        arrays.append(pa.array([resolution] * number_of_rows, type=pa.string()))
+    if time_stamps is None:
+        arrays.append(pa.nulls(number_of_rows, type=pa.timestamp("ns")))
+    else:
+        arrays.append(pa.array(np.asarray(time_stamps, dtype="datetime64[ns]"), type=pa.timestamp("ns")))
+    output_names = schema.names[len(arrays):]
+    missing_output_names = [name for name in output_names if name not in data_frame.columns]
+    if missing_output_names:
+        raise ValueError(f"The results have no columns for the outputs {missing_output_names}.")
+    for name in output_names:
+        value_type = schema.field(name).type
+        values = data_frame[name].to_numpy(dtype=value_type.to_pandas_dtype())
+        arrays.append(pa.array(values, type=value_type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def write_results(
+    file_path: str, results: pd.DataFrame, all_outputs: List[ComponentOutput], use_float32: bool = False
+) -> None:
+    """Writes the time series of all outputs into one Parquet file."""
+    schema = make_schema(all_outputs, get_value_type(use_float32))
+    pq.write_table(make_table(schema, results, results.index), file_path, compression=PARQUET_COMPRESSION)
+
+
+def write_aggregated_results(
+    file_path: str,
+    aggregated_results: Dict[str, Optional[pd.DataFrame]],
+    all_outputs: List[ComponentOutput],
+    use_float32: bool = False,
+) -> None:
+    """Writes the aggregated results into one Parquet file with one row group per resolution.
+
+    Args:
+        file_path: Path of the Parquet file.
+        aggregated_results: Results per resolution, for example ``{"monthly": results_monthly}``.
+            Resolutions without results are skipped. The cumulative results are written without time stamp.
+        all_outputs: Outputs of the columns of the results.
+        use_float32: If True, the values are stored as float32 instead of float64.
+    """
+    schema = make_schema(all_outputs, get_value_type(use_float32), with_resolution=True)
+    with pq.ParquetWriter(file_path, schema, compression=PARQUET_COMPRESSION) as writer:
+        for resolution, data_frame in aggregated_results.items():
+            if data_frame is None:
+                continue
+            time_stamps = data_frame.index if isinstance(data_frame.index, pd.DatetimeIndex) else None
+            writer.write_table(make_table(schema, data_frame, time_stamps, resolution))
+
+
+def read_results(
+    file_path: str, columns: Optional[Sequence[str]] = None, filters: Optional[List[Any]] = None
+) -> pd.DataFrame:
+    """Reads results from a Parquet file, with the time stamps as index.
+
+    Args:
+        file_path: Path of the Parquet file.
+        columns: Output columns to read. Only these columns are loaded from the file. Defaults to all columns.
+        filters: Row filters in the form of :func:`pyarrow.parquet.read_table`,
+            for example ``[("resolution", "==", "monthly")]``. Row groups that do not match are skipped.
+    """
+    if columns is not None:
+        schema_names = pq.read_schema(file_path).names
+        columns = [name for name in (RESOLUTION_COLUMN, TIME_COLUMN) if name in schema_names] + list(columns)
+    data_frame = pq.read_table(file_path, columns=columns, filters=filters).to_pandas()
+    if TIME_COLUMN in data_frame.columns:
+        data_frame = data_frame.set_index(TIME_COLUMN)
+        data_frame.index.name = None
+    return data_frame
+
+
+def read_output_metadata(file_path: str) -> Dict[str, Dict[str, str]]:
+    """Reads the metadata of all output columns from the schema of a Parquet file, without reading the data."""
+    schema = pq.read_schema(file_path)
+    return {
+        field.name: {key.decode(): value.decode() for key, value in field.metadata.items()}
+        for field in schema
+        if field.metadata
+    }
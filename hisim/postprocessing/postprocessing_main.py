@@ -4,6 +4,7 @@ import importlib
 import json
 
 # clean
+import multiprocessing
 import os
 import pickle
 import string
@@ -16,6 +17,8 @@ import pandas as pd
 from hisim import log
 from hisim import utils
 from hisim.component import ComponentOutput
+from hisim.component_profiling import COMPONENT_PROFILE_FILENAME, get_profile_summary_lines
+from hisim.postprocessing import parquet_export
 from hisim.postprocessing.postprocessing_datatransfer import PostProcessingDataTransfer
 from hisim.postprocessingoptions import PostProcessingOptions
 from hisim.sim_repository_singleton import SingletonSimRepository, SingletonDictKeyEnum
@@ -31,6 +34,25 @@ def _load_attribute(module_name: str, attribute_name: str) -> Any:
     return getattr(importlib.import_module(module_name), attribute_name)
 
 
+# Post processing data of the charts that are being rendered in forked worker processes.
+_chart_job_data: Optional[PostProcessingDataTransfer] = None
+
+
+def render_chart_job(
+    chart_job: Tuple[str, int, Tuple[Any, ...]], ppdt: Optional[PostProcessingDataTransfer] = None
+) -> Any:
+    """Renders the chart of one output with a chart function of the PostProcessor.
+
+    In a worker process of PostProcessor.render_charts, the post processing data is inherited from the parent.
+    """
+    chart_function_name, index, chart_arguments = chart_job
+    if ppdt is None:
+        ppdt = _chart_job_data
+    if ppdt is None:
+        raise ValueError("No post processing data was given for rendering the chart.")
+    return getattr(PostProcessor, chart_function_name)(ppdt, index, *chart_arguments)
+
+
 class PostProcessor:
     """Core Post processor class."""
 
@@ -66,6 +88,7 @@ class PostProcessor:
             # Charts etc. are not needed when executing HiSim in a container. Allow only csv files and KPI.
             allowed_options_for_docker = {
                 PostProcessingOptions.EXPORT_TO_CSV,
+                PostProcessingOptions.EXPORT_TO_PARQUET,
                 PostProcessingOptions.COMPUTE_KPIS,
                 PostProcessingOptions.GENERATE_CSV_FOR_HOUSING_DATA_BASE,
                 PostProcessingOptions.COMPUTE_OPEX,
@@ -135,6 +158,13 @@ class PostProcessor:
             end = timer()
             duration = end - start
             log.information("Making PKL export took " + f"{duration:1.2f}s.")
+        if PostProcessingOptions.EXPORT_TO_PARQUET in ppdt.post_processing_options:
+            log.information("Making parquet exports.")
+            start = timer()
+            self.make_parquet_export(ppdt)
+            end = timer()
+            duration = end - start
+            log.information("Making parquet export took " + f"{duration:1.2f}s.")
         if PostProcessingOptions.MAKE_NETWORK_CHARTS in ppdt.post_processing_options:
             log.information("Computing network charts.")
             start = timer()
@@ -152,6 +182,8 @@ class PostProcessor:
             )
             report = report_generator_class(dirpath=ppdt.simulation_parameters.result_directory)
             self.write_simulation_parameters_to_report(ppdt, report)
+            if ppdt.simulation_parameters.profile_components:
+                self.write_component_profile_to_report(ppdt, report)
             end = timer()
             duration = end - start
             log.information(
@@ -370,6 +402,11 @@ class PostProcessor:
         log.information("Exporting to pkl.")
         self.export_results_to_pickle(ppdt)
 
+    def make_parquet_export(self, ppdt: PostProcessingDataTransfer) -> None:
+        """Exports all data to Parquet."""
+        log.information("Exporting to parquet.")
+        self.export_results_to_parquet(ppdt)
+
     def make_monthly_bar_charts(
         self,
         ppdt: PostProcessingDataTransfer,
@@ -377,19 +414,24 @@ class PostProcessor:
     ) -> None:
         """Make bar charts."""
         assert ppdt.results_monthly is not None
+        self.render_charts(ppdt, "make_monthly_bar_chart", (), report_image_entries)
+
+    @staticmethod
+    def make_monthly_bar_chart(ppdt: PostProcessingDataTransfer, index: int) -> ReportImageEntry:
+        """Make the bar chart of one output."""
+        assert ppdt.results_monthly is not None
         charts_module = importlib.import_module("hisim.postprocessing.charts")
-        for index, output in enumerate(ppdt.all_outputs):
-            my_bar = charts_module.BarChart(
-                output=output.full_name,
-                component_name=output.component_name,
-                units=output.unit,
-                directory_path=os.path.join(ppdt.simulation_parameters.result_directory),
-                time_correction_factor=ppdt.time_correction_factor_in_hours_per_timestep,
-                output_description=output.output_description,
-                figure_format=ppdt.simulation_parameters.figure_format,
-            )
-            my_entry = my_bar.plot(data=ppdt.results_monthly.iloc[:, index])
-            report_image_entries.append(my_entry)
+        output = ppdt.all_outputs[index]
+        my_bar = charts_module.BarChart(
+            output=output.full_name,
+            component_name=output.component_name,
+            units=output.unit,
+            directory_path=os.path.join(ppdt.simulation_parameters.result_directory),
+            time_correction_factor=ppdt.time_correction_factor_in_hours_per_timestep,
+            output_description=output.output_description,
+            figure_format=ppdt.simulation_parameters.figure_format,
+        )
+        return cast("ReportImageEntry", my_bar.plot(data=ppdt.results_monthly.iloc[:, index]))
 
     def make_single_day_plots(
         self,
@@ -398,22 +440,26 @@ class PostProcessor:
         report_image_entries: List[ReportImageEntry],
     ) -> None:
         """Makes plots for selected days."""
+        self.render_charts(ppdt, "make_single_day_plot", (days,), report_image_entries)
+
+    @staticmethod
+    def make_single_day_plot(ppdt: PostProcessingDataTransfer, index: int, days: Dict[str, int]) -> ReportImageEntry:
+        """Makes the plot of one output for the selected day."""
         chart_single_day_class = _load_attribute("hisim.postprocessing.chart_singleday", "ChartSingleDay")
-        for index, output in enumerate(ppdt.all_outputs):
-            my_days = chart_single_day_class(
-                output=output.full_name,
-                component_name=output.component_name,
-                units=output.unit,
-                directory_path=ppdt.simulation_parameters.result_directory,
-                time_correction_factor=ppdt.time_correction_factor_in_hours_per_timestep,
-                day=days["day"],
-                month=days["month"],
-                data=ppdt.results.iloc[:, index],
-                output_description=output.output_description,
-                figure_format=ppdt.simulation_parameters.figure_format,
-            )
-            my_entry = my_days.plot(close=True)
-            report_image_entries.append(my_entry)
+        output = ppdt.all_outputs[index]
+        my_days = chart_single_day_class(
+            output=output.full_name,
+            component_name=output.component_name,
+            units=output.unit,
+            directory_path=ppdt.simulation_parameters.result_directory,
+            time_correction_factor=ppdt.time_correction_factor_in_hours_per_timestep,
+            day=days["day"],
+            month=days["month"],
+            data=ppdt.results.iloc[:, index],
+            output_description=output.output_description,
+            figure_format=ppdt.simulation_parameters.figure_format,
+        )
+        return cast("ReportImageEntry", my_days.plot(close=True))
 
     def make_carpet_plots(
         self,
@@ -421,24 +467,30 @@ class PostProcessor:
         report_image_entries: List[ReportImageEntry],
     ) -> None:
         """Make carpet plots."""
-        charts_module = importlib.import_module("hisim.postprocessing.charts")
-        for index, output in enumerate(ppdt.all_outputs):
-            log.trace("Making carpet plots")
-            my_carpet = charts_module.Carpet(
-                output=output.full_name,
-                component_name=output.component_name,
-                units=output.unit,
-                directory_path=ppdt.simulation_parameters.result_directory,
-                time_correction_factor=ppdt.time_correction_factor_in_hours_per_timestep,
-                output_description=output.output_description,
-                figure_format=ppdt.simulation_parameters.figure_format,
-            )
+        self.render_charts(ppdt, "make_carpet_plot", (), report_image_entries)
 
-            my_entry = my_carpet.plot(
+    @staticmethod
+    def make_carpet_plot(ppdt: PostProcessingDataTransfer, index: int) -> Optional[ReportImageEntry]:
+        """Make the carpet plot of one output."""
+        charts_module = importlib.import_module("hisim.postprocessing.charts")
+        output = ppdt.all_outputs[index]
+        log.trace("Making carpet plots")
+        my_carpet = charts_module.Carpet(
+            output=output.full_name,
+            component_name=output.component_name,
+            units=output.unit,
+            directory_path=ppdt.simulation_parameters.result_directory,
+            time_correction_factor=ppdt.time_correction_factor_in_hours_per_timestep,
+            output_description=output.output_description,
+            figure_format=ppdt.simulation_parameters.figure_format,
+        )
+        return cast(
+            Optional["ReportImageEntry"],
+            my_carpet.plot(
                 xdims=int((ppdt.simulation_parameters.end_date - ppdt.simulation_parameters.start_date).days),
                 data=ppdt.results.iloc[:, index],
-            )
-            report_image_entries.append(my_entry)
+            ),
+        )
 
     @utils.measure_memory_leak
     def make_line_plots(
@@ -447,22 +499,54 @@ class PostProcessor:
         report_image_entries: List[ReportImageEntry],
     ) -> None:
         """Makes the line plots."""
-        charts_module = importlib.import_module("hisim.postprocessing.charts")
-        for index, output in enumerate(ppdt.all_outputs):
+        for output in ppdt.all_outputs:
             if output.output_description is None:
                 raise ValueError("Output description was missing for " + output.full_name)
-            my_line = charts_module.Line(
-                output=output.full_name,
-                component_name=output.component_name,
-                units=output.unit,
-                directory_path=ppdt.simulation_parameters.result_directory,
-                time_correction_factor=ppdt.time_correction_factor_in_hours_per_timestep,
-                output_description=output.output_description,
-                figure_format=ppdt.simulation_parameters.figure_format,
-            )
-            my_entry = my_line.plot(data=ppdt.results.iloc[:, index])
-            report_image_entries.append(my_entry)
-            del my_line
+        self.render_charts(ppdt, "make_line_plot", (), report_image_entries)
+
+    @staticmethod
+    def make_line_plot(ppdt: PostProcessingDataTransfer, index: int) -> ReportImageEntry:
+        """Makes the line plot of one output."""
+        charts_module = importlib.import_module("hisim.postprocessing.charts")
+        output = ppdt.all_outputs[index]
+        my_line = charts_module.Line(
+            output=output.full_name,
+            component_name=output.component_name,
+            units=output.unit,
+            directory_path=ppdt.simulation_parameters.result_directory,
+            time_correction_factor=ppdt.time_correction_factor_in_hours_per_timestep,
+            output_description=output.output_description,
+            figure_format=ppdt.simulation_parameters.figure_format,
+        )
+        return cast("ReportImageEntry", my_line.plot(data=ppdt.results.iloc[:, index]))
+
+    @staticmethod
+    def render_charts(
+        ppdt: PostProcessingDataTransfer,
+        chart_function_name: str,
+        chart_arguments: Tuple[Any, ...],
+        report_image_entries: List[ReportImageEntry],
+    ) -> None:
+        """Renders one chart per output and appends the report image entries in the order of the outputs.
+
+        With ``plot_worker_count`` larger than 1 in the simulation parameters, the charts are rendered in a
+        pool of forked processes. The workers inherit the post processing data, including the results, from
+        the parent process, so the results are not copied for every chart. Only the report image entries
+        are sent back. Without fork support, the charts are rendered one after the other.
+        """
+        chart_jobs = [(chart_function_name, index, chart_arguments) for index in range(len(ppdt.all_outputs))]
+        worker_count = min(ppdt.simulation_parameters.plot_worker_count, len(chart_jobs))
+        if worker_count <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+            report_image_entries.extend(render_chart_job(chart_job, ppdt) for chart_job in chart_jobs)
+            return
+        global _chart_job_data  # pylint: disable=global-statement
+        _chart_job_data = ppdt
+        log.flush()
+        try:
+            with multiprocessing.get_context("fork").Pool(processes=worker_count) as pool:
+                report_image_entries.extend(pool.map(render_chart_job, chart_jobs, chunksize=1))
+        finally:
+            _chart_job_data = None
 
     @utils.measure_execution_time
     def export_results_to_csv(self, ppdt: PostProcessingDataTransfer) -> None:
@@ -495,6 +579,31 @@ class PostProcessor:
                     csvfilename = self.shorten_path(csvfilename)
                     ppdt.results_monthly[column].to_csv(csvfilename, sep=",", decimal=".", header=header)
 
+    @utils.measure_execution_time
+    def export_results_to_parquet(self, ppdt: PostProcessingDataTransfer) -> None:
+        """Exports the results and the aggregated results to one Parquet file each."""
+        use_float32 = ppdt.simulation_parameters.export_results_as_float32
+        parquet_filename = os.path.join(
+            ppdt.simulation_parameters.result_directory, parquet_export.RESULTS_PARQUET_FILENAME
+        )
+        parquet_export.write_results(
+            self.shorten_path(parquet_filename), ppdt.results, ppdt.all_outputs, use_float32=use_float32
+        )
+        aggregated_results = {
+            "hourly": ppdt.results_hourly,
+            "daily": ppdt.results_daily,
+            "monthly": ppdt.results_monthly,
+            "cumulative": ppdt.results_cumulative,
+        }
+        if all(data_frame is None for data_frame in aggregated_results.values()):
+            return
+        aggregated_filename = os.path.join(
+            ppdt.simulation_parameters.result_directory, parquet_export.AGGREGATED_RESULTS_PARQUET_FILENAME
+        )
+        parquet_export.write_aggregated_results(
+            self.shorten_path(aggregated_filename), aggregated_results, ppdt.all_outputs, use_float32=use_float32
+        )
+
     @utils.measure_execution_time
     def export_results_to_pickle(self, ppdt: PostProcessingDataTransfer) -> None:
         """Exports the results to a Pickle file."""
@@ -565,6 +674,24 @@ class PostProcessor:
             headline=". Simulation Parameters",
         )
 
+    def write_component_profile_to_report(
+        self, ppdt: PostProcessingDataTransfer, report: reportgenerator.ReportGenerator
+    ) -> None:
+        """Write the summary of the component profile of the simulation loop to report."""
+        file_path = os.path.join(ppdt.simulation_parameters.result_directory, COMPONENT_PROFILE_FILENAME)
+        if not os.path.isfile(file_path):
+            log.warning(f"No component profile was found at {file_path}.")
+            return
+        with open(file_path, "r", encoding="utf-8") as file:
+            profile = json.load(file)
+        lines = ["Wall time of the slowest components in the simulation loop."]
+        lines += get_profile_summary_lines(profile)
+        self.write_new_chapter_with_text_content_to_report(
+            report=report,
+            lines=lines,
+            headline=". Component Profile",
+        )
+
     def write_components_to_report(
         self,
         ppdt: PostProcessingDataTransfer,
@@ -879,9 +1006,10 @@ class PostProcessor:
             ("monthly", ppdt.results_monthly, ppdt.results_monthly.index),
         ]
 
+        data_paths: Dict[str, str] = {}
         for time_res, df, index in time_configs:
             result_df = self.iterate_over_results_and_add_values_to_dict(results_df=df, timeseries=index)
-            self.write_filename_and_save_to_csv(
+            data_paths[time_res] = self.write_filename_and_save_to_csv(
                 dataframe=result_df,
                 folder=self.result_data_folder_for_scenario_evaluation,
                 simulation_duration=ppdt.simulation_parameters.duration.days,
@@ -914,7 +1042,7 @@ class PostProcessor:
 
         # create dataframe
         simple_df_yearly_data = pd.DataFrame(simple_dict_cumulative_data)
-        self.write_filename_and_save_to_csv(
+        data_paths["yearly"] = self.write_filename_and_save_to_csv(
             dataframe=simple_df_yearly_data,
             folder=self.result_data_folder_for_scenario_evaluation,
             time_resolution_of_data="yearly",
@@ -923,6 +1051,36 @@ class PostProcessor:
 
         self.write_config_data_for_scenario_evaluation(ppdt, my_sim)
 
+        if ppdt.simulation_parameters.result_catalog_path is not None:
+            self.register_results_in_catalog(ppdt, data_paths)
+
+    def register_results_in_catalog(self, ppdt: PostProcessingDataTransfer, data_paths: Dict[str, str]) -> None:
+        """Registers the results for the scenario evaluation in the result catalog."""
+        result_catalog_path = ppdt.simulation_parameters.result_catalog_path
+        if result_catalog_path is None:
+            raise ValueError("No result catalog path was set in the simulation parameters.")
+        result_catalog = importlib.import_module("hisim.postprocessing.scenario_evaluation.result_catalog")
+        module_config: Any = ppdt.module_config
+        if isinstance(module_config, str) and os.path.isfile(module_config):
+            with open(module_config, "r", encoding="utf-8") as openfile:
+                module_config = json.load(openfile)
+        if not isinstance(module_config, dict):
+            module_config = {}
+        kpis = ppdt.kpi_collection_dict if PostProcessingOptions.COMPUTE_KPIS in ppdt.post_processing_options else {}
+        catalog_entry = result_catalog.ResultCatalogEntry(
+            scenario_data_folder=self.result_data_folder_for_scenario_evaluation,
+            model=self.model,
+            scenario=self.scenario,
+            region=self.region,
+            year=self.year,
+            simulation_duration_in_days=ppdt.simulation_parameters.duration.days,
+            module_config=module_config,
+            kpis=kpis,
+            data_paths={resolution: os.path.abspath(path) for resolution, path in data_paths.items()},
+        )
+        result_catalog.ResultCatalog(result_catalog_path).register(catalog_entry)
+        log.information("Registered the results in the result catalog " + result_catalog_path)
+
     def write_config_data_for_scenario_evaluation(self, ppdt: PostProcessingDataTransfer, my_sim: "Simulator") -> None:
         """Prepare the results for the scenario evaluation."""
         # create dictionary with all import data information
@@ -1072,8 +1230,8 @@ class PostProcessor:
         folder: str,
         time_resolution_of_data: str,
         simulation_duration: int,
-    ) -> None:
-        """Write file to csv."""
+    ) -> str:
+        """Write file to csv and return its path."""
 
         filename = os.path.join(
             folder,
@@ -1081,6 +1239,7 @@ class PostProcessor:
         )
 
         dataframe.to_csv(path_or_buf=filename, index=None)  # type: ignore
+        return filename
 
     def write_kpis_to_json_file(self, ppdt: PostProcessingDataTransfer) -> None:
         """Write all KPIs o json file."""
@@ -0,0 +1,230 @@
+"""SQLite catalog of the results that were prepared for the scenario evaluation.
+
+Every finished simulation with ``PREPARE_OUTPUTS_FOR_SCENARIO_EVALUATION`` and a
+``result_catalog_path`` in its simulation parameters registers itself in the catalog.
+An entry holds the scenario metadata, the module config and its hash, the KPIs and the
+paths of the yearly, monthly, daily and hourly result files. The ``ResultDataCollection``
+queries the catalog instead of walking through all result folders and opening their json files.
+Simulations with ``log_connections_to_result_catalog`` also store their component connections here,
+instead of writing ``component_connections.json``.
+
+Many simulations may register into the same catalog at the same time, so every registration
+is one short transaction and waits for locks of other processes.
+"""
+
+# clean
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+#: Resolutions of the result files of the scenario evaluation.
+RESULT_DATA_RESOLUTIONS: List[str] = ["yearly", "monthly", "daily", "hourly"]
+
+#: Seconds to wait for locks of other processes that write into the catalog.
+CATALOG_TIMEOUT_IN_SECONDS: float = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS simulations (
+    scenario_data_folder        TEXT PRIMARY KEY,
+    model                       TEXT,
+    scenario                    TEXT,
+    region                      TEXT,
+    year                        INTEGER,
+    simulation_duration_in_days INTEGER,
+    config_hash                 TEXT,
+    module_config               TEXT,
+    kpis                        TEXT,
+    yearly_path                 TEXT,
+    monthly_path                TEXT,
+    daily_path                  TEXT,
+    hourly_path                 TEXT,
+    registered_at               REAL
+);
+CREATE INDEX IF NOT EXISTS idx_simulations_duration ON simulations(simulation_duration_in_days);
+CREATE INDEX IF NOT EXISTS idx_simulations_config_hash ON simulations(config_hash);
+CREATE TABLE IF NOT EXISTS component_connections (
+    result_directory TEXT,
+    from_component   TEXT,
+    from_field       TEXT,
+    to_component     TEXT,
+    to_field         TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_component_connections_result_directory ON component_connections(result_directory);
+"""
+
+
+def get_config_hash(module_config: Dict[str, Any]) -> str:
+    """Returns a hash of the module config that does not depend on the order of its keys."""
+    return hashlib.sha256(json.dumps(module_config, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ResultCatalogEntry:
+
+    """Catalog entry of the scenario evaluation results of one simulation."""
+
+    scenario_data_folder: str
+    model: str
+    scenario: str
+    region: str
+    year: int
+    simulation_duration_in_days: int
+    module_config: Dict[str, Any] = field(default_factory=dict)
+    kpis: Dict[str, Any] = field(default_factory=dict)
+    data_paths: Dict[str, str] = field(default_factory=dict)
+    config_hash: str = ""
+
+    def __post_init__(self) -> None:
+        """Computes the config hash if none was given."""
+        if not self.config_hash:
+            self.config_hash = get_config_hash(self.module_config)
+
+
+class ResultCatalog:
+
+    """Persistent SQLite catalog of the scenario evaluation results of many simulations."""
+
+    def __init__(self, catalog_path: str) -> None:
+        """Opens the catalog and creates its tables if the file does not exist yet."""
+        self.catalog_path: str = catalog_path
+        catalog_directory = os.path.dirname(os.path.abspath(catalog_path))
+        os.makedirs(catalog_directory, exist_ok=True)
+        connection = self.connect()
+        try:
+            connection.executescript(_SCHEMA)
+        finally:
+            connection.close()
+
+    def connect(self) -> sqlite3.Connection:
+        """Opens a connection that waits for the locks of other processes."""
+        return sqlite3.connect(self.catalog_path, timeout=CATALOG_TIMEOUT_IN_SECONDS)
+
+    def register(self, entry: ResultCatalogEntry) -> None:
+        """Adds the entry of a simulation or replaces the earlier entry of the same result folder."""
+        row = (
+            os.path.abspath(entry.scenario_data_folder),
+            entry.model,
+            entry.scenario,
+            entry.region,
+            entry.year,
+            entry.simulation_duration_in_days,
+            entry.config_hash,
+            json.dumps(entry.module_config, default=str),
+            json.dumps(entry.kpis, default=str),
+            *[entry.data_paths.get(resolution) for resolution in RESULT_DATA_RESOLUTIONS],
+            time.time(),
+        )
+        connection = self.connect()
+        try:
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO simulations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row
+                )
+        finally:
+            connection.close()
+
+    def register_component_connections(
+        self, result_directory: str, connections: List[Dict[str, Dict[str, str]]]
+    ) -> None:
+        """Stores the component connections of a simulation and replaces its earlier connections.
+
+        The connections have the schema of component_connections.json.
+        """
+        result_directory = os.path.abspath(result_directory)
+        rows = [
+            (
+                result_directory,
+                connection["From"]["Component"],
+                connection["From"]["Field"],
+                connection["To"]["Component"],
+                connection["To"]["Field"],
+            )
+            for connection in connections
+        ]
+        connection = self.connect()
+        try:
+            with connection:
+                connection.execute("DELETE FROM component_connections WHERE result_directory = ?", (result_directory,))
+                connection.executemany("INSERT INTO component_connections VALUES (?, ?, ?, ?, ?)", rows)
+        finally:
+            connection.close()
+
+    def get_component_connections(self, result_directory: str) -> List[Dict[str, Dict[str, str]]]:
+        """Returns the component connections of a simulation with the schema of component_connections.json."""
+        connection = self.connect()
+        try:
+            rows = connection.execute(
+                "SELECT from_component, from_field, to_component, to_field FROM component_connections "
+                "WHERE result_directory = ? ORDER BY rowid",
+                (os.path.abspath(result_directory),),
+            ).fetchall()
+        finally:
+            connection.close()
+        return [
+            {
+                "From": {"Component": from_component, "Field": from_field},
+                "To": {"Component": to_component, "Field": to_field},
+            }
+            for from_component, from_field, to_component, to_field in rows
+        ]
+
+    def get_entries(
+        self,
+        simulation_duration_in_days: Optional[int] = None,
+        model: Optional[str] = None,
+        unique_configs_only: bool = True,
+    ) -> List[ResultCatalogEntry]:
+        """Returns the entries with the given simulation duration and model, in the order of registration.
+
+        With ``unique_configs_only``, only the first registered entry of each config hash and scenario is returned.
+        """
+        conditions = []
+        parameters: List[Any] = []
+        if simulation_duration_in_days is not None:
+            conditions.append("simulation_duration_in_days = ?")
+            parameters.append(simulation_duration_in_days)
+        if model is not None:
+            conditions.append("model = ?")
+            parameters.append(model)
+        query = "SELECT * FROM simulations"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY registered_at, scenario_data_folder"
+        connection = self.connect()
+        connection.row_factory = sqlite3.Row
+        try:
+            rows = connection.execute(query, parameters).fetchall()
+        finally:
+            connection.close()
+
+        entries: List[ResultCatalogEntry] = []
+        seen_configs = set()
+        for row in rows:
+            if unique_configs_only:
+                config_key = (row["config_hash"], row["scenario"], row["simulation_duration_in_days"])
+                if config_key in seen_configs:
+                    continue
+                seen_configs.add(config_key)
+            entries.append(
+                ResultCatalogEntry(
+                    scenario_data_folder=row["scenario_data_folder"],
+                    model=row["model"],
+                    scenario=row["scenario"],
+                    region=row["region"],
+                    year=row["year"],
+                    simulation_duration_in_days=row["simulation_duration_in_days"],
+                    module_config=json.loads(row["module_config"]),
+                    kpis=json.loads(row["kpis"]),
+                    data_paths={
+                        resolution: row[f"{resolution}_path"]
+                        for resolution in RESULT_DATA_RESOLUTIONS
+                        if row[f"{resolution}_path"] is not None
+                    },
+                    config_hash=row["config_hash"],
+                )
+            )
+        return entries
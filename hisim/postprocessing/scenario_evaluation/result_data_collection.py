@@ -4,7 +4,8 @@
 import glob
 import datetime
 import os
-from typing import Dict, Any, Optional, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, Optional, List, Tuple
 import json
 import shutil
 import re
@@ -17,6 +18,16 @@ from hisim.postprocessing.scenario_evaluation.result_data_processing import (
     ResultDataTypeEnum,
     DataFormatEnum,
 )
+from hisim.postprocessing.scenario_evaluation.result_catalog import (
+    ResultCatalog,
+    ResultCatalogEntry,
+    get_config_hash,
+)
+
+#: Columns of the result csv files that are read for the scenario evaluation.
+RESULT_DATA_COLUMNS = {"model", "scenario", "region", "variable", "unit", "time", "year", "value"}
+#: Number of threads that read result csv files at the same time.
+RESULT_DATA_READER_COUNT = min(8, os.cpu_count() or 1)
 
 
 class ResultDataCollection:
@@ -33,8 +44,14 @@ class ResultDataCollection:
             os.pardir, os.pardir, os.pardir, "system_setups", "results"
         ),
         path_to_default_config: Optional[str] = None,
+        result_catalog_path: Optional[str] = None,
     ) -> None:
-        """Initialize the class."""
+        """Initialize the class.
+
+        If a result catalog path is given, the result folders, data files, module configs and building KPIs are
+        queried from the result catalog instead of searching through the folder from which data will be collected
+        and opening the json files of the result folders.
+        """
         result_folder = folder_from_which_data_will_be_collected
         self.result_data_folder = os.path.join(
             os.getcwd(),
@@ -53,9 +70,16 @@ class ResultDataCollection:
         self.data_format_type: str = data_format_type
         self.scenario_analysis_config_name: str = scenario_analysis_config_name
 
-        log.information(f"Checking results from folder: {result_folder}")
-
-        list_with_result_data_folders = self.get_only_useful_data(result_path=result_folder)
+        result_catalog_entries: Optional[Dict[str, ResultCatalogEntry]] = None
+        if result_catalog_path is None:
+            log.information(f"Checking results from folder: {result_folder}")
+            list_with_result_data_folders = self.get_only_useful_data(result_path=result_folder)
+        else:
+            log.information(f"Querying results from catalog: {result_catalog_path}")
+            result_catalog_entries = self.get_entries_from_result_catalog(
+                result_catalog_path=result_catalog_path, simulation_duration_to_check=simulation_duration_to_check
+            )
+            list_with_result_data_folders = list(result_catalog_entries)
 
         if data_processing_mode == ResultDataProcessingModeEnum.PROCESS_ALL_DATA.name:
             parameter_key = None
@@ -71,7 +95,29 @@ class ResultDataCollection:
         print("parameter key ", parameter_key)
         print("##################")
 
-        if path_to_default_config is None:
+        if result_catalog_entries is not None:
+            default_config_dict = (
+                None if path_to_default_config is None else self.get_default_config(path_to_default_config)
+            )
+            (
+                list_with_csv_files,
+                list_with_parameter_key_values,
+                list_with_module_config_dicts,
+                list_building_set_heating_temperature_in_celsius,
+                list_building_min_indoor_temperature_in_celsius,
+                list_building_diff_min_indoor_and_set_heating_temperature_in_celsius,
+                list_building_set_cooling_temperature_in_celsius,
+                list_building_max_indoor_temperature_in_celsius,
+                list_building_diff_max_indoor_and_set_cooling_temperature_in_celsius,
+                list_building_temp_deviation_below_set_heating_in_celsius_hour,
+                list_building_temp_deviation_above_set_cooling_in_celsius_hour,
+            ) = self.go_through_all_result_catalog_entries_and_collect_file_paths_according_to_parameters(
+                result_catalog_entries=result_catalog_entries,
+                default_config_dict=default_config_dict,
+                parameter_key=parameter_key,
+            )
+
+        elif path_to_default_config is None:
             list_with_parameter_key_values = None
             list_with_csv_files = list_with_result_data_folders
             list_with_module_config_dicts = None
@@ -102,15 +148,23 @@ class ResultDataCollection:
         if not list_with_csv_files:
             raise ValueError("list_with_csv_files is empty")
 
-        all_csv_files = self.import_data_from_file(
-            paths_to_check=list_with_csv_files,
-            analyze_yearly_or_hourly_data=time_resolution_of_data_set,
-        )
+        if result_catalog_entries is None:
+            all_csv_files = self.import_data_from_file(
+                paths_to_check=list_with_csv_files,
+                analyze_yearly_or_hourly_data=time_resolution_of_data_set,
+            )
 
-        dict_of_csv_data = self.make_dictionaries_with_simulation_duration_keys(
-            simulation_duration_to_check=simulation_duration_to_check,
-            all_csv_files=all_csv_files,
-        )
+            dict_of_csv_data = self.make_dictionaries_with_simulation_duration_keys(
+                simulation_duration_to_check=simulation_duration_to_check,
+                all_csv_files=all_csv_files,
+            )
+        else:
+            dict_of_csv_data = self.get_data_files_from_result_catalog_entries(
+                result_catalog_entries=result_catalog_entries,
+                paths_to_check=list_with_csv_files,
+                simulation_duration_to_check=simulation_duration_to_check,
+                time_resolution_of_data_set=time_resolution_of_data_set,
+            )
 
         (
             self.filepath_of_aggregated_dataframe,
@@ -138,6 +192,209 @@ class ResultDataCollection:
 
         print("\n")
 
+    def get_entries_from_result_catalog(
+        self, result_catalog_path: str, simulation_duration_to_check: str
+    ) -> Dict[str, ResultCatalogEntry]:
+        """Get the catalog entries with unique module configs and the wanted simulation duration by their result data folder."""
+        result_catalog_entries = {
+            entry.scenario_data_folder: entry
+            for entry in ResultCatalog(result_catalog_path).get_entries(
+                simulation_duration_in_days=int(simulation_duration_to_check)
+            )
+        }
+        print(
+            "len of list with all paths to containing result data ",
+            len(result_catalog_entries),
+        )
+        if len(result_catalog_entries) == 0:
+            raise ValueError(
+                f"No results with a simulation duration of {simulation_duration_to_check} days are registered in "
+                f"the result catalog {result_catalog_path}."
+            )
+        return result_catalog_entries
+
+    def get_data_files_from_result_catalog_entries(
+        self,
+        result_catalog_entries: Dict[str, ResultCatalogEntry],
+        paths_to_check: List[str],
+        simulation_duration_to_check: str,
+        time_resolution_of_data_set: str,
+    ) -> Dict:
+        """Get the data files of the wanted time resolution of the result data folders from the catalog entries."""
+        kind_of_data_set = ResultDataTypeEnum[time_resolution_of_data_set].value
+        list_with_data_files = []
+        for folder in paths_to_check:
+            entry = result_catalog_entries[os.path.abspath(folder)]
+            if kind_of_data_set not in entry.data_paths:
+                raise ValueError(f"The result catalog contains no {kind_of_data_set} data for the folder {folder}.")
+            list_with_data_files.append(entry.data_paths[kind_of_data_set])
+        return {f"{simulation_duration_to_check}": list_with_data_files}
+
+    def go_through_all_result_catalog_entries_and_collect_file_paths_according_to_parameters(
+        self,
+        result_catalog_entries: Dict[str, ResultCatalogEntry],
+        default_config_dict: Optional[Dict[str, Any]],
+        parameter_key: Optional[str],
+    ) -> Tuple[
+        List[Any],
+        Optional[List[Any]],
+        Optional[List[Any]],
+        List[Any],
+        List[Any],
+        List[Any],
+        List[Any],
+        List[Any],
+        List[Any],
+        List[Any],
+        List[Any],
+    ]:
+        """Order the result folders of the catalog entries according to different parameters.
+
+        Like go_through_all_result_data_folders_and_collect_file_paths_according_to_parameters, but the module
+        configs and the building KPIs are taken from the catalog entries. Without a default config, the module
+        configs are not compared and not returned.
+        """
+        list_with_module_configs: List = []
+        list_with_csv_files: List = []
+        list_with_parameter_key_values: List = []
+        list_building_set_heating_temperature_in_celsius: List = []
+        list_building_set_cooling_temperature_in_celsius: List = []
+        list_building_min_indoor_temperature_in_celsius: List = []
+        list_building_max_indoor_temperature_in_celsius: List = []
+        list_building_diff_min_indoor_and_set_heating_temperature_in_celsius: List = []
+        list_building_diff_max_indoor_and_set_cooling_temperature_in_celsius: List = []
+        list_building_temp_deviation_below_set_heating_in_celsius_hour: List = []
+        list_building_temp_deviation_above_set_cooling_in_celsius_hour: List = []
+        default_config_hash = None if default_config_dict is None else get_config_hash(default_config_dict)
+
+        for folder, entry in result_catalog_entries.items():
+            module_config_dict = dict(entry.module_config)
+            if default_config_dict is None:
+                list_with_csv_files.append(folder)
+            else:
+                # check if module config and default config have any keys in common
+                if len(set(default_config_dict).intersection(module_config_dict)) == 0:
+                    raise KeyError(
+                        f"The module config of the folder {folder} should contain the keys of the default config,",
+                        "otherwise their values cannot be compared.",
+                    )
+                if parameter_key is None:
+                    list_with_module_configs.append(module_config_dict)
+                    list_with_csv_files.append(folder)
+                else:
+                    # for paper: reference scenario without use of pv should have a share of maximum pv power of 0
+                    if "ref_" in entry.scenario:
+                        module_config_dict["share_of_maximum_pv_power"] = 0
+                    # check if there is a module config which is equal to default config
+                    if entry.config_hash == default_config_hash or all(
+                        item in module_config_dict.items() for item in default_config_dict.items()
+                    ):
+                        self.path_of_scenario_data_executed_with_default_config = folder
+                    list_with_csv_files.append(folder)
+                    list_with_parameter_key_values.append(module_config_dict[parameter_key])
+                    list_with_module_configs.append(module_config_dict)
+                    # add to each item in the dict also the default system setup if the default system setup exists
+                    if self.path_of_scenario_data_executed_with_default_config != "":
+                        list_with_csv_files.append(self.path_of_scenario_data_executed_with_default_config)
+                        list_with_parameter_key_values.append(default_config_dict[parameter_key])
+                        list_with_module_configs.append(default_config_dict)
+            self.get_indoor_air_temperatures_of_building_from_result_catalog_entry(
+                entry=entry,
+                list_building_set_heating_temperature_in_celsius=list_building_set_heating_temperature_in_celsius,
+                list_building_min_indoor_temperature_in_celsius=list_building_min_indoor_temperature_in_celsius,
+                list_building_diff_min_indoor_and_set_heating_temperature_in_celsius=list_building_diff_min_indoor_and_set_heating_temperature_in_celsius,
+                list_building_set_cooling_temperature_in_celsius=list_building_set_cooling_temperature_in_celsius,
+                list_building_max_indoor_temperature_in_celsius=list_building_max_indoor_temperature_in_celsius,
+                list_building_diff_max_indoor_and_set_cooling_temperature_in_celsius=list_building_diff_max_indoor_and_set_cooling_temperature_in_celsius,
+                list_building_temp_deviation_below_set_heating_in_celsius_hour=list_building_temp_deviation_below_set_heating_in_celsius_hour,
+                list_building_temp_deviation_above_set_cooling_in_celsius_hour=list_building_temp_deviation_above_set_cooling_in_celsius_hour,
+            )
+
+        return (
+            list_with_csv_files,
+            None if default_config_dict is None else list_with_parameter_key_values,
+            None if default_config_dict is None else list_with_module_configs,
+            list_building_set_heating_temperature_in_celsius,
+            list_building_min_indoor_temperature_in_celsius,
+            list_building_diff_min_indoor_and_set_heating_temperature_in_celsius,
+            list_building_set_cooling_temperature_in_celsius,
+            list_building_max_indoor_temperature_in_celsius,
+            list_building_diff_max_indoor_and_set_cooling_temperature_in_celsius,
+            list_building_temp_deviation_below_set_heating_in_celsius_hour,
+            list_building_temp_deviation_above_set_cooling_in_celsius_hour,
+        )
+
+    def get_indoor_air_temperatures_of_building_from_result_catalog_entry(
+        self,
+        entry: ResultCatalogEntry,
+        list_building_set_heating_temperature_in_celsius: List,
+        list_building_min_indoor_temperature_in_celsius: List,
+        list_building_diff_min_indoor_and_set_heating_temperature_in_celsius: List,
+        list_building_set_cooling_temperature_in_celsius: List,
+        list_building_max_indoor_temperature_in_celsius: List,
+        list_building_diff_max_indoor_and_set_cooling_temperature_in_celsius: List,
+        list_building_temp_deviation_below_set_heating_in_celsius_hour: List,
+        list_building_temp_deviation_above_set_cooling_in_celsius_hour: List,
+    ) -> Tuple[List, List, List, List, List, List, List, List]:
+        """Get indoor air temperatures of building from the KPIs of the catalog entry.
+
+        The set temperatures are part of the names of the temperature deviation KPIs.
+        """
+        try:
+            building_kpis = entry.kpis["BUI1"]["Building"]
+        except KeyError as exc:
+            raise KeyError(
+                f"The result catalog contains no building KPIs for the folder {entry.scenario_data_folder}. "
+                "Run the simulation with the KPI computation."
+            ) from exc
+        deviations_below_set_temperature: List[Tuple[float, Any]] = []
+        deviations_above_set_temperature: List[Tuple[float, Any]] = []
+        for kpi_name, kpi_entry in building_kpis.items():
+            match = re.fullmatch(
+                r"Temperature deviation of building indoor air temperature being (below|above) set temperature "
+                r"(?P<set_temperature>[-+0-9.eE]+) Celsius",
+                kpi_name,
+            )
+            if match is None:
+                continue
+            deviation = (float(match.group("set_temperature")), kpi_entry.get("value"))
+            if match.group(1) == "below":
+                deviations_below_set_temperature.append(deviation)
+            else:
+                deviations_above_set_temperature.append(deviation)
+        if len(deviations_below_set_temperature) != 1 or len(deviations_above_set_temperature) != 1:
+            raise ValueError(
+                f"The building KPIs of the folder {entry.scenario_data_folder} contain no unique temperature "
+                "deviations below and above the set temperatures."
+            )
+        set_heating_temperature, temp_deviation_below_set = deviations_below_set_temperature[0]
+        set_cooling_temperature, temp_deviation_above_set = deviations_above_set_temperature[0]
+        min_temperature = float(building_kpis["Minimum building indoor air temperature reached"].get("value"))
+        max_temperature = float(building_kpis["Maximum building indoor air temperature reached"].get("value"))
+
+        list_building_set_heating_temperature_in_celsius.append(set_heating_temperature)
+        list_building_min_indoor_temperature_in_celsius.append(min_temperature)
+        list_building_diff_min_indoor_and_set_heating_temperature_in_celsius.append(
+            set_heating_temperature - min_temperature
+        )
+        list_building_set_cooling_temperature_in_celsius.append(set_cooling_temperature)
+        list_building_max_indoor_temperature_in_celsius.append(max_temperature)
+        list_building_diff_max_indoor_and_set_cooling_temperature_in_celsius.append(
+            max_temperature - set_cooling_temperature
+        )
+        list_building_temp_deviation_below_set_heating_in_celsius_hour.append(temp_deviation_below_set)
+        list_building_temp_deviation_above_set_cooling_in_celsius_hour.append(temp_deviation_above_set)
+        return (
+            list_building_set_heating_temperature_in_celsius,
+            list_building_min_indoor_temperature_in_celsius,
+            list_building_diff_min_indoor_and_set_heating_temperature_in_celsius,
+            list_building_set_cooling_temperature_in_celsius,
+            list_building_max_indoor_temperature_in_celsius,
+            list_building_diff_max_indoor_and_set_cooling_temperature_in_celsius,
+            list_building_temp_deviation_below_set_heating_in_celsius_hour,
+            list_building_temp_deviation_above_set_cooling_in_celsius_hour,
+        )
+
     def get_only_useful_data(self, result_path: str) -> List[str]:
         """Go through all result folders and filter only useful data and write unuseful data into txt file."""
 
@@ -561,9 +818,8 @@ class ResultDataCollection:
             "Output": defaultdict(list),
         }
 
-        for house_index, csv_file in enumerate(csv_data_list):
+        for house_index, dataframe in enumerate(self.read_result_data_files(csv_data_list)):
             log.information(f"Reading data from house number {house_index}")
-            dataframe = pd.read_csv(csv_file)
             set_of_variables = dataframe["variable"].unique()
 
             for variable in set_of_variables:
@@ -679,6 +935,20 @@ class ResultDataCollection:
         # del dict_with_all_data
         return filename, dict_with_all_data
 
+    def read_result_data_files(self, csv_files: List[str]) -> Iterator[pd.DataFrame]:
+        """Read the result csv files in parallel threads and yield them in the given order.
+
+        Only the columns of the scenario evaluation format are read. The files are read in chunks,
+        so only a few of them are held in memory at the same time.
+        """
+        chunk_size = 4 * RESULT_DATA_READER_COUNT
+        with ThreadPoolExecutor(max_workers=RESULT_DATA_READER_COUNT) as executor:
+            for start in range(0, len(csv_files), chunk_size):
+                yield from executor.map(
+                    lambda csv_file: pd.read_csv(csv_file, usecols=lambda column: column in RESULT_DATA_COLUMNS),
+                    csv_files[start : start + chunk_size],
+                )
+
     def store_scenario_data_with_the_right_name_and_in_the_right_path(
         self,
         result_data_folder: str,
@@ -102,6 +102,8 @@ class ScenarioAnalysisConfig(ConfigBase):
     variables_to_check: List[str]
     dict_with_scenarios_to_check: Optional[Dict]
     dict_with_extra_information_for_specific_plot: Dict[str, Dict]
+    # Path of the SQLite result catalog that the simulations registered into; None searches the result folders.
+    result_catalog_path: Optional[str] = None
 
     @classmethod
     def get_default(cls):
@@ -194,6 +196,7 @@ class ScenarioAnalysisWithConfig:
             path_to_default_config=path_to_default_config,
             time_resolution_of_data_set=time_resolution_of_data_set,
             simulation_duration_to_check=simulation_duration_to_check_in_days,
+            result_catalog_path=scenario_analysis_config.result_catalog_path,
         )
         result_data_plotting.ScenarioChartGeneration(
             simulation_duration_to_check=simulation_duration_to_check_in_days,
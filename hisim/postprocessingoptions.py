@@ -40,3 +40,4 @@ class PostProcessingOptions(IntEnum):
     WRITE_CONFIGS_FOR_SCENARIO_EVALUATION_TO_JSON = 26
     EXPORT_MONTHLY_RESULTS = 27
     EXPORT_RESULTS_IN_ONE_FILE = 38
+    EXPORT_TO_PARQUET = 39
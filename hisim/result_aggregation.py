@@ -0,0 +1,182 @@
+"""Hourly, daily, monthly and cumulative aggregation of the simulation results.
+
+Every output is aggregated either as mean or as sum, depending on whether its unit is in
+:data:`hisim.loadtypes.UNITS_USING_MEAN_AGGREGATION`. Instead of resampling every column with
+pandas, the aggregator reduces the whole (timesteps x outputs) array at once. The timesteps are
+reduced to hourly sums with precomputed period boundaries. The daily, monthly and cumulative
+aggregates are derived from the hourly sums, because hours always lie within one day and one month.
+
+The hourly sums can also be updated row by row while the simulation runs. Then the aggregates are
+available after the last timestep without the per-step result array.
+
+Like the pandas resampling, NaN values are skipped: they do not count towards the sums, and the means
+are divided by the number of values that are not NaN. Periods with only NaN values get a sum of 0 and
+a mean of NaN.
+"""
+
+# clean
+from typing import List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from hisim.component import ComponentOutput
+from hisim.loadtypes import UNITS_USING_MEAN_AGGREGATION
+
+#: Frequencies of the aggregated results, matching the labels of the former pandas resampling.
+HOURLY_FREQUENCY: str = "60min"
+DAILY_FREQUENCY: str = "D"
+MONTHLY_FREQUENCY: str = "ME"
+
+
+def get_group_starts(codes: np.ndarray) -> np.ndarray:
+    """Returns the positions where a new group starts in an array of non-decreasing group codes."""
+    return np.flatnonzero(np.diff(codes, prepend=-1))
+
+
+class ResultAggregator:
+
+    """Aggregates the simulation results to hourly, daily, monthly and cumulative values in one pass."""
+
+    def __init__(self, index: pd.DatetimeIndex, use_mean: Sequence[bool]) -> None:
+        """Precomputes the period boundaries of all timesteps.
+
+        Args:
+            index: Sorted time stamps of all timesteps.
+            use_mean: One flag per output. True if the output is aggregated as mean, False for a sum.
+        """
+        if len(index) == 0:
+            raise ValueError("Can not aggregate results without timesteps.")
+        if not index.is_monotonic_increasing:
+            raise ValueError("The time stamps of the results need to be sorted.")
+        self.number_of_timesteps: int = len(index)
+        self.use_mean: np.ndarray = np.asarray(use_mean, dtype=bool)
+        self.number_of_outputs: int = len(self.use_mean)
+
+        first_hour = index[0].floor("h")
+        self.hourly_index: pd.DatetimeIndex = pd.date_range(
+            start=first_hour, end=index[-1].floor("h"), freq=HOURLY_FREQUENCY
+        )
+        self.daily_index: pd.DatetimeIndex = pd.date_range(
+            start=first_hour.normalize(), end=index[-1].normalize(), freq=DAILY_FREQUENCY
+        )
+        first_month_start = first_hour.normalize().replace(day=1)
+        self.monthly_index: pd.DatetimeIndex = pd.date_range(
+            start=first_month_start, end=index[-1].normalize() + pd.offsets.MonthEnd(0), freq=MONTHLY_FREQUENCY
+        )
+
+        # hour of every timestep, and day and month of every hour
+        self.timestep_hour_codes: np.ndarray = np.asarray(
+            (index.floor("h") - first_hour) // pd.Timedelta(hours=1), dtype=np.int64
+        )
+        self.timestep_group_starts: np.ndarray = get_group_starts(self.timestep_hour_codes)
+        self.hour_day_codes: np.ndarray = np.asarray(
+            (self.hourly_index.normalize() - first_hour.normalize()).days, dtype=np.int64
+        )
+        self.hour_month_codes: np.ndarray = np.asarray(
+            (self.hourly_index.year - first_month_start.year) * 12
+            + self.hourly_index.month
+            - first_month_start.month,
+            dtype=np.int64,
+        )
+        self.hourly_counts: np.ndarray = np.bincount(self.timestep_hour_codes, minlength=len(self.hourly_index))
+        self.hourly_sums: np.ndarray = np.zeros((len(self.hourly_index), self.number_of_outputs), dtype=np.float64)
+        # number of skipped NaN values per hour and output
+        self.hourly_nan_counts: np.ndarray = np.zeros((len(self.hourly_index), self.number_of_outputs), dtype=np.int64)
+        self.rows_added: int = 0
+
+    @classmethod
+    def for_outputs(cls, index: pd.DatetimeIndex, all_outputs: List[ComponentOutput]) -> "ResultAggregator":
+        """Creates the aggregator with mean or sum aggregation according to the units of the outputs."""
+        return cls(index, [output.unit in UNITS_USING_MEAN_AGGREGATION for output in all_outputs])
+
+    def aggregate(self, values: np.ndarray) -> None:
+        """Reduces the complete (timesteps x outputs) result array to hourly sums."""
+        if values.shape != (self.number_of_timesteps, self.number_of_outputs):
+            raise ValueError(
+                f"Expected results of shape {(self.number_of_timesteps, self.number_of_outputs)}, got {values.shape}."
+            )
+        self.hourly_sums[:] = 0.0
+        self.hourly_nan_counts[:] = 0
+        if self.number_of_outputs > 0:
+            hours = self.timestep_hour_codes[self.timestep_group_starts]
+            nan_mask = np.isnan(values)
+            if nan_mask.any():
+                values = np.where(nan_mask, 0.0, values)
+                self.hourly_nan_counts[hours] = np.add.reduceat(
+                    nan_mask.astype(np.int64), self.timestep_group_starts, axis=0
+                )
+            self.hourly_sums[hours] = np.add.reduceat(values, self.timestep_group_starts, axis=0)
+        self.rows_added = self.number_of_timesteps
+
+    def add_row(self, timestep: int, row_values: np.ndarray) -> None:
+        """Adds the converged values of one timestep to the hourly sums while the simulation runs."""
+        hour = self.timestep_hour_codes[timestep]
+        nan_mask = np.isnan(row_values)
+        if nan_mask.any():
+            row_values = np.where(nan_mask, 0.0, row_values)
+            self.hourly_nan_counts[hour] += nan_mask
+        self.hourly_sums[hour] += row_values
+        self.rows_added += 1
+
+    def get_results(
+        self, column_names: List[str]
+    ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """Returns the cumulative, monthly, daily and hourly results, like :meth:`Simulator.get_std_results`."""
+        if len(column_names) != self.number_of_outputs:
+            raise ValueError(
+                f"Got {len(column_names)} column names for an aggregator with {self.number_of_outputs} outputs."
+            )
+        if self.rows_added != self.number_of_timesteps:
+            raise ValueError(
+                f"Only {self.rows_added} of {self.number_of_timesteps} timesteps were added to the aggregator."
+            )
+        daily_starts = get_group_starts(self.hour_day_codes)
+        monthly_starts = get_group_starts(self.hour_month_codes)
+        daily_sums = np.add.reduceat(self.hourly_sums, daily_starts, axis=0)
+        daily_counts = np.add.reduceat(self.hourly_counts, daily_starts)
+        daily_nan_counts = np.add.reduceat(self.hourly_nan_counts, daily_starts, axis=0)
+        monthly_sums = np.add.reduceat(self.hourly_sums, monthly_starts, axis=0)
+        monthly_counts = np.add.reduceat(self.hourly_counts, monthly_starts)
+        monthly_nan_counts = np.add.reduceat(self.hourly_nan_counts, monthly_starts, axis=0)
+        cumulative_sums = self.hourly_sums.sum(axis=0, keepdims=True)
+        cumulative_counts = np.array([self.number_of_timesteps])
+        cumulative_nan_counts = self.hourly_nan_counts.sum(axis=0, keepdims=True)
+
+        results_merged_cumulative = pd.DataFrame(
+            self.finish_aggregates(cumulative_sums, cumulative_counts, cumulative_nan_counts), columns=column_names
+        )
+        results_merged_monthly = pd.DataFrame(
+            self.finish_aggregates(monthly_sums, monthly_counts, monthly_nan_counts),
+            columns=column_names,
+            index=self.monthly_index,
+        )
+        results_merged_daily = pd.DataFrame(
+            self.finish_aggregates(daily_sums, daily_counts, daily_nan_counts),
+            columns=column_names,
+            index=self.daily_index,
+        )
+        results_merged_hourly = pd.DataFrame(
+            self.finish_aggregates(self.hourly_sums, self.hourly_counts, self.hourly_nan_counts),
+            columns=column_names,
+            index=self.hourly_index,
+        )
+        return (
+            results_merged_cumulative,
+            results_merged_monthly,
+            results_merged_daily,
+            results_merged_hourly,
+        )
+
+    def finish_aggregates(self, sums: np.ndarray, counts: np.ndarray, nan_counts: np.ndarray) -> np.ndarray:
+        """Divides the sums of the mean outputs by the number of values per period that are not NaN.
+
+        Periods without values get NaN for mean outputs and 0 for sum outputs, like pandas resampling.
+        """
+        aggregates = sums.copy()
+        value_counts = counts[:, np.newaxis] - nan_counts[:, self.use_mean]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = sums[:, self.use_mean] / value_counts
+        means[value_counts == 0] = np.nan
+        aggregates[:, self.use_mean] = means
+        return aggregates
@@ -0,0 +1,98 @@
+"""Columnar store for the converged values of all simulation timesteps.
+
+The simulator writes every converged single time step into one row of a preallocated
+(timesteps x outputs) float64 array. The results DataFrame for post processing is a
+zero-copy view over that array, so the results are only held in memory once.
+Optionally, the array can be backed by a memory-mapped ``.npy`` file in the result directory.
+For lean runs, the store only keeps a selection of the outputs, as compact float32 values.
+"""
+
+# clean
+import os
+from typing import List, Optional, Sequence
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from hisim import log
+
+#: File name of the memory-mapped result array inside the result directory.
+MEMORY_MAPPED_RESULTS_FILENAME: str = "simulation_results.npy"
+
+
+class ResultStore:
+
+    """Preallocated (timesteps x outputs) result array that the simulator fills row by row."""
+
+    def __init__(
+        self,
+        number_of_timesteps: int,
+        number_of_outputs: int,
+        memmap_path: Optional[str] = None,
+        output_indices: Optional[Sequence[int]] = None,
+        dtype: npt.DTypeLike = np.float64,
+    ) -> None:
+        """Allocates the result array, either in memory or as memory-mapped file.
+
+        Args:
+            number_of_timesteps: Number of rows of the result array.
+            number_of_outputs: Number of outputs of the simulation.
+            memmap_path: If set, the result array is backed by a memory-mapped file at this path.
+            output_indices: Global indices of the outputs to keep. Defaults to all outputs.
+            dtype: Type of the stored values.
+        """
+        self.number_of_timesteps: int = number_of_timesteps
+        self.output_indices: Optional[np.ndarray] = None
+        if output_indices is not None:
+            self.output_indices = np.asarray(output_indices, dtype=np.intp)
+            number_of_outputs = len(self.output_indices)
+        self.number_of_outputs: int = number_of_outputs
+        self.memmap_path: Optional[str] = memmap_path
+        self.rows_written: int = 0
+        dtype = np.dtype(dtype)
+        self.values: np.ndarray
+        if memmap_path is None:
+            self.values = np.zeros((number_of_timesteps, number_of_outputs), dtype=dtype)
+        else:
+            log.information("Storing simulation results in memory-mapped file " + memmap_path)
+            self.values = np.lib.format.open_memmap(
+                memmap_path, mode="w+", dtype=dtype, shape=(number_of_timesteps, number_of_outputs)
+            )
+
+    def __len__(self) -> int:
+        """Returns the number of timesteps that were written so far."""
+        return self.rows_written
+
+    def write_row(self, timestep: int, row_values: np.ndarray) -> None:
+        """Writes the converged values of one timestep into its row."""
+        if self.output_indices is None:
+            self.values[timestep, :] = row_values
+        else:
+            self.values[timestep, :] = row_values[self.output_indices]
+        if timestep >= self.rows_written:
+            self.rows_written = timestep + 1
+
+    def to_data_frame(self, column_names: List[str], index: Optional[pd.Index] = None) -> pd.DataFrame:
+        """Returns a DataFrame that is a view on the result array without copying the data.
+
+        Compact float32 values are converted to a float64 copy, so the post processing computes with float64.
+        """
+        if len(column_names) != self.number_of_outputs:
+            raise ValueError(
+                f"Got {len(column_names)} column names for a result store with {self.number_of_outputs} outputs."
+            )
+        if self.values.dtype != np.float64:
+            return pd.DataFrame(data=self.values.astype(np.float64), columns=column_names, index=index, copy=False)
+        return pd.DataFrame(data=self.values, columns=column_names, index=index, copy=False)
+
+    def release(self) -> None:
+        """Flushes and removes the memory-mapped file. In-memory stores are left to the garbage collector."""
+        if self.memmap_path is None:
+            return
+        if isinstance(self.values, np.memmap):
+            self.values.flush()
+        try:
+            os.remove(self.memmap_path)
+        except OSError as error:
+            log.warning(f"Could not remove memory-mapped result file {self.memmap_path}: {error}")
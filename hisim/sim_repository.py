@@ -1,10 +1,35 @@
 """ Class for the simulation repository. """
 # clean
-from typing import Any, Dict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional, Sequence, Union
+
+import numpy as np
 
 from hisim import loadtypes as lt
 
 
+@dataclass
+class ForecastSource:
+
+    """Full-length values of a component, of which consumers read a forecast window.
+
+    The producing component only moves the start of the window in every timestep.
+    The window itself is a read-only view into the values and only created when it is read.
+    """
+
+    values: np.ndarray
+    horizon_in_timesteps: int
+    start: int = 0
+
+    def get_window(self, start: Optional[int] = None, horizon_in_timesteps: Optional[int] = None) -> np.ndarray:
+        """Returns the read-only view of the values from the start for the horizon, cut at the end of the values."""
+        if start is None:
+            start = self.start
+        if horizon_in_timesteps is None:
+            horizon_in_timesteps = self.horizon_in_timesteps
+        return self.values[start : start + horizon_in_timesteps]
+
+
 class SimRepository:
 
     """Class for exchanging information across all components."""
@@ -13,18 +38,21 @@ class SimRepository:
         """Initializes the SimRepository."""
         self.entries: Dict[str, Any] = {}
         self.dynamic_entries: Dict[lt.ComponentType, Dict[int, Any]] = {component_type: {} for component_type in lt.ComponentType}
+        self.forecast_sources: Dict[Hashable, ForecastSource] = {}
 
     def set_entry(self, key: str, entry: Any) -> None:
         """Sets an entry in the SimRepository."""
         self.entries[key] = entry
 
     def get_entry(self, key: str) -> Any:
-        """Gets an entry from the SimRepository."""
+        """Gets an entry from the SimRepository. For forecast sources, this is the current forecast window."""
+        if key not in self.entries and key in self.forecast_sources:
+            return self.forecast_sources[key].get_window()
         return self.entries[key]
 
     def entry_exists(self, key: str) -> bool:
         """Checks if an entry exists."""
-        return key in self.entries
+        return key in self.entries or key in self.forecast_sources
 
     def delete_entry(self, key: str) -> None:
         """Deletes an existing entry."""
@@ -35,24 +63,58 @@ class SimRepository:
         self.dynamic_entries[component_type][source_weight] = entry
 
     def get_dynamic_entry(self, component_type: lt.ComponentType, source_weight: int) -> Any:
-        """Gets a dynamic entry."""
+        """Gets a dynamic entry. For dynamic forecast sources, this is the current forecast window."""
         entries_by_weight = self.dynamic_entries.get(component_type, None)
         if entries_by_weight is None:
             return None
+        if source_weight not in entries_by_weight and (component_type, source_weight) in self.forecast_sources:
+            return self.forecast_sources[(component_type, source_weight)].get_window()
         value = entries_by_weight.get(source_weight, None)
         return value
 
     def get_dynamic_component_weights(self, component_type: lt.ComponentType) -> list[int]:
         """Gets weights for dynamic components."""
-        return list(self.dynamic_entries[component_type].keys())
+        weights = list(self.dynamic_entries[component_type].keys())
+        for key in self.forecast_sources:
+            if isinstance(key, tuple) and key[0] == component_type and key[1] not in weights:
+                weights.append(key[1])
+        return weights
 
     def delete_dynamic_entry(self, component_type: lt.ComponentType, source_weight: int) -> Any:
         """Deletes a dynamic component entry."""
         self.dynamic_entries[component_type].pop(source_weight)
 
+    def set_forecast_source(
+        self, key: Hashable, values: Union[Sequence[float], np.ndarray], horizon_in_timesteps: int
+    ) -> None:
+        """Sets the full-length values of a forecast once, before the simulation.
+
+        Float arrays are not copied. The forecast windows are read-only views, so consumers cannot change the values.
+        Dynamic forecasts use the key (component_type, source_weight).
+        """
+        read_only_values = np.asarray(values, dtype=np.float64).view()
+        read_only_values.flags.writeable = False
+        self.forecast_sources[key] = ForecastSource(read_only_values, int(horizon_in_timesteps))
+
+    def set_forecast_start(self, key: Hashable, start: int) -> None:
+        """Moves the forecast window to the timestep, without creating the window."""
+        self.forecast_sources[key].start = start
+
+    def get_forecast_window(
+        self, key: Hashable, start: Optional[int] = None, horizon_in_timesteps: Optional[int] = None
+    ) -> np.ndarray:
+        """Returns the read-only forecast window, by default from the current start for the horizon of the source."""
+        return self.forecast_sources[key].get_window(start, horizon_in_timesteps)
+
+    def forecast_exists(self, key: Hashable) -> bool:
+        """Checks if a forecast source exists."""
+        return key in self.forecast_sources
+
     def clear(self) -> None:
         """Clears all dictionaries at the end of the simulation to enable garbage collection and reduce memory consumption."""
         self.entries.clear()
         del self.entries
         self.dynamic_entries.clear()
         del self.dynamic_entries
+        self.forecast_sources.clear()
+        del self.forecast_sources
@@ -0,0 +1,111 @@
+"""Checkpoints of long simulations, so that a restarted simulation continues from the last checkpoint.
+
+If ``checkpoint_interval_in_seconds`` is set in the simulation parameters, the simulator periodically
+writes a checkpoint into the result directory at the beginning of a timestep. A checkpoint holds the
+states of all components right after ``i_save_state``, the single timestep values, the running KPI values
+and the contents of the SimRepository. The results of the finished timesteps are kept in a separate file,
+to which every checkpoint only appends the timesteps since the last checkpoint. A simulation that is
+started again with the same result directory and the same outputs resumes from the checkpoint.
+The checkpoint is removed once the simulation finished.
+"""
+
+# clean
+import os
+import pickle
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from hisim import log
+
+#: File name of the checkpoint inside the result directory.
+CHECKPOINT_FILENAME: str = "simulation_checkpoint.pkl"
+
+#: File name of the results of the finished timesteps, next to the checkpoint.
+CHECKPOINT_RESULTS_FILENAME: str = "simulation_checkpoint_results.bin"
+
+
+@dataclass
+class SimulationCheckpoint:
+
+    """Everything that is needed to continue a simulation at the beginning of a timestep."""
+
+    next_timestep: int
+    number_of_timesteps: int
+    output_names: List[str]
+    stsv_values: np.ndarray
+    #: Shape of the result array of all timesteps and its data type, the rows are in the results file.
+    result_shape: Tuple[int, ...]
+    result_dtype: str
+    component_states: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    sim_repository_entries: Dict[str, Any] = field(default_factory=dict)
+    sim_repository_dynamic_entries: Dict[Any, Dict[int, Any]] = field(default_factory=dict)
+    kpi_accumulator_state: Optional[Dict[str, Any]] = None
+
+
+def write_checkpoint(file_path: str, checkpoint: SimulationCheckpoint) -> None:
+    """Writes the checkpoint into a temporary file first and then replaces the last checkpoint.
+
+    A job that is killed while writing keeps its last complete checkpoint.
+    """
+    temporary_file_path = file_path + ".tmp"
+    with open(temporary_file_path, "wb") as file:
+        pickle.dump(checkpoint, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary_file_path, file_path)
+
+
+def read_checkpoint(file_path: str) -> Optional[SimulationCheckpoint]:
+    """Reads the checkpoint. Returns None if there is no checkpoint or it cannot be read."""
+    if not os.path.isfile(file_path):
+        return None
+    try:
+        with open(file_path, "rb") as file:
+            checkpoint = pickle.load(file)
+    except Exception as error:  # pylint: disable=broad-except
+        log.warning(f"Could not read the checkpoint {file_path}, starting from the first timestep: {error}")
+        return None
+    if not isinstance(checkpoint, SimulationCheckpoint):
+        log.warning(f"The file {file_path} is no simulation checkpoint, starting from the first timestep.")
+        return None
+    return checkpoint
+
+
+def get_results_path(file_path: str) -> str:
+    """Returns the path of the results file that belongs to the checkpoint."""
+    return os.path.join(os.path.dirname(file_path), CHECKPOINT_RESULTS_FILENAME)
+
+
+def append_checkpoint_results(file_path: str, results: np.ndarray, first_timestep: int, next_timestep: int) -> None:
+    """Writes the result rows of the timesteps since the last checkpoint into the results file.
+
+    The rows are written behind the rows of the first timesteps, rows that were written after the last
+    checkpoint of an interrupted simulation are replaced.
+    """
+    results_path = get_results_path(file_path)
+    bytes_per_timestep = results[0].nbytes
+    mode = "r+b" if first_timestep > 0 and os.path.isfile(results_path) else "wb"
+    with open(results_path, mode) as file:
+        file.seek(first_timestep * bytes_per_timestep)
+        file.write(np.ascontiguousarray(results[first_timestep:next_timestep]).tobytes())
+        file.truncate()
+
+
+def read_checkpoint_results(file_path: str, checkpoint: SimulationCheckpoint) -> Optional[np.ndarray]:
+    """Reads the result rows of the timesteps before the checkpoint. Returns None if they are incomplete."""
+    results_path = get_results_path(file_path)
+    if not os.path.isfile(results_path):
+        return None
+    columns = int(np.prod(checkpoint.result_shape[1:]))
+    number_of_values = checkpoint.next_timestep * columns
+    values = np.fromfile(results_path, dtype=np.dtype(checkpoint.result_dtype), count=number_of_values)
+    if len(values) != number_of_values:
+        return None
+    return values.reshape((checkpoint.next_timestep, *checkpoint.result_shape[1:]))
+
+
+def remove_checkpoint(file_path: str) -> None:
+    """Removes the checkpoint and its results after the simulation finished."""
+    for path in (file_path, file_path + ".tmp", get_results_path(file_path)):
+        if os.path.exists(path):
+            os.remove(path)
@@ -3,7 +3,8 @@
 from __future__ import annotations
 import os
 import inspect
-from typing import List, Optional, Sequence
+from typing import List, Optional, Sequence, Tuple
+import calendar
 import enum
 
 import datetime
@@ -14,6 +15,14 @@ from hisim import log
 from hisim.postprocessingoptions import PostProcessingOptions
 
 
+def shift_date_by_years(date: datetime.datetime, offset_in_years: int) -> datetime.datetime:
+    """Returns the date in another year, February 29 becomes February 28 in years that are no leap years."""
+    year = date.year + offset_in_years
+    if date.month == 2 and date.day == 29 and not calendar.isleap(year):
+        return date.replace(year=year, day=28)
+    return date.replace(year=year)
+
+
 @dataclass()
 class SimulationParameters(JSONWizard):
 
@@ -45,6 +54,22 @@ class SimulationParameters(JSONWizard):
         cache_dir_path: str = os.path.join(os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe()))), "inputs", "cache"),  # type: ignore
         multiple_buildings: bool = False,
         log_connections: bool = False,
+        convergence_absolute_tolerance: float = 0.0001,
+        convergence_relative_tolerance: float = 0.0,
+        use_memory_mapped_results: bool = False,
+        use_component_dependency_scheduling: bool = False,
+        use_selective_resimulation: bool = False,
+        use_time_series_sources: bool = False,
+        persist_hplib_results: bool = False,
+        plot_worker_count: int = 1,
+        use_streaming_aggregation: bool = False,
+        export_results_as_float32: bool = False,
+        result_catalog_path: Optional[str] = None,
+        use_lean_results: bool = False,
+        profile_components: bool = False,
+        checkpoint_interval_in_seconds: Optional[float] = None,
+        additional_simulation_years: Optional[Sequence[int]] = None,
+        log_connections_to_result_catalog: bool = False,
     ):
         """Initialize the SimulationParameters.
 
@@ -76,9 +101,59 @@ class SimulationParameters(JSONWizard):
                 Defaults to False (single building).
             log_connections: If True, enable logging of component connections for
                 debugging and verification. Defaults to False.
+            convergence_absolute_tolerance: Absolute difference between two iterations below which
+                an output counts as converged. Defaults to 0.0001.
+            convergence_relative_tolerance: Additional tolerance relative to the magnitude of the
+                previous value of an output. Defaults to 0.0 (purely absolute check).
+            use_memory_mapped_results: If True, the result array of all timesteps is backed by a
+                memory-mapped file in the result directory instead of RAM. Defaults to False.
+            use_component_dependency_scheduling: If True, the components are ordered by their input/output
+                connections. Components outside of connection cycles are simulated once per timestep and only
+                the cyclic blocks are iterated until convergence. Components that exchange data only via the
+                SimRepository are not seen by the scheduler. Defaults to False.
+            use_selective_resimulation: If True, a component is only restored and simulated again in an
+                iteration if one of its inputs changed beyond the convergence tolerance in the last pass.
+                The number of i_simulate calls and skipped simulations of every component is then written to
+                component_iteration_statistics.json in the result directory. Defaults to False.
+            use_time_series_sources: If True, components that declared precomputed values for all of their
+                outputs are not simulated anymore. Their output columns are written directly into every
+                timestep. Defaults to False.
+            persist_hplib_results: If True, heat pumps based on hplib load the results of earlier simulations
+                with the same heat pump model from the cache directory and save their results there after
+                the last timestep. Defaults to False.
+            plot_worker_count: Number of processes that render the line, carpet, single day and monthly
+                bar charts in the post processing. Defaults to 1, which renders the charts one after the other.
+            use_streaming_aggregation: If True, the hourly, daily, monthly and cumulative results are updated
+                after every timestep instead of being aggregated from the complete results after the
+                simulation. Defaults to False.
+            export_results_as_float32: If True, the Parquet export stores the results as float32 instead of
+                float64 values. Defaults to False.
+            result_catalog_path: Path of the SQLite result catalog. If set, the results that are prepared for the
+                scenario evaluation are registered in this catalog. Defaults to None.
+            use_lean_results: If True, only the results of the outputs that the KPI, OPEX and CAPEX computation
+                reads are kept, as float32 values. These are the outputs with a post processing flag or with a
+                load type in LOAD_TYPES_FOR_KPI_COMPUTATION. All post processing only sees these outputs.
+                Meant for large parameter sweeps that only need the KPIs. Defaults to False.
+            profile_components: If True, the wall time and calls of i_simulate, i_save_state, i_restore_state and
+                i_doublecheck are measured for every component, together with the iterations until convergence of
+                every timestep. The profile is written to component_profile.json in the result directory.
+                Defaults to False.
+            checkpoint_interval_in_seconds: If set, the simulation writes a checkpoint into the result directory
+                whenever this wall time passed since the last checkpoint. A simulation that is started again with
+                the same result directory continues from the last checkpoint. Defaults to None (no checkpoints).
+            additional_simulation_years: Years that are simulated after the period from start_date to end_date,
+                with the same prepared components and their states at the end of the previous year. The results
+                of every year are written into a subdirectory of the result directory named after the year.
+                Defaults to None (only one period).
+            log_connections_to_result_catalog: If True and a result_catalog_path is set, the logged component
+                connections are stored in the result catalog instead of component_connections.json.
+                Defaults to False.
         """
         self.start_date: datetime.datetime = start_date
         self.end_date: datetime.datetime = end_date
+        # the configured period, further years are derived from it so that a clamped leap day is not carried over
+        self.configured_start_date: datetime.datetime = start_date
+        self.configured_end_date: datetime.datetime = end_date
         self.seconds_per_timestep = seconds_per_timestep
         self.duration = end_date - start_date
         total_seconds = self.duration.total_seconds()
@@ -96,6 +171,42 @@ class SimulationParameters(JSONWizard):
         self.multiple_buildings = multiple_buildings
         self.figure_format = FigureFormat.PNG
         self.log_connections = log_connections
+        self.convergence_absolute_tolerance: float = convergence_absolute_tolerance
+        self.convergence_relative_tolerance: float = convergence_relative_tolerance
+        self.use_memory_mapped_results: bool = use_memory_mapped_results
+        self.use_component_dependency_scheduling: bool = use_component_dependency_scheduling
+        self.use_selective_resimulation: bool = use_selective_resimulation
+        self.use_time_series_sources: bool = use_time_series_sources
+        self.persist_hplib_results: bool = persist_hplib_results
+        self.plot_worker_count: int = plot_worker_count
+        self.use_streaming_aggregation: bool = use_streaming_aggregation
+        self.export_results_as_float32: bool = export_results_as_float32
+        self.result_catalog_path: Optional[str] = result_catalog_path
+        self.use_lean_results: bool = use_lean_results
+        self.profile_components: bool = profile_components
+        self.checkpoint_interval_in_seconds: Optional[float] = checkpoint_interval_in_seconds
+        self.additional_simulation_years: List[int] = list(additional_simulation_years or [])
+        self.log_connections_to_result_catalog: bool = log_connections_to_result_catalog
+
+    def set_period(self, start_date: datetime.datetime, end_date: datetime.datetime) -> None:
+        """Moves the simulation to another period with the same time resolution."""
+        self.start_date = start_date
+        self.end_date = end_date
+        self.duration = end_date - start_date
+        self.timesteps = int(self.duration.total_seconds() / self.seconds_per_timestep)
+        self.year = int(start_date.year)
+
+    def get_period_of_year(self, year: int) -> Tuple[datetime.datetime, datetime.datetime]:
+        """Returns the start and end date of the simulated period, shifted to another year.
+
+        The period is derived from the configured one. A period that starts or ends on February 29 starts or ends
+        on February 28 in years that are no leap years.
+        """
+        offset_in_years = year - self.configured_start_date.year
+        return (
+            shift_date_by_years(self.configured_start_date, offset_in_years),
+            shift_date_by_years(self.configured_end_date, offset_in_years),
+        )
 
     @classmethod
     def full_year(cls, year: int, seconds_per_timestep: int) -> SimulationParameters:
@@ -5,20 +5,31 @@ It iterates over all components in each timestep until convergence and loops ove
 # clean
 import os
 import datetime
+import json
 from typing import List, Tuple, Optional, Dict, Any, Union
+import pickle
 import time
+import numpy as np
 import pandas as pd
 
 from hisim.postprocessing.postprocessing_datatransfer import PostProcessingDataTransfer
 from hisim.component_wrapper import ComponentWrapper
+from hisim.output_registry import OutputRegistry
+from hisim.component_scheduler import EvaluationBlock, build_evaluation_blocks
 from hisim import sim_repository
+from hisim.result_store import ResultStore, MEMORY_MAPPED_RESULTS_FILENAME
+from hisim.result_aggregation import ResultAggregator
+from hisim.component_profiling import ComponentProfile, SimulationProfile
+from hisim import simulation_checkpoint
+from hisim.postprocessing.kpi_computation.kpi_accumulators import KpiAccumulators
+from hisim.postprocessing.scenario_evaluation.result_catalog import ResultCatalog
 import hisim.component as cp
 import hisim.dynamic_component as dcp
 from hisim import log
+from hisim.loadtypes import LOAD_TYPES_FOR_KPI_COMPUTATION
 from hisim.simulationparameters import SimulationParameters
 from hisim import utils
 from hisim import postprocessingoptions
-from hisim.loadtypes import UNITS_USING_MEAN_AGGREGATION
 from hisim.result_path_provider import ResultPathProviderSingleton, SortingOptionEnum
 
 
@@ -29,6 +40,9 @@ __maintainer__ = "Noah Pflugradt"
 __email__ = "n.pflugradt@fz-juelich.de"
 __status__ = "production"
 
+#: File name of the logged component connections inside the result directory.
+COMPONENT_CONNECTIONS_FILENAME: str = "component_connections.json"
+
 
 class Simulator:
 
@@ -57,7 +71,9 @@ class Simulator:
             self._simulation_parameters = my_simulation_parameters
             log.logger.logging_level = self._simulation_parameters.logging_level
         self.wrapped_components: List[ComponentWrapper] = []
-        self.all_outputs: List[cp.ComponentOutput] = []
+        self.output_registry: OutputRegistry = OutputRegistry()
+        # all outputs in the order of their global index
+        self.all_outputs: List[cp.ComponentOutput] = self.output_registry.outputs
 
         self.setup_function = setup_function
         self.module_filename = module_filename
@@ -67,6 +83,10 @@ class Simulator:
         self.results_data_frame: pd.DataFrame
         self.iteration_logging_path: str = ""
         self.config_dictionary: Dict[str, Any] = {}
+        self.evaluation_blocks: Optional[List[EvaluationBlock]] = None
+        self.simulated_components: Optional[List[ComponentWrapper]] = None
+        self.time_series_output_indices: np.ndarray = np.zeros(0, dtype=np.intp)
+        self.time_series_values: np.ndarray = np.zeros((0, 0), dtype=np.float64)
 
     def set_simulation_parameters(self, my_simulation_parameters: SimulationParameters) -> None:
         """Sets the simulation parameters and the logging level at the same time."""
@@ -97,7 +117,7 @@ class Simulator:
 
         # set the wrapper
         wrap = ComponentWrapper(component, is_cachable, connect_automatically=connect_automatically)
-        wrap.register_component_outputs(self.all_outputs, wrapped_components_so_far=self.wrapped_components)
+        wrap.register_component_outputs(self.output_registry, wrapped_components_so_far=self.wrapped_components)
         self.wrapped_components.append(wrap)
         if component.component_name in self.config_dictionary:
             raise ValueError("duplicate component name : " + component.component_name)
@@ -107,11 +127,46 @@ class Simulator:
     def connect_all_components(self) -> None:
         """Connects the inputs from every component to the corresponding outputs."""
         for wrapped_component in self.wrapped_components:
-            wrapped_component.connect_inputs(self.all_outputs)
+            wrapped_component.connect_inputs(self.output_registry)
+
+    def write_component_connections(self) -> None:
+        """Writes the connections that all components collected in connect_input, if connections are logged.
+
+        The connections are written once into component_connections.json in the result directory, or into the
+        result catalog if log_connections_to_result_catalog is set.
+        """
+        if not self._simulation_parameters.log_connections:
+            return
+        connection_records = [
+            connection_record
+            for wrapped_component in self.wrapped_components
+            for connection_record in wrapped_component.my_component.connection_records
+        ]
+        result_directory = self._simulation_parameters.result_directory
+        result_catalog_path = self._simulation_parameters.result_catalog_path
+        if self._simulation_parameters.log_connections_to_result_catalog:
+            if result_catalog_path is not None:
+                ResultCatalog(result_catalog_path).register_component_connections(result_directory, connection_records)
+                log.information(f"Stored {len(connection_records)} component connections in {result_catalog_path}")
+                return
+            log.warning("No result_catalog_path is set, so the component connections are written to a file.")
+        file_name = os.path.join(result_directory, COMPONENT_CONNECTIONS_FILENAME)
+        try:
+            os.makedirs(result_directory, exist_ok=True)
+            with open(file_name, "w", encoding="utf-8") as file:
+                json.dump(connection_records, file)
+        except OSError as error:
+            # Log warning instead of crashing
+            log.warning(
+                f"Failed to write component connections to {file_name}: {error}. "
+                "Component connections will not be logged to file."
+            )
 
     @utils.measure_execution_time
     def prepare_calculation(self) -> None:
         """Connects the inputs from every component to the corresponding outputs."""
+        # precomputed outputs are shared with the components that are prepared later, e.g. weather data for PV
+        precomputed_values: Dict[Tuple[str, str], Tuple[cp.Component, cp.ComponentOutput]] = {}
         for wrapped_component in self.wrapped_components:
             # check if component should be connected to default connections automatically
             if wrapped_component.connect_automatically is True:
@@ -119,7 +174,57 @@ class Simulator:
                     source_component_list=[wp.my_component for wp in self.wrapped_components],
                     target_component=wrapped_component.my_component,
                 )
+            wrapped_component.my_component.precomputed_values_of_prepared_components = precomputed_values
             wrapped_component.prepare_calculation()
+            for output in wrapped_component.my_component.precomputed_output_values:
+                precomputed_values[(output.component_name, output.field_name)] = (wrapped_component.my_component, output)
+        self.prepare_time_series_sources()
+
+    def prepare_time_series_sources(self) -> None:
+        """Collects the precomputed output columns of all time series source components.
+
+        If enabled in the simulation parameters, a component is a time series source if it declared precomputed
+        values for all of its registered outputs in i_prepare_simulation. Its columns are written into the single time step values in one vectorized
+        assignment per timestep and i_simulate is not called for it anymore. The columns are copied into one matrix,
+        the components then only keep views into it.
+        """
+        output_indices: List[int] = []
+        columns: List[Tuple[cp.Component, cp.ComponentOutput]] = []
+        timesteps = self._simulation_parameters.timesteps
+        for wrapped_component in self.wrapped_components:
+            component = wrapped_component.my_component
+            wrapped_component.is_time_series_source = False
+            if not self._simulation_parameters.use_time_series_sources:
+                continue
+            if not component.precomputed_output_values or not wrapped_component.component_outputs:
+                continue
+            if any(output not in component.precomputed_output_values for output in wrapped_component.component_outputs):
+                log.debug(
+                    f"{component.component_name} declared precomputed values only for some outputs "
+                    "and is simulated normally."
+                )
+                continue
+            for output in wrapped_component.component_outputs:
+                output_indices.append(output.global_index)
+                columns.append((component, output))
+            wrapped_component.is_time_series_source = True
+            log.information(f"{component.component_name} is used as time series source without i_simulate calls.")
+        self.time_series_output_indices = np.array(output_indices, dtype=np.intp)
+        self.time_series_values = np.empty((timesteps, len(columns)), dtype=np.float64)
+        for column_index, (component, output) in enumerate(columns):
+            values = component.get_precomputed_output_values(output)
+            if len(values) < timesteps:
+                raise ValueError(
+                    f"The precomputed values of {output.full_name} have {len(values)} entries, "
+                    f"but the simulation has {timesteps} timesteps."
+                )
+            self.time_series_values[:, column_index] = values[:timesteps]
+            component.precomputed_output_values[output] = self.time_series_values[:, column_index]
+        self.simulated_components = [
+            wrapped_component
+            for wrapped_component in self.wrapped_components
+            if not wrapped_component.is_time_series_source
+        ]
 
     def process_one_timestep(
         self, timestep: int, previous_stsv: cp.SingleTimeStepValues
@@ -134,30 +239,85 @@ class Simulator:
         Following up, all components have their states restored and simulated respectively.
         Convergence is dependent on the i_restore and i_simulate of the components and how they
         are connected to each other.
+
+        With dependency scheduling enabled, only the components in cyclic blocks are iterated,
+        all other components are simulated once in topological order.
         """
 
+        # Time series sources are not simulated, their precomputed columns are written directly
+        simulated_components = self.simulated_components
+        if simulated_components is None:
+            simulated_components = self.wrapped_components
+
         # Save states of all components
         # Executes save state in the component
-        for wrapped_component in self.wrapped_components:
+        for wrapped_component in simulated_components:
             wrapped_component.save_state()
 
-        continue_calculation = True
-
         # Verifies data existence
         if (len(self.all_outputs)) == 0:
             raise ValueError("Not a single column was defined.")
 
         # Creates List with values
         stsv = previous_stsv.clone()
+        if len(self.time_series_output_indices) > 0:
+            stsv.values[self.time_series_output_indices] = self.time_series_values[timestep]
         # Creates a buffer List with values
         previous_values = previous_stsv.clone()
+
+        if self._simulation_parameters.use_component_dependency_scheduling:
+            if self.evaluation_blocks is None:
+                self.evaluation_blocks = self.build_evaluation_blocks()
+            iterative_tries = 1
+            force_convergence = False
+            for evaluation_block in self.evaluation_blocks:
+                if not evaluation_block.is_cyclic:
+                    wrapped_component = evaluation_block.wrapped_components[0]
+                    wrapped_component.restore_state()
+                    wrapped_component.calculate_component(timestep, stsv, False)
+                    continue
+                block_tries, block_forced = self.iterate_until_convergence(
+                    timestep, stsv, previous_values, evaluation_block.wrapped_components, evaluation_block.output_indices
+                )
+                iterative_tries = max(iterative_tries, block_tries)
+                force_convergence = force_convergence or block_forced
+        else:
+            iterative_tries, force_convergence = self.iterate_until_convergence(
+                timestep, stsv, previous_values, simulated_components, None
+            )
+
+        for wrapped_component in self.wrapped_components:
+            wrapped_component.doublecheck(timestep, stsv)
+        return (stsv, iterative_tries, force_convergence)
+
+    def iterate_until_convergence(
+        self,
+        timestep: int,
+        stsv: cp.SingleTimeStepValues,
+        previous_values: cp.SingleTimeStepValues,
+        wrapped_components: List[ComponentWrapper],
+        output_indices: Optional[np.ndarray],
+    ) -> Tuple[int, bool]:
+        """Restores and simulates the given components until their outputs converge.
+
+        If output indices are given, only these outputs are checked for convergence.
+        With selective re-simulation, a component is only restored and simulated again if one of
+        its inputs changed beyond the tolerance in the last pass.
+        Returns the number of iterations and whether convergence had to be forced.
+        """
+        continue_calculation = True
         iterative_tries = 0
         force_convergence = False
+        selective_resimulation = self._simulation_parameters.use_selective_resimulation
+        components_to_simulate = [True] * len(wrapped_components)
 
         # Starts loop
         while continue_calculation:
             # Loops through components
-            for wrapped_component in self.wrapped_components:
+            for position, wrapped_component in enumerate(wrapped_components):
+                if not components_to_simulate[position]:
+                    wrapped_component.skipped_simulations += 1
+                    continue
                 # Executes restore state for each component
                 wrapped_component.restore_state()
                 # Executes i_simulate for component
@@ -165,28 +325,83 @@ class Simulator:
 
             # Stops simulation for too small difference between
             # actual values and previous values
-            if stsv.is_close_enough_to_previous(previous_values):
+            changed_values = stsv.get_changed_value_mask(previous_values, output_indices)
+            if not changed_values.any():
                 continue_calculation = False
+            elif selective_resimulation:
+                changed_outputs = np.zeros(len(stsv.values), dtype=bool)
+                if output_indices is None:
+                    changed_outputs = changed_values
+                else:
+                    changed_outputs[output_indices] = changed_values
+                components_to_simulate = [
+                    bool(changed_outputs[wrapped_component.source_output_indices].any())
+                    for wrapped_component in wrapped_components
+                ]
+                # the changed outputs are not read by any component of this loop
+                if not any(components_to_simulate):
+                    continue_calculation = False
             if (
                 iterative_tries > 2
                 and postprocessingoptions.PostProcessingOptions.PROVIDE_DETAILED_ITERATION_LOGGING
                 in self._simulation_parameters.post_processing_options
             ):
-                myerr = stsv.get_differences_for_error_msg(previous_values, self.all_outputs)
+                myerr = stsv.get_differences_for_error_msg(previous_values, self.all_outputs, output_indices)
                 with open(self.iteration_logging_path, "a", encoding="utf-8") as filestream:
                     filestream.write(myerr + "\n")
             if iterative_tries > 10:
                 force_convergence = True
             if iterative_tries > 100:
-                list_of_changed_values = stsv.get_differences_for_error_msg(previous_values, self.all_outputs)
+                list_of_changed_values = stsv.get_differences_for_error_msg(
+                    previous_values, self.all_outputs, output_indices
+                )
                 raise ValueError("More than 100 tries in time step " + str(timestep) + "\n" + list_of_changed_values)
             # Copies actual values to previous variable
             previous_values.copy_values_from_other(stsv)
             iterative_tries += 1
+        return iterative_tries, force_convergence
 
+    def get_component_iteration_statistics(self) -> Dict[str, Dict[str, float]]:
+        """Gets the number of i_simulate calls and skipped simulations for every component."""
+        timesteps = max(self._simulation_parameters.timesteps, 1)
+        statistics: Dict[str, Dict[str, float]] = {}
         for wrapped_component in self.wrapped_components:
-            wrapped_component.doublecheck(timestep, stsv)
-        return (stsv, iterative_tries, force_convergence)
+            statistics[wrapped_component.my_component.component_name] = {
+                "simulate_calls": wrapped_component.simulate_calls,
+                "skipped_simulations": wrapped_component.skipped_simulations,
+                "average_simulate_calls_per_timestep": wrapped_component.simulate_calls / timesteps,
+            }
+        return statistics
+
+    def write_component_iteration_statistics(self) -> None:
+        """Logs the per-component iteration statistics and writes them to the result directory."""
+        statistics = self.get_component_iteration_statistics()
+        sorted_statistics = sorted(statistics.items(), key=lambda item: item[1]["simulate_calls"], reverse=True)
+        for component_name, component_statistics in sorted_statistics:
+            log.debug(
+                f"{component_name}: {component_statistics['simulate_calls']} i_simulate calls "
+                f"({component_statistics['average_simulate_calls_per_timestep']:.2f} per timestep), "
+                f"{component_statistics['skipped_simulations']} skipped"
+            )
+        file_name = os.path.join(self._simulation_parameters.result_directory, "component_iteration_statistics.json")
+        with open(file_name, "w", encoding="utf-8") as file:
+            json.dump(dict(sorted_statistics), file, indent=4)
+
+    def build_evaluation_blocks(self) -> List[EvaluationBlock]:
+        """Builds the evaluation blocks from the component connections and logs the resulting schedule."""
+        simulated_components = self.simulated_components
+        if simulated_components is None:
+            simulated_components = self.wrapped_components
+        evaluation_blocks = build_evaluation_blocks(simulated_components)
+        number_of_cyclic_blocks = sum(1 for evaluation_block in evaluation_blocks if evaluation_block.is_cyclic)
+        log.information(
+            f"Scheduled {len(simulated_components)} components in {len(evaluation_blocks)} evaluation blocks, "
+            f"{number_of_cyclic_blocks} of them are iterated until convergence."
+        )
+        for evaluation_block in evaluation_blocks:
+            if evaluation_block.is_cyclic:
+                log.debug("Cyclic evaluation block: " + ", ".join(evaluation_block.get_component_names()))
+        return evaluation_blocks
 
     def prepare_simulation_directory(self):
         """Prepares the simulation directory. Determines the filename if nothing is set."""
@@ -257,6 +472,7 @@ class Simulator:
         self.prepare_calculation()
         # Connects all components
         self.connect_all_components()
+        self.write_component_connections()
         log.information(
             "finished connecting all components. A total of "
             + str(len(self.wrapped_components))
@@ -264,7 +480,58 @@ class Simulator:
             + str(len(self.all_outputs))
             + " outputs."
         )
-        all_result_lines = []
+        if self._simulation_parameters.use_component_dependency_scheduling:
+            self.evaluation_blocks = self.build_evaluation_blocks()
+        if self._simulation_parameters.additional_simulation_years:
+            self.run_all_periods(start_counter)
+        else:
+            self.simulate_period(start_counter)
+        for wrapped_component in self.wrapped_components:
+            wrapped_component.clear()
+        self.simulation_repository.clear()
+        with open(flagfile, "a", encoding="utf-8") as filestream:
+            filestream.write("finished")
+
+    def run_all_periods(self, start_counter: float) -> None:
+        """Simulates the period of the simulation parameters and then the same period in all additional years.
+
+        The components are prepared and connected only once. Before every further year, the simulation parameters
+        are moved to that year and the components reload their year-dependent inputs in i_prepare_next_period.
+        The states of buildings, storages and controllers are carried over from the end of the previous year.
+        The results of every year are post processed into a subdirectory of the result directory.
+        """
+        base_result_directory = self._simulation_parameters.result_directory
+        years = [self._simulation_parameters.year] + self._simulation_parameters.additional_simulation_years
+        for period_index, year in enumerate(years):
+            if period_index > 0:
+                start_counter = time.perf_counter()
+                self._simulation_parameters.set_period(*self._simulation_parameters.get_period_of_year(year))
+                self.prepare_next_period()
+            self._simulation_parameters.result_directory = os.path.join(base_result_directory, str(year))
+            os.makedirs(self._simulation_parameters.result_directory, exist_ok=True)
+            self.simulate_period(start_counter)
+        self._simulation_parameters.result_directory = base_result_directory
+
+    @utils.measure_execution_time
+    def prepare_next_period(self) -> None:
+        """Lets all components reload the inputs that depend on the simulated period, without preparing them again."""
+        log.information(f"Preparing the components for the year {self._simulation_parameters.year}")
+        precomputed_values: Dict[Tuple[str, str], Tuple[cp.Component, cp.ComponentOutput]] = {}
+        for wrapped_component in self.wrapped_components:
+            wrapped_component.my_component.precomputed_values_of_prepared_components = precomputed_values
+            wrapped_component.prepare_next_period()
+            for output in wrapped_component.my_component.precomputed_output_values:
+                precomputed_values[(output.component_name, output.field_name)] = (wrapped_component.my_component, output)
+        self.prepare_time_series_sources()
+        if self._simulation_parameters.use_component_dependency_scheduling:
+            self.evaluation_blocks = self.build_evaluation_blocks()
+
+    def simulate_period(self, start_counter: float) -> None:
+        """Performs all the timesteps of the current period and post processes its results."""
+        result_store = self.create_result_store()
+        result_aggregator = self.create_streaming_result_aggregator()
+        kpi_accumulators = self.create_kpi_accumulators()
+        simulation_profile = self.create_simulation_profile()
         log.information("Starting simulation for year " + str(self._simulation_parameters.year))
         log.information("Starting simulation for " + str(self._simulation_parameters.timesteps) + " timesteps")
         lastmessage = datetime.datetime.now()
@@ -274,9 +541,34 @@ class Simulator:
 
         # Creates empty list with values to get started
         number_of_outputs = len(self.all_outputs)
-        stsv = cp.SingleTimeStepValues(number_of_outputs)
+        stsv = cp.SingleTimeStepValues(
+            number_of_outputs,
+            absolute_tolerance=self._simulation_parameters.convergence_absolute_tolerance,
+            relative_tolerance=self._simulation_parameters.convergence_relative_tolerance,
+        )
+
+        checkpoint_path = self.get_checkpoint_path()
+        checkpoint_interval_in_seconds = self._simulation_parameters.checkpoint_interval_in_seconds or 0.0
+        first_timestep = 0
+        if checkpoint_path is not None:
+            first_timestep = self.resume_from_checkpoint(
+                checkpoint_path, stsv, result_store, result_aggregator, kpi_accumulators
+            )
+        last_checkpoint_time = time.perf_counter()
+        last_checkpoint_timestep = first_timestep
 
-        for step in range(self._simulation_parameters.timesteps):
+        for step in range(first_timestep, self._simulation_parameters.timesteps):
+            if (
+                checkpoint_path is not None
+                and step > first_timestep
+                and time.perf_counter() - last_checkpoint_time > checkpoint_interval_in_seconds
+            ):
+                if not self.write_checkpoint(
+                    checkpoint_path, last_checkpoint_timestep, step, stsv, result_store, kpi_accumulators
+                ):
+                    checkpoint_path = None
+                last_checkpoint_time = time.perf_counter()
+                last_checkpoint_timestep = step
             (
                 resulting_stsv,
                 iteration_tries,
@@ -287,9 +579,15 @@ class Simulator:
 
             # Accumulates iteration counter
             total_iteration_tries_since_last_msg += iteration_tries
-
-            # Appends
-            all_result_lines.append(resulting_stsv.values)
+            if simulation_profile is not None:
+                simulation_profile.finish_timestep(iteration_tries)
+
+            # Writes the converged values into the row of this timestep
+            result_store.write_row(step, resulting_stsv.values)
+            if result_aggregator is not None:
+                result_aggregator.add_row(step, result_store.values[step])
+            if kpi_accumulators is not None:
+                kpi_accumulators.update(resulting_stsv.values)
             del resulting_stsv
             # Calculates time execution
             elapsed = datetime.datetime.now() - lastmessage
@@ -305,7 +603,16 @@ class Simulator:
                 )
                 last_step = step
                 total_iteration_tries_since_last_msg = 0
-        postprocessing_datatransfer = self.prepare_post_processing(all_result_lines, start_counter)
+        if kpi_accumulators is not None:
+            kpi_accumulators.finish()
+        if simulation_profile is not None:
+            simulation_profile.finish()
+            simulation_profile.write(self._simulation_parameters.result_directory)
+        for wrapped_component in self.wrapped_components:
+            wrapped_component.my_component.i_finish_simulation()
+        if self._simulation_parameters.use_selective_resimulation:
+            self.write_component_iteration_statistics()
+        postprocessing_datatransfer = self.prepare_post_processing(result_store, start_counter, result_aggregator)
         log.information("Starting postprocessing")
         if postprocessing_datatransfer is None:
             raise ValueError("postprocessing_datatransfer was none")
@@ -314,18 +621,210 @@ class Simulator:
 
         my_post_processor = pp.PostProcessor()
         my_post_processor.run(ppdt=postprocessing_datatransfer, my_sim=self)
-        for wrapped_component in self.wrapped_components:
-            wrapped_component.clear()
-        del all_result_lines
+        result_store.release()
+        del result_store
         del postprocessing_datatransfer
         del my_post_processor
-        self.simulation_repository.clear()
         log.information("Finished postprocessing")
-        with open(flagfile, "a", encoding="utf-8") as filestream:
-            filestream.write("finished")
+        if checkpoint_path is not None:
+            simulation_checkpoint.remove_checkpoint(checkpoint_path)
+
+    def create_result_store(self) -> ResultStore:
+        """Creates the preallocated result store for all timesteps and outputs.
+
+        For lean runs, the store only keeps the outputs that are needed for the KPIs, as float32 values.
+        """
+        memmap_path: Optional[str] = None
+        if self._simulation_parameters.use_memory_mapped_results:
+            memmap_path = os.path.join(self._simulation_parameters.result_directory, MEMORY_MAPPED_RESULTS_FILENAME)
+        if not self._simulation_parameters.use_lean_results:
+            return ResultStore(
+                number_of_timesteps=self._simulation_parameters.timesteps,
+                number_of_outputs=len(self.all_outputs),
+                memmap_path=memmap_path,
+            )
+        result_outputs = self.get_result_outputs()
+        log.information(f"Lean run: keeping the results of {len(result_outputs)} of {len(self.all_outputs)} outputs")
+        return ResultStore(
+            number_of_timesteps=self._simulation_parameters.timesteps,
+            number_of_outputs=len(self.all_outputs),
+            memmap_path=memmap_path,
+            output_indices=[output.global_index for output in result_outputs],
+            dtype=np.float32,
+        )
+
+    def get_result_outputs(self) -> List[cp.ComponentOutput]:
+        """Returns the outputs whose results are kept for the post processing.
+
+        For lean runs, these are the outputs with a post processing flag or with a load type
+        that the KPI, OPEX and CAPEX computation reads. Otherwise, these are all outputs.
+        """
+        if not self._simulation_parameters.use_lean_results:
+            return self.all_outputs
+        return [
+            output
+            for output in self.all_outputs
+            if output.postprocessing_flag or output.load_type in LOAD_TYPES_FOR_KPI_COMPUTATION
+        ]
+
+    def get_checkpoint_path(self) -> Optional[str]:
+        """Returns the path of the checkpoint in the result directory, if checkpoints are enabled."""
+        if self._simulation_parameters.checkpoint_interval_in_seconds is None:
+            return None
+        return os.path.join(self._simulation_parameters.result_directory, simulation_checkpoint.CHECKPOINT_FILENAME)
+
+    def write_checkpoint(
+        self,
+        checkpoint_path: str,
+        last_checkpoint_timestep: int,
+        next_timestep: int,
+        stsv: cp.SingleTimeStepValues,
+        result_store: ResultStore,
+        kpi_accumulators: Optional[KpiAccumulators],
+    ) -> bool:
+        """Saves the states of all components and writes a checkpoint at the beginning of the next timestep.
+
+        Saving the states again at the beginning of the timestep does not change them. Only the results of
+        the timesteps since the last checkpoint are appended to the results of the checkpoint.
+        Returns False if the checkpoint could not be written, for example because a component state cannot be pickled.
+        """
+        for wrapped_component in self.wrapped_components:
+            wrapped_component.save_state()
+        checkpoint = simulation_checkpoint.SimulationCheckpoint(
+            next_timestep=next_timestep,
+            number_of_timesteps=self._simulation_parameters.timesteps,
+            output_names=[output.full_name for output in self.all_outputs],
+            stsv_values=stsv.values.copy(),
+            result_shape=result_store.values.shape,
+            result_dtype=result_store.values.dtype.str,
+            component_states={
+                wrapped_component.my_component.component_name: wrapped_component.my_component.i_get_checkpoint_state()
+                for wrapped_component in self.wrapped_components
+            },
+            sim_repository_entries=dict(self.simulation_repository.entries),
+            sim_repository_dynamic_entries={
+                component_type: dict(entries)
+                for component_type, entries in self.simulation_repository.dynamic_entries.items()
+            },
+            kpi_accumulator_state=None if kpi_accumulators is None else kpi_accumulators.get_checkpoint_state(),
+        )
+        try:
+            simulation_checkpoint.append_checkpoint_results(
+                checkpoint_path, result_store.values, last_checkpoint_timestep, next_timestep
+            )
+            simulation_checkpoint.write_checkpoint(checkpoint_path, checkpoint)
+        except (pickle.PicklingError, TypeError, AttributeError, OSError) as error:
+            log.warning(f"Could not write the checkpoint {checkpoint_path}, no more checkpoints are written: {error}")
+            return False
+        log.information(f"Wrote checkpoint before timestep {next_timestep}")
+        return True
+
+    def resume_from_checkpoint(
+        self,
+        checkpoint_path: str,
+        stsv: cp.SingleTimeStepValues,
+        result_store: ResultStore,
+        result_aggregator: Optional[ResultAggregator],
+        kpi_accumulators: Optional[KpiAccumulators],
+    ) -> int:
+        """Restores the simulation from the checkpoint and returns the timestep to continue with.
+
+        Returns 0 if there is no checkpoint or it was taken for other timesteps or outputs.
+        """
+        checkpoint = simulation_checkpoint.read_checkpoint(checkpoint_path)
+        if checkpoint is None:
+            return 0
+        output_names = [output.full_name for output in self.all_outputs]
+        if (
+            checkpoint.number_of_timesteps != self._simulation_parameters.timesteps
+            or checkpoint.output_names != output_names
+            or tuple(checkpoint.result_shape) != result_store.values.shape
+            or checkpoint.result_dtype != result_store.values.dtype.str
+        ):
+            log.warning(f"The checkpoint {checkpoint_path} belongs to another simulation, starting from the first timestep.")
+            return 0
+        results = simulation_checkpoint.read_checkpoint_results(checkpoint_path, checkpoint)
+        if results is None:
+            log.warning(f"The results of the checkpoint {checkpoint_path} are incomplete, starting from the first timestep.")
+            return 0
+        for wrapped_component in self.wrapped_components:
+            component = wrapped_component.my_component
+            component.i_restore_checkpoint_state(checkpoint.component_states.get(component.component_name, {}))
+            # the checkpoint was taken after i_save_state, restoring continues from the saved state
+            wrapped_component.restore_state()
+        self.simulation_repository.entries.clear()
+        self.simulation_repository.entries.update(checkpoint.sim_repository_entries)
+        for component_type, entries in checkpoint.sim_repository_dynamic_entries.items():
+            self.simulation_repository.dynamic_entries[component_type] = dict(entries)
+        stsv.values[:] = checkpoint.stsv_values
+        for step, row_values in enumerate(results):
+            result_store.values[step, :] = row_values
+            if result_aggregator is not None:
+                result_aggregator.add_row(step, result_store.values[step])
+        result_store.rows_written = checkpoint.next_timestep
+        if kpi_accumulators is not None and checkpoint.kpi_accumulator_state is not None:
+            kpi_accumulators.set_checkpoint_state(checkpoint.kpi_accumulator_state)
+        log.information(f"Resuming the simulation from the checkpoint at timestep {checkpoint.next_timestep}")
+        return checkpoint.next_timestep
+
+    def create_simulation_profile(self) -> Optional[SimulationProfile]:
+        """Sets a profile on every component wrapper, if component profiling is enabled."""
+        if not self._simulation_parameters.profile_components:
+            return None
+        component_profiles = []
+        for wrapped_component in self.wrapped_components:
+            wrapped_component.profile = ComponentProfile(wrapped_component.my_component.component_name)
+            component_profiles.append(wrapped_component.profile)
+        log.information(f"Profiling {len(component_profiles)} components")
+        return SimulationProfile(component_profiles)
+
+    def create_kpi_accumulators(self) -> Optional[KpiAccumulators]:
+        """Lets all components register their KPI accumulators, if KPIs are computed.
+
+        Returns None if KPIs are not computed or no component registered an accumulator.
+        """
+        if postprocessingoptions.PostProcessingOptions.COMPUTE_KPIS not in self._simulation_parameters.post_processing_options:
+            return None
+        kpi_accumulators = KpiAccumulators()
+        for wrapped_component in self.wrapped_components:
+            wrapped_component.my_component.register_kpi_accumulators(kpi_accumulators)
+        if len(kpi_accumulators) == 0:
+            return None
+        kpi_accumulators.prepare()
+        log.information(f"Updating {len(kpi_accumulators)} KPI accumulators after every timestep")
+        return kpi_accumulators
+
+    def create_streaming_result_aggregator(self) -> Optional[ResultAggregator]:
+        """Creates the aggregator that is updated after every timestep, if streaming aggregation is enabled."""
+        if not self._simulation_parameters.use_streaming_aggregation or not self.requires_std_results():
+            return None
+        return ResultAggregator.for_outputs(self.get_result_index(), self.get_result_outputs())
+
+    def requires_std_results(self) -> bool:
+        """Checks if the post processing options need the cumulative, monthly, daily and hourly results."""
+        options = self._simulation_parameters.post_processing_options
+        return (
+            postprocessingoptions.PostProcessingOptions.PLOT_MONTHLY_BAR_CHARTS in options
+            or postprocessingoptions.PostProcessingOptions.PREPARE_OUTPUTS_FOR_SCENARIO_EVALUATION in options
+            or postprocessingoptions.PostProcessingOptions.EXPORT_MONTHLY_RESULTS in options
+            or postprocessingoptions.PostProcessingOptions.EXPORT_TO_PARQUET in options
+        )
+
+    def get_result_index(self) -> pd.DatetimeIndex:
+        """Returns the time stamps of all timesteps."""
+        return pd.date_range(
+            start=self._simulation_parameters.start_date,
+            end=self._simulation_parameters.end_date,
+            freq=f"{self._simulation_parameters.seconds_per_timestep}s",
+        )[:-1]
 
     @utils.measure_execution_time
-    def prepare_post_processing(self, all_result_lines, start_counter):
+    def prepare_post_processing(
+        self,
+        all_result_lines: Union[ResultStore, List[Any]],
+        start_counter: float,
+        result_aggregator: Optional[ResultAggregator] = None,
+    ):
         """Assembles simulation results into a DataFrame and prepares data for post-processing.
 
         Builds a pandas DataFrame from simulation outputs, assigns a datetime index based on
@@ -334,8 +833,10 @@ class Simulator:
         containing all results and metadata.
 
         Args:
-            all_result_lines: List of result arrays, one per timestep.
+            all_result_lines: Result store filled during the simulation or a list of result arrays, one per timestep.
             start_counter: High-resolution time from before simulation started, used to compute execution time.
+            result_aggregator: Aggregator that was updated during the simulation. If given, its aggregates are used
+                instead of aggregating the complete results again.
 
         Returns:
             PostProcessingDataTransfer: Object bundling results, outputs, parameters, and timing for post-processing.
@@ -347,34 +848,43 @@ class Simulator:
         colum_names = []
         if self.setup_function is None:
             raise ValueError("No setup function was set")
+        result_outputs = self.all_outputs
+        if isinstance(all_result_lines, ResultStore) and all_result_lines.output_indices is not None:
+            result_outputs = [self.all_outputs[index] for index in all_result_lines.output_indices]
         entry: cp.ComponentOutput
-        for _index, entry in enumerate(self.all_outputs):
+        for _index, entry in enumerate(result_outputs):
             column_name = entry.get_pretty_name()
             colum_names.append(column_name)
-            log.debug("Output column: " + column_name)
-        self.results_data_frame = pd.DataFrame(data=all_result_lines, columns=colum_names)
-        df_index = pd.date_range(
-            start=self._simulation_parameters.start_date,
-            end=self._simulation_parameters.end_date,
-            freq=f"{self._simulation_parameters.seconds_per_timestep}s",
-        )[:-1]
-        self.results_data_frame.index = df_index
+            if log.is_enabled(log.LogPrio.DEBUG):
+                log.debug("Output column: " + column_name)
+        df_index = self.get_result_index()
+        if isinstance(all_result_lines, ResultStore):
+            # zero-copy view on the preallocated result array
+            self.results_data_frame = all_result_lines.to_data_frame(colum_names, df_index)
+        else:
+            self.results_data_frame = pd.DataFrame(
+                data=np.asarray(all_result_lines, dtype=np.float64), columns=colum_names, index=df_index
+            )
         end_counter = time.perf_counter()
         execution_time = end_counter - start_counter
         log.information(f"Simulation took {execution_time:1.2f}s.")
 
-        if (
-                postprocessingoptions.PostProcessingOptions.PLOT_MONTHLY_BAR_CHARTS in self._simulation_parameters.post_processing_options or
-                postprocessingoptions.PostProcessingOptions.PREPARE_OUTPUTS_FOR_SCENARIO_EVALUATION in self._simulation_parameters.post_processing_options or
-                postprocessingoptions.PostProcessingOptions.EXPORT_MONTHLY_RESULTS in self._simulation_parameters.post_processing_options
-        ):
+        if result_aggregator is not None:
+            log.information("Using the std results aggregated during the simulation")
+            (
+                results_merged_cumulative,
+                results_merged_monthly,
+                results_merged_daily,
+                results_merged_hourly,
+            ) = result_aggregator.get_results(colum_names)
+        elif self.requires_std_results():
             log.information("Preparing std results for post processing")
             (
                 results_merged_cumulative,
                 results_merged_monthly,
                 results_merged_daily,
                 results_merged_hourly,
-            ) = self.get_std_results(self.results_data_frame)
+            ) = self.get_std_results(self.results_data_frame, result_outputs)
         else:
             results_merged_cumulative = None
             results_merged_monthly = None
@@ -383,7 +893,7 @@ class Simulator:
 
         ppdt = PostProcessingDataTransfer(
             results=self.results_data_frame,
-            all_outputs=self.all_outputs,
+            all_outputs=result_outputs,
             simulation_parameters=self._simulation_parameters,
             wrapped_components=self.wrapped_components,
             mode=1,
@@ -434,52 +944,18 @@ class Simulator:
 
     @utils.measure_execution_time
     def get_std_results(
-        self, results_data_frame: pd.DataFrame
+        self, results_data_frame: pd.DataFrame, result_outputs: Optional[List[cp.ComponentOutput]] = None
     ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-        """Converts results into a pretty dataframe for post processing."""
-
-        units_mean = UNITS_USING_MEAN_AGGREGATION
-
-        monthly_frames = []
-        daily_frames = []
-        cumulative_data = {}
-        hourly_frames = []
+        """Converts results into a pretty dataframe for post processing.
 
-        use_hourly_resample = self._simulation_parameters.seconds_per_timestep != 3600
-
-        for i, column_name in enumerate(results_data_frame.columns):
-            log.debug(f"Processing column {i + 1}/{len(results_data_frame.columns)} - {column_name}")
-            col_data = results_data_frame.iloc[:, i]
-            unit = self.all_outputs[i].unit
-
-            if unit in units_mean:
-                monthly = col_data.resample("ME").mean()
-                daily = col_data.resample("D").mean()
-                hourly = col_data.resample("60min").mean() if use_hourly_resample else col_data
-                cumulative = col_data.mean()
-            else:
-                monthly = col_data.resample("ME").sum()
-                daily = col_data.resample("D").sum()
-                hourly = col_data.resample("60min").sum() if use_hourly_resample else col_data
-                cumulative = col_data.sum()
-
-            monthly_frames.append(monthly.rename(column_name))
-            daily_frames.append(daily.rename(column_name))
-            hourly_frames.append(hourly.rename(column_name))
-            cumulative_data[column_name] = cumulative
-
-        # Combine at once to avoid per-column index assignment
-        results_merged_monthly = pd.concat(monthly_frames, axis=1)
-        results_merged_daily = pd.concat(daily_frames, axis=1)
-        results_merged_hourly = pd.concat(hourly_frames, axis=1)
-        results_merged_cumulative = pd.DataFrame([cumulative_data])
-
-        return (
-            results_merged_cumulative,
-            results_merged_monthly,
-            results_merged_daily,
-            results_merged_hourly,
-        )
+        Mean and sum outputs are aggregated for all columns at once, see :class:`ResultAggregator`.
+        The result outputs are the outputs of the columns and default to all outputs.
+        """
+        if result_outputs is None:
+            result_outputs = self.all_outputs
+        result_aggregator = ResultAggregator.for_outputs(pd.DatetimeIndex(results_data_frame.index), result_outputs)
+        result_aggregator.aggregate(results_data_frame.to_numpy(dtype=np.float64))
+        return result_aggregator.get_results(list(results_data_frame.columns))
 
     def connect_everything_automatically(
         self,
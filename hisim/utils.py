@@ -20,6 +20,7 @@ import psutil
 import pytz
 
 from hisim import log
+from hisim.columnar_cache import columnar_cache_exists
 from hisim.simulationparameters import SimulationParameters
 
 __authors__ = "Noah Pflugradt, Vitor Hugo Bellotto Zago"
@@ -264,13 +265,18 @@ def get_cache_file(
     component_key: str,
     parameter_class: Any,
     my_simulation_parameters: SimulationParameters,
-    cache_dir_path: Optional[str] = None
+    cache_dir_path: Optional[str] = None,
+    simulation_parameter_key: Optional[str] = None,
 ) -> Tuple[bool, str]:  # noqa
     """Gets a cache path for a given parameter set.
 
     This will generate a file path based on any dataclass_json.
     It works by turning the class into a json string, hashing the string and then using that as filename.
     The idea is to have a unique file path for every possible configuration.
+    By default the whole simulation parameters are part of the key. Components whose data only depends
+    on some of them can pass their own simulation_parameter_key instead.
+    The cache counts as existing if either the file itself or its binary columnar version
+    (see hisim.columnar_cache) exists.
     """
     parameter_class_copy = copy.deepcopy(parameter_class)
     if hasattr(parameter_class_copy, "building_name"):
@@ -280,7 +286,9 @@ def get_cache_file(
         cache_dir_path = my_simulation_parameters.cache_dir_path
     if my_simulation_parameters is None:
         raise ValueError("Simulation parameters was none.")
-    simulation_parameter_str = my_simulation_parameters.get_unique_key()
+    if simulation_parameter_key is None:
+        simulation_parameter_key = my_simulation_parameters.get_unique_key()
+    simulation_parameter_str = simulation_parameter_key
     json_str = json_str + simulation_parameter_str
     if len(json_str) < 5:
         raise ValueError("Empty json detected for caching. This is a bug.")
@@ -293,7 +301,7 @@ def get_cache_file(
     cache_absolute_filepath = os.path.join(cache_dir_path, filename)
     if not os.path.isdir(cache_dir_path):
         os.mkdir(cache_dir_path)
-    if os.path.isfile(cache_absolute_filepath):
+    if columnar_cache_exists(cache_absolute_filepath):
         return True, cache_absolute_filepath
     return False, cache_absolute_filepath
 
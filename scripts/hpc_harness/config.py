@@ -309,6 +309,14 @@ class WorkerConfig:
     max_jobs_per_child: int = 50
     child_rss_ceiling_gb: Optional[float] = None
     """Recycle a warm child whose RSS exceeds this between jobs (None = only job-count based)."""
+    shared_cache_dir: Optional[str] = None
+    """Node-local directory (e.g. /dev/shm/hisim_cache) that all warm children share for HiSim's
+    weather/PV/LPG caches; exported as HISIM_SHARED_CACHE_DIR (None = read caches directly)."""
+    hisim_log_buffered: bool = False
+    """Buffer HiSim's log messages and write them in batches through one open file handle
+    instead of opening the log file for every message; exported as HISIM_LOG_BUFFERED."""
+    hisim_log_quiet: bool = False
+    """Do not print HiSim's log messages to the children's console; exported as HISIM_LOG_QUIET."""
 
     # --- single_core gate (§4.2) ---
     node_gate: str = "auto"
@@ -34,6 +34,13 @@ LOGGER = logging.getLogger(__name__)
 # Errnos that mean "the mount is gone", not merely slow (spec §4.2.1).
 _DEFINITIVE_FS_ERRNOS = {errno.ENOTCONN, errno.ESTALE, errno.ENOENT, errno.EROFS}
 
+# Checkpoint that HiSim writes into the result dir with ``checkpoint_interval_in_seconds``
+# (hisim.simulation_checkpoint.CHECKPOINT_FILENAME), or into the ``<year>/`` subdirectory of the
+# result dir for multi-year simulations. A requeued job resumes from it. The results of the finished
+# timesteps are next to it (hisim.simulation_checkpoint.CHECKPOINT_RESULTS_FILENAME).
+CHECKPOINT_FILE_NAME = "simulation_checkpoint.pkl"
+CHECKPOINT_RESULTS_FILE_NAME = "simulation_checkpoint_results.bin"
+
 
 class Worker:
     """One per Slurm allocation; owns the node's warm pool."""
@@ -152,6 +159,13 @@ class Worker:
                 for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS",
                             "NUMEXPR_NUM_THREADS", "VECLIB_MAXIMUM_THREADS")
             }
+            if cfg.shared_cache_dir:
+                # one node-local copy of the weather/profile caches for all children
+                pin_env["HISIM_SHARED_CACHE_DIR"] = cfg.shared_cache_dir
+            if cfg.hisim_log_buffered:
+                pin_env["HISIM_LOG_BUFFERED"] = "1"
+            if cfg.hisim_log_quiet:
+                pin_env["HISIM_LOG_QUIET"] = "1"
             self.spawner = Spawner(cfg.runner, env=pin_env)
             slots = self._compute_slots()
             self.pool = WarmPool(
@@ -312,14 +326,35 @@ class Worker:
 
     @staticmethod
     def _clean_old_attempts(job: Dict[str, Any]) -> None:
-        """Remove older staging dirs of this job before starting the new attempt (§4.8)."""
+        """Remove older staging dirs of this job before starting the new attempt (§4.8).
+
+        The simulation checkpoints of the old attempt with the newest checkpoint are moved into
+        the new staging dir first, at the same relative paths (the per-year subdirectories of
+        multi-year simulations included), so a requeued simulation continues where the killed
+        attempt stopped.
+        """
         staging = Path(job["staging_dir"])
         stem = staging.name.rsplit(".attempt-", 1)[0]
+        carried_checkpoints = staging.parent / f"{stem}.checkpoints"
         try:
+            shutil.rmtree(carried_checkpoints, ignore_errors=True)
+            checkpoints = list(staging.parent.glob(f"{stem}.attempt-*/**/{CHECKPOINT_FILE_NAME}"))
+            if checkpoints:
+                newest = max(checkpoints, key=lambda path: path.stat().st_mtime)
+                newest_attempt = staging.parent / newest.relative_to(staging.parent).parts[0]
+                for file_name in (CHECKPOINT_FILE_NAME, CHECKPOINT_RESULTS_FILE_NAME):
+                    for checkpoint in newest_attempt.glob(f"**/{file_name}"):
+                        carried_checkpoint = carried_checkpoints / checkpoint.relative_to(newest_attempt)
+                        carried_checkpoint.parent.mkdir(parents=True, exist_ok=True)
+                        os.replace(checkpoint, carried_checkpoint)
             for old in staging.parent.glob(f"{stem}.attempt-*"):
                 if old != staging:
                     shutil.rmtree(old, ignore_errors=True)
             shutil.rmtree(staging, ignore_errors=True)  # clean re-run of same attempt
+            if carried_checkpoints.exists():
+                staging.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(carried_checkpoints, staging)
+                LOGGER.info("Job %s resumes from the checkpoint of an earlier attempt", job.get("id"))
         except OSError:
             pass
 
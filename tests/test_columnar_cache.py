@@ -0,0 +1,113 @@
+"""Tests for the binary columnar cache files in :mod:`hisim.columnar_cache`."""
+
+# clean
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hisim import columnar_cache, log, utils
+from hisim.components.weather import LocationEnum, WeatherConfig
+from hisim.simulationparameters import SimulationParameters
+
+pytestmark = pytest.mark.base
+
+
+@pytest.fixture(autouse=True)
+def log_into_test_directory(tmp_path, monkeypatch) -> None:
+    """The migration and the shared caches are logged, so the log file is kept in the test directory."""
+    monkeypatch.setattr(log.logger, "logging_path", str(tmp_path))
+
+
+def test_columns_keep_their_types_and_are_memory_mapped(tmp_path) -> None:
+    """Float, integer, boolean and string columns are restored with their types from a memory-mapped file."""
+    cache_filepath = os.path.join(tmp_path, "Component_abc.cache")
+    data_frame = pd.DataFrame(
+        {
+            "power": [0.1, 0.2, 1 / 3],
+            "location": [0, 1, 2],
+            "at_home": [True, False, True],
+            "label": ["a", "bb", "ccc"],
+        }
+    )
+
+    written_path = columnar_cache.save_columnar_cache(cache_filepath, data_frame)
+
+    assert written_path == os.path.join(tmp_path, "Component_abc.npy")
+    columns = columnar_cache.load_columnar_cache(cache_filepath)
+    assert list(columns) == ["power", "location", "at_home", "label"]
+    assert isinstance(columns["power"].base, np.memmap)
+    assert columns["power"].tolist() == [0.1, 0.2, 1 / 3]
+    assert columns["location"].dtype.kind == "i"
+    assert columns["at_home"].tolist() == [True, False, True]
+    assert columns["label"].tolist() == ["a", "bb", "ccc"]
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_columns_of_different_length_are_rejected(tmp_path) -> None:
+    """A dictionary with columns of different lengths cannot be stored."""
+    with pytest.raises(ValueError):
+        columnar_cache.save_columnar_cache(os.path.join(tmp_path, "x.cache"), {"a": [1.0], "b": [1.0, 2.0]})
+
+
+def test_legacy_csv_cache_is_migrated(tmp_path) -> None:
+    """A CSV cache written by older versions is converted to the binary format and removed."""
+    cache_filepath = os.path.join(tmp_path, "Weather_abc.cache")
+    pd.DataFrame({"t_out": [1.5, 2.5], "DNI": [0.0, 100.0]}).to_csv(cache_filepath)
+    assert columnar_cache.columnar_cache_exists(cache_filepath)
+
+    columns = columnar_cache.load_columnar_cache(cache_filepath, sep=",", decimal=".", encoding="cp1252")
+
+    assert list(columns) == ["t_out", "DNI"]
+    assert columns["DNI"].tolist() == [0.0, 100.0]
+    assert not os.path.exists(cache_filepath)
+    assert os.path.isfile(columnar_cache.get_columnar_cache_path(cache_filepath))
+    data_frame = columnar_cache.load_columnar_cache_as_data_frame(cache_filepath)
+    assert data_frame["t_out"].tolist() == [1.5, 2.5]
+
+
+def test_get_cache_file_finds_binary_cache(tmp_path) -> None:
+    """get_cache_file reports a cache as existing if only the binary file was written."""
+    simulation_parameters = SimulationParameters.one_day_only(year=2021, seconds_per_timestep=3600)
+    config = WeatherConfig.get_default(location_entry=LocationEnum.AACHEN)
+    file_exists, cache_filepath = utils.get_cache_file("Weather", config, simulation_parameters, str(tmp_path))
+    assert not file_exists
+
+    columnar_cache.save_columnar_cache(cache_filepath, {"t_out": np.zeros(3)})
+
+    file_exists, cache_filepath_again = utils.get_cache_file("Weather", config, simulation_parameters, str(tmp_path))
+    assert file_exists
+    assert cache_filepath_again == cache_filepath
+    with pytest.raises(FileNotFoundError):
+        columnar_cache.load_columnar_cache(os.path.join(tmp_path, "missing.cache"))
+
+
+def test_shared_cache_attaches_node_local_copy(tmp_path, monkeypatch) -> None:
+    """With HISIM_SHARED_CACHE_DIR, caches are copied once into the shared directory and memory-mapped from there."""
+    shared_cache_directory = os.path.join(tmp_path, "shm")
+    cache_filepath = os.path.join(tmp_path, "Weather_abc.cache")
+    columnar_cache.save_columnar_cache(cache_filepath, {"t_out": [1.0, 2.0]})
+    values = columnar_cache.get_column_values(columnar_cache.load_columnar_cache(cache_filepath), "t_out")
+    assert isinstance(values, np.ndarray)
+    assert not values.flags.writeable
+    assert values.tolist() == [1.0, 2.0]
+
+    monkeypatch.setenv(columnar_cache.SHARED_CACHE_DIRECTORY_ENVIRONMENT_VARIABLE, shared_cache_directory)
+    columns = columnar_cache.load_columnar_cache(cache_filepath)
+
+    shared_cache_path = os.path.join(shared_cache_directory, "Weather_abc.npy")
+    assert os.path.isfile(shared_cache_path)
+    memory_mapped_file = columns["t_out"].base
+    assert isinstance(memory_mapped_file, np.memmap)
+    assert memory_mapped_file.filename == shared_cache_path
+    values = columnar_cache.get_column_values(columns, "t_out")
+    assert isinstance(values, np.ndarray)
+    assert not values.flags.writeable
+    assert values.tolist() == [1.0, 2.0]
+
+    os.remove(columnar_cache.get_columnar_cache_path(cache_filepath))
+    assert columnar_cache.get_node_local_cache_path(shared_cache_path.replace(shared_cache_directory, str(tmp_path))) == (
+        shared_cache_path
+    )
@@ -102,7 +102,7 @@ def test_single_time_step_values() -> None:
     # Create SingleTimeStepValues with 5 values
     stsv = cp.SingleTimeStepValues(5)
     assert len(stsv.values) == 5
-    assert stsv.values == [0.0, 0.0, 0.0, 0.0, 0.0]
+    assert stsv.values.tolist() == [0.0, 0.0, 0.0, 0.0, 0.0]
 
     # Create outputs for testing
     output1 = cp.ComponentOutput("Component1", "Output1", lt.LoadTypes.ELECTRICITY, lt.Units.WATT)
@@ -128,13 +128,14 @@ def test_single_time_step_values() -> None:
     # Test copy_values_from_other
     stsv2 = cp.SingleTimeStepValues(5)
     stsv2.copy_values_from_other(stsv)
-    assert stsv2.values == stsv.values
-    assert stsv2.values == [123.45, 678.90, 0.0, 0.0, 0.0]
+    assert stsv2.values.tolist() == stsv.values.tolist()
+    assert stsv2.values.tolist() == [123.45, 678.90, 0.0, 0.0, 0.0]
 
     # Test clone
     stsv3 = stsv.clone()
-    assert stsv3.values == stsv.values
+    assert stsv3.values.tolist() == stsv.values.tolist()
     assert stsv3 is not stsv  # Should be a different object
+    assert stsv3.values is not stsv.values  # Should not share the buffer
 
     # Test is_close_enough_to_previous with same values
     assert stsv.is_close_enough_to_previous(stsv) is True
@@ -168,6 +169,49 @@ def test_single_time_step_values() -> None:
     log.information("SingleTimeStepValues tests passed!")
 
 
+@pytest.mark.base
+def test_single_time_step_values_tolerances() -> None:
+    """Test the vectorized convergence check of SingleTimeStepValues.
+
+    This test verifies:
+    - copy_values_from_other copies in place into the existing buffer
+    - the absolute tolerance can be configured
+    - the relative tolerance scales with the previous value
+    - NaN values do not block convergence
+    - get_input_value returns a plain float
+    """
+    previous = cp.SingleTimeStepValues(3, absolute_tolerance=0.01)
+    previous.values = [1000.0, 1.0, 0.0]
+    current = previous.clone()
+    assert current.absolute_tolerance == 0.01
+
+    buffer_before = current.values
+    current.copy_values_from_other(previous)
+    assert current.values is buffer_before
+
+    current.values[1] = 1.005
+    assert current.is_close_enough_to_previous(previous) is True
+    current.values[1] = 1.02
+    assert current.is_close_enough_to_previous(previous) is False
+    assert current.get_changed_value_mask(previous).tolist() == [False, True, False]
+
+    relative = cp.SingleTimeStepValues(3, absolute_tolerance=0.0001, relative_tolerance=0.001)
+    relative.values = [1000.5, 1.0, 0.0]
+    assert relative.is_close_enough_to_previous(previous) is True
+    relative.values = [1002.0, 1.0, 0.0]
+    assert relative.is_close_enough_to_previous(previous) is False
+
+    nan_values = cp.SingleTimeStepValues(3)
+    nan_values.values = [float("nan"), 1.0, 0.0]
+    assert nan_values.is_close_enough_to_previous(previous) is True
+
+    output = cp.ComponentOutput("Component1", "Output1", lt.LoadTypes.ELECTRICITY, lt.Units.WATT)
+    output.global_index = 1
+    component_input = cp.ComponentInput("Component2", "Input1", lt.LoadTypes.ELECTRICITY, lt.Units.WATT, True)
+    component_input.source_output = output
+    assert type(previous.get_input_value(component_input)) is float  # pylint: disable=unidiomatic-typecheck
+
+
 @pytest.mark.base
 def test_config_base() -> None:
     """Test ConfigBase class.
@@ -0,0 +1,62 @@
+"""Unit tests for the per-component profiling of the simulation loop."""
+
+# clean
+
+import json
+import os
+from typing import List
+
+import pytest
+
+from hisim.component_profiling import (
+    COMPONENT_PROFILE_FILENAME,
+    I_RESTORE_STATE,
+    I_SIMULATE,
+    ComponentProfile,
+    SimulationProfile,
+    get_profile_summary_lines,
+)
+
+pytestmark = pytest.mark.base
+
+
+def test_profile_counts_calls_and_iterations(tmp_path) -> None:
+    """Calls, simulate calls per timestep and iterations per timestep are counted and written to json."""
+    simulated_timesteps: List[int] = []
+    fast_component = ComponentProfile("Fast")
+    slow_component = ComponentProfile("Slow")
+    simulation_profile = SimulationProfile([fast_component, slow_component])
+
+    for timestep, iterations in enumerate([1, 3, 1]):
+        for _ in range(iterations):
+            fast_component.call(I_RESTORE_STATE, lambda: None)
+            fast_component.call(I_SIMULATE, simulated_timesteps.append, timestep)
+        slow_component.call(I_SIMULATE, simulated_timesteps.append, timestep)
+        simulation_profile.finish_timestep(iterations)
+    simulation_profile.finish()
+    file_path = simulation_profile.write(str(tmp_path))
+
+    assert simulated_timesteps == [0, 0, 1, 1, 1, 1, 2, 2]
+    assert os.path.basename(file_path) == COMPONENT_PROFILE_FILENAME
+    with open(file_path, "r", encoding="utf-8") as file:
+        profile = json.load(file)
+    assert profile["iterations_per_timestep"] == {"1": 2, "3": 1}
+    assert profile["components"]["Fast"]["calls"][I_SIMULATE] == 5
+    assert profile["components"]["Fast"]["calls"][I_RESTORE_STATE] == 5
+    assert profile["components"]["Fast"]["simulate_calls_per_timestep"] == {"1": 2, "3": 1}
+    assert profile["components"]["Slow"]["simulate_calls_per_timestep"] == {"1": 3}
+    assert len(get_profile_summary_lines(profile)) == 4
+
+
+def test_failing_call_is_still_counted() -> None:
+    """The wall time of a method that raises is added before the error is passed on."""
+    component_profile = ComponentProfile("Failing")
+
+    def fail() -> None:
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        component_profile.call(I_SIMULATE, fail)
+
+    assert component_profile.calls[I_SIMULATE] == 1
+    assert component_profile.wall_time_in_seconds[I_SIMULATE] >= 0.0
@@ -0,0 +1,187 @@
+"""Tests for the dependency-graph scheduling of components.
+
+A small chain ``source -> relay -> (controller <-> storage) -> meter`` is built from minimal
+test components. The tests check that the cycle is detected as the only cyclic block, that
+the blocks come out in topological order and that the simulator gives the same converged
+values with fewer ``i_simulate`` calls when the scheduling is enabled. The selective
+re-simulation is checked on the same chain.
+"""
+
+# clean
+
+from typing import List
+
+import pytest
+
+from hisim import component as cp
+from hisim import loadtypes as lt
+from hisim.component_scheduler import build_evaluation_blocks, get_strongly_connected_components
+from hisim.component_wrapper import ComponentWrapper
+from hisim.output_registry import OutputRegistry
+from hisim.simulationparameters import SimulationParameters
+from hisim.simulator import Simulator
+
+pytestmark = pytest.mark.base
+
+
+class ChainComponent(cp.Component):
+
+    """Minimal component: its output is ``factor * sum(inputs) + offset``."""
+
+    InputName = "Input"
+    SecondInputName = "SecondInput"
+    OutputName = "Output"
+
+    def __init__(
+        self,
+        name: str,
+        my_simulation_parameters: SimulationParameters,
+        number_of_inputs: int,
+        factor: float = 1.0,
+        offset: float = 0.0,
+    ) -> None:
+        """Initializes the component with the given number of inputs."""
+        super().__init__(
+            name=name,
+            my_simulation_parameters=my_simulation_parameters,
+            my_config=cp.ConfigBase(name=name),
+            my_display_config=cp.DisplayConfig(),
+        )
+        self.factor = factor
+        self.offset = offset
+        self.simulate_calls = 0
+        self.component_inputs_list: List[cp.ComponentInput] = []
+        for input_name in [self.InputName, self.SecondInputName][:number_of_inputs]:
+            self.component_inputs_list.append(
+                self.add_input(name, input_name, lt.LoadTypes.ANY, lt.Units.ANY, mandatory=True)
+            )
+        self.output_channel = self.add_output(
+            name, self.OutputName, lt.LoadTypes.ANY, lt.Units.ANY, output_description="Test output"
+        )
+
+    def i_prepare_simulation(self) -> None:
+        """Nothing to prepare."""
+
+    def i_save_state(self) -> None:
+        """No state."""
+
+    def i_restore_state(self) -> None:
+        """No state."""
+
+    def i_simulate(self, timestep: int, stsv: cp.SingleTimeStepValues, force_convergence: bool) -> None:
+        """Sets the output from the inputs."""
+        self.simulate_calls += 1
+        total = sum(stsv.get_input_value(component_input) for component_input in self.component_inputs_list)
+        stsv.set_output_value(self.output_channel, self.factor * total + self.offset)
+
+
+def build_chain(simulation_parameters: SimulationParameters) -> List[ChainComponent]:
+    """Builds ``source -> relay -> (controller <-> storage) -> meter``, added in scrambled order."""
+    source = ChainComponent("Source", simulation_parameters, number_of_inputs=0, offset=8.0)
+    relay = ChainComponent("Relay", simulation_parameters, number_of_inputs=1)
+    controller = ChainComponent("Controller", simulation_parameters, number_of_inputs=2, factor=0.5)
+    storage = ChainComponent("Storage", simulation_parameters, number_of_inputs=1, factor=0.5)
+    meter = ChainComponent("Meter", simulation_parameters, number_of_inputs=1)
+    relay.connect_input(ChainComponent.InputName, source.component_name, ChainComponent.OutputName)
+    controller.connect_input(ChainComponent.InputName, relay.component_name, ChainComponent.OutputName)
+    controller.connect_input(ChainComponent.SecondInputName, storage.component_name, ChainComponent.OutputName)
+    storage.connect_input(ChainComponent.InputName, controller.component_name, ChainComponent.OutputName)
+    meter.connect_input(ChainComponent.InputName, storage.component_name, ChainComponent.OutputName)
+    return [meter, storage, relay, controller, source]
+
+
+def test_strongly_connected_components_of_small_graph() -> None:
+    """Tarjan finds the cycle and the single nodes."""
+    successors = [[1], [2], [1, 3], []]
+    components = sorted(get_strongly_connected_components(successors))
+    assert components == [[0], [1, 2], [3]]
+
+
+def test_build_evaluation_blocks_orders_topologically(tmp_path) -> None:
+    """The cycle is one cyclic block and every block comes after the blocks it depends on."""
+    simulation_parameters = SimulationParameters.one_day_only(year=2021, seconds_per_timestep=3600)
+    simulation_parameters.result_directory = str(tmp_path)
+    output_registry = OutputRegistry()
+    wrapped_components: List[ComponentWrapper] = []
+    for component in build_chain(simulation_parameters):
+        wrapped_component = ComponentWrapper(component, is_cachable=False, connect_automatically=False)
+        wrapped_component.register_component_outputs(output_registry, wrapped_components_so_far=wrapped_components)
+        wrapped_components.append(wrapped_component)
+    for wrapped_component in wrapped_components:
+        wrapped_component.connect_inputs(output_registry)
+
+    blocks = build_evaluation_blocks(wrapped_components)
+
+    assert [block.get_component_names() for block in blocks] == [
+        ["Source"],
+        ["Relay"],
+        ["Storage", "Controller"],
+        ["Meter"],
+    ]
+    assert [block.is_cyclic for block in blocks] == [False, False, True, False]
+    assert sorted(blocks[2].output_indices.tolist()) == sorted(
+        [wrapped_components[1].component_outputs[0].global_index, wrapped_components[3].component_outputs[0].global_index]
+    )
+
+
+@pytest.mark.parametrize("use_scheduling", [False, True])
+def test_scheduled_timestep_matches_legacy_iteration(tmp_path, use_scheduling: bool) -> None:
+    """Both iteration schemes converge to the same values; the scheduled one needs fewer calls."""
+    simulation_parameters = SimulationParameters.one_day_only(year=2021, seconds_per_timestep=3600)
+    simulation_parameters.result_directory = str(tmp_path)
+    simulation_parameters.convergence_absolute_tolerance = 1e-9
+    simulation_parameters.use_component_dependency_scheduling = use_scheduling
+    my_sim = Simulator(
+        module_directory=str(tmp_path), module_filename="test", my_simulation_parameters=simulation_parameters
+    )
+    components = build_chain(simulation_parameters)
+    for component in components:
+        my_sim.add_component(component)
+    my_sim.connect_all_components()
+
+    stsv = cp.SingleTimeStepValues(len(my_sim.all_outputs), absolute_tolerance=1e-9)
+    resulting_stsv, _, _ = my_sim.process_one_timestep(0, stsv)
+
+    meter, storage, relay, _, source = components
+    assert resulting_stsv.get_input_value(meter.component_inputs_list[0]) == pytest.approx(8.0 / 3.0, abs=1e-6)
+    assert resulting_stsv.values[storage.output_channel.global_index] == pytest.approx(8.0 / 3.0, abs=1e-6)
+    if use_scheduling:
+        assert my_sim.evaluation_blocks is not None
+        assert source.simulate_calls == 1
+        assert relay.simulate_calls == 1
+        assert meter.simulate_calls == 1
+    else:
+        assert source.simulate_calls > 1
+
+
+@pytest.mark.parametrize("use_scheduling", [False, True])
+def test_selective_resimulation_skips_components_with_unchanged_inputs(tmp_path, use_scheduling: bool) -> None:
+    """Only components with changed inputs are simulated again; the statistics count the skips."""
+    simulation_parameters = SimulationParameters.one_day_only(year=2021, seconds_per_timestep=3600)
+    simulation_parameters.result_directory = str(tmp_path)
+    simulation_parameters.use_component_dependency_scheduling = use_scheduling
+    simulation_parameters.use_selective_resimulation = True
+    my_sim = Simulator(
+        module_directory=str(tmp_path), module_filename="test", my_simulation_parameters=simulation_parameters
+    )
+    components = build_chain(simulation_parameters)
+    for component in components:
+        my_sim.add_component(component)
+    my_sim.connect_all_components()
+
+    stsv = cp.SingleTimeStepValues(len(my_sim.all_outputs), absolute_tolerance=1e-9)
+    resulting_stsv, _, _ = my_sim.process_one_timestep(0, stsv)
+
+    meter, _, relay, controller, source = components
+    assert resulting_stsv.values[meter.output_channel.global_index] == pytest.approx(8.0 / 3.0, abs=1e-6)
+    assert source.simulate_calls == 1
+    assert relay.simulate_calls <= 2
+    assert controller.simulate_calls > relay.simulate_calls
+
+    statistics = my_sim.get_component_iteration_statistics()
+    assert statistics["Source"]["simulate_calls"] == 1
+    assert statistics["Controller"]["simulate_calls"] == controller.simulate_calls
+    if not use_scheduling:
+        assert statistics["Source"]["skipped_simulations"] > 0
+    my_sim.write_component_iteration_statistics()
+    assert (tmp_path / "component_iteration_statistics.json").is_file()
@@ -0,0 +1,123 @@
+"""Benchmark of the optimizations of the MPC controller: warm started solves against solving from scratch."""
+
+# clean
+
+from typing import Any, Dict, List
+
+import numpy as np
+import pytest
+
+from hisim import log
+from hisim.components.controller_mpc import MpcController, MpcControllerConfig
+from hisim.simulationparameters import SimulationParameters
+
+pytestmark = pytest.mark.mpc
+
+SECONDS_PER_TIMESTEP = 60
+
+
+@pytest.fixture(autouse=True)
+def log_into_test_directory(tmp_path, monkeypatch) -> None:
+    """The controller logs the built problems, so the log file is kept in the test directory."""
+    monkeypatch.setattr(log.logger, "logging_path", str(tmp_path))
+
+
+def make_mpc_controller(
+    optimizer_sampling_rate: int, prediction_horizon_in_hours: int, warm_start: bool
+) -> MpcController:
+    """Returns an MPC controller for a building with a heat pump air conditioner."""
+    my_simulation_parameters = SimulationParameters.one_day_only(2021, seconds_per_timestep=SECONDS_PER_TIMESTEP)
+    config = MpcControllerConfig.get_default_config()
+    config.predictive = False
+    config.prediction_horizon = prediction_horizon_in_hours * 3600
+    config.optimizer_sampling_rate = optimizer_sampling_rate
+    config.warm_start = warm_start
+    config.h_tr_w = 90.0
+    config.h_tr_ms = 2700.0
+    config.h_tr_em = 160.0
+    config.h_ve_adj = 50.0
+    config.h_tr_is = 1100.0
+    config.c_m = 2.5e7
+    config.cop_coef = [0.1, 3.0]
+    config.eer_coef = [-0.05, 4.5]
+    return MpcController(my_simulation_parameters=my_simulation_parameters, config=config)
+
+
+def set_forecasts(my_mpc_controller: MpcController, day: int) -> None:
+    """Sets synthetic forecasts of every disturbance and price, the outside temperature is shifted from day to day."""
+    minutes = np.arange(my_mpc_controller.prediction_horizon)
+    my_mpc_controller.temperature_forecast_24h_1min = list(28.0 + day + 6.0 * np.sin(2 * np.pi * (minutes / 1440 - 0.3)))
+    my_mpc_controller.phi_ia_forecast_24h_1min = [300.0] * len(minutes)
+    my_mpc_controller.phi_st_forecast_24h_1min = [300.0] * len(minutes)
+    my_mpc_controller.phi_m_forecast_24h_1min = [300.0] * len(minutes)
+    my_mpc_controller.price_purchase_forecast_24h_1min = [0.3] * len(minutes)
+    my_mpc_controller.price_injection_forecast_24h_1min = [0.09] * len(minutes)
+    my_mpc_controller.pv_forecast_24h_1min = [0.0] * len(minutes)
+
+
+def optimize_day(my_mpc_controller: MpcController, day: int) -> np.ndarray:
+    """Runs the optimization of one day and returns the optimal thermal power of every timestep."""
+    sampling_rate = my_mpc_controller.get_optimizer_sampling_rate()
+    set_forecasts(my_mpc_controller, day)
+    p_th_opt, _, _ = my_mpc_controller.optimize(
+        my_mpc_controller.temperature_forecast_24h_1min[0::sampling_rate],
+        my_mpc_controller.phi_ia_forecast_24h_1min[0::sampling_rate],
+        my_mpc_controller.phi_st_forecast_24h_1min[0::sampling_rate],
+        my_mpc_controller.phi_m_forecast_24h_1min[0::sampling_rate],
+        my_mpc_controller.price_purchase_forecast_24h_1min[0::sampling_rate],
+        my_mpc_controller.price_injection_forecast_24h_1min[0::sampling_rate],
+        my_mpc_controller.pv_forecast_24h_1min[0::sampling_rate],
+        int(my_mpc_controller.prediction_horizon / sampling_rate),
+    )
+    return np.array(p_th_opt)
+
+
+def get_solver_statistics(my_mpc_controller: MpcController) -> Dict[str, Any]:
+    """Returns the statistics of the last solve."""
+    assert my_mpc_controller.optimization_problem is not None
+    statistics: Dict[str, Any] = my_mpc_controller.optimization_problem.opti.stats()
+    return statistics
+
+
+def test_solves_with_the_default_config_succeed() -> None:
+    """With the default config, which warm starts, the first and the following solves succeed."""
+    my_mpc_controller = make_mpc_controller(
+        MpcControllerConfig.get_default_config().optimizer_sampling_rate, prediction_horizon_in_hours=24, warm_start=True
+    )
+    assert my_mpc_controller.mpcconfig.warm_start is MpcControllerConfig.get_default_config().warm_start
+
+    return_statuses: List[str] = []
+    for day in range(3):
+        optimize_day(my_mpc_controller, day)
+        return_statuses.append(get_solver_statistics(my_mpc_controller)["return_status"])
+
+    assert return_statuses == ["Solve_Succeeded"] * 3
+
+
+@pytest.mark.parametrize("prediction_horizon_in_hours", [12, 24])
+@pytest.mark.parametrize("optimizer_sampling_rate", [60, 30, 15])
+def test_warm_started_solves_match_solves_from_scratch(
+    optimizer_sampling_rate: int, prediction_horizon_in_hours: int
+) -> None:
+    """The problem that is built once and warm started finds the same solutions as the problem built for every day."""
+    days = range(3)
+    my_warm_started_controller = make_mpc_controller(optimizer_sampling_rate, prediction_horizon_in_hours, True)
+    warm_started_solutions = []
+    warm_started_iterations = []
+    for day in days:
+        warm_started_solutions.append(optimize_day(my_warm_started_controller, day))
+        warm_started_iterations.append(get_solver_statistics(my_warm_started_controller)["iter_count"])
+
+    solutions_from_scratch = []
+    iterations_from_scratch = []
+    for day in days:
+        my_cold_controller = make_mpc_controller(optimizer_sampling_rate, prediction_horizon_in_hours, False)
+        solutions_from_scratch.append(optimize_day(my_cold_controller, day))
+        iterations_from_scratch.append(get_solver_statistics(my_cold_controller)["iter_count"])
+
+    for warm_started_solution, solution_from_scratch in zip(warm_started_solutions, solutions_from_scratch):
+        assert len(warm_started_solution) == prediction_horizon_in_hours * 3600 // SECONDS_PER_TIMESTEP
+        np.testing.assert_allclose(warm_started_solution, solution_from_scratch, rtol=1e-3, atol=1.0)
+    # the first solve starts from scratch as well, the following ones start from the previous solution
+    assert warm_started_iterations[0] == iterations_from_scratch[0]
+    assert sum(warm_started_iterations[1:]) <= sum(iterations_from_scratch[1:])
@@ -1,5 +1,8 @@
 """Test for generic pv system."""
 
+import numpy as np
+import pandas as pd
+import pvlib
 import pytest
 from tests import functions_for_testing as fft
 from hisim import sim_repository
@@ -183,3 +186,57 @@ def test_photovoltaic_cec() -> None:
             stsv.values[my_pvs.electricity_energy_output_channel.global_index]
         ) == 340.552602382255 * (seconds_per_timestep / 3600)
     )
+
+
+@pytest.mark.base
+@pytest.mark.parametrize(
+    "module_database",
+    [
+        generic_pv_system.PVLibModuleAndInverterEnum.CEC_MODULE_DATABASE,
+        generic_pv_system.PVLibModuleAndInverterEnum.SANDIA_MODULE_DATABASE,
+    ],
+)
+@pytest.mark.parametrize("integrate_inverter", [True, False])
+def test_vectorized_ac_power_ratios_match_single_timesteps(
+    module_database: generic_pv_system.PVLibModuleAndInverterEnum, integrate_inverter: bool
+) -> None:
+    """The whole-year calculation gives the same AC power ratios as simulate_cec/simulate_sandia per timestep."""
+    mysim = sim.SimulationParameters.one_day_only(year=2021, seconds_per_timestep=1800)
+    times = pd.date_range("2021-06-01", periods=mysim.timesteps, freq="30min", tz="Europe/Berlin")
+    solar_position = pvlib.solarposition.get_solarposition(times, 50.77, 6.08)
+    clear_sky = pvlib.location.Location(50.77, 6.08).get_clearsky(times, solar_position=solar_position)
+    weather_data = {
+        "dni_extra": pvlib.irradiance.get_extra_radiation(times).to_numpy(),
+        "dni": 0.8 * clear_sky["dni"].to_numpy(),
+        "dhi": 1.1 * clear_sky["dhi"].to_numpy(),
+        "ghi": clear_sky["ghi"].to_numpy(),
+        "azimuth": solar_position["azimuth"].to_numpy(),
+        "apparent_zenith": solar_position["apparent_zenith"].to_numpy(),
+        "temperature": np.linspace(12.0, 24.0, mysim.timesteps),
+        "wind_speed": np.linspace(0.0, 6.0, mysim.timesteps),
+    }
+    my_pvs_config = generic_pv_system.PVSystemConfig.get_default_pv_system(module_database=module_database)
+    my_pvs_config.integrate_inverter = integrate_inverter
+    my_pvs = generic_pv_system.PVSystem(config=my_pvs_config, my_simulation_parameters=mysim)
+    # use the databases that ship with pvlib, so the test does not depend on the hisim input data
+    if module_database == generic_pv_system.PVLibModuleAndInverterEnum.CEC_MODULE_DATABASE:
+        my_pvs.module = pvlib.pvsystem.retrieve_sam("CECMod").iloc[:, 5]
+        simulate_fct = my_pvs.simulate_cec
+    else:
+        my_pvs.module = pvlib.pvsystem.retrieve_sam("SandiaMod").iloc[:, 5]
+        simulate_fct = my_pvs.simulate_sandia
+    my_pvs.inverter = pvlib.pvsystem.retrieve_sam("CECInverter").iloc[:, 100]
+
+    single_timestep_ratios = [
+        simulate_fct(
+            **{name: values[timestep] for name, values in weather_data.items()},
+            surface_azimuth=my_pvs_config.azimuth,
+            surface_tilt=my_pvs_config.tilt,
+        )
+        for timestep in range(mysim.timesteps)
+    ]
+    vectorized_ratios = my_pvs.calculate_ac_power_ratios_for_all_timesteps(**weather_data)
+
+    assert vectorized_ratios.shape == (mysim.timesteps,)
+    assert max(single_timestep_ratios) > 0
+    assert vectorized_ratios.tolist() == pytest.approx(single_timestep_ratios, rel=1e-12, abs=1e-12)
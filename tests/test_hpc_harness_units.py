@@ -1,5 +1,6 @@
 """Unit tests for server-free HPC-harness pieces (autoscaler, circuit breaker, memory, ETA, config, console ring, slots, run_one)."""
 
+import os
 import sys
 import time
 from pathlib import Path
@@ -409,6 +410,48 @@ def test_compute_max_slots_is_min_of_memory_and_cores():
                              total_mem_gb=16.0) == 1
 
 
+def test_clean_old_attempts_carries_over_newest_checkpoint(tmp_path):
+    """The newest simulation checkpoint and its results of the old attempts are moved into the new staging dir."""
+    from hpc_harness.worker.worker import CHECKPOINT_FILE_NAME, CHECKPOINT_RESULTS_FILE_NAME, Worker
+
+    for attempt, content in ((1, b"old"), (2, b"newest")):
+        attempt_dir = tmp_path / f"000001_job.attempt-{attempt}"
+        attempt_dir.mkdir()
+        (attempt_dir / CHECKPOINT_FILE_NAME).write_bytes(content)
+        (attempt_dir / CHECKPOINT_RESULTS_FILE_NAME).write_bytes(content)
+        (attempt_dir / "partial_result.csv").write_text("", encoding="utf-8")
+        os.utime(attempt_dir / CHECKPOINT_FILE_NAME, (attempt, attempt))
+    staging = tmp_path / "000001_job.attempt-3"
+
+    Worker._clean_old_attempts({"id": 1, "staging_dir": str(staging)})  # pylint: disable=protected-access
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [staging.name]
+    assert sorted(path.name for path in staging.iterdir()) == [CHECKPOINT_FILE_NAME, CHECKPOINT_RESULTS_FILE_NAME]
+    assert (staging / CHECKPOINT_FILE_NAME).read_bytes() == b"newest"
+    assert (staging / CHECKPOINT_RESULTS_FILE_NAME).read_bytes() == b"newest"
+
+
+def test_clean_old_attempts_carries_over_the_checkpoints_of_every_year(tmp_path):
+    """Multi-year simulations keep their checkpoints in per-year subdirectories, which are carried over too."""
+    from hpc_harness.worker.worker import CHECKPOINT_FILE_NAME, Worker
+
+    old_attempt = tmp_path / "000001_job.attempt-1"
+    for year in ("2021", "2022"):
+        (old_attempt / year).mkdir(parents=True)
+        (old_attempt / year / CHECKPOINT_FILE_NAME).write_bytes(year.encode())
+    (old_attempt / "2021" / "partial_result.csv").write_text("", encoding="utf-8")
+    staging = tmp_path / "000001_job.attempt-2"
+
+    Worker._clean_old_attempts({"id": 1, "staging_dir": str(staging)})  # pylint: disable=protected-access
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [staging.name]
+    assert sorted(str(path.relative_to(staging)) for path in staging.rglob("*") if path.is_file()) == [
+        os.path.join("2021", CHECKPOINT_FILE_NAME),
+        os.path.join("2022", CHECKPOINT_FILE_NAME),
+    ]
+    assert (staging / "2022" / CHECKPOINT_FILE_NAME).read_bytes() == b"2022"
+
+
 # ------------------------------------------------- system-setup runner & submit script
 
 
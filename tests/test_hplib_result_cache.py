@@ -0,0 +1,110 @@
+"""Tests for the memo of hplib results in :mod:`hisim.components.hplib_result_cache`."""
+
+# clean
+
+import os
+from typing import Any
+
+import pytest
+
+from hisim.components import hplib_result_cache
+from hisim.components.advanced_heat_pump_hplib import HeatPumpHplib, HeatPumpHplibConfig
+from hisim.components.more_advanced_heat_pump_hplib import MoreAdvancedHeatPumpHPLib, MoreAdvancedHeatPumpHPLibConfig
+from hisim.simulationparameters import SimulationParameters
+
+pytestmark = pytest.mark.base
+
+
+def test_least_recently_used_entries_are_evicted() -> None:
+    """The memo keeps at most the configured number of operating points and evicts the least recently used."""
+    calculations = []
+
+    def calculate(value: float) -> float:
+        calculations.append(value)
+        return 2 * value
+
+    memo = hplib_result_cache.HplibResultCache(maximum_number_of_entries=2)
+    assert memo.get_or_calculate((1.0, 1), lambda: calculate(1.0)) == 2.0
+    assert memo.get_or_calculate((2.0, 1), lambda: calculate(2.0)) == 4.0
+    assert memo.get_or_calculate((1.0, 1), lambda: calculate(1.0)) == 2.0
+    assert memo.get_or_calculate((3.0, 1), lambda: calculate(3.0)) == 6.0
+
+    assert len(memo) == 2
+    assert list(memo.results) == [(1.0, 1), (3.0, 1)]
+    assert calculations == [1.0, 2.0, 3.0]
+    assert (memo.hits, memo.misses) == (1, 3)
+
+
+def test_memo_is_saved_and_loaded(tmp_path) -> None:
+    """A saved memo is loaded into another memo without replacing entries it already has."""
+    filepath = hplib_result_cache.get_hplib_result_cache_filepath(str(tmp_path), "abc")
+    memo = hplib_result_cache.HplibResultCache()
+    memo.get_or_calculate((1.0, 1), lambda: {"P_th": 1.0})
+    memo.get_or_calculate((2.0, 1), lambda: {"P_th": 2.0})
+    memo.save(filepath)
+    assert memo.number_of_unsaved_entries == 0
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+    other_memo = hplib_result_cache.HplibResultCache()
+    other_memo.get_or_calculate((1.0, 1), lambda: {"P_th": 10.0})
+    other_memo.load(filepath)
+    other_memo.load(os.path.join(tmp_path, "missing.pkl"))
+
+    assert other_memo.get_or_calculate((1.0, 1), lambda: {"P_th": -1.0}) == {"P_th": 10.0}
+    assert other_memo.get_or_calculate((2.0, 1), lambda: {"P_th": -1.0}) == {"P_th": 2.0}
+
+
+def test_heat_pumps_with_the_same_model_share_the_memo() -> None:
+    """Heat pumps with the same parameters reuse each other's results from the first timestep on."""
+    simulation_parameters = SimulationParameters.one_day_only(2021, 60)
+    first_heat_pump = HeatPumpHplib(
+        config=HeatPumpHplibConfig.get_default_generic_advanced_hp_lib(), my_simulation_parameters=simulation_parameters
+    )
+    second_heat_pump = HeatPumpHplib(
+        config=HeatPumpHplibConfig.get_default_generic_advanced_hp_lib(), my_simulation_parameters=simulation_parameters
+    )
+    assert first_heat_pump.calculation_cache is second_heat_pump.calculation_cache
+
+    first_results = first_heat_pump.get_cached_results_or_run_hplib_simulation(
+        t_in_primary=-7.04, t_in_secondary=47.0, parameters=first_heat_pump.parameters, t_amb=-7.0, mode=1
+    )
+    hits = second_heat_pump.calculation_cache.hits
+    second_results = second_heat_pump.get_cached_results_or_run_hplib_simulation(
+        t_in_primary=-7.0, t_in_secondary=47.0, parameters=second_heat_pump.parameters, t_amb=-7.0, mode=1
+    )
+
+    assert second_results is first_results
+    assert second_heat_pump.calculation_cache.hits == hits + 1
+
+
+def test_more_advanced_heat_pumps_share_the_memo_per_temperature_difference(tmp_path) -> None:
+    """The more advanced heat pumps share the memo, whose key also holds the temperature difference and p_th_min."""
+    simulation_parameters = SimulationParameters.one_day_only(2021, 60)
+    simulation_parameters.cache_dir_path = str(tmp_path)
+    simulation_parameters.persist_hplib_results = True
+    first_heat_pump, second_heat_pump = [
+        MoreAdvancedHeatPumpHPLib(
+            config=MoreAdvancedHeatPumpHPLibConfig.get_default_generic_advanced_hp_lib(),
+            my_simulation_parameters=simulation_parameters,
+        )
+        for _ in range(2)
+    ]
+    assert first_heat_pump.calculation_cache is second_heat_pump.calculation_cache
+    assert first_heat_pump.calculation_cache.maximum_number_of_entries is not None
+
+    def simulate(heat_pump: MoreAdvancedHeatPumpHPLib) -> Any:
+        return heat_pump.get_cached_results_or_run_hplib_simulation(
+            t_in_primary=-7.0, t_in_secondary=47.0, t_amb=-7.0, mode=1, operation_mode="heating_building", p_th_min=0.0
+        )
+
+    first_results = simulate(first_heat_pump)
+    second_heat_pump.heatpump.delta_t = 2.5
+    results_with_other_temperature_difference = simulate(second_heat_pump)
+    second_heat_pump.heatpump.delta_t = first_heat_pump.heatpump.delta_t
+    second_results = simulate(second_heat_pump)
+
+    assert second_results is first_results
+    assert results_with_other_temperature_difference["m_dot"] != pytest.approx(first_results["m_dot"])
+
+    second_heat_pump.i_finish_simulation()
+    assert os.path.isfile(second_heat_pump.get_hplib_result_cache_filepath())
@@ -0,0 +1,80 @@
+"""Unit tests for :class:`hisim.postprocessing.kpi_computation.kpi_accumulators.KpiAccumulators`."""
+
+# clean
+
+import numpy as np
+import pytest
+
+from hisim import component as cp
+from hisim import loadtypes as lt
+from hisim.postprocessing.kpi_computation.kpi_accumulators import KpiAccumulatorKind, KpiAccumulators
+
+pytestmark = pytest.mark.base
+
+
+def make_output(field_name: str, global_index: int) -> cp.ComponentOutput:
+    """Makes an output at the given position of the timestep values."""
+    output = cp.ComponentOutput("Component", field_name, lt.LoadTypes.ELECTRICITY, lt.Units.WATT)
+    output.global_index = global_index
+    return output
+
+
+def test_accumulators_match_the_values_of_all_timesteps() -> None:
+    """Sums, extrema, deviations and cycles are the same as computed from the full time series."""
+    rng = np.random.default_rng(1)
+    power = rng.normal(0.0, 100.0, 200)
+    temperature = rng.uniform(15.0, 28.0, 200)
+    off_time = np.where(rng.random(200) < 0.5, 0.0, rng.uniform(1.0, 900.0, 200))
+    values = np.column_stack([power, temperature, off_time])
+    power_output, temperature_output, off_time_output = (
+        make_output("Power", 0),
+        make_output("Temperature", 1),
+        make_output("TimeOff", 2),
+    )
+
+    kpi_accumulators = KpiAccumulators()
+    power_sum = kpi_accumulators.add(KpiAccumulatorKind.SUM, power_output)
+    positive_power = kpi_accumulators.add(KpiAccumulatorKind.POSITIVE_SUM, power_output)
+    negative_power = kpi_accumulators.add(KpiAccumulatorKind.NEGATIVE_SUM, power_output)
+    max_power = kpi_accumulators.add(KpiAccumulatorKind.MAXIMUM, power_output)
+    min_temperature = kpi_accumulators.add(KpiAccumulatorKind.MINIMUM, temperature_output)
+    below_heating = kpi_accumulators.add(KpiAccumulatorKind.DEVIATION_BELOW, temperature_output, threshold=19.0)
+    above_cooling = kpi_accumulators.add(KpiAccumulatorKind.DEVIATION_ABOVE, temperature_output, threshold=24.0)
+    cycles = kpi_accumulators.add(KpiAccumulatorKind.CYCLES, off_time_output)
+    kpi_accumulators.prepare()
+    for row in values:
+        kpi_accumulators.update(row)
+    kpi_accumulators.finish()
+
+    assert power_sum.value == pytest.approx(power.sum())
+    assert power_sum.get_mean() == pytest.approx(power.mean())
+    assert positive_power.value == pytest.approx(power[power > 0].sum())
+    assert negative_power.value == pytest.approx(power[power < 0].sum())
+    assert max_power.value == power.max()
+    assert min_temperature.value == temperature.min()
+    assert below_heating.value == pytest.approx((19.0 - temperature[temperature < 19.0]).sum())
+    assert above_cooling.value == pytest.approx((temperature[temperature > 24.0] - 24.0).sum())
+    expected_cycles = sum(
+        1 for time_index in range(len(off_time) - 1) if off_time[time_index] != 0 and off_time[time_index + 1] == 0
+    )
+    assert cycles.value == expected_cycles
+
+
+def test_unregistered_output_is_rejected() -> None:
+    """Accumulators need outputs that have a position in the timestep values."""
+    kpi_accumulators = KpiAccumulators()
+    kpi_accumulators.add(KpiAccumulatorKind.SUM, make_output("Power", -1))
+
+    with pytest.raises(ValueError):
+        kpi_accumulators.prepare()
+
+
+def test_values_are_not_set_before_the_simulation_finished() -> None:
+    """Components fall back to the results frame while the accumulator values are not set."""
+    kpi_accumulators = KpiAccumulators()
+    accumulator = kpi_accumulators.add(KpiAccumulatorKind.MAXIMUM, make_output("Power", 0))
+    kpi_accumulators.prepare()
+    kpi_accumulators.finish()
+
+    assert accumulator.value is None
+    assert accumulator.get_mean() is None
@@ -0,0 +1,99 @@
+"""Tests for the buffered and quiet modes of :class:`hisim.log.Logger`."""
+
+# clean
+
+import os
+import time
+from typing import Iterator
+
+import pytest
+
+from hisim import log
+from hisim.log import LogPrio
+
+pytestmark = pytest.mark.base
+
+
+@pytest.fixture(name="logger")
+def fixture_logger(tmp_path) -> Iterator[log.Logger]:
+    """A logger that writes to a temporary directory and is closed after the test."""
+    my_logger = log.Logger()
+    my_logger.logging_path = str(tmp_path)
+    my_logger.before_result_dir_created = False
+    yield my_logger
+    my_logger.configure(buffered=False, use_background_writer=False)
+
+
+def read_log_file(tmp_path) -> str:
+    """Reads the simulation log file or returns an empty string if it was not written yet."""
+    file_path = os.path.join(tmp_path, "hisim_simulation.log")
+    if not os.path.isfile(file_path):
+        return ""
+    with open(file_path, encoding="utf-8") as file:
+        return file.read()
+
+
+def test_buffered_messages_are_written_when_the_buffer_is_full(logger: log.Logger, tmp_path, capsys) -> None:
+    """Messages are kept in memory until the buffer is full and then written through one open file."""
+    logger.configure(buffered=True, quiet=True, buffer_size=3, flush_interval_in_seconds=3600)
+
+    logger.log(LogPrio.INFORMATION, "first")
+    logger.log(LogPrio.INFORMATION, "second")
+    assert read_log_file(tmp_path) == ""
+
+    logger.log(LogPrio.INFORMATION, "third")
+    assert read_log_file(tmp_path) == "first\nsecond\nthird\n"
+    assert list(logger.open_files) == [os.path.join(tmp_path, "hisim_simulation.log")]
+
+    logger.log(LogPrio.INFORMATION, "fourth")
+    logger.reset()
+    assert read_log_file(tmp_path) == "first\nsecond\nthird\nfourth\n"
+    assert not logger.open_files
+    assert capsys.readouterr().out == ""
+
+
+def test_messages_below_the_logging_level_are_not_formatted(logger: log.Logger, tmp_path) -> None:
+    """Message functions are only called for messages that pass the logging level."""
+    calls = []
+
+    def create_message() -> str:
+        calls.append(1)
+        return "expensive"
+
+    logger.configure(quiet=True)
+    logger.log(LogPrio.DEBUG, create_message)
+    assert not calls
+    assert not logger.is_enabled(LogPrio.DEBUG)
+
+    logger.log(LogPrio.WARNING, create_message)
+    assert calls == [1]
+    assert read_log_file(tmp_path) == "expensive\n"
+
+
+def test_background_writer_flushes_periodically(logger: log.Logger, tmp_path) -> None:
+    """The background writer thread writes buffered messages after the flush interval."""
+    logger.configure(buffered=True, quiet=True, use_background_writer=True, flush_interval_in_seconds=0.05)
+    logger.log(LogPrio.INFORMATION, "from the writer thread")
+
+    deadline = time.monotonic() + 5
+    while read_log_file(tmp_path) == "" and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert read_log_file(tmp_path) == "from the writer thread\n"
+    logger.configure(use_background_writer=False)
+    assert logger.writer_thread is None
+
+
+def test_modes_are_read_from_the_environment(monkeypatch) -> None:
+    """Batch workers switch on buffered and quiet mode through environment variables."""
+    monkeypatch.setenv(log.LOGGING_BUFFERED_ENVIRONMENT_VARIABLE, "1")
+    monkeypatch.setenv(log.LOGGING_QUIET_ENVIRONMENT_VARIABLE, "true")
+    my_logger = log.Logger()
+    assert my_logger.buffered
+    assert my_logger.quiet
+
+    monkeypatch.setenv(log.LOGGING_BUFFERED_ENVIRONMENT_VARIABLE, "0")
+    monkeypatch.delenv(log.LOGGING_QUIET_ENVIRONMENT_VARIABLE)
+    my_logger = log.Logger()
+    assert not my_logger.buffered
+    assert not my_logger.quiet
@@ -0,0 +1,53 @@
+"""Unit tests for calculating several households with the local LPG at the same time."""
+
+# clean
+
+import pytest
+from utspclient.helpers.lpgdata import Households
+
+from hisim.components import loadprofilegenerator_utsp_connector
+
+pytestmark = pytest.mark.base
+
+
+def test_random_seeds_depend_only_on_household_and_variant() -> None:
+    """Duplicated households get different seeds, and the seeds are the same in every run."""
+    seed = loadprofilegenerator_utsp_connector.get_local_lpg_random_seed(Households.CHR01_Couple_both_at_Work, "1")
+
+    assert seed == loadprofilegenerator_utsp_connector.get_local_lpg_random_seed(
+        Households.CHR01_Couple_both_at_Work, "1"
+    )
+    assert seed != loadprofilegenerator_utsp_connector.get_local_lpg_random_seed(
+        Households.CHR01_Couple_both_at_Work, "2"
+    )
+    assert seed != loadprofilegenerator_utsp_connector.get_local_lpg_random_seed(
+        Households.CHR02_Couple_30_64_age_with_work, "1"
+    )
+
+
+def test_result_folders_keep_the_order_of_the_households(monkeypatch) -> None:
+    """The result folders of the pool are returned in the order of the households, each with its own directory."""
+    monkeypatch.setattr(loadprofilegenerator_utsp_connector, "LOCAL_LPG_WORKER_COUNT", 3)
+    monkeypatch.setattr(
+        loadprofilegenerator_utsp_connector.UtspLpgConnector,
+        "execute_local_lpg_single_household",
+        lambda self, calculation_index, household, random_seed: f"C{calculation_index}/{household.Name}/{random_seed}",
+    )
+    my_connector = loadprofilegenerator_utsp_connector.UtspLpgConnector.__new__(
+        loadprofilegenerator_utsp_connector.UtspLpgConnector
+    )
+    my_connector.calculation_index_for_local_lpg = 1
+    households = [
+        Households.CHR01_Couple_both_at_Work,
+        Households.CHR02_Couple_30_64_age_with_work,
+        Households.CHR01_Couple_both_at_Work,
+        Households.CHR02_Couple_30_64_age_with_work,
+    ]
+
+    result_folders = my_connector.execute_local_lpg_households(households=households, random_seeds=[11, 12, 13, 14])
+
+    assert result_folders == [
+        f"C{index}/{household.Name}/{random_seed}"
+        for index, (household, random_seed) in enumerate(zip(households, [11, 12, 13, 14]), start=1)
+    ]
+    assert loadprofilegenerator_utsp_connector._local_lpg_connector is None  # pylint: disable=protected-access
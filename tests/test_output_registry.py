@@ -0,0 +1,50 @@
+"""Unit tests for :class:`hisim.output_registry.OutputRegistry`."""
+
+# clean
+
+import pytest
+
+from hisim import component as cp
+from hisim import loadtypes as lt
+from hisim.output_registry import OutputRegistry
+
+pytestmark = pytest.mark.base
+
+
+def test_outputs_are_found_by_name() -> None:
+    """Outputs get consecutive global indices and are found by their component and field name."""
+    output_registry = OutputRegistry()
+    pv_power = cp.ComponentOutput(
+        "PV",
+        "ElectricityOutput",
+        lt.LoadTypes.ELECTRICITY,
+        lt.Units.WATT,
+        postprocessing_flag=[lt.InandOutputType.ELECTRICITY_PRODUCTION, lt.ComponentType.PV],
+    )
+    household_power = cp.ComponentOutput(
+        "Household",
+        "ElectricityOutput",
+        lt.LoadTypes.ELECTRICITY,
+        lt.Units.WATT,
+        postprocessing_flag=[lt.InandOutputType.ELECTRICITY_CONSUMPTION_UNCONTROLLED],
+    )
+    temperature = cp.ComponentOutput("Building", "TemperatureIndoorAir", lt.LoadTypes.TEMPERATURE, lt.Units.CELSIUS)
+    for output in (pv_power, household_power, temperature):
+        output_registry.register(output)
+
+    assert len(output_registry) == 3
+    assert [output.global_index for output in output_registry.outputs] == [0, 1, 2]
+    assert output_registry.get_output("Household", "ElectricityOutput") is household_power
+    assert output_registry.get_output("Household", "TemperatureIndoorAir") is None
+    assert output_registry.get_output("PV", "ElectricityOutput") is pv_power
+
+
+def test_output_is_registered_only_once() -> None:
+    """A second output with the same component and field name is rejected."""
+    output_registry = OutputRegistry()
+    output_registry.register(cp.ComponentOutput("PV", "ElectricityOutput", lt.LoadTypes.ELECTRICITY, lt.Units.WATT))
+
+    with pytest.raises(ValueError):
+        output_registry.register(
+            cp.ComponentOutput("PV", "ElectricityOutput", lt.LoadTypes.ELECTRICITY, lt.Units.WATT)
+        )
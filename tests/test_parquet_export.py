@@ -0,0 +1,90 @@
+"""Unit tests for the Parquet export of the simulation results."""
+
+# clean
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hisim import component as cp
+from hisim import loadtypes as lt
+
+pytest.importorskip("pyarrow")
+from hisim.postprocessing import parquet_export  # noqa: E402  # pylint: disable=wrong-import-position
+
+pytestmark = pytest.mark.base
+
+
+def make_outputs() -> list:
+    """Makes one power and one energy output."""
+    return [
+        cp.ComponentOutput(
+            "PV", "Power", lt.LoadTypes.ELECTRICITY, lt.Units.WATT,
+            postprocessing_flag=[lt.InandOutputType.ELECTRICITY_PRODUCTION], output_description="PV power",
+        ),
+        cp.ComponentOutput("Meter", "Energy", lt.LoadTypes.ELECTRICITY, lt.Units.WATT_HOUR),
+    ]
+
+
+def test_results_keep_values_and_metadata(tmp_path) -> None:
+    """All outputs are written into one file with typed columns and their metadata in the schema."""
+    outputs = make_outputs()
+    index = pd.date_range("2021-01-01", periods=48, freq="3600s")
+    results = pd.DataFrame(
+        np.arange(96, dtype=float).reshape(48, 2), columns=[output.get_pretty_name() for output in outputs], index=index
+    )
+    file_path = os.path.join(tmp_path, parquet_export.RESULTS_PARQUET_FILENAME)
+
+    parquet_export.write_results(file_path, results, outputs, use_float32=True)
+
+    read_back = parquet_export.read_results(file_path, columns=[outputs[1].get_pretty_name()])
+    assert list(read_back.columns) == [outputs[1].get_pretty_name()]
+    assert read_back.dtypes.iloc[0] == np.float32
+    np.testing.assert_allclose(read_back.iloc[:, 0].to_numpy(), results.iloc[:, 1].to_numpy())
+    assert list(read_back.index) == list(index)
+
+    metadata = parquet_export.read_output_metadata(file_path)
+    assert metadata[outputs[0].get_pretty_name()]["component_name"] == "PV"
+    assert metadata[outputs[0].get_pretty_name()]["unit"] == lt.Units.WATT.value
+    assert metadata[outputs[0].get_pretty_name()]["aggregation"] == "mean"
+    assert lt.InandOutputType.ELECTRICITY_PRODUCTION.value in metadata[outputs[0].get_pretty_name()]["postprocessing_flag"]
+    assert metadata[outputs[1].get_pretty_name()]["aggregation"] == "sum"
+
+
+def test_aggregated_results_can_be_filtered_by_resolution(tmp_path) -> None:
+    """The aggregated results of all resolutions share one file and are read back by resolution."""
+    outputs = make_outputs()
+    columns = [output.get_pretty_name() for output in outputs]
+    daily = pd.DataFrame([[1.0, 2.0], [3.0, 4.0]], columns=columns, index=pd.date_range("2021-01-01", periods=2))
+    cumulative = pd.DataFrame([[2.0, 6.0]], columns=columns)
+    file_path = os.path.join(tmp_path, parquet_export.AGGREGATED_RESULTS_PARQUET_FILENAME)
+
+    parquet_export.write_aggregated_results(
+        file_path, {"hourly": None, "daily": daily, "cumulative": cumulative}, outputs
+    )
+
+    read_daily = parquet_export.read_results(file_path, filters=[("resolution", "==", "daily")])
+    assert len(read_daily) == 2
+    assert read_daily[columns[1]].tolist() == [2.0, 4.0]
+    read_cumulative = parquet_export.read_results(file_path, filters=[("resolution", "==", "cumulative")])
+    assert read_cumulative[columns[0]].tolist() == [2.0]
+
+
+def test_columns_are_matched_to_the_outputs_by_name(tmp_path) -> None:
+    """The values of each output are taken from its own column, also if the columns are in another order."""
+    outputs = make_outputs()
+    results = pd.DataFrame(
+        {outputs[1].get_pretty_name(): [1.0, 2.0], outputs[0].get_pretty_name(): [3.0, 4.0]},
+        index=pd.date_range("2021-01-01", periods=2, freq="3600s"),
+    )
+    file_path = os.path.join(tmp_path, parquet_export.RESULTS_PARQUET_FILENAME)
+
+    parquet_export.write_results(file_path, results, outputs)
+
+    read_back = parquet_export.read_results(file_path)
+    assert read_back[outputs[0].get_pretty_name()].tolist() == [3.0, 4.0]
+    assert read_back[outputs[1].get_pretty_name()].tolist() == [1.0, 2.0]
+    with pytest.raises(ValueError):
+        parquet_export.write_results(file_path, results.iloc[:, :1], outputs)
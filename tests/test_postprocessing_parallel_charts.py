@@ -0,0 +1,62 @@
+"""Tests for rendering the post processing charts in a process pool."""
+
+# clean
+
+import multiprocessing
+import os
+from types import SimpleNamespace
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hisim import component as cp
+from hisim import loadtypes as lt
+from hisim.postprocessing.postprocessing_main import PostProcessor
+from hisim.simulationparameters import SimulationParameters
+
+pytestmark = pytest.mark.base
+
+
+def make_post_processing_data(result_directory: str, plot_worker_count: int) -> Any:
+    """Makes the parts of the post processing data that the chart functions use."""
+    simulation_parameters = SimulationParameters.one_day_only(year=2021, seconds_per_timestep=3600)
+    simulation_parameters.result_directory = result_directory
+    simulation_parameters.plot_worker_count = plot_worker_count
+    all_outputs = [
+        cp.ComponentOutput(
+            f"Component{index}", f"Output{index}", lt.LoadTypes.ELECTRICITY, lt.Units.WATT, output_description="Test"
+        )
+        for index in range(3)
+    ]
+    results = pd.DataFrame(
+        {output.get_pretty_name(): np.arange(24, dtype=float) * (index + 1) for index, output in enumerate(all_outputs)},
+        index=pd.date_range("2021-01-01", periods=24, freq="h"),
+    )
+    return SimpleNamespace(
+        all_outputs=all_outputs,
+        results=results,
+        simulation_parameters=simulation_parameters,
+        time_correction_factor_in_hours_per_timestep=1.0,
+    )
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_parallel_line_plots_keep_the_order_of_the_outputs(tmp_path) -> None:
+    """The report image entries of the process pool are in the same order as those of serial rendering."""
+    serial_entries: list = []
+    PostProcessor().make_line_plots(
+        make_post_processing_data(os.path.join(tmp_path, "serial"), plot_worker_count=1), serial_entries
+    )
+    parallel_entries: list = []
+    PostProcessor().make_line_plots(
+        make_post_processing_data(os.path.join(tmp_path, "parallel"), plot_worker_count=2), parallel_entries
+    )
+
+    assert [entry.component_name for entry in parallel_entries] == ["Component0", "Component1", "Component2"]
+    assert [entry.component_name for entry in parallel_entries] == [entry.component_name for entry in serial_entries]
+    assert [os.path.relpath(entry.file_path, os.path.join(tmp_path, "parallel")) for entry in parallel_entries] == [
+        os.path.relpath(entry.file_path, os.path.join(tmp_path, "serial")) for entry in serial_entries
+    ]
+    assert all(os.path.isfile(entry.file_path) for entry in parallel_entries)
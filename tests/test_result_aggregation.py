@@ -0,0 +1,99 @@
+"""Unit tests for :class:`hisim.result_aggregation.ResultAggregator`.
+
+The aggregator replaces the per-column pandas resampling of the simulator. These tests check
+that it yields the same cumulative, monthly, daily and hourly results as the resampling and that
+the streaming mode gives the same results as aggregating the complete array.
+"""
+
+# clean
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hisim.result_aggregation import ResultAggregator
+
+pytestmark = pytest.mark.base
+
+
+def resample_like_before(data_frame: pd.DataFrame, use_mean: list, seconds_per_timestep: int) -> tuple:
+    """Aggregates the results column by column with pandas, like the former get_std_results."""
+    monthly, daily, hourly, cumulative = [], [], [], {}
+    for index, column_name in enumerate(data_frame.columns):
+        column = data_frame.iloc[:, index]
+        how = "mean" if use_mean[index] else "sum"
+        monthly.append(getattr(column.resample("ME"), how)())
+        daily.append(getattr(column.resample("D"), how)())
+        hourly.append(getattr(column.resample("60min"), how)() if seconds_per_timestep != 3600 else column)
+        cumulative[column_name] = getattr(column, how)()
+    return (
+        pd.DataFrame([cumulative]),
+        pd.concat(monthly, axis=1),
+        pd.concat(daily, axis=1),
+        pd.concat(hourly, axis=1),
+    )
+
+
+@pytest.mark.parametrize("seconds_per_timestep", [900, 3600, 7200])
+def test_aggregates_match_pandas_resampling(seconds_per_timestep: int) -> None:
+    """Mean and sum columns are aggregated like the per-column pandas resampling."""
+    index = pd.date_range("2021-01-30", "2021-03-02", freq=f"{seconds_per_timestep}s", inclusive="left")
+    values = np.random.default_rng(1).random((len(index), 3))
+    use_mean = [True, False, True]
+    data_frame = pd.DataFrame(values, columns=["a", "b", "c"], index=index)
+
+    aggregator = ResultAggregator(index, use_mean)
+    aggregator.aggregate(values)
+    results = aggregator.get_results(["a", "b", "c"])
+
+    for result, expected in zip(results, resample_like_before(data_frame, use_mean, seconds_per_timestep)):
+        np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), equal_nan=True)
+        assert list(result.index) == list(expected.index)
+        assert list(result.columns) == ["a", "b", "c"]
+
+
+def test_nan_values_are_skipped_like_pandas_resampling() -> None:
+    """NaN values are skipped in the sums and means, and periods with only NaN values are handled like pandas."""
+    index = pd.date_range("2021-01-01", periods=3 * 24 * 4, freq="900s")
+    values = np.random.default_rng(3).random((len(index), 2))
+    values[5, :] = np.nan
+    values[24 * 4 : 2 * 24 * 4, :] = np.nan
+    use_mean = [True, False]
+    data_frame = pd.DataFrame(values, columns=["a", "b"], index=index)
+    expected_results = resample_like_before(data_frame, use_mean, 900)
+
+    complete = ResultAggregator(index, use_mean)
+    complete.aggregate(values)
+    streaming = ResultAggregator(index, use_mean)
+    for timestep, row in enumerate(values):
+        streaming.add_row(timestep, row)
+
+    for aggregator in (complete, streaming):
+        for result, expected in zip(aggregator.get_results(["a", "b"]), expected_results):
+            np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), equal_nan=True)
+    daily_results = complete.get_results(["a", "b"])[2]
+    assert np.isnan(daily_results["a"].iloc[1])
+    assert daily_results["b"].iloc[1] == 0.0
+
+
+def test_streaming_matches_complete_aggregation() -> None:
+    """Adding the rows one by one gives the same aggregates as aggregating the complete array."""
+    index = pd.date_range("2021-01-01", periods=3 * 24 * 4, freq="900s")
+    values = np.random.default_rng(2).random((len(index), 2))
+    complete = ResultAggregator(index, [True, False])
+    complete.aggregate(values)
+    streaming = ResultAggregator(index, [True, False])
+    for timestep, row in enumerate(values):
+        streaming.add_row(timestep, row)
+
+    for streamed, expected in zip(streaming.get_results(["a", "b"]), complete.get_results(["a", "b"])):
+        np.testing.assert_allclose(streamed.to_numpy(), expected.to_numpy())
+
+
+def test_results_need_all_timesteps() -> None:
+    """The aggregates are only returned after all timesteps were added."""
+    index = pd.date_range("2021-01-01", periods=4, freq="900s")
+    aggregator = ResultAggregator(index, [False])
+    aggregator.add_row(0, np.array([1.0]))
+    with pytest.raises(ValueError):
+        aggregator.get_results(["a"])
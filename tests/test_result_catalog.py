@@ -0,0 +1,148 @@
+"""Unit tests for :class:`hisim.postprocessing.scenario_evaluation.result_catalog.ResultCatalog`."""
+
+# clean
+
+import os
+
+import pytest
+
+from hisim.postprocessing.scenario_evaluation.result_catalog import ResultCatalog, ResultCatalogEntry
+from hisim.postprocessing.scenario_evaluation.result_data_collection import ResultDataCollection
+
+pytestmark = pytest.mark.base
+
+
+def make_entry(tmp_path, folder_name: str, module_config: dict, duration: int = 365) -> ResultCatalogEntry:
+    """Makes the catalog entry of one result folder."""
+    folder = os.path.join(tmp_path, folder_name, "result_data_for_scenario_evaluation")
+    return ResultCatalogEntry(
+        scenario_data_folder=folder,
+        model="HiSim_household",
+        scenario="scenario",
+        region="Aachen",
+        year=2021,
+        simulation_duration_in_days=duration,
+        module_config=module_config,
+        kpis={"BUI1": {"General": {"Self-consumption": {"value": 0.3, "unit": "-"}}}},
+        data_paths={"yearly": os.path.join(folder, f"yearly_{duration}_days.csv")},
+    )
+
+
+def test_registered_entries_are_returned_by_duration(tmp_path) -> None:
+    """Entries are persisted in the catalog file and filtered by their simulation duration."""
+    catalog_path = os.path.join(tmp_path, "catalog", "results.sqlite")
+    ResultCatalog(catalog_path).register(make_entry(tmp_path, "a", {"pv_power": 5}))
+    ResultCatalog(catalog_path).register(make_entry(tmp_path, "b", {"pv_power": 10}, duration=30))
+
+    entries = ResultCatalog(catalog_path).get_entries(simulation_duration_in_days=365)
+
+    assert len(entries) == 1
+    assert entries[0].module_config == {"pv_power": 5}
+    assert entries[0].kpis["BUI1"]["General"]["Self-consumption"]["value"] == 0.3
+    assert entries[0].data_paths["yearly"].endswith("yearly_365_days.csv")
+    assert "monthly" not in entries[0].data_paths
+
+
+def test_duplicated_configs_are_returned_once(tmp_path) -> None:
+    """Results of the same module config and scenario are only returned once, in the order of registration."""
+    catalog = ResultCatalog(os.path.join(tmp_path, "results.sqlite"))
+    catalog.register(make_entry(tmp_path, "a", {"pv_power": 5, "battery": 1}))
+    catalog.register(make_entry(tmp_path, "b", {"battery": 1, "pv_power": 5}))
+    catalog.register(make_entry(tmp_path, "c", {"pv_power": 10}))
+
+    entries = catalog.get_entries()
+
+    assert [os.path.basename(os.path.dirname(entry.scenario_data_folder)) for entry in entries] == ["a", "c"]
+    assert len(catalog.get_entries(unique_configs_only=False)) == 3
+
+
+def test_component_connections_replace_the_earlier_connections(tmp_path) -> None:
+    """The connections of a simulation keep their schema and order, and a new run replaces them."""
+    catalog_path = os.path.join(tmp_path, "results.sqlite")
+    result_directory = os.path.join(tmp_path, "result")
+    connections = [
+        {
+            "From": {"Component": "Weather", "Field": "TemperatureOutside"},
+            "To": {"Component": "Building", "Field": "TemperatureOutside"},
+        },
+        {
+            "From": {"Component": "PV", "Field": "ElectricityOutput"},
+            "To": {"Component": "ElectricityMeter", "Field": "Input_PV"},
+        },
+    ]
+    ResultCatalog(catalog_path).register_component_connections(result_directory, connections)
+    ResultCatalog(catalog_path).register_component_connections(result_directory, connections[:1])
+    ResultCatalog(catalog_path).register_component_connections(os.path.join(tmp_path, "other"), connections)
+
+    assert ResultCatalog(catalog_path).get_component_connections(result_directory) == connections[:1]
+    assert ResultCatalog(catalog_path).get_component_connections(os.path.join(tmp_path, "other")) == connections
+
+
+def make_building_kpis(set_heating_temperature: float, min_temperature: float) -> dict:
+    """Makes the building KPIs of a simulation as they are registered in the catalog."""
+    return {
+        "BUI1": {
+            "Building": {
+                "Minimum building indoor air temperature reached": {"value": min_temperature, "unit": "Celsius"},
+                "Maximum building indoor air temperature reached": {"value": 26.0, "unit": "Celsius"},
+                f"Temperature deviation of building indoor air temperature being below set temperature "
+                f"{set_heating_temperature} Celsius": {"value": 4.0, "unit": "Celsius*h"},
+                "Temperature deviation of building indoor air temperature being above set temperature 24.0 Celsius": {
+                    "value": 7.0,
+                    "unit": "Celsius*h",
+                },
+            }
+        }
+    }
+
+
+def test_data_collection_takes_configs_and_building_kpis_from_the_catalog(tmp_path) -> None:
+    """The module configs and building KPIs come from the catalog, the result folders have no json files."""
+    catalog = ResultCatalog(os.path.join(tmp_path, "results.sqlite"))
+    for folder_name, pv_power, set_heating_temperature in (("a", 10, 19.0), ("default", 5, 20.0)):
+        entry = make_entry(tmp_path, folder_name, {"pv_power": pv_power, "battery": 1})
+        entry.kpis = make_building_kpis(set_heating_temperature, min_temperature=18.5)
+        catalog.register(entry)
+    entries = {entry.scenario_data_folder: entry for entry in catalog.get_entries(simulation_duration_in_days=365)}
+    data_collection = ResultDataCollection.__new__(ResultDataCollection)
+    data_collection.path_of_scenario_data_executed_with_default_config = ""
+
+    (
+        list_with_csv_files,
+        list_with_parameter_key_values,
+        list_with_module_configs,
+        list_building_set_heating_temperature_in_celsius,
+        list_building_min_indoor_temperature_in_celsius,
+        list_building_diff_min_indoor_and_set_heating_temperature_in_celsius,
+        *_,
+        list_building_temp_deviation_above_set_cooling_in_celsius_hour,
+    ) = data_collection.go_through_all_result_catalog_entries_and_collect_file_paths_according_to_parameters(
+        result_catalog_entries=entries, default_config_dict={"pv_power": 5, "battery": 1}, parameter_key="pv_power"
+    )
+
+    default_folder = os.path.join(tmp_path, "default", "result_data_for_scenario_evaluation")
+    assert data_collection.path_of_scenario_data_executed_with_default_config == default_folder
+    other_folder = os.path.join(tmp_path, "a", "result_data_for_scenario_evaluation")
+    assert list_with_csv_files == [other_folder, default_folder, default_folder]
+    assert list_with_parameter_key_values == [10, 5, 5]
+    assert list_with_module_configs is not None and list_with_module_configs[0] == {"pv_power": 10, "battery": 1}
+    assert list_building_set_heating_temperature_in_celsius == [19.0, 20.0]
+    assert list_building_min_indoor_temperature_in_celsius == [18.5, 18.5]
+    assert list_building_diff_min_indoor_and_set_heating_temperature_in_celsius == [0.5, 1.5]
+    assert list_building_temp_deviation_above_set_cooling_in_celsius_hour == [7.0, 7.0]
+
+
+def test_data_collection_without_default_config_takes_building_kpis_from_the_catalog(tmp_path) -> None:
+    """Without a default config, the module configs are not compared, but the building KPIs are still collected."""
+    entry = make_entry(tmp_path, "a", {"pv_power": 10})
+    entry.kpis = make_building_kpis(20.0, min_temperature=19.0)
+    data_collection = ResultDataCollection.__new__(ResultDataCollection)
+    data_collection.path_of_scenario_data_executed_with_default_config = ""
+
+    results = data_collection.go_through_all_result_catalog_entries_and_collect_file_paths_according_to_parameters(
+        result_catalog_entries={entry.scenario_data_folder: entry}, default_config_dict=None, parameter_key=None
+    )
+
+    assert results[0] == [entry.scenario_data_folder]
+    assert results[1] is None and results[2] is None
+    assert results[3] == [20.0]
@@ -0,0 +1,84 @@
+"""Unit tests for :class:`hisim.result_store.ResultStore`.
+
+The result store is the preallocated (timesteps x outputs) array that the simulator
+fills row by row. These tests check that rows end up in the right place, that the
+DataFrame handed to post processing is a view on the array and that the optional
+memory-mapped backing file is created and removed again.
+"""
+
+# clean
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hisim.result_store import ResultStore
+
+pytestmark = pytest.mark.base
+
+
+def test_write_row_fills_preallocated_array() -> None:
+    """Rows are written at their timestep and ``len`` counts the written timesteps."""
+    store = ResultStore(number_of_timesteps=3, number_of_outputs=2)
+    assert store.values.shape == (3, 2)
+    assert store.values.dtype == np.float64
+    assert len(store) == 0
+
+    store.write_row(0, np.array([1.0, 2.0]))
+    store.write_row(1, np.array([3.0, 4.0]))
+    assert len(store) == 2
+    assert store.values[1].tolist() == [3.0, 4.0]
+    assert store.values[2].tolist() == [0.0, 0.0]
+
+
+def test_data_frame_is_zero_copy_view() -> None:
+    """The DataFrame shares its memory with the result array."""
+    store = ResultStore(number_of_timesteps=2, number_of_outputs=2)
+    store.write_row(0, np.array([1.0, 2.0]))
+    store.write_row(1, np.array([3.0, 4.0]))
+    index = pd.date_range("2021-01-01", periods=2, freq="60s")
+
+    data_frame = store.to_data_frame(["a", "b"], index)
+
+    assert np.shares_memory(data_frame.to_numpy(), store.values)
+    assert data_frame["b"].tolist() == [2.0, 4.0]
+    assert (data_frame.index == index).all()
+
+
+def test_data_frame_rejects_wrong_number_of_columns() -> None:
+    """A column name list that does not match the number of outputs raises."""
+    store = ResultStore(number_of_timesteps=2, number_of_outputs=2)
+    with pytest.raises(ValueError):
+        store.to_data_frame(["a"])
+
+
+def test_memory_mapped_store_creates_and_releases_file(tmp_path) -> None:
+    """The memory-mapped store writes a ``.npy`` file that is removed on release."""
+    memmap_path = os.path.join(tmp_path, "results.npy")
+    store = ResultStore(number_of_timesteps=4, number_of_outputs=3, memmap_path=memmap_path)
+    assert os.path.isfile(memmap_path)
+
+    store.write_row(3, np.array([1.0, 2.0, 3.0]))
+    assert len(store) == 4
+    assert store.to_data_frame(["a", "b", "c"])["c"].iloc[3] == 3.0
+
+    store.release()
+    assert not os.path.exists(memmap_path)
+
+
+def test_lean_store_keeps_selected_outputs_as_float32() -> None:
+    """A lean store only keeps the selected outputs and hands them to post processing as float64."""
+    store = ResultStore(number_of_timesteps=2, number_of_outputs=4, output_indices=[1, 3], dtype=np.float32)
+    assert store.values.shape == (2, 2)
+    assert store.values.dtype == np.float32
+
+    store.write_row(0, np.array([1.0, 2.0, 3.0, 4.0]))
+    store.write_row(1, np.array([5.0, 6.0, 7.0, 8.0]))
+
+    data_frame = store.to_data_frame(["b", "d"])
+    assert data_frame.dtypes.tolist() == [np.float64, np.float64]
+    assert data_frame["d"].tolist() == [4.0, 8.0]
+    with pytest.raises(ValueError):
+        store.to_data_frame(["a", "b", "c", "d"])
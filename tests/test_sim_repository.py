@@ -2,7 +2,7 @@
 
 ``SimRepository`` is a small, fully deterministic key/value store used to exchange
 data across components during a simulation. Every method only mutates or reads the
-two internal dicts (``entries`` and ``dynamic_entries``); none of them touch the
+internal dicts (``entries``, ``dynamic_entries`` and ``forecast_sources``); none of them touch the
 filesystem, the network, or any global state. These tests therefore exercise the
 CRUD contract directly and hermetically, with no simulation setup required.
 
@@ -15,6 +15,7 @@ every member of :class:`lt.ComponentType`, so any real enum member (here
 
 from typing import Any
 
+import numpy as np
 import pytest
 
 from hisim import loadtypes as lt
@@ -155,6 +156,38 @@ def test_dynamic_entries_are_independent_per_component_type() -> None:
     assert repo.get_dynamic_component_weights(other) == [1]
 
 
+# --------------------------------------------------------------------------- #
+# Forecast sources: set_forecast_source / set_forecast_start / get_forecast_window
+# --------------------------------------------------------------------------- #
+def test_forecast_window_is_a_read_only_view_of_the_values() -> None:
+    """The window follows the start, is cut at the end and shares the memory of the values."""
+    repo = SimRepository()
+    values = np.arange(10, dtype=np.float64)
+    repo.set_forecast_source("demand", values, horizon_in_timesteps=4)
+
+    repo.set_forecast_start("demand", 3)
+    window = repo.get_forecast_window("demand")
+
+    assert window.tolist() == [3.0, 4.0, 5.0, 6.0]
+    assert np.shares_memory(window, values)
+    assert window.flags.writeable is False
+    assert repo.get_forecast_window("demand", start=8).tolist() == [8.0, 9.0]
+    assert repo.get_forecast_window("demand", start=0, horizon_in_timesteps=2).tolist() == [0.0, 1.0]
+    # consumers that read the forecast as plain entry get the current window
+    assert repo.entry_exists("demand") is True
+    assert repo.get_entry("demand").tolist() == [3.0, 4.0, 5.0, 6.0]
+
+
+def test_dynamic_forecast_source_is_read_as_dynamic_entry() -> None:
+    """A forecast keyed by (component_type, weight) is found like a dynamic entry."""
+    repo = SimRepository()
+    repo.set_forecast_source((_CT, 2), [1.0, 2.0, 3.0], horizon_in_timesteps=2)
+    repo.set_forecast_start((_CT, 2), 1)
+
+    assert repo.get_dynamic_component_weights(_CT) == [2]
+    assert repo.get_dynamic_entry(_CT, 2).tolist() == [2.0, 3.0]
+
+
 # --------------------------------------------------------------------------- #
 # clear()
 # --------------------------------------------------------------------------- #
@@ -0,0 +1,213 @@
+"""Unit tests for the checkpoints of long simulations in :mod:`hisim.simulation_checkpoint`."""
+
+# clean
+
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hisim import component as cp
+from hisim import loadtypes as lt
+from hisim import simulation_checkpoint
+from hisim.postprocessing.kpi_computation.kpi_accumulators import KpiAccumulatorKind, KpiAccumulators
+from hisim.simulationparameters import SimulationParameters
+from hisim.simulator import Simulator
+
+pytestmark = pytest.mark.base
+
+
+@dataclass
+class CountingConfig(cp.ConfigBase):
+
+    """Configuration of the counting component."""
+
+    failing_timestep: Optional[int] = None
+
+
+class CountingComponent(cp.Component):
+
+    """Sums up the timesteps."""
+
+    OutputName = "Total"
+
+    def __init__(self, my_simulation_parameters: SimulationParameters, failing_timestep: Optional[int] = None) -> None:
+        """Initializes the component, which fails at the given timestep to interrupt the simulation."""
+        super().__init__(
+            name="Counting",
+            my_simulation_parameters=my_simulation_parameters,
+            my_config=CountingConfig(building_name="BUI1", name="Counting", failing_timestep=failing_timestep),
+            my_display_config=cp.DisplayConfig(),
+        )
+        self.total = 0.0
+        self.total_previous = 0.0
+        self.output_channel = self.add_output(
+            self.component_name, self.OutputName, lt.LoadTypes.ANY, lt.Units.ANY, output_description="Total"
+        )
+
+    def i_prepare_simulation(self) -> None:
+        """Nothing to prepare."""
+
+    def i_save_state(self) -> None:
+        """Saves the total."""
+        self.total_previous = self.total
+
+    def i_restore_state(self) -> None:
+        """Restores the total."""
+        self.total = self.total_previous
+
+    def i_simulate(self, timestep: int, stsv: cp.SingleTimeStepValues, force_convergence: bool) -> None:
+        """Adds the timestep to the total."""
+        if timestep == self.config.failing_timestep:
+            raise RuntimeError("Interrupted simulation")
+        self.total = self.total_previous + timestep
+        stsv.set_output_value(self.output_channel, self.total)
+
+
+def run_counting_simulation(result_directory: str, failing_timestep: Optional[int] = None) -> pd.DataFrame:
+    """Runs one day with checkpoints before every timestep and returns the results."""
+    simulation_parameters = SimulationParameters.one_day_only(year=2021, seconds_per_timestep=3600)
+    simulation_parameters.result_directory = result_directory
+    simulation_parameters.checkpoint_interval_in_seconds = 0.0
+    my_sim = Simulator(
+        module_directory=result_directory, module_filename="test", my_simulation_parameters=simulation_parameters
+    )
+    my_sim.add_component(CountingComponent(simulation_parameters, failing_timestep))
+    my_sim.run_all_timesteps()
+    return my_sim.results_data_frame
+
+
+def test_checkpoint_is_written_and_read_back(tmp_path) -> None:
+    """A checkpoint keeps the results, component states and repository entries, and is removed again."""
+    file_path = os.path.join(tmp_path, simulation_checkpoint.CHECKPOINT_FILENAME)
+    results = np.array([[0.1], [0.3], [0.0], [0.0]])
+    checkpoint = simulation_checkpoint.SimulationCheckpoint(
+        next_timestep=2,
+        number_of_timesteps=4,
+        output_names=["Battery # StateOfCharge"],
+        stsv_values=np.array([0.5]),
+        result_shape=results.shape,
+        result_dtype=results.dtype.str,
+        component_states={"Battery": {"state": {"soc": 0.5}, "previous_state": {"soc": 0.3}}},
+        sim_repository_entries={"surplus": 1.0},
+    )
+
+    simulation_checkpoint.append_checkpoint_results(file_path, results, 0, 2)
+    simulation_checkpoint.write_checkpoint(file_path, checkpoint)
+    read_back = simulation_checkpoint.read_checkpoint(file_path)
+
+    assert read_back is not None
+    assert read_back.next_timestep == 2
+    read_back_results = simulation_checkpoint.read_checkpoint_results(file_path, read_back)
+    assert read_back_results is not None
+    assert read_back_results.tolist() == [[0.1], [0.3]]
+    assert read_back.component_states["Battery"]["previous_state"] == {"soc": 0.3}
+    assert read_back.sim_repository_entries == {"surplus": 1.0}
+    assert not os.path.exists(file_path + ".tmp")
+
+    simulation_checkpoint.remove_checkpoint(file_path)
+    assert simulation_checkpoint.read_checkpoint(file_path) is None
+    assert not os.path.exists(simulation_checkpoint.get_results_path(file_path))
+
+
+def test_checkpoint_results_are_appended(tmp_path) -> None:
+    """Every checkpoint only writes the rows since the last one and replaces rows behind an older checkpoint."""
+    file_path = os.path.join(tmp_path, simulation_checkpoint.CHECKPOINT_FILENAME)
+    results_path = simulation_checkpoint.get_results_path(file_path)
+    results = np.arange(12, dtype=np.float32).reshape(6, 2)
+
+    simulation_checkpoint.append_checkpoint_results(file_path, results, 0, 2)
+    simulation_checkpoint.append_checkpoint_results(file_path, results, 2, 5)
+    assert os.path.getsize(results_path) == 5 * results[0].nbytes
+
+    # a resumed simulation continues behind the checkpoint at timestep 3
+    results[3:] = -1.0
+    simulation_checkpoint.append_checkpoint_results(file_path, results, 3, 4)
+    assert os.path.getsize(results_path) == 4 * results[0].nbytes
+    written = np.fromfile(results_path, dtype=np.float32).reshape(4, 2)
+    assert written.tolist() == results[:4].tolist()
+
+
+def test_broken_checkpoint_is_ignored(tmp_path) -> None:
+    """A checkpoint that cannot be read lets the simulation start from the first timestep."""
+    file_path = os.path.join(tmp_path, simulation_checkpoint.CHECKPOINT_FILENAME)
+    with open(file_path, "wb") as file:
+        file.write(b"not a checkpoint")
+
+    assert simulation_checkpoint.read_checkpoint(file_path) is None
+
+
+def test_kpi_accumulators_continue_from_checkpoint() -> None:
+    """Restored KPI accumulators continue with the running values of the checkpoint."""
+    output = cp.ComponentOutput("Meter", "Power", lt.LoadTypes.ELECTRICITY, lt.Units.WATT)
+    output.global_index = 0
+    first_run = KpiAccumulators()
+    first_run.add(KpiAccumulatorKind.SUM, output)
+    first_run.prepare()
+    first_run.update(np.array([1.0]))
+    checkpoint_state = first_run.get_checkpoint_state()
+
+    resumed_run = KpiAccumulators()
+    total = resumed_run.add(KpiAccumulatorKind.SUM, output)
+    resumed_run.prepare()
+    resumed_run.set_checkpoint_state(checkpoint_state)
+    resumed_run.update(np.array([2.0]))
+    resumed_run.finish()
+
+    assert total.value == 3.0
+    assert total.number_of_timesteps == 2
+
+
+def test_checkpoint_keeps_the_attributes_of_the_component() -> None:
+    """The checkpoint of a component holds its attributes, without the outputs and the configuration."""
+    simulation_parameters = SimulationParameters.one_day_only(year=2021, seconds_per_timestep=3600)
+    my_component = CountingComponent(simulation_parameters)
+    my_component.total = 3.0
+    my_component.i_save_state()
+
+    checkpoint_state = my_component.i_get_checkpoint_state()
+    assert checkpoint_state == {"total": 3.0, "total_previous": 3.0}
+
+    resumed_component = CountingComponent(simulation_parameters)
+    resumed_component.i_restore_checkpoint_state(checkpoint_state)
+    resumed_component.i_restore_state()
+    assert resumed_component.total == 3.0
+    assert resumed_component.output_channel is not my_component.output_channel
+
+
+def test_resumed_simulation_matches_uninterrupted_simulation(tmp_path) -> None:
+    """A simulation that is interrupted and started again continues from the checkpoint with the same results."""
+    interrupted_directory = os.path.join(tmp_path, "interrupted")
+    with pytest.raises(RuntimeError):
+        run_counting_simulation(interrupted_directory, failing_timestep=12)
+    checkpoint = simulation_checkpoint.read_checkpoint(
+        os.path.join(interrupted_directory, simulation_checkpoint.CHECKPOINT_FILENAME)
+    )
+    assert checkpoint is not None
+    assert checkpoint.next_timestep == 12
+
+    resumed_results = run_counting_simulation(interrupted_directory)
+    uninterrupted_results = run_counting_simulation(os.path.join(tmp_path, "uninterrupted"))
+
+    pd.testing.assert_frame_equal(resumed_results, uninterrupted_results)
+    assert resumed_results.iloc[-1, 0] == sum(range(24))
+
+
+def test_simulation_resumes_after_several_interruptions(tmp_path) -> None:
+    """The results of a simulation that was interrupted several times are continued from the last checkpoint."""
+    with pytest.raises(RuntimeError):
+        run_counting_simulation(str(tmp_path), failing_timestep=12)
+    with pytest.raises(RuntimeError):
+        run_counting_simulation(str(tmp_path), failing_timestep=18)
+    checkpoint_path = os.path.join(tmp_path, simulation_checkpoint.CHECKPOINT_FILENAME)
+    checkpoint = simulation_checkpoint.read_checkpoint(checkpoint_path)
+    assert checkpoint is not None
+    assert checkpoint.next_timestep == 18
+
+    resumed_results = run_counting_simulation(str(tmp_path))
+
+    assert resumed_results.iloc[:, 0].tolist() == [float(sum(range(step + 1))) for step in range(24)]
+    assert not os.path.exists(simulation_checkpoint.get_results_path(checkpoint_path))
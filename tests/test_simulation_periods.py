@@ -0,0 +1,133 @@
+"""Unit tests for moving the simulation parameters to further years of a multi-year simulation."""
+
+# clean
+
+import datetime
+import os
+from typing import List
+
+import pytest
+
+from hisim import component as cp
+from hisim import loadtypes as lt
+from hisim.simulationparameters import SimulationParameters
+from hisim.simulator import Simulator
+
+pytestmark = pytest.mark.base
+
+
+class YearCountingComponent(cp.Component):
+
+    """Counts the simulated timesteps over all years and remembers the years it was prepared for."""
+
+    OutputName = "Total"
+
+    def __init__(self, my_simulation_parameters: SimulationParameters) -> None:
+        """Initializes the component."""
+        super().__init__(
+            name="YearCounting",
+            my_simulation_parameters=my_simulation_parameters,
+            my_config=cp.ConfigBase(name="YearCounting"),
+            my_display_config=cp.DisplayConfig(),
+        )
+        self.total = 0.0
+        self.total_previous = 0.0
+        self.prepared_years: List[int] = []
+        self.output_channel = self.add_output(
+            self.component_name, self.OutputName, lt.LoadTypes.ANY, lt.Units.ANY, output_description="Total"
+        )
+
+    def i_prepare_simulation(self) -> None:
+        """Remembers the first year."""
+        self.prepared_years.append(self.my_simulation_parameters.year)
+
+    def i_prepare_next_period(self) -> None:
+        """Remembers the further years."""
+        self.prepared_years.append(self.my_simulation_parameters.year)
+
+    def i_save_state(self) -> None:
+        """Saves the total."""
+        self.total_previous = self.total
+
+    def i_restore_state(self) -> None:
+        """Restores the total."""
+        self.total = self.total_previous
+
+    def i_simulate(self, timestep: int, stsv: cp.SingleTimeStepValues, force_convergence: bool) -> None:
+        """Counts the timestep."""
+        self.total = self.total_previous + 1
+        stsv.set_output_value(self.output_channel, self.total)
+
+
+def test_period_is_moved_to_another_year() -> None:
+    """The next period keeps the time resolution and the part of the year, only the year changes."""
+    my_simulation_parameters = SimulationParameters(
+        start_date=datetime.datetime(2021, 3, 1),
+        end_date=datetime.datetime(2021, 5, 1),
+        seconds_per_timestep=900,
+        result_directory="",
+        additional_simulation_years=[2022, 2023],
+    )
+
+    my_simulation_parameters.set_period(*my_simulation_parameters.get_period_of_year(2023))
+
+    assert my_simulation_parameters.additional_simulation_years == [2022, 2023]
+    assert my_simulation_parameters.start_date == datetime.datetime(2023, 3, 1)
+    assert my_simulation_parameters.end_date == datetime.datetime(2023, 5, 1)
+    assert my_simulation_parameters.year == 2023
+    assert my_simulation_parameters.seconds_per_timestep == 900
+    assert my_simulation_parameters.timesteps == 61 * 24 * 4
+
+
+def test_full_year_covers_the_leap_day() -> None:
+    """A full year period that is moved into a leap year has one more day."""
+    my_simulation_parameters = SimulationParameters.full_year(year=2023, seconds_per_timestep=3600)
+
+    my_simulation_parameters.set_period(*my_simulation_parameters.get_period_of_year(2024))
+
+    assert my_simulation_parameters.start_date == datetime.datetime(2024, 1, 1)
+    assert my_simulation_parameters.end_date == datetime.datetime(2025, 1, 1)
+    assert my_simulation_parameters.timesteps == 366 * 24
+
+
+def test_leap_day_is_moved_to_february_28() -> None:
+    """A period that starts on February 29 starts on February 28 in years that are no leap years."""
+    my_simulation_parameters = SimulationParameters(
+        start_date=datetime.datetime(2020, 2, 29),
+        end_date=datetime.datetime(2020, 3, 1),
+        seconds_per_timestep=3600,
+    )
+
+    assert my_simulation_parameters.get_period_of_year(2021) == (
+        datetime.datetime(2021, 2, 28),
+        datetime.datetime(2021, 3, 1),
+    )
+    my_simulation_parameters.set_period(*my_simulation_parameters.get_period_of_year(2021))
+    assert my_simulation_parameters.get_period_of_year(2024) == (
+        datetime.datetime(2024, 2, 29),
+        datetime.datetime(2024, 3, 1),
+    )
+
+
+def test_multi_year_simulation_carries_the_states_over(tmp_path) -> None:
+    """All years are simulated one after the other with the states of the previous year, each into its own directory."""
+    my_simulation_parameters = SimulationParameters(
+        start_date=datetime.datetime(2020, 2, 29),
+        end_date=datetime.datetime(2020, 3, 1),
+        seconds_per_timestep=3600,
+        result_directory=str(tmp_path),
+        additional_simulation_years=[2021, 2024],
+    )
+    my_sim = Simulator(
+        module_directory=str(tmp_path), module_filename="test", my_simulation_parameters=my_simulation_parameters
+    )
+    my_component = YearCountingComponent(my_simulation_parameters)
+    my_sim.add_component(my_component)
+
+    my_sim.run_all_timesteps()
+
+    assert my_component.prepared_years == [2020, 2021, 2024]
+    assert all(os.path.isdir(os.path.join(tmp_path, str(year))) for year in (2020, 2021, 2024))
+    # the last year continues counting after the 24 hours of each of the two years before
+    assert my_sim.results_data_frame.iloc[:, 0].tolist() == [float(48 + hour) for hour in range(1, 25)]
+    assert my_simulation_parameters.result_directory == str(tmp_path)
@@ -0,0 +1,161 @@
+"""Tests for components that declare their outputs as precomputed time series.
+
+A replay component declares its output for all timesteps in ``i_prepare_simulation``. With
+``use_time_series_sources`` the simulator writes the column directly and never calls its
+``i_simulate``; without the option, the component is simulated as before.
+"""
+
+# clean
+
+from typing import List
+
+import numpy as np
+import pytest
+
+from hisim import component as cp
+from hisim import loadtypes as lt
+from hisim.simulationparameters import SimulationParameters
+from hisim.simulator import Simulator
+
+pytestmark = pytest.mark.base
+
+
+class ReplayComponent(cp.Component):
+
+    """Replays a list of values and declares it as precomputed output."""
+
+    OutputName = "Output"
+
+    def __init__(self, my_simulation_parameters: SimulationParameters, values: List[float]) -> None:
+        """Initializes the component with the values to replay."""
+        super().__init__(
+            name="Replay",
+            my_simulation_parameters=my_simulation_parameters,
+            my_config=cp.ConfigBase(name="Replay"),
+            my_display_config=cp.DisplayConfig(),
+        )
+        self.values = values
+        self.simulate_calls = 0
+        self.output_channel = self.add_output(
+            self.component_name, self.OutputName, lt.LoadTypes.ANY, lt.Units.ANY, output_description="Replayed values"
+        )
+
+    def i_prepare_simulation(self) -> None:
+        """Declares the replayed values."""
+        self.set_precomputed_output_values(self.output_channel, self.values)
+
+    def i_save_state(self) -> None:
+        """No state."""
+
+    def i_restore_state(self) -> None:
+        """No state."""
+
+    def i_simulate(self, timestep: int, stsv: cp.SingleTimeStepValues, force_convergence: bool) -> None:
+        """Sets the value of the timestep."""
+        self.simulate_calls += 1
+        stsv.set_output_value(self.output_channel, self.values[timestep])
+
+
+class DoublingComponent(cp.Component):
+
+    """Doubles its input."""
+
+    InputName = "Input"
+    OutputName = "Output"
+
+    def __init__(self, my_simulation_parameters: SimulationParameters) -> None:
+        """Initializes the component."""
+        super().__init__(
+            name="Doubling",
+            my_simulation_parameters=my_simulation_parameters,
+            my_config=cp.ConfigBase(name="Doubling"),
+            my_display_config=cp.DisplayConfig(),
+        )
+        self.input_channel = self.add_input(
+            self.component_name, self.InputName, lt.LoadTypes.ANY, lt.Units.ANY, mandatory=True
+        )
+        self.output_channel = self.add_output(
+            self.component_name, self.OutputName, lt.LoadTypes.ANY, lt.Units.ANY, output_description="Doubled input"
+        )
+
+    def i_prepare_simulation(self) -> None:
+        """Nothing to prepare."""
+
+    def i_save_state(self) -> None:
+        """No state."""
+
+    def i_restore_state(self) -> None:
+        """No state."""
+
+    def i_simulate(self, timestep: int, stsv: cp.SingleTimeStepValues, force_convergence: bool) -> None:
+        """Sets the output to twice the input."""
+        stsv.set_output_value(self.output_channel, 2 * stsv.get_input_value(self.input_channel))
+
+
+@pytest.mark.parametrize("use_time_series_sources", [False, True])
+def test_time_series_source_is_written_without_simulation(tmp_path, use_time_series_sources: bool) -> None:
+    """The precomputed column is written directly and gives the same values as simulating the component."""
+    simulation_parameters = SimulationParameters.one_day_only(year=2021, seconds_per_timestep=3600)
+    simulation_parameters.result_directory = str(tmp_path)
+    simulation_parameters.use_time_series_sources = use_time_series_sources
+    my_sim = Simulator(
+        module_directory=str(tmp_path), module_filename="test", my_simulation_parameters=simulation_parameters
+    )
+    values = [float(timestep) for timestep in range(simulation_parameters.timesteps)]
+    replay = ReplayComponent(simulation_parameters, values)
+    doubling = DoublingComponent(simulation_parameters)
+    doubling.connect_input(DoublingComponent.InputName, replay.component_name, ReplayComponent.OutputName)
+    my_sim.add_component(replay)
+    my_sim.add_component(doubling)
+    my_sim.prepare_calculation()
+    my_sim.connect_all_components()
+
+    stsv = cp.SingleTimeStepValues(len(my_sim.all_outputs))
+    for timestep in [0, 5]:
+        resulting_stsv, _, _ = my_sim.process_one_timestep(timestep, stsv)
+        assert resulting_stsv.values[replay.output_channel.global_index] == values[timestep]
+        assert resulting_stsv.values[doubling.output_channel.global_index] == 2 * values[timestep]
+
+    assert my_sim.wrapped_components[0].is_time_series_source == use_time_series_sources
+    if use_time_series_sources:
+        assert replay.simulate_calls == 0
+        assert my_sim.time_series_values.shape == (simulation_parameters.timesteps, 1)
+    else:
+        assert replay.simulate_calls > 0
+        # without the option the declared values are not converted into an array
+        assert replay.precomputed_output_values[replay.output_channel] is values
+
+
+def test_too_short_time_series_raises(tmp_path) -> None:
+    """Precomputed values that do not cover the simulation are rejected."""
+    simulation_parameters = SimulationParameters.one_day_only(year=2021, seconds_per_timestep=3600)
+    simulation_parameters.result_directory = str(tmp_path)
+    simulation_parameters.use_time_series_sources = True
+    my_sim = Simulator(
+        module_directory=str(tmp_path), module_filename="test", my_simulation_parameters=simulation_parameters
+    )
+    my_sim.add_component(ReplayComponent(simulation_parameters, list(np.zeros(3))))
+    with pytest.raises(ValueError):
+        my_sim.prepare_calculation()
+
+
+def test_precomputed_values_are_available_to_later_components(tmp_path) -> None:
+    """Components prepared after a source can read its precomputed values through their inputs."""
+    simulation_parameters = SimulationParameters.one_day_only(year=2021, seconds_per_timestep=3600)
+    simulation_parameters.result_directory = str(tmp_path)
+    my_sim = Simulator(
+        module_directory=str(tmp_path), module_filename="test", my_simulation_parameters=simulation_parameters
+    )
+    values = [float(timestep) for timestep in range(simulation_parameters.timesteps)]
+    replay = ReplayComponent(simulation_parameters, values)
+    doubling = DoublingComponent(simulation_parameters)
+    doubling.connect_input(DoublingComponent.InputName, replay.component_name, ReplayComponent.OutputName)
+    assert doubling.get_precomputed_input_values(doubling.input_channel) is None
+
+    my_sim.add_component(replay)
+    my_sim.add_component(doubling)
+    my_sim.prepare_calculation()
+
+    precomputed_values = doubling.get_precomputed_input_values(doubling.input_channel)
+    assert precomputed_values is not None
+    assert precomputed_values.tolist() == values
@@ -3,13 +3,16 @@
 Covers full-year DNI output sanity checks, enum-vs-string location
 configuration consistency, direct-filepath configuration including
 validation that a data source is required when a direct filepath is given,
-and the cached-file pressure-column fallback in ``i_prepare_simulation``.
+the cached-file pressure-column fallback in ``i_prepare_simulation`` and the
+derivation of all resolutions from the 1-minute weather cache.
 """
 import pathlib
 
+import numpy as np
 import pandas as pd
 import pytest
 from hisim import sim_repository
+from hisim import columnar_cache
 from hisim import component
 from hisim import utils
 from hisim.components import weather
@@ -210,3 +213,48 @@ def test_weather_cache_pressure_non_keyerror_propagates(
     monkeypatch.setattr(weather.pd, "read_csv", fake_read_csv)
     with pytest.raises(ValueError, match="simulated cache corruption"):
         my_weather.i_prepare_simulation()
+
+
+@pytest.mark.base
+def test_weather_resolutions_are_derived_from_one_minute_cache(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """All resolutions of a location and year are derived from one cached 1-minute weather file.
+
+    The weather file is not read again once the 1-minute cache exists, and the derived lists are
+    the means of the 1-minute values over each timestep.
+    """
+    my_config: weather.WeatherConfig = weather.WeatherConfig.get_default(
+        location_entry=weather.LocationEnum.AACHEN
+    )
+    one_minute_parameters = SimulationParameters.full_year(year=2021, seconds_per_timestep=60)
+    one_minute_parameters.cache_dir_path = str(tmp_path)
+    cache_found, cache_filepath = weather.get_one_minute_weather_cache_file(my_config, one_minute_parameters)
+    assert not cache_found
+    one_minute_values = np.arange(60 * 24 * 365, dtype=np.float64)
+    columnar_cache.save_columnar_cache(
+        cache_filepath,
+        {
+            column_name: one_minute_values
+            for column_name in ["DNI", "T", "DHI", "GHI", "Wspd", "Pressure", "DNIextra", "altitude", "azimuth", "apparent_zenith"]
+        },
+    )
+
+    def fail_to_read(*args: object, **kwargs: object) -> None:
+        raise AssertionError("The weather file must not be read if the 1-minute cache exists.")
+
+    monkeypatch.setattr(weather, "read_test_reference_year_data", fail_to_read)
+    for seconds_per_timestep in [900, 3600]:
+        mysim = SimulationParameters.full_year(year=2021, seconds_per_timestep=seconds_per_timestep)
+        mysim.cache_dir_path = str(tmp_path)
+        assert weather.get_one_minute_weather_cache_file(my_config, mysim) == (True, cache_filepath)
+        my_weather = weather.Weather(config=my_config, my_simulation_parameters=mysim)
+        my_weather.set_sim_repo(sim_repository.SimRepository())
+        my_weather.i_prepare_simulation()
+
+        minutes_per_timestep = seconds_per_timestep // 60
+        expected = one_minute_values.reshape(-1, minutes_per_timestep).mean(axis=1)
+        assert len(my_weather.temperature_list) == mysim.timesteps
+        assert my_weather.temperature_list == pytest.approx(expected.tolist())
+        assert my_weather.azimuth_list == pytest.approx(expected.tolist())